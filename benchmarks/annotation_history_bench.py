@@ -0,0 +1,125 @@
+"""Benchmark screenshot annotation undo/redo on long editing sessions.
+
+Draws ``--actions`` freehand strokes, recording an undo checkpoint before
+each one as the overlay does, then undoes and redoes every step. The
+deep-copy snapshots used before AnnotationHistory are timed for reference
+on a shorter session, since their cost grows quadratically.
+
+    uv run python benchmarks/annotation_history_bench.py
+    uv run python benchmarks/annotation_history_bench.py --actions 5000
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtCore import QPoint  # noqa: E402
+from PyQt6.QtGui import QColor  # noqa: E402
+
+from src.core.annotation_history import AnnotationHistory  # noqa: E402
+
+
+def _timed(label, func, repeat=1):
+    started = time.perf_counter()
+    result = None
+    for _ in range(repeat):
+        result = func()
+    elapsed = (time.perf_counter() - started) * 1000 / repeat
+    print(f"{label:<36} {elapsed:10.3f} ms")
+    return result
+
+
+def _strokes(count, points):
+    return [
+        {
+            "type": "pen",
+            "color": QColor("#FF3333"),
+            "points": [QPoint(index, step) for step in range(points)],
+            "thickness": 4,
+        }
+        for index in range(count)
+    ]
+
+
+def _session(history, strokes):
+    actions = []
+    for stroke in strokes:
+        history.record(actions)
+        actions.append(stroke)
+    return actions
+
+
+def _clone_action(action):
+    """Deep copy of one action, as the overlay snapshotted them before."""
+    cloned = {}
+    for key, value in action.items():
+        if key == "points":
+            cloned[key] = [QPoint(point) for point in value]
+        elif key == "pos":
+            cloned[key] = QPoint(value)
+        elif key == "color":
+            cloned[key] = QColor(value)
+        else:
+            cloned[key] = value
+    return cloned
+
+
+def _snapshot_session(strokes):
+    undo_states = []
+    actions = []
+    for stroke in strokes:
+        undo_states.append([_clone_action(a) for a in actions])
+        actions.append(stroke)
+    return undo_states
+
+
+def _traced(func):
+    tracemalloc.start()
+    result = func()
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--actions", type=int, default=1000)
+    parser.add_argument("--points", type=int, default=50)
+    parser.add_argument("--max-depth", type=int, default=2000)
+    parser.add_argument("--snapshot-actions", type=int, default=250)
+    args = parser.parse_args()
+
+    strokes = _strokes(args.actions, args.points)
+    print(f"{args.actions} strokes x {args.points} points")
+
+    history = AnnotationHistory(max_depth=args.max_depth)
+    actions = _timed(
+        f"session ({args.actions}), AnnotationHistory",
+        lambda: _session(history, strokes),
+    )
+    _, peak = _traced(
+        lambda: _session(AnnotationHistory(max_depth=args.max_depth), strokes)
+    )
+    estimated = history.memory_usage() / (1024 * 1024)
+    print(f"{'  peak traced memory (MB)':<36} {peak:10.1f}")
+    print(f"{'  estimated history (MB)':<36} {estimated:10.1f}")
+
+    steps = len(history)
+    _timed("undo (per step)", lambda: history.undo(actions), steps)
+    _timed("redo (per step)", lambda: history.redo(actions), steps)
+
+    count = min(args.actions, args.snapshot_actions)
+    _timed(
+        f"session ({count}), deep-copy snapshots",
+        lambda: _snapshot_session(strokes[:count]),
+    )
+    _, peak = _traced(lambda: _snapshot_session(strokes[:count]))
+    print(f"{'  peak traced memory (MB)':<36} {peak:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
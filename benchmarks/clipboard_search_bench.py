@@ -0,0 +1,117 @@
+"""Benchmark ranked clipboard search on a synthetic history.
+
+Builds a ClipboardSearchIndex over N synthetic entries (English snippets,
+Chinese sentences and a few images), then times typical queries: words,
+prefixes, typos, pinyin initials, full pinyin and CJK substrings.
+
+    uv run python benchmarks/clipboard_search_bench.py
+    uv run python benchmarks/clipboard_search_bench.py --entries 20000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.clipboard_search import ClipboardSearchIndex  # noqa: E402
+
+WORDS = [
+    "deploy",
+    "release",
+    "invoice",
+    "customer",
+    "password",
+    "meeting",
+    "kubernetes",
+    "function",
+    "return",
+    "error",
+    "timeout",
+    "config",
+    "https",
+    "github",
+    "budget",
+    "report",
+]
+PHRASES = [
+    "复制的中文内容",
+    "会议纪要请查收",
+    "服务器地址已经更新",
+    "明天下午三点开会",
+    "发票抬头和税号",
+    "测试环境部署完成",
+]
+
+
+def _synthetic_entries(count, rng):
+    now = time.time()
+    entries = []
+    for index in range(count):
+        created_at = now - index * 60
+        if index % 50 == 0:
+            entries.append(
+                {
+                    "id": f"e{index}",
+                    "type": "image",
+                    "width": rng.choice([1920, 2560, 800]),
+                    "height": rng.choice([1080, 1440, 600]),
+                    "created_at": created_at,
+                }
+            )
+            continue
+        if index % 3 == 0:
+            text = f"{rng.choice(PHRASES)} {rng.choice(PHRASES)} {index}"
+        else:
+            text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 30)))
+            text += f" id_{index}"
+        entries.append(
+            {"id": f"e{index}", "type": "text", "text": text, "created_at": created_at}
+        )
+    return entries
+
+
+def _timed(label, func, repeat=1):
+    started = time.perf_counter()
+    result = None
+    for _ in range(repeat):
+        result = func()
+    elapsed = (time.perf_counter() - started) * 1000 / repeat
+    print(f"{label:<36} {elapsed:10.3f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=10_000)
+    args = parser.parse_args()
+
+    entries = _synthetic_entries(args.entries, random.Random(42))
+    index = ClipboardSearchIndex()
+
+    def build():
+        for entry in entries:
+            index.add(entry)
+
+    print(f"synthetic history: {len(entries)} entries")
+    _timed("build index", build)
+    _timed("add one entry", lambda: index.add(dict(entries[1], id="fresh")), 100)
+
+    for query in [
+        "id_1234",
+        "kube",
+        "timout",
+        "deploy release",
+        "hysq",
+        "fuwuqi",
+        "中文内容",
+        "1920x1080",
+        "error",
+    ]:
+        _timed(f"search {query!r} (top 20)", lambda q=query: index.search(q, 20), 50)
+
+
+if __name__ == "__main__":
+    main()
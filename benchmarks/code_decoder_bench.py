@@ -0,0 +1,83 @@
+"""Benchmark QR decoding on a large selection with several codes.
+
+Draws ``--codes`` QR codes onto a synthetic page and times the single
+full-resolution ``detectAndDecode`` the overlay used to run, a native
+``detectAndDecodeMulti``, and decode_codes (pyramid candidates plus a
+native tile sweep, each decoded at native resolution).
+
+    uv run python benchmarks/code_decoder_bench.py
+    uv run python benchmarks/code_decoder_bench.py --width 7680 --height 4320
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2  # noqa: E402
+import numpy as np  # noqa: E402
+from PyQt6.QtGui import QImage  # noqa: E402
+
+from src.core.code_decoder import decode_codes  # noqa: E402
+from src.utils.qimage_numpy import array_image  # noqa: E402
+
+
+def _timed(label, func, repeat=1):
+    started = time.perf_counter()
+    result = None
+    for _ in range(repeat):
+        result = func()
+    elapsed = (time.perf_counter() - started) * 1000 / repeat
+    print(f"{label:<36} {elapsed:10.3f} ms")
+    return result
+
+
+def _page(width, height, count):
+    page = np.full((height, width), 235, np.uint8)
+    encoder = cv2.QRCodeEncoder.create()
+    for index in range(count):
+        module = 5 + index % 4
+        code = cv2.resize(
+            encoder.encode(f"https://example.com/code/{index}"),
+            None,
+            fx=module,
+            fy=module,
+            interpolation=cv2.INTER_NEAREST,
+        )
+        code = cv2.copyMakeBorder(
+            code, *(4 * module,) * 4, cv2.BORDER_CONSTANT, value=255
+        )
+        x = (index * 1700) % (width - code.shape[1])
+        y = (index * 1100) % (height - code.shape[0])
+        page[y : y + code.shape[0], x : x + code.shape[1]] = code
+    return page
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--width", type=int, default=5120)
+    parser.add_argument("--height", type=int, default=2880)
+    parser.add_argument("--codes", type=int, default=3)
+    args = parser.parse_args()
+
+    page = _page(args.width, args.height, args.codes)
+    image = array_image(page, QImage.Format.Format_Grayscale8).convertToFormat(
+        QImage.Format.Format_RGB32
+    )
+    print(f"{args.width}x{args.height}, {args.codes} codes")
+
+    detector = cv2.QRCodeDetector()
+    text = _timed("detectAndDecode (before)", lambda: detector.detectAndDecode(page))
+    print(f"{'  codes found':<36} {int(bool(text[0])):10d}")
+    result = _timed(
+        "detectAndDecodeMulti, native", lambda: detector.detectAndDecodeMulti(page)
+    )
+    print(f"{'  codes found':<36} {sum(1 for t in result[1] if t):10d}")
+    codes = _timed("decode_codes", lambda: decode_codes(image))
+    print(f"{'  codes found':<36} {len(codes):10d}")
+
+
+if __name__ == "__main__":
+    main()
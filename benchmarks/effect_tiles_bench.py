@@ -0,0 +1,92 @@
+"""Benchmark mosaic/blur generation for the screenshot overlay.
+
+Compares the whole-desktop mosaic the overlay used to precompute on every
+capture with building only the tiles under one annotation stroke.
+
+    uv run python benchmarks/effect_tiles_bench.py
+    uv run python benchmarks/effect_tiles_bench.py --block 24
+"""
+
+import argparse
+import os
+import sys
+import time
+from unittest.mock import patch
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtCore import QRect, Qt  # noqa: E402
+from PyQt6.QtGui import QColor, QLinearGradient, QPainter, QPixmap  # noqa: E402
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+app = QApplication.instance() or QApplication([])
+
+from src.core import effect_tiles  # noqa: E402
+from src.core.effect_tiles import EffectTileCache  # noqa: E402
+
+
+def _timed(label, func, repeat=1):
+    started = time.perf_counter()
+    result = None
+    for _ in range(repeat):
+        result = func()
+    elapsed = (time.perf_counter() - started) * 1000 / repeat
+    print(f"{label:<36} {elapsed:10.3f} ms")
+    return result
+
+
+def _desktop(width, height):
+    pixmap = QPixmap(width, height)
+    painter = QPainter(pixmap)
+    gradient = QLinearGradient(0, 0, width, height)
+    gradient.setColorAt(0, QColor("#224488"))
+    gradient.setColorAt(1, QColor("#EECC22"))
+    painter.fillRect(pixmap.rect(), gradient)
+    painter.end()
+    return pixmap
+
+
+def _full_mosaic(pixmap, block):
+    return pixmap.scaled(
+        max(1, pixmap.width() // block),
+        max(1, pixmap.height() // block),
+        Qt.AspectRatioMode.IgnoreAspectRatio,
+        Qt.TransformationMode.FastTransformation,
+    ).scaled(
+        pixmap.width(),
+        pixmap.height(),
+        Qt.AspectRatioMode.IgnoreAspectRatio,
+        Qt.TransformationMode.FastTransformation,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--width", type=int, default=3 * 3840)
+    parser.add_argument("--height", type=int, default=2160)
+    parser.add_argument("--block", type=int, default=15)
+    args = parser.parse_args()
+
+    pixmap = _desktop(args.width, args.height)
+    stroke = QRect(1200, 800, 600, 40)
+    print(f"virtual desktop: {args.width}x{args.height}, stroke {stroke.width()}x"
+          f"{stroke.height()}")
+
+    _timed("whole-desktop mosaic (previous)", lambda: _full_mosaic(pixmap, args.block))
+    for style in ("mosaic", "blur"):
+
+        def first_stroke():
+            tiles = EffectTileCache(pixmap, style, args.block)
+            tiles.region(stroke)
+            return tiles
+
+        tiles = _timed(f"{style} tiles for one stroke", first_stroke, 5)
+        print(f"{'  tiles built':<36} {len(tiles):10d}")
+        _timed(f"{style} stroke, tiles cached", lambda: tiles.region(stroke), 20)
+        with patch.object(effect_tiles, "np", None):
+            _timed(f"{style} tiles for one stroke, no numpy", first_stroke, 5)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Benchmark the built-in file index on a synthetic tree.
+
+The default run feeds a synthetic 1M-entry tree (1,000 directories with
+1,000 files each) through the same merge path the crawler uses, then times
+queries, persistence and reloading. Pass ``--disk N`` to also crawl a real
+temporary tree with N files via ``os.scandir``.
+
+    uv run python benchmarks/file_index_bench.py
+    uv run python benchmarks/file_index_bench.py --entries 200000 --disk 20000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.file_index import FileIndex  # noqa: E402
+
+WORDS = [
+    "report",
+    "invoice",
+    "photo",
+    "backup",
+    "draft",
+    "notes",
+    "config",
+    "build",
+    "release",
+    "design",
+    "budget",
+    "meeting",
+    "archive",
+    "client",
+    "export",
+]
+EXTENSIONS = [".txt", ".pdf", ".png", ".docx", ".json", ".log", ".py", ".xlsx"]
+
+
+def _synthetic_name(rng, index):
+    return (
+        f"{rng.choice(WORDS)}_{rng.choice(WORDS)}_{index:07d}"
+        f"{rng.choice(EXTENSIONS)}"
+    )
+
+
+def _timed(label, func, repeat=1):
+    started = time.perf_counter()
+    result = None
+    for _ in range(repeat):
+        result = func()
+    elapsed = (time.perf_counter() - started) * 1000 / repeat
+    print(f"{label:<36} {elapsed:10.2f} ms")
+    return result
+
+
+def bench_synthetic(entries, index_file):
+    rng = random.Random(42)
+    root = os.path.join(tempfile.gettempdir(), "x-tools-synthetic-root")
+    dirs = max(1, entries // 1000)
+    per_dir = max(1, entries // dirs)
+    index = FileIndex([root], index_file=index_file)
+
+    def populate():
+        index._add_dir(root)
+        index._apply_scan(root, 1.0, [(f"dir_{d:05d}", True) for d in range(dirs)])
+        counter = 0
+        for d in range(dirs):
+            listing = []
+            for _ in range(per_dir):
+                listing.append((_synthetic_name(rng, counter), False))
+                counter += 1
+            index._apply_scan(os.path.join(root, f"dir_{d:05d}"), 1.0, listing)
+
+    print(f"synthetic tree: {dirs} dirs x {per_dir} files")
+    _timed("index synthetic tree", populate)
+    print(f"{'entries':<36} {len(index):10d}")
+
+    queries = ["r", "re", "report", "invoice_photo", "0123456", "budget .xlsx", "zz"]
+    for query in queries:
+        _timed(f"search {query!r} (top 20)", lambda q=query: index.search(q), 20)
+    _timed("search 'report' page 50", lambda: index.search("report", offset=1000), 20)
+
+    _timed("save index", index.save)
+    print(
+        f"{'index file size':<36} {os.path.getsize(index_file) / 1024 / 1024:10.1f} MB"
+    )
+
+    restored = FileIndex([root], index_file=index_file)
+    _timed("load index", restored.load)
+    _timed("search after load", lambda: restored.search("report"), 20)
+
+
+def bench_disk(files, index_file):
+    with tempfile.TemporaryDirectory() as tmp:
+        rng = random.Random(7)
+        per_dir = 500
+        for i in range(files):
+            folder = os.path.join(tmp, f"d{i // per_dir:04d}")
+            if i % per_dir == 0:
+                os.makedirs(folder, exist_ok=True)
+            with open(os.path.join(folder, _synthetic_name(rng, i)), "w"):
+                pass
+
+        index = FileIndex([tmp], index_file=index_file)
+        print(f"disk tree: {files} files")
+        _timed("crawl with os.scandir", index.build)
+        _timed("refresh (no changes)", index.refresh)
+
+        with open(os.path.join(tmp, "d0000", "fresh_report.txt"), "w"):
+            pass
+        _timed("refresh (one dir changed)", index.refresh)
+        print(f"{'found new file':<36} {bool(index.search('fresh_report'))!s:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--disk", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index_file = os.path.join(tmp, "file_index.bin")
+        bench_synthetic(args.entries, index_file)
+        if args.disk:
+            print()
+            bench_disk(args.disk, index_file)
+
+
+if __name__ == "__main__":
+    main()
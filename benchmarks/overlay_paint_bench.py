@@ -0,0 +1,165 @@
+"""Benchmark ScreenshotOverlay frame times under the offscreen Qt platform.
+
+Loads a synthetic virtual desktop (three 4K screens side by side by
+default) into the overlay, then times one frame per mouse move: the event
+handler plus rendering the region it invalidated into an ARGB image, the
+way the backing store would. A full-widget repaint is timed for reference.
+
+    uv run python benchmarks/overlay_paint_bench.py
+    uv run python benchmarks/overlay_paint_bench.py --width 3840
+"""
+
+import argparse
+import os
+import sys
+import time
+from unittest.mock import patch
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtCore import QEvent, QPoint, QPointF, QRect, Qt  # noqa: E402
+from PyQt6.QtGui import (  # noqa: E402
+    QColor,
+    QImage,
+    QLinearGradient,
+    QMouseEvent,
+    QPainter,
+    QPixmap,
+    QRegion,
+)
+from PyQt6.QtWidgets import QApplication, QWidget  # noqa: E402
+
+app = QApplication.instance() or QApplication([])
+
+from src.core.screen_capture import ScreenCapture  # noqa: E402
+from src.ui.screenshot_overlay import ScreenshotOverlay  # noqa: E402
+
+
+def _timed(label, func, repeat=1):
+    started = time.perf_counter()
+    result = None
+    for _ in range(repeat):
+        result = func()
+    elapsed = (time.perf_counter() - started) * 1000 / repeat
+    print(f"{label:<36} {elapsed:10.3f} ms")
+    return result
+
+
+def _load_desktop(overlay, width, height):
+    pixmap = QPixmap(width, height)
+    painter = QPainter(pixmap)
+    gradient = QLinearGradient(0, 0, width, height)
+    gradient.setColorAt(0, QColor("#224488"))
+    gradient.setColorAt(1, QColor("#EECC22"))
+    painter.fillRect(pixmap.rect(), gradient)
+    painter.end()
+
+    overlay.screen_capture = ScreenCapture.from_pixmap(pixmap)
+    overlay.screen_virtual_rect = QRect(0, 0, width, height)
+    overlay.setGeometry(0, 0, width, height)
+
+
+def _render(overlay, canvas, region):
+    painter = QPainter(canvas)
+    overlay.render(
+        painter, region.boundingRect().topLeft(), region, QWidget.RenderFlag(0)
+    )
+    painter.end()
+
+
+def _invalidated(overlay, canvas):
+    overlay._invalidate_annotation_layer()
+    _render(overlay, canvas, QRegion(overlay.rect()))
+
+
+class _Mover:
+    """Sends mouse moves along a path and renders what each invalidates."""
+
+    def __init__(self, overlay, canvas, points):
+        self.overlay = overlay
+        self.canvas = canvas
+        self.points = points
+        self.index = 0
+        self.dirty_pixels = 0
+
+    def frame(self):
+        x, y = self.points[self.index % len(self.points)]
+        self.index += 1
+        event = QMouseEvent(
+            QEvent.Type.MouseMove,
+            QPointF(x, y),
+            Qt.MouseButton.NoButton,
+            Qt.MouseButton.NoButton,
+            Qt.KeyboardModifier.NoModifier,
+        )
+        with patch.object(self.overlay, "update") as update_mock:
+            self.overlay.mouseMoveEvent(event)
+        region = update_mock.call_args.args[0]
+        bounds = region.boundingRect()
+        self.dirty_pixels += bounds.width() * bounds.height()
+        _render(self.overlay, self.canvas, region)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--width", type=int, default=3 * 3840)
+    parser.add_argument("--height", type=int, default=2160)
+    parser.add_argument("--frames", type=int, default=60)
+    parser.add_argument("--annotations", type=int, default=200)
+    args = parser.parse_args()
+
+    overlay = ScreenshotOverlay()
+    _load_desktop(overlay, args.width, args.height)
+    canvas = QImage(args.width, args.height, QImage.Format.Format_ARGB32_Premultiplied)
+    canvas.fill(0)
+    overlay.selection_rect = QRect(400, 300, 2400, 1400)
+    overlay.current_mouse_pos = QPoint(1000, 800)
+
+    print(f"virtual desktop: {args.width}x{args.height}")
+    full = QRegion(overlay.rect())
+    _timed("full repaint", lambda: _render(overlay, canvas, full), 5)
+
+    def run(label, points):
+        mover = _Mover(overlay, canvas, points)
+        _timed(label, mover.frame, args.frames)
+        average = mover.dirty_pixels / max(1, mover.index)
+        print(f"{'  dirty pixels per frame':<36} {average:10.0f}")
+
+    hover = [(1000 + 3 * i, 800 + 2 * i) for i in range(args.frames)]
+    run("hover frame (magnifier)", hover)
+
+    overlay.is_resizing = True
+    overlay.resize_anchor = "br"
+    resize = [(2800 + 4 * i, 1700 + 3 * i) for i in range(args.frames)]
+    run("resize selection frame", resize)
+    overlay.is_resizing = False
+
+    overlay.draw_mode = "pen"
+    overlay.current_action = {
+        "type": "pen",
+        "color": QColor("#FF3333"),
+        "points": [QPoint(800, 800)],
+        "thickness": 4,
+    }
+    stroke = [(800 + 6 * i, 800 + (i % 20) * 3) for i in range(args.frames)]
+    run("pen stroke frame", stroke)
+
+    # Committed annotations are served from the cached layer, so the cost of
+    # a stroke frame should not grow with how much was drawn before it.
+    overlay.draw_actions = [
+        {
+            "type": "pen",
+            "color": QColor("#3366FF"),
+            "points": [QPoint(500 + 10 * i, 400 + j * 5) for j in range(40)],
+            "thickness": 4,
+        }
+        for i in range(args.annotations)
+    ]
+    overlay.current_action["points"] = [QPoint(800, 800)]
+    _timed("full repaint (layer rebuild)", lambda: _invalidated(overlay, canvas), 5)
+    run(f"pen stroke frame, {args.annotations} annotations", stroke)
+
+
+if __name__ == "__main__":
+    main()
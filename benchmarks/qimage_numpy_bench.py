@@ -0,0 +1,93 @@
+"""Benchmark handing QImage pixels to NumPy on 8K images.
+
+Times the ways QR and OCR used to read pixels (``bits().asstring()``
+into ``np.frombuffer``, plus a channel slice made contiguous for the
+model) against the zero-copy views in src.utils.qimage_numpy. Every path
+includes the Qt format conversion it needs.
+
+    uv run python benchmarks/qimage_numpy_bench.py
+    uv run python benchmarks/qimage_numpy_bench.py --width 3840 --height 2160
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+from PyQt6.QtGui import QColor, QImage, QLinearGradient, QPainter  # noqa: E402
+
+from src.utils.qimage_numpy import bgra_view, image_view  # noqa: E402
+
+
+def _timed(label, func, repeat=1):
+    started = time.perf_counter()
+    result = None
+    for _ in range(repeat):
+        result = func()
+    elapsed = (time.perf_counter() - started) * 1000 / repeat
+    print(f"{label:<36} {elapsed:10.3f} ms")
+    return result
+
+
+def _screenshot(width, height):
+    image = QImage(width, height, QImage.Format.Format_ARGB32_Premultiplied)
+    painter = QPainter(image)
+    gradient = QLinearGradient(0, 0, width, height)
+    gradient.setColorAt(0, QColor("#224488"))
+    gradient.setColorAt(1, QColor("#EECC22"))
+    painter.fillRect(image.rect(), gradient)
+    painter.end()
+    return image
+
+
+def _qr_before(image):
+    ptr = image.bits()
+    ptr.setsize(image.sizeInBytes())
+    return np.frombuffer(ptr.asstring(), dtype=np.uint8).reshape(
+        (image.height(), image.width(), 4)
+    )
+
+
+def _ocr_before(image):
+    image = image.convertToFormat(QImage.Format.Format_RGBA8888)
+    ptr = image.bits()
+    ptr.setsize(image.sizeInBytes())
+    arr = np.frombuffer(ptr.asstring(), dtype=np.uint8).reshape(
+        (image.height(), image.width(), 4)
+    )
+    # The model copies the strided slice into a contiguous input.
+    return np.ascontiguousarray(arr[:, :, :3])
+
+
+def _ocr_after(image):
+    return np.ascontiguousarray(image_view(image, QImage.Format.Format_RGB888))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--width", type=int, default=7680)
+    parser.add_argument("--height", type=int, default=4320)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    image = _screenshot(args.width, args.height)
+    print(f"{args.width}x{args.height}, {image.sizeInBytes() / 2**20:.1f} MB")
+
+    before = _timed("QR pixels, asstring", lambda: _qr_before(image), args.repeat)
+    after = _timed("QR pixels, bgra_view", lambda: bgra_view(image), args.repeat)
+    assert np.array_equal(before, after)
+
+    before = _timed("OCR input, asstring + slice", lambda: _ocr_before(image))
+    after = _timed("OCR input, RGB888 view", lambda: _ocr_after(image))
+    assert np.array_equal(before, after)
+    _timed(
+        "  of which RGB888 conversion",
+        lambda: image.convertToFormat(QImage.Format.Format_RGB888),
+    )
+
+
+if __name__ == "__main__":
+    main()
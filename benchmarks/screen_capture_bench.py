@@ -0,0 +1,127 @@
+"""Benchmark multi-monitor capture setup under the offscreen Qt platform.
+
+Fakes ``--screens`` screens side by side (4K by default, the first one at
+2x) whose grabs are copies of a synthetic desktop, then times turning them
+into an overlay capture: the desktop-sized composite built before
+ScreenCapture, and ScreenCapture itself. Reads the overlay makes per frame
+and on copy are timed on both.
+
+    uv run python benchmarks/screen_capture_bench.py
+    uv run python benchmarks/screen_capture_bench.py --screens 2 --width 2560
+"""
+
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtCore import QRect, QSize, Qt  # noqa: E402
+from PyQt6.QtGui import QColor, QLinearGradient, QPainter, QPixmap  # noqa: E402
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+app = QApplication.instance() or QApplication([])
+
+from src.core.screen_capture import ScreenCapture, scaled_rect  # noqa: E402
+
+
+def _timed(label, func, repeat=1):
+    started = time.perf_counter()
+    result = None
+    for _ in range(repeat):
+        result = func()
+    elapsed = (time.perf_counter() - started) * 1000 / repeat
+    print(f"{label:<36} {elapsed:10.3f} ms")
+    return result
+
+
+class _FakeScreen:
+    def __init__(self, geometry, scale):
+        self._geometry = geometry
+        self._scale = scale
+        self._pixmap = QPixmap(
+            round(geometry.width() * scale), round(geometry.height() * scale)
+        )
+        painter = QPainter(self._pixmap)
+        gradient = QLinearGradient(0, 0, self._pixmap.width(), 0)
+        gradient.setColorAt(0, QColor("#224488"))
+        gradient.setColorAt(1, QColor("#EECC22"))
+        painter.fillRect(self._pixmap.rect(), gradient)
+        painter.end()
+
+    def geometry(self):
+        return self._geometry
+
+    def devicePixelRatio(self):
+        return self._scale
+
+    def grabWindow(self, window):
+        return self._pixmap.copy()
+
+
+def _composite(capture):
+    # What capture_screen built before ScreenCapture: every screen painted
+    # into one desktop-sized pixmap, kept alongside the per-screen grabs.
+    pixmap = QPixmap(QSize(capture.width(), capture.height()))
+    pixmap.setDevicePixelRatio(capture.scale)
+    pixmap.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(pixmap)
+    for grab in capture.grabs:
+        offset = grab.geometry.topLeft() - capture.virtual_rect.topLeft()
+        painter.drawPixmap(offset, grab.pixmap)
+    painter.end()
+    return pixmap
+
+
+def _megabytes(*pixmaps):
+    return sum(p.width() * p.height() * 4 for p in pixmaps) / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--screens", type=int, default=3)
+    parser.add_argument("--width", type=int, default=3840)
+    parser.add_argument("--height", type=int, default=2160)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # The first screen is 2x, so its logical size is half its pixels.
+    screens = [_FakeScreen(QRect(0, 0, args.width // 2, args.height // 2), 2.0)]
+    for _ in range(1, args.screens):
+        left = screens[-1].geometry().right() + 1
+        screens.append(_FakeScreen(QRect(left, 0, args.width, args.height), 1.0))
+
+    capture = _timed(
+        f"grab {args.screens} screens", lambda: ScreenCapture.grab(screens)
+    )
+    grabs = [grab.pixmap for grab in capture.grabs]
+    print(f"{'  per-screen grab (ms)':<36} {capture.grab_times()}")
+
+    composite = _timed(
+        "composite (before)", lambda: _composite(capture), args.repeat
+    )
+    print(f"{'  buffers (MB), before':<36} {_megabytes(composite, *grabs):10.1f}")
+    print(f"{'  buffers (MB), ScreenCapture':<36} {_megabytes(*grabs):10.1f}")
+
+    zoom = QRect(capture.width() // 2, 200, 15, 15)
+    _timed("magnifier copy, composite", lambda: composite.copy(zoom), 200)
+    _timed("magnifier copy, ScreenCapture", lambda: capture.copy(zoom), 200)
+
+    seam = screens[1].geometry().left()
+    selection = QRect(seam - 400, 100, 800, 600)
+    _timed(
+        "spanning selection, composite",
+        lambda: composite.copy(scaled_rect(selection, capture.scale)),
+        args.repeat,
+    )
+    _timed(
+        "spanning selection, ScreenCapture",
+        lambda: capture.region(selection),
+        args.repeat,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Benchmark stitching a scrolling capture from full-HD frames.
+
+Scrolls a synthetic page under a sticky header and footer and times each
+step of ScrollStitcher: hashing a frame's rows, finding the shift, adding
+the frame, and assembling the final image. Memory is compared with
+keeping every grabbed frame.
+
+    uv run python benchmarks/scroll_stitch_bench.py
+    uv run python benchmarks/scroll_stitch_bench.py --frames 120 --step 90
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+from PyQt6.QtGui import QImage  # noqa: E402
+
+from src.core.scroll_stitch import ScrollStitcher, find_shift, row_hashes  # noqa: E402
+from src.utils.qimage_numpy import array_image, bgra_view  # noqa: E402
+
+HEADER = 120
+FOOTER = 60
+
+
+def _timed(label, func, repeat=1):
+    started = time.perf_counter()
+    result = None
+    for _ in range(repeat):
+        result = func()
+    elapsed = (time.perf_counter() - started) * 1000 / repeat
+    print(f"{label:<36} {elapsed:10.3f} ms")
+    return result
+
+
+def _frames(width, height, count, step):
+    band = height - HEADER - FOOTER
+    rng = np.random.default_rng(1)
+    page = rng.integers(0, 256, (band + count * step, width, 4), dtype=np.uint8)
+    page[..., 3] = 255
+    for top in range(0, len(page), 180):
+        page[top : top + 40] = 255
+    header = np.full((HEADER, width, 4), 60, np.uint8)
+    footer = np.full((FOOTER, width, 4), 200, np.uint8)
+    return [
+        array_image(
+            np.concatenate([header, page[index * step : index * step + band], footer]),
+            QImage.Format.Format_RGB32,
+        )
+        for index in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--frames", type=int, default=60)
+    parser.add_argument("--step", type=int, default=120)
+    args = parser.parse_args()
+
+    frames = _frames(args.width, args.height, args.frames, args.step)
+    print(f"{args.frames} frames of {args.width}x{args.height}, {args.step} px apart")
+
+    pixels = bgra_view(frames[1])
+    _timed("row_hashes", lambda: row_hashes(pixels), repeat=20)
+    previous, current = row_hashes(bgra_view(frames[0])), row_hashes(pixels)
+    _timed("find_shift", lambda: find_shift(previous, current), repeat=20)
+
+    stitcher = ScrollStitcher()
+    started = time.perf_counter()
+    for frame in frames:
+        stitcher.add_frame(frame)
+    elapsed = (time.perf_counter() - started) * 1000 / len(frames)
+    print(f"{'add_frame, per frame':<36} {elapsed:10.3f} ms")
+    image = _timed("image()", stitcher.image)
+    print(f"{'  stitched height':<36} {image.height():10d} px")
+
+    tiles = sum(tile.nbytes for tile in stitcher._tiles) / 2**20
+    frames_mb = sum(frame.sizeInBytes() for frame in frames) / 2**20
+    print(f"{'tiles held':<36} {tiles:10.1f} MB")
+    print(f"{'every frame kept':<36} {frames_mb:10.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
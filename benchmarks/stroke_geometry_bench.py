@@ -0,0 +1,123 @@
+"""Benchmark the per-move cost of keeping a live freehand stroke painted.
+
+Grows a mosaic-style stroke point by point and times, at a few stroke
+lengths, what one mouse move used to cost (re-smoothing and re-stroking the
+whole path, then clipping to it) against StrokeGeometry, which rebuilds
+only the tail and paints only the parts under the dirty tail.
+
+    uv run python benchmarks/stroke_geometry_bench.py
+    uv run python benchmarks/stroke_geometry_bench.py --points 20000
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtCore import QPoint, QRect, Qt  # noqa: E402
+from PyQt6.QtGui import QColor, QImage, QPainter, QPainterPathStroker  # noqa: E402
+
+from src.core.stroke_geometry import (  # noqa: E402
+    StrokeGeometry,
+    add_point,
+    simplify,
+    smooth_path,
+)
+
+STROKE_WIDTH = 15
+
+
+def _timed(label, func, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    elapsed = (time.perf_counter() - started) * 1000 / repeat
+    print(f"{label:<36} {elapsed:10.3f} ms")
+
+
+def _raw_points(count):
+    return [
+        QPoint(
+            round(960 + 700 * math.sin(step / 400) + 40 * math.sin(step / 9)),
+            round(540 + 400 * math.sin(step / 290) + 40 * math.cos(step / 11)),
+        )
+        for step in range(count)
+    ]
+
+
+def _paint(canvas, source, outlines, clip):
+    painter = QPainter(canvas)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    painter.setClipRect(clip)
+    for outline in outlines:
+        target = outline.boundingRect().toAlignedRect() & clip
+        if target.isEmpty():
+            continue
+        painter.save()
+        painter.setClipPath(outline, Qt.ClipOperation.IntersectClip)
+        painter.drawImage(target, source, target)
+        painter.restore()
+    painter.end()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    canvas = QImage(1920, 1080, QImage.Format.Format_ARGB32_Premultiplied)
+    source = QImage(1920, 1080, QImage.Format.Format_ARGB32_Premultiplied)
+    source.fill(QColor("#3366AA"))
+    stroker = QPainterPathStroker()
+    stroker.setWidth(STROKE_WIDTH)
+    stroker.setCapStyle(Qt.PenCapStyle.RoundCap)
+    stroker.setJoinStyle(Qt.PenJoinStyle.RoundJoin)
+
+    raw = _raw_points(args.points)
+    points = []
+    for pos in raw:
+        add_point(points, pos)
+    print(
+        f"{args.points} mouse moves -> {len(points)} live points, "
+        f"{len(simplify(points))} after simplify"
+    )
+
+    for length in (100, 1000, len(raw)):
+        stroke = raw[:length]
+        tail = stroke[-4:]
+        margin = STROKE_WIDTH // 2 + 2
+        xs, ys = [p.x() for p in tail], [p.y() for p in tail]
+        dirty = QRect(
+            QPoint(min(xs) - margin, min(ys) - margin),
+            QPoint(max(xs) + margin, max(ys) + margin),
+        )
+        print(f"{length} points")
+
+        def before():
+            outline = stroker.createStroke(smooth_path(stroke))
+            _paint(canvas, source, [outline], outline.boundingRect().toAlignedRect())
+
+        _timed("  whole path (before)", before, args.repeat)
+
+        live = list(stroke)
+        geometry = StrokeGeometry(STROKE_WIDTH)
+        geometry.update(live)
+        wiggle = [stroke[-1], stroke[-1] + QPoint(1, 1)]
+
+        def after():
+            # Slide the last point back and forth, as a live move does.
+            wiggle.reverse()
+            live[-1] = wiggle[0]
+            geometry.update(live)
+            _paint(canvas, source, [p.outline for p in geometry.parts()], dirty)
+
+        _timed("  StrokeGeometry, tail only", after, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+DEFAULT_UNDO_DEPTH = 200
+DEFAULT_UNDO_MAX_MB = 64
+
+# Rough per-object costs used to keep the history under its byte budget.
+_ACTION_BYTES = 240
+_POINT_BYTES = 64
+
+
+def _freeze(action):
+    """Shallow copy of an annotation action.
+
+    Editing code replaces an action's values (``pos``, ``points``) rather
+    than mutating them, so the copy stays valid without cloning points.
+    """
+    return dict(action)
+
+
+def _same(live, frozen):
+    if live.keys() != frozen.keys():
+        return False
+    return all(live[key] is frozen[key] for key in frozen)
+
+
+def _action_bytes(action):
+    return (
+        _ACTION_BYTES
+        + _POINT_BYTES * len(action.get("points", ()))
+        + len(str(action.get("text", "")))
+    )
+
+
+class _Splice:
+    """Replace ``removed`` at ``index`` with ``inserted`` (frozen actions)."""
+
+    __slots__ = ("index", "removed", "inserted", "size")
+
+    def __init__(self, index, removed, inserted):
+        self.index = index
+        self.removed = removed
+        self.inserted = inserted
+        self.size = 64 + sum(_action_bytes(a) for a in removed + inserted)
+
+
+def _diff(frozen, live):
+    """Return the splice turning ``frozen`` into ``live``, or ``None``."""
+    low = 0
+    high_frozen = len(frozen)
+    high_live = len(live)
+    limit = min(high_frozen, high_live)
+    while low < limit and _same(live[low], frozen[low]):
+        low += 1
+    while (
+        high_frozen > low
+        and high_live > low
+        and _same(live[high_live - 1], frozen[high_frozen - 1])
+    ):
+        high_frozen -= 1
+        high_live -= 1
+    if low == high_frozen and low == high_live:
+        return None
+    return _Splice(
+        low,
+        frozen[low:high_frozen],
+        [_freeze(action) for action in live[low:high_live]],
+    )
+
+
+class AnnotationHistory:
+    """Undo/redo history for the screenshot annotation list.
+
+    Instead of a deep copy of every action per edit, the history keeps one
+    shallow copy of the list as of the latest checkpoint and, for each
+    older checkpoint, only the splice that turns the next state back into
+    it. Unchanged actions are shared between all states, so an edit costs
+    memory proportional to the actions it touched. The oldest steps are
+    dropped beyond ``max_depth`` or once the stored splices exceed
+    ``max_bytes``.
+
+    ``record`` is called before an edit, like the snapshot it replaces;
+    ``undo`` and ``redo`` update the caller's action list in place.
+    """
+
+    def __init__(self, max_depth=DEFAULT_UNDO_DEPTH, max_bytes=None):
+        self._top = None
+        self._undo = []
+        self._redo = []
+        self._bytes = 0
+        self.configure(max_depth, max_bytes)
+
+    def configure(self, max_depth=DEFAULT_UNDO_DEPTH, max_bytes=None):
+        if max_bytes is None:
+            max_bytes = DEFAULT_UNDO_MAX_MB * 1024 * 1024
+        self.max_depth = max(1, int(max_depth))
+        self.max_bytes = max(0, int(max_bytes))
+        self._trim()
+
+    def __len__(self):
+        return len(self._undo) + (self._top is not None)
+
+    def can_undo(self):
+        return self._top is not None
+
+    def can_redo(self):
+        return bool(self._redo)
+
+    def memory_usage(self):
+        """Approximate bytes held by stored splices."""
+        return self._bytes
+
+    def clear(self):
+        self._top = None
+        self._undo = []
+        self._redo = []
+        self._bytes = 0
+
+    def record(self, actions):
+        """Add a checkpoint that ``undo`` returns ``actions`` to."""
+        if self._top is None:
+            self._top = [_freeze(action) for action in actions]
+        else:
+            forward = _diff(self._top, actions)
+            if forward is not None:
+                self._push(self._undo, self._invert(forward))
+                self._top = self._apply(self._top, forward)
+        self._drop(self._redo)
+        self._trim()
+
+    def undo(self, actions):
+        if self._top is None:
+            return False
+        forward = _diff(self._top, actions)
+        self._push(self._redo, forward or _Splice(0, [], []))
+        self._restore(actions, forward)
+        if self._undo:
+            back = self._pop(self._undo)
+            self._top = self._apply(self._top, back)
+        else:
+            self._top = None
+        return True
+
+    def redo(self, actions):
+        if not self._redo:
+            return False
+        forward = self._pop(self._redo)
+        if self._top is None:
+            self._top = [_freeze(action) for action in actions]
+        else:
+            back = _diff(self._top, actions)
+            if back is not None:
+                self._push(self._undo, self._invert(back))
+                self._top = self._apply(self._top, back)
+        actions[forward.index : forward.index + len(forward.removed)] = [
+            dict(action) for action in forward.inserted
+        ]
+        self._trim()
+        return True
+
+    @staticmethod
+    def _invert(splice):
+        return _Splice(splice.index, splice.inserted, splice.removed)
+
+    @staticmethod
+    def _apply(frozen, splice):
+        end = splice.index + len(splice.removed)
+        return frozen[: splice.index] + splice.inserted + frozen[end:]
+
+    @staticmethod
+    def _restore(actions, forward):
+        if forward is None:
+            return
+        end = forward.index + len(forward.inserted)
+        actions[forward.index : end] = [
+            dict(action) for action in forward.removed
+        ]
+
+    def _push(self, stack, splice):
+        stack.append(splice)
+        self._bytes += splice.size
+
+    def _pop(self, stack):
+        splice = stack.pop()
+        self._bytes -= splice.size
+        return splice
+
+    def _drop(self, stack):
+        self._bytes -= sum(splice.size for splice in stack)
+        stack.clear()
+
+    def _trim(self):
+        excess = len(self._undo) - (self.max_depth - 1)
+        if excess > 0:
+            self._bytes -= sum(splice.size for splice in self._undo[:excess])
+            del self._undo[:excess]
+        while self._undo and self._bytes > self.max_bytes:
+            self._bytes -= self._undo.pop(0).size
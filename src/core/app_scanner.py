@@ -1,42 +1,9 @@
 import os
 import re
-import importlib
 import win32com.client
 import pythoncom
 
-lazy_pinyin = None
-try:
-    _pypinyin = importlib.import_module("pypinyin")
-    lazy_pinyin = getattr(_pypinyin, "lazy_pinyin", None)
-except Exception:
-    lazy_pinyin = None
-
-
-INITIAL_RANGES = [
-    (-20319, "a"),
-    (-20284, "b"),
-    (-19776, "c"),
-    (-19219, "d"),
-    (-18711, "e"),
-    (-18527, "f"),
-    (-18240, "g"),
-    (-17923, "h"),
-    (-17418, "j"),
-    (-16475, "k"),
-    (-16213, "l"),
-    (-15641, "m"),
-    (-15166, "n"),
-    (-14923, "o"),
-    (-14915, "p"),
-    (-14631, "q"),
-    (-14150, "r"),
-    (-14091, "s"),
-    (-13319, "t"),
-    (-12839, "w"),
-    (-12557, "x"),
-    (-11848, "y"),
-    (-11056, "z"),
-]
+from src.core.pinyin import char_initial, full_pinyin
 
 
 class AppScanner:
@@ -56,44 +23,13 @@ class AppScanner:
 
     @staticmethod
     def _char_initial(ch):
-        if not ch:
-            return ""
-
-        lower = ch.lower()
-        if "a" <= lower <= "z" or "0" <= lower <= "9":
-            return lower
-
-        try:
-            gbk = ch.encode("gbk")
-        except Exception:
-            return ""
-
-        if len(gbk) < 2:
-            return ""
-
-        code = gbk[0] * 256 + gbk[1] - 65536
-        for i in range(len(INITIAL_RANGES) - 1):
-            lower_bound, initial = INITIAL_RANGES[i]
-            upper_bound, _ = INITIAL_RANGES[i + 1]
-            if lower_bound <= code < upper_bound:
-                return initial
-
-        if code >= INITIAL_RANGES[-1][0]:
-            return INITIAL_RANGES[-1][1]
-
-        return ""
+        return char_initial(ch)
 
     def _build_search_fields(self, name):
         lower = self._normalize(name)
         compact = self._compact(lower)
         initials = "".join(self._char_initial(ch) for ch in name)
-
-        pinyin_full = ""
-        if lazy_pinyin is not None:
-            try:
-                pinyin_full = "".join(lazy_pinyin(name)).lower()
-            except Exception:
-                pinyin_full = ""
+        pinyin_full = full_pinyin(name)
 
         return {
             "_search_lower": lower,
@@ -1,14 +1,27 @@
 import json
 import os
+import shutil
+import tempfile
 import time
 import uuid
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 from PyQt6.QtCore import QObject, QTimer, pyqtSignal
 from PyQt6.QtGui import QImage, QPixmap
 from PyQt6.QtWidgets import QApplication
 
+from src.core.capture_search import CaptureHistoryIndex, format_timestamp
+from src.core.config import config_manager
+from src.core.image_store import image_store as default_image_store
+from src.core.image_writer import image_pixel_digest
 from src.core.logger import get_logger
+from src.core.metrics import metrics_store
+from src.core.retention import (
+    HistoryEntries,
+    RetentionIndex,
+    RetentionPolicy,
+    background_cleaner,
+)
 
 
 logger = get_logger(__name__)
@@ -21,20 +34,48 @@ IMAGE_DIR = os.path.join(XTOOLS_DIR, "capture_images")
 
 class CaptureHistoryManager(QObject):
     entries_changed = pyqtSignal()
+    # (save_path, ok) once a capture queued with a save path has been written.
+    capture_saved = pyqtSignal(str, bool)
+    _capture_written = pyqtSignal(object)
 
-    def __init__(self):
+    def __init__(self, image_store=None, retention_policy=None, cleaner=None):
         super().__init__()
-        self._entries = []
+        self._image_store = image_store or default_image_store
+        self._entries = HistoryEntries()
         self._is_applying = False
         self._max_entries = 300
+        self._retention_policy = retention_policy or RetentionPolicy.from_config(
+            config_manager, "capture_history", max_entries=self._max_entries
+        )
+        self._retention = RetentionIndex()
+        self._cleaner = cleaner or background_cleaner
+        self._index = CaptureHistoryIndex()
+        self._writer = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="capture-writer"
+        )
+        self._capture_written.connect(self._on_capture_written)
         self._load()
+        self._image_store.reconcile(
+            "capture",
+            {
+                entry["id"]: self._image_store.digest_from_path(entry["image_path"])
+                for entry in self._entries
+                if self._image_store.owns(entry["image_path"])
+            },
+        )
+        for entry in reversed(self._entries):
+            self._index.add(entry)
+            if not entry["pinned"]:
+                self._track_retention(entry, entry["created_at"])
+        if self._trim():
+            self._save()
 
     def _load(self):
         os.makedirs(XTOOLS_DIR, exist_ok=True)
         os.makedirs(IMAGE_DIR, exist_ok=True)
 
         if not os.path.exists(HISTORY_FILE):
-            self._entries = []
+            self._entries = HistoryEntries()
             return
 
         try:
@@ -68,65 +109,297 @@ class CaptureHistoryManager(QObject):
                     }
                     entries.append(entry)
 
-            self._entries = entries[: self._max_entries]
+            self._entries = HistoryEntries(entries[: self._max_entries])
         except Exception as e:
             logger.warning("Failed to load capture history: %s", e)
-            self._entries = []
+            self._entries = HistoryEntries()
 
     def _save(self):
         try:
             os.makedirs(XTOOLS_DIR, exist_ok=True)
             os.makedirs(IMAGE_DIR, exist_ok=True)
             with open(HISTORY_FILE, "w", encoding="utf-8") as f:
-                json.dump(self._entries, f, ensure_ascii=False, indent=2)
+                json.dump(
+                    self._entries.to_list(), f, ensure_ascii=False, indent=2
+                )
         except Exception as e:
             logger.warning("Failed to save capture history: %s", e)
 
     @staticmethod
-    def _pixmap_from_image_like(image_like):
-        if isinstance(image_like, QPixmap) and not image_like.isNull():
-            return image_like
+    def _image_from_image_like(image_like):
         if isinstance(image_like, QImage) and not image_like.isNull():
-            return QPixmap.fromImage(image_like)
+            return image_like
+        if isinstance(image_like, QPixmap) and not image_like.isNull():
+            return image_like.toImage()
         return None
 
+    @staticmethod
+    def _action_list(actions):
+        if not isinstance(actions, (list, tuple, set)):
+            return []
+        return [str(action) for action in actions if str(action).strip()]
+
+    def _store_image(self, image, capture_id):
+        """Put ``image`` in the blob store; return ``(path, encode_ms)``.
+
+        The path is empty if the image could not be written. Encoding is
+        skipped when the store already holds the same pixels.
+        """
+        digest = image_pixel_digest(image)
+        image_path = self._image_store.path_for(digest)
+        # Take the reference before checking for the blob, so a cleanup
+        # running in the background cannot delete it in between.
+        self._image_store.add_ref(digest, f"capture:{capture_id}")
+        if self._image_store.contains(digest):
+            return image_path, 0.0
+
+        # The clipboard history may be encoding the same pixels right now;
+        # the store lets one of us encode and the other reuse the blob.
+        started = time.perf_counter()
+        ok = self._image_store.write(digest, image)
+        elapsed = (time.perf_counter() - started) * 1000
+        if not ok:
+            self._image_store.release(f"capture:{capture_id}")
+            return "", elapsed
+        return image_path, elapsed
+
+    def _insert_entry(self, entry):
+        self._entries.add(entry)
+        self._index.add(entry)
+        self._track_retention(entry)
+        self._trim()
+        self._save()
+        self.entries_changed.emit()
+
     def add_capture(self, image_like, source="", saved_path="", actions=None):
-        pixmap = self._pixmap_from_image_like(image_like)
-        if pixmap is None:
+        """Store a capture synchronously and return its entry."""
+        image = self._image_from_image_like(image_like)
+        if image is None:
             return None
 
-        os.makedirs(IMAGE_DIR, exist_ok=True)
         capture_id = str(uuid.uuid4())
-        image_path = os.path.join(IMAGE_DIR, f"{capture_id}.png")
-        if not pixmap.save(image_path, "PNG"):
+        image_path, _encode_ms = self._store_image(image, capture_id)
+        if not image_path:
             return None
 
-        action_list = []
-        if isinstance(actions, (list, tuple, set)):
-            action_list = [str(action) for action in actions if str(action).strip()]
-
         entry = {
             "id": capture_id,
             "image_path": image_path,
             "saved_path": str(saved_path or "").strip(),
             "created_at": time.time(),
             "source": str(source or "").strip(),
-            "actions": action_list,
+            "actions": self._action_list(actions),
             "pinned": False,
-            "width": pixmap.width(),
-            "height": pixmap.height(),
+            "width": image.width(),
+            "height": image.height(),
         }
-
-        self._entries.insert(0, entry)
-        self._trim()
-        self._save()
-        self.entries_changed.emit()
+        self._insert_entry(entry)
         return dict(entry)
 
+    def submit_capture(
+        self, image_like, source="", actions=None, save_path="", save_source="auto"
+    ):
+        """Queue a capture for the background writer and return its id.
+
+        The image is encoded to PNG once, into the blob store, and
+        ``save_path`` receives a hard link to (or a copy of) that file, so
+        the caller can return without waiting. The history entry appears
+        when the write finishes, and ``capture_saved`` reports the outcome
+        of the save. Pass a ``QImage``: a ``QPixmap`` is converted here,
+        on the calling thread.
+        """
+        image = self._image_from_image_like(image_like)
+        if image is None:
+            return ""
+
+        job = {
+            "id": str(uuid.uuid4()),
+            "image": image,
+            "created_at": time.time(),
+            "source": str(source or "").strip(),
+            "actions": self._action_list(actions),
+            "save_path": str(save_path or "").strip(),
+            "save_source": str(save_source or ""),
+        }
+        self._writer.submit(self._write_capture, job)
+        return job["id"]
+
+    def _write_capture(self, job):
+        """Encode and save a queued capture; runs on the writer thread."""
+        image = job.pop("image")
+        job["width"] = image.width()
+        job["height"] = image.height()
+        job["saved"] = False
+        try:
+            job["image_path"], encode_ms = self._store_image(image, job["id"])
+        except Exception as e:
+            logger.warning("Failed to store capture: %s", e)
+            job["image_path"], encode_ms = "", 0.0
+
+        save_path = job["save_path"]
+        if save_path:
+            started = time.perf_counter()
+            if job["image_path"]:
+                job["saved"] = self._publish_copy(job["image_path"], save_path)
+            else:
+                job["saved"] = self._encode_to(image, save_path)
+            elapsed = encode_ms + (time.perf_counter() - started) * 1000
+            metrics_store.record(
+                "screenshot.save",
+                elapsed,
+                {
+                    "ok": job["saved"],
+                    "path": save_path,
+                    "source": job["save_source"],
+                },
+            )
+            if job["saved"]:
+                logger.info("Screenshot saved (%s): %s", job["save_source"], save_path)
+            else:
+                logger.warning(
+                    "Failed to save screenshot (%s): %s", job["save_source"], save_path
+                )
+        self._capture_written.emit(job)
+
+    @staticmethod
+    def _publish_copy(source_path, output_path):
+        """Give ``output_path`` its own copy of the bytes of ``source_path``.
+
+        The source is a shared, content-addressed blob, so the user's file
+        is never linked to it: editing the saved file must not change the
+        history images.
+        """
+        tmp_path = None
+        try:
+            output_dir = os.path.dirname(os.path.abspath(output_path))
+            os.makedirs(output_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                prefix=f".{os.path.basename(output_path)}.",
+                suffix=".tmp",
+                dir=output_dir,
+            )
+            os.close(fd)
+            shutil.copyfile(source_path, tmp_path)
+            os.replace(tmp_path, output_path)
+            tmp_path = None
+            return True
+        except Exception as e:
+            logger.warning("Failed to save screenshot to %s: %s", output_path, e)
+            return False
+        finally:
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _encode_to(image, output_path):
+        try:
+            output_dir = os.path.dirname(output_path)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+            return bool(image.save(output_path, "PNG"))
+        except Exception as e:
+            logger.warning("Failed to save screenshot to %s: %s", output_path, e)
+            return False
+
+    def _on_capture_written(self, job):
+        if job["save_path"]:
+            self.capture_saved.emit(job["save_path"], bool(job["saved"]))
+        if not job["image_path"]:
+            return
+
+        actions = job["actions"]
+        if job["save_path"] and not job["saved"]:
+            actions = [action for action in actions if action != "save"]
+        self._insert_entry(
+            {
+                "id": job["id"],
+                "image_path": job["image_path"],
+                "saved_path": job["save_path"] if job["saved"] else "",
+                "created_at": job["created_at"],
+                "source": job["source"],
+                "actions": actions,
+                "pinned": False,
+                "width": job["width"],
+                "height": job["height"],
+            }
+        )
+
+    def wait_for_writes(self, timeout=None):
+        """Block until every capture queued so far has been written."""
+        self._writer.submit(lambda: None).result(timeout)
+
+    @staticmethod
+    def _entry_size(entry):
+        try:
+            return os.path.getsize(entry.get("image_path", ""))
+        except OSError:
+            return 0
+
+    def _entry_blob(self, entry):
+        """Key of the store blob ``entry`` shares with others, if any."""
+        path = entry.get("image_path", "")
+        if self._image_store.owns(path):
+            return self._image_store.digest_from_path(path)
+        return None
+
+    def _track_retention(self, entry, last_used=None):
+        self._retention.add(
+            entry["id"], self._entry_size(entry), last_used, self._entry_blob(entry)
+        )
+
     def _trim(self):
-        while len(self._entries) > self._max_entries:
-            removed = self._entries.pop()
-            self._safe_remove_history_image(removed.get("image_path", ""))
+        """Evict entries that break the retention policy; return how many."""
+        started = time.perf_counter()
+        bytes_before = self._retention.total_bytes
+        evicted = self._retention.evict(
+            self._retention_policy,
+            pinned_count=len(self._entries) - len(self._retention),
+        )
+        if not evicted:
+            return 0
+
+        removed = self._entries.pop_many(evicted)
+        for entry in removed:
+            self._index.remove(entry.get("id"))
+        self._cleaner.submit(self._cleanup_evicted, removed)
+        metrics_store.record(
+            "history.evict",
+            (time.perf_counter() - started) * 1000,
+            {
+                "history": "capture",
+                "evicted": len(removed),
+                "bytes": bytes_before - self._retention.total_bytes,
+            },
+        )
+        return len(removed)
+
+    def _cleanup_evicted(self, entries):
+        """Release evicted images; runs off the GUI thread."""
+        for entry in entries:
+            self._release_image(entry)
+
+    def set_retention_policy(self, policy):
+        self._retention_policy = policy
+        if self._trim():
+            self._save()
+            self.entries_changed.emit()
+
+    def reload_retention_policy(self, config):
+        self.set_retention_policy(
+            RetentionPolicy.from_config(
+                config, "capture_history", max_entries=self._max_entries
+            )
+        )
+
+    def _release_image(self, entry):
+        path = entry.get("image_path", "")
+        if self._image_store.owns(path):
+            self._image_store.release(f"capture:{entry.get('id', '')}")
+        else:
+            self._safe_remove_history_image(path)
 
     @staticmethod
     def _safe_remove_history_image(path):
@@ -143,74 +416,71 @@ class CaptureHistoryManager(QObject):
 
     @staticmethod
     def _format_time(ts):
-        try:
-            return datetime.fromtimestamp(float(ts)).strftime("%Y-%m-%d %H:%M:%S")
-        except Exception:
-            return ""
-
-    def get_entries(self, query="", limit=300):
-        text = str(query or "").strip().lower()
-        items = self._entries
-        if text:
-            filtered = []
-            for entry in items:
-                haystack = " ".join(
-                    [
-                        f"{entry.get('width', 0)}x{entry.get('height', 0)}",
-                        str(entry.get("source", "")),
-                        str(entry.get("saved_path", "")),
-                        self._format_time(entry.get("created_at", 0)),
-                        " ".join(str(action) for action in entry.get("actions", [])),
-                        "截图 捕获 capture screenshot shot image 图片",
-                    ]
-                ).lower()
-                if text in haystack:
-                    filtered.append(entry)
-            items = filtered
-
-        sorted_items = sorted(
-            items,
-            key=lambda e: (
-                0 if e.get("pinned", False) else 1,
-                -float(e.get("created_at", 0)),
-            ),
+        return format_timestamp(ts)
+
+    def get_entries(
+        self, query="", limit=300, since=None, until=None, source="", action=""
+    ):
+        """Return matching entries, pinned first, then newest first.
+
+        ``since``/``until`` bound the capture time (inclusive/exclusive) and
+        accept a timestamp, ``datetime`` or ``date``; ``source`` and
+        ``action`` keep entries recorded with that source or action.
+        """
+        items = self._index.query(
+            query,
+            since=since,
+            until=until,
+            source=source,
+            action=action,
+            limit=limit,
         )
-        return [dict(item) for item in sorted_items[: max(1, int(limit or 1))]]
+        return [dict(item) for item in items]
+
+    def sources(self):
+        return self._index.sources()
+
+    def actions(self):
+        return self._index.actions()
 
     def get_entry(self, entry_id):
         key = str(entry_id).strip()
         if not key:
             return None
-        for entry in self._entries:
-            if entry.get("id") == key:
-                return dict(entry)
-        return None
+        entry = self._entries.get(key)
+        return dict(entry) if entry is not None else None
 
     def toggle_pin(self, entry_id):
         key = str(entry_id).strip()
         if not key:
             return False
-        for entry in self._entries:
-            if entry.get("id") == key:
-                entry["pinned"] = not bool(entry.get("pinned", False))
-                self._save()
-                self.entries_changed.emit()
-                return bool(entry["pinned"])
-        return False
+        entry = self._entries.get(key)
+        if entry is None:
+            return False
+        entry["pinned"] = not bool(entry.get("pinned", False))
+        if entry["pinned"]:
+            self._retention.remove(key)
+        else:
+            self._track_retention(entry)
+        self._index.set_pinned(key, entry["pinned"])
+        self._save()
+        self.entries_changed.emit()
+        return bool(entry["pinned"])
 
     def delete_entry(self, entry_id):
         key = str(entry_id).strip()
         if not key:
             return False
 
-        for idx, entry in enumerate(self._entries):
-            if entry.get("id") == key:
-                removed = self._entries.pop(idx)
-                self._safe_remove_history_image(removed.get("image_path", ""))
-                self._save()
-                self.entries_changed.emit()
-                return True
-        return False
+        removed = self._entries.pop(key)
+        if removed is None:
+            return False
+        self._retention.remove(key)
+        self._index.remove(key)
+        self._release_image(removed)
+        self._save()
+        self.entries_changed.emit()
+        return True
 
     def clear_unpinned(self):
         remaining = []
@@ -220,10 +490,12 @@ class CaptureHistoryManager(QObject):
                 remaining.append(entry)
             else:
                 removed_count += 1
-                self._safe_remove_history_image(entry.get("image_path", ""))
+                self._index.remove(entry.get("id"))
+                self._release_image(entry)
 
         if removed_count > 0:
-            self._entries = remaining
+            self._entries = HistoryEntries(remaining)
+            self._retention.clear()
             self._save()
             self.entries_changed.emit()
         return removed_count
@@ -240,6 +512,7 @@ class CaptureHistoryManager(QObject):
         image = QImage(str(entry.get("image_path", "")))
         if image.isNull():
             return False
+        self._retention.touch(entry.get("id"))
 
         self._is_applying = True
         try:
@@ -0,0 +1,230 @@
+import heapq
+from bisect import bisect_left, insort
+from datetime import date, datetime
+from datetime import time as datetime_time
+
+CAPTURE_KEYWORDS = "截图 捕获 capture screenshot shot image 图片"
+
+_GRAM_SIZE = 3
+
+
+def format_timestamp(ts):
+    try:
+        return datetime.fromtimestamp(float(ts)).strftime("%Y-%m-%d %H:%M:%S")
+    except Exception:
+        return ""
+
+
+def capture_haystack(entry):
+    """Lower-cased text a capture history query is matched against."""
+    return " ".join(
+        [
+            f"{entry.get('width', 0)}x{entry.get('height', 0)}",
+            str(entry.get("source", "")),
+            str(entry.get("saved_path", "")),
+            format_timestamp(entry.get("created_at", 0)),
+            " ".join(str(action) for action in entry.get("actions", [])),
+            CAPTURE_KEYWORDS,
+        ]
+    ).lower()
+
+
+def _timestamp(value):
+    """Accept ``None``, a POSIX timestamp, a ``datetime`` or a ``date``."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, date):
+        return datetime.combine(value, datetime_time.min).timestamp()
+    return float(value)
+
+
+def _grams(text):
+    """Every substring of ``text`` up to ``_GRAM_SIZE`` characters long."""
+    grams = set()
+    for size in range(1, _GRAM_SIZE + 1):
+        grams.update(text[i : i + size] for i in range(len(text) - size + 1))
+    return grams
+
+
+class _Doc:
+    __slots__ = ("entry", "created_at", "haystack", "grams", "source", "actions")
+
+    def __init__(self, entry, created_at, haystack, grams, source, actions):
+        self.entry = entry
+        self.created_at = created_at
+        self.haystack = haystack
+        self.grams = grams
+        self.source = source
+        self.actions = actions
+
+
+class CaptureHistoryIndex:
+    """Search text, timeline and filter maps for capture history entries.
+
+    Each entry's haystack (size, source, saved path, formatted time and
+    actions) is built once when the entry is added, and every substring of
+    up to three characters maps to the entries containing it. A query
+    intersects those postings and confirms longer queries against the
+    stored haystack. Entries are also kept sorted by capture time and
+    grouped by source and action, so filtered queries and the unfiltered
+    list only touch the entries they return.
+    """
+
+    def __init__(self):
+        self._docs = {}
+        self._timeline = []
+        self._postings = {}
+        self._by_source = {}
+        self._by_action = {}
+        self._pinned = set()
+
+    def __len__(self):
+        return len(self._docs)
+
+    def __contains__(self, entry_id):
+        return entry_id in self._docs
+
+    def add(self, entry):
+        entry_id = entry.get("id")
+        self.remove(entry_id)
+
+        created_at = float(entry.get("created_at", 0) or 0)
+        haystack = capture_haystack(entry)
+        grams = _grams(haystack)
+        source = str(entry.get("source", ""))
+        actions = {str(action) for action in entry.get("actions", [])}
+
+        self._docs[entry_id] = _Doc(entry, created_at, haystack, grams, source, actions)
+        insort(self._timeline, (created_at, entry_id))
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(entry_id)
+        self._by_source.setdefault(source, set()).add(entry_id)
+        for action in actions:
+            self._by_action.setdefault(action, set()).add(entry_id)
+        if entry.get("pinned", False):
+            self._pinned.add(entry_id)
+
+    def remove(self, entry_id):
+        doc = self._docs.pop(entry_id, None)
+        if doc is None:
+            return
+        index = bisect_left(self._timeline, (doc.created_at, entry_id))
+        if index < len(self._timeline) and self._timeline[index][1] == entry_id:
+            del self._timeline[index]
+        for gram in doc.grams:
+            self._discard(self._postings, gram, entry_id)
+        self._discard(self._by_source, doc.source, entry_id)
+        for action in doc.actions:
+            self._discard(self._by_action, action, entry_id)
+        self._pinned.discard(entry_id)
+
+    def set_pinned(self, entry_id, pinned):
+        if entry_id not in self._docs:
+            return
+        if pinned:
+            self._pinned.add(entry_id)
+        else:
+            self._pinned.discard(entry_id)
+
+    def clear(self):
+        self._docs.clear()
+        self._timeline = []
+        self._postings.clear()
+        self._by_source.clear()
+        self._by_action.clear()
+        self._pinned.clear()
+
+    @staticmethod
+    def _discard(mapping, key, value):
+        values = mapping.get(key)
+        if values is not None:
+            values.discard(value)
+            if not values:
+                del mapping[key]
+
+    def sources(self):
+        return sorted(source for source in self._by_source if source)
+
+    def actions(self):
+        return sorted(self._by_action)
+
+    def _text_matches(self, text):
+        if len(text) <= _GRAM_SIZE:
+            return set(self._postings.get(text, ()))
+        sets = []
+        for i in range(len(text) - _GRAM_SIZE + 1):
+            ids = self._postings.get(text[i : i + _GRAM_SIZE])
+            if ids is None:
+                return set()
+            sets.append(ids)
+        sets.sort(key=len)
+        docs = self._docs
+        candidates = sets[0].intersection(*sets[1:])
+        return {entry_id for entry_id in candidates if text in docs[entry_id].haystack}
+
+    def query(self, text="", since=None, until=None, source="", action="", limit=300):
+        """Return matching entries, pinned first, then newest first.
+
+        ``since`` is inclusive and ``until`` exclusive; both accept a
+        timestamp, ``datetime`` or ``date``. The original entry dicts are
+        returned.
+        """
+        limit = max(1, int(limit or 1))
+        start = _timestamp(since)
+        end = _timestamp(until)
+
+        candidates = None
+        text = str(text or "").strip().lower()
+        if text:
+            candidates = self._text_matches(text)
+        for key, mapping in ((source, self._by_source), (action, self._by_action)):
+            if not key:
+                continue
+            ids = mapping.get(str(key), set())
+            candidates = set(ids) if candidates is None else candidates & ids
+
+        docs = self._docs
+        if candidates is None:
+            return self._walk_timeline(start, end, limit)
+
+        if start is not None or end is not None:
+            candidates = {
+                entry_id
+                for entry_id in candidates
+                if (start is None or docs[entry_id].created_at >= start)
+                and (end is None or docs[entry_id].created_at < end)
+            }
+        pinned = self._pinned
+        best = heapq.nlargest(
+            limit,
+            candidates,
+            key=lambda entry_id: (entry_id in pinned, docs[entry_id].created_at),
+        )
+        return [docs[entry_id].entry for entry_id in best]
+
+    def _walk_timeline(self, start, end, limit):
+        timeline = self._timeline
+        low = 0 if start is None else bisect_left(timeline, (start,))
+        high = len(timeline) if end is None else bisect_left(timeline, (end,))
+        docs = self._docs
+
+        pinned = sorted(
+            (
+                entry_id
+                for entry_id in self._pinned
+                if (start is None or docs[entry_id].created_at >= start)
+                and (end is None or docs[entry_id].created_at < end)
+            ),
+            key=lambda entry_id: docs[entry_id].created_at,
+            reverse=True,
+        )
+        result = [docs[entry_id].entry for entry_id in pinned[:limit]]
+        for index in range(high - 1, low - 1, -1):
+            if len(result) >= limit:
+                break
+            entry_id = timeline[index][1]
+            if entry_id not in self._pinned:
+                result.append(docs[entry_id].entry)
+        return result
@@ -1,14 +1,32 @@
-import hashlib
+import itertools
 import json
 import os
 import time
 import uuid
+from collections import OrderedDict
 
 from PyQt6.QtCore import QObject, QTimer, pyqtSignal
 from PyQt6.QtGui import QImage
 from PyQt6.QtWidgets import QApplication
 
+from src.core.clipboard_search import ClipboardSearchIndex
+from src.core.clipboard_store import (
+    LARGE_TEXT_THRESHOLD,
+    TEXT_PREVIEW_CHARS,
+    ClipboardHistoryStore,
+    text_digest,
+)
+from src.core.config import config_manager
+from src.core.image_store import image_store as default_image_store
+from src.core.image_writer import BackgroundImageWriter, image_pixel_digest
 from src.core.logger import get_logger
+from src.core.metrics import metrics_store
+from src.core.retention import (
+    HistoryEntries,
+    RetentionIndex,
+    RetentionPolicy,
+    background_cleaner,
+)
 
 
 logger = get_logger(__name__)
@@ -16,77 +34,195 @@ logger = get_logger(__name__)
 APPDATA_DIR = os.getenv("APPDATA") or os.path.expanduser("~")
 XTOOLS_DIR = os.path.join(APPDATA_DIR, "x-tools")
 HISTORY_FILE = os.path.join(XTOOLS_DIR, "clipboard_history.json")
+DB_FILE = os.path.join(XTOOLS_DIR, "clipboard_history.db")
 IMAGE_DIR = os.path.join(XTOOLS_DIR, "clipboard_images")
 
+# Apps often set the clipboard several times in a row (one call per format),
+# so changes are read once the clipboard has been quiet for this long.
+CLIPBOARD_COALESCE_MS = 80
+
+# Entries loaded at startup are indexed for search this many per idle tick.
+SEARCH_INDEX_CHUNK = 500
+
 
 class ClipboardHistoryManager(QObject):
     entries_changed = pyqtSignal()
 
-    def __init__(self):
+    def __init__(
+        self,
+        image_store=None,
+        retention_policy=None,
+        cleaner=None,
+        coalesce_ms=CLIPBOARD_COALESCE_MS,
+    ):
         super().__init__()
-        self._entries = []
+        self._image_store = image_store or default_image_store
+        self._entries = HistoryEntries()
         self._clipboard = None
         self._is_started = False
         self._is_applying = False
-        self._max_entries = 200
+        self._max_entries = 20000
+        self._retention_policy = retention_policy or RetentionPolicy.from_config(
+            config_manager, "clipboard_history", max_entries=self._max_entries
+        )
+        self._retention = RetentionIndex()
+        self._cleaner = cleaner or background_cleaner
         self._last_signature = ""
+        self._store = None
+        # Copied images are shown at once and encoded to PNG in the background;
+        # until then the entry is "pending" and copies come from memory.
+        self._pending_images = {}
+        self._image_writer = BackgroundImageWriter(
+            "clipboard.image_encode", self._image_store
+        )
+        self._image_writer.image_written.connect(self._on_image_written)
+        self._coalesce_ms = max(0, int(coalesce_ms))
+        self._coalesce_timer = QTimer(self)
+        self._coalesce_timer.setSingleShot(True)
+        self._coalesce_timer.setInterval(self._coalesce_ms)
+        self._coalesce_timer.timeout.connect(self._flush_clipboard_burst)
+        self._burst_started = 0.0
+        self._burst_events = 0
+        self._change_events = 0
+        self._suppressed_events = 0
+        # Loaded entries wait here, oldest first, until idle ticks index them;
+        # a search drains whatever is left before it runs.
+        self._search_index = ClipboardSearchIndex()
+        self._unindexed = OrderedDict()
+        self._index_timer = QTimer(self)
+        self._index_timer.setSingleShot(True)
+        self._index_timer.setInterval(0)
+        self._index_timer.timeout.connect(self._index_next_chunk)
         self._load()
 
-    def _load(self):
-        os.makedirs(XTOOLS_DIR, exist_ok=True)
-        os.makedirs(IMAGE_DIR, exist_ok=True)
+    @staticmethod
+    def _normalize_entry(item):
+        if not isinstance(item, dict):
+            return None
+
+        entry_type = str(item.get("type", "")).strip()
+        if entry_type not in {"text", "image"}:
+            return None
+
+        entry = {
+            "id": str(item.get("id", "")).strip() or str(uuid.uuid4()),
+            "type": entry_type,
+            "text": str(item.get("text", "")),
+            "image_path": str(item.get("image_path", "")),
+            "created_at": float(item.get("created_at", time.time())),
+            "pinned": bool(item.get("pinned", False)),
+            "signature": str(item.get("signature", "")),
+            "width": int(item.get("width", 0) or 0),
+            "height": int(item.get("height", 0) or 0),
+        }
+        if item.get("text_hash"):
+            entry["text_length"] = int(item.get("text_length", 0) or 0)
+            entry["text_hash"] = str(item["text_hash"])
+
+        if entry["type"] == "image" and (
+            not entry["image_path"] or not os.path.exists(entry["image_path"])
+        ):
+            return None
+        return entry
 
+    def _migrate_legacy_history(self):
+        """Import the old JSON history into the database once."""
         if not os.path.exists(HISTORY_FILE):
-            self._entries = []
             return
 
         try:
             with open(HISTORY_FILE, "r", encoding="utf-8") as f:
                 raw = json.load(f)
+        except Exception as e:
+            logger.warning("Failed to read legacy clipboard history: %s", e)
+            return
 
-            entries = []
-            if isinstance(raw, list):
-                for item in raw:
-                    if not isinstance(item, dict):
-                        continue
-
-                    entry_type = str(item.get("type", "")).strip()
-                    if entry_type not in {"text", "image"}:
-                        continue
-
-                    entry = {
-                        "id": str(item.get("id", "")).strip() or str(uuid.uuid4()),
-                        "type": entry_type,
-                        "text": str(item.get("text", "")),
-                        "image_path": str(item.get("image_path", "")),
-                        "created_at": float(item.get("created_at", time.time())),
-                        "pinned": bool(item.get("pinned", False)),
-                        "signature": str(item.get("signature", "")),
-                        "width": int(item.get("width", 0) or 0),
-                        "height": int(item.get("height", 0) or 0),
-                    }
-
-                    if entry["type"] == "image" and (
-                        not entry["image_path"]
-                        or not os.path.exists(entry["image_path"])
-                    ):
-                        continue
+        entries = []
+        full_texts = {}
+        for item in raw if isinstance(raw, list) else []:
+            entry = self._normalize_entry(item)
+            if entry is not None:
+                full_text = self._move_text_out_of_line(entry)
+                if full_text is not None:
+                    full_texts[entry["text_hash"]] = full_text
+                entries.append(entry)
+        self._store.insert_many(entries, full_texts)
 
-                    entries.append(entry)
+        try:
+            os.replace(HISTORY_FILE, HISTORY_FILE + ".migrated")
+        except OSError as e:
+            logger.warning("Failed to retire legacy clipboard history: %s", e)
+        logger.info("Migrated %d clipboard history entries to SQLite", len(entries))
+
+    def _load(self):
+        os.makedirs(XTOOLS_DIR, exist_ok=True)
+        os.makedirs(IMAGE_DIR, exist_ok=True)
 
-            self._entries = entries[: self._max_entries]
+        try:
+            self._store = ClipboardHistoryStore(DB_FILE)
+            self._migrate_legacy_history()
+            entries = []
+            for item in self._store.load_entries(limit=self._max_entries):
+                entry = self._normalize_entry(item)
+                if entry is not None:
+                    entries.append(entry)
+            self._entries = HistoryEntries(entries)
+            self._image_store.reconcile(
+                "clipboard",
+                {
+                    entry["id"]: self._image_store.digest_from_path(entry["image_path"])
+                    for entry in entries
+                    if entry["type"] == "image"
+                    and self._image_store.owns(entry["image_path"])
+                },
+            )
         except Exception as e:
             logger.warning("Failed to load clipboard history: %s", e)
-            self._entries = []
-
-    def _save(self):
+            self._entries = HistoryEntries()
+
+        self._retention.clear()
+        self._search_index.clear()
+        self._unindexed.clear()
+        for entry in reversed(self._entries):
+            self._unindexed[entry["id"]] = entry
+            if not entry["pinned"]:
+                self._track_retention(entry, entry["created_at"])
+        self._trim()
+        if self._unindexed:
+            self._index_timer.start()
+
+    def _index_next_chunk(self):
+        for _ in range(min(SEARCH_INDEX_CHUNK, len(self._unindexed))):
+            _entry_id, entry = self._unindexed.popitem(last=False)
+            self._search_index.add(entry)
+        if self._unindexed:
+            self._index_timer.start()
+
+    def _ensure_search_index(self):
+        if self._unindexed:
+            self._index_timer.stop()
+            while self._unindexed:
+                _entry_id, entry = self._unindexed.popitem(last=False)
+                self._search_index.add(entry)
+
+    def _index_entry(self, entry):
+        # Keep the index oldest-first while the initial build is running.
+        if self._unindexed:
+            self._unindexed[entry["id"]] = entry
+        else:
+            self._search_index.add(entry)
+
+    def _unindex_entry(self, entry_id):
+        self._unindexed.pop(entry_id, None)
+        self._search_index.remove(entry_id)
+
+    def _persist(self, action, *args):
+        if self._store is None:
+            return
         try:
-            os.makedirs(XTOOLS_DIR, exist_ok=True)
-            os.makedirs(IMAGE_DIR, exist_ok=True)
-            with open(HISTORY_FILE, "w", encoding="utf-8") as f:
-                json.dump(self._entries, f, ensure_ascii=False, indent=2)
+            getattr(self._store, action)(*args)
         except Exception as e:
-            logger.warning("Failed to save clipboard history: %s", e)
+            logger.warning("Failed to update clipboard history (%s): %s", action, e)
 
     def start(self, clipboard=None):
         if self._is_started:
@@ -96,15 +232,55 @@ class ClipboardHistoryManager(QObject):
         if self._clipboard is None:
             return
 
-        self._clipboard.dataChanged.connect(self._on_clipboard_changed)
+        self._clipboard.dataChanged.connect(self._on_clipboard_data_changed)
         self._is_started = True
 
+    def _on_clipboard_data_changed(self):
+        """Open or extend the coalescing window for a burst of changes."""
+        if self._is_applying:
+            return
+
+        self._change_events += 1
+        if self._coalesce_ms <= 0:
+            self._on_clipboard_changed()
+            return
+
+        now = time.perf_counter()
+        if self._coalesce_timer.isActive():
+            self._suppressed_events += 1
+            self._burst_events += 1
+            # Keep extending the window, but never hold a steady stream of
+            # changes back for more than a few windows.
+            if (now - self._burst_started) * 1000 < self._coalesce_ms * 4:
+                self._coalesce_timer.start()
+            return
+
+        self._burst_started = now
+        self._burst_events = 1
+        self._coalesce_timer.start()
+
+    def _flush_clipboard_burst(self):
+        if self._burst_events > 1:
+            metrics_store.record(
+                "clipboard.coalesce",
+                (time.perf_counter() - self._burst_started) * 1000,
+                {"events": self._burst_events},
+            )
+        self._burst_events = 0
+        self._on_clipboard_changed()
+
+    def coalesce_stats(self):
+        return {
+            "events": self._change_events,
+            "suppressed": self._suppressed_events,
+            "ingested": self._change_events - self._suppressed_events,
+        }
+
     def _make_text_entry(self, text):
         content = text.strip()
         if not content:
             return None
 
-        digest = hashlib.sha1(content.encode("utf-8", errors="replace")).hexdigest()
         return {
             "id": str(uuid.uuid4()),
             "type": "text",
@@ -112,31 +288,34 @@ class ClipboardHistoryManager(QObject):
             "image_path": "",
             "created_at": time.time(),
             "pinned": False,
-            "signature": f"txt:{digest}",
+            "signature": f"txt:{text_digest(content)}",
             "width": 0,
             "height": 0,
         }
 
+    @staticmethod
+    def _move_text_out_of_line(entry):
+        """Cut a large text down to its preview; return the full text.
+
+        The full text goes to the store compressed and is read back only when
+        the entry is copied or previewed. Returns ``None`` for small texts.
+        """
+        text = entry.get("text", "")
+        if entry.get("type") != "text" or len(text) <= LARGE_TEXT_THRESHOLD:
+            return None
+        entry["text"] = text[:TEXT_PREVIEW_CHARS]
+        entry["text_length"] = len(text)
+        entry["text_hash"] = text_digest(text)
+        return text
+
     def _make_image_entry(self, image):
         if not isinstance(image, QImage) or image.isNull():
             return None
 
-        os.makedirs(IMAGE_DIR, exist_ok=True)
         image_id = str(uuid.uuid4())
-        image_path = os.path.join(IMAGE_DIR, f"{image_id}.png")
-
-        if not image.save(image_path, "PNG"):
-            return None
-
-        try:
-            with open(image_path, "rb") as f:
-                digest = hashlib.sha1(f.read()).hexdigest()
-        except Exception:
-            digest_source = (
-                f"{image.width()}x{image.height()}:{os.path.getsize(image_path)}"
-            )
-            digest = hashlib.sha1(digest_source.encode("utf-8")).hexdigest()
-        return {
+        digest = image_pixel_digest(image)
+        image_path = self._image_store.path_for(digest)
+        entry = {
             "id": image_id,
             "type": "image",
             "text": "",
@@ -147,6 +326,33 @@ class ClipboardHistoryManager(QObject):
             "width": image.width(),
             "height": image.height(),
         }
+        return entry
+
+    @staticmethod
+    def _entry_size(entry):
+        if entry.get("text_hash"):
+            return int(entry.get("text_length", 0))
+        if entry.get("type") == "text":
+            return len(str(entry.get("text", "")).encode("utf-8", errors="replace"))
+        try:
+            return os.path.getsize(entry.get("image_path", ""))
+        except OSError:
+            # Not written yet: charge the decoded size until the PNG exists.
+            return int(entry.get("width", 0)) * int(entry.get("height", 0)) * 4
+
+    def _entry_blob(self, entry):
+        """Key of the stored data ``entry`` shares with others, if any."""
+        if entry.get("text_hash"):
+            return f"text:{entry['text_hash']}"
+        path = entry.get("image_path", "")
+        if entry.get("type") == "image" and self._image_store.owns(path):
+            return f"image:{self._image_store.digest_from_path(path)}"
+        return None
+
+    def _track_retention(self, entry, last_used=None):
+        self._retention.add(
+            entry["id"], self._entry_size(entry), last_used, self._entry_blob(entry)
+        )
 
     def _on_clipboard_changed(self):
         if self._is_applying:
@@ -160,6 +366,8 @@ class ClipboardHistoryManager(QObject):
             return
 
         entry = None
+        image = None
+        full_text = None
         if mime.hasImage():
             image = self._clipboard.image()
             if image is not None and not image.isNull():
@@ -172,30 +380,107 @@ class ClipboardHistoryManager(QObject):
 
         signature = entry.get("signature", "")
         if signature and signature == self._last_signature:
-            if entry.get("type") == "image":
-                self._safe_remove_file(entry.get("image_path", ""))
             return
 
-        if (
-            self._entries
-            and signature
-            and self._entries[0].get("signature") == signature
-        ):
-            if entry.get("type") == "image":
-                self._safe_remove_file(entry.get("image_path", ""))
+        newest = self._entries.newest()
+        if newest is not None and signature and newest.get("signature") == signature:
             return
 
         self._last_signature = signature
-        self._entries.insert(0, entry)
+        full_text = self._move_text_out_of_line(entry)
+        self._entries.add(entry)
+        if entry.get("type") == "image":
+            # Take the reference before checking for the blob, so a cleanup
+            # running in the background cannot delete it in between.
+            digest = self._image_store.digest_from_path(entry["image_path"])
+            self._image_store.add_ref(digest, f"clipboard:{entry['id']}")
+            if not self._image_store.contains(digest):
+                entry["pending"] = True
+        self._track_retention(entry)
+        self._index_entry(entry)
+        if entry.get("pending"):
+            self._pending_images[entry["id"]] = image
+            self._image_writer.submit(entry["id"], image, entry["image_path"])
+        else:
+            self._persist("insert", entry, full_text)
         self._trim()
-        self._save()
+        self.entries_changed.emit()
+
+    def _on_image_written(self, entry_id, path, ok):
+        self._pending_images.pop(entry_id, None)
+        entry = self._entries.get(entry_id)
+        if entry is None:
+            # Deleted or trimmed while it was still being written.
+            self._image_store.discard_if_unreferenced(
+                self._image_store.digest_from_path(path)
+            )
+            return
+
+        if not ok:
+            self._entries.pop(entry_id)
+            self._retention.remove(entry_id)
+            self._unindex_entry(entry_id)
+            self._release_image(entry)
+            self.entries_changed.emit()
+            return
+
+        entry.pop("pending", None)
+        self._retention.update_size(entry_id, self._entry_size(entry))
+        self._persist("insert", entry)
         self.entries_changed.emit()
 
     def _trim(self):
-        while len(self._entries) > self._max_entries:
-            removed = self._entries.pop()
-            if removed.get("type") == "image":
-                self._safe_remove_file(removed.get("image_path", ""))
+        """Evict entries that break the retention policy; return how many."""
+        started = time.perf_counter()
+        bytes_before = self._retention.total_bytes
+        evicted = self._retention.evict(
+            self._retention_policy,
+            pinned_count=len(self._entries) - len(self._retention),
+        )
+        if not evicted:
+            return 0
+
+        removed = self._entries.pop_many(evicted)
+        for entry in removed:
+            self._unindex_entry(entry.get("id"))
+        self._cleaner.submit(self._cleanup_evicted, removed)
+        metrics_store.record(
+            "history.evict",
+            (time.perf_counter() - started) * 1000,
+            {
+                "history": "clipboard",
+                "evicted": len(removed),
+                "bytes": bytes_before - self._retention.total_bytes,
+            },
+        )
+        return len(removed)
+
+    def _cleanup_evicted(self, entries):
+        """Delete evicted rows and image references; runs off the GUI thread."""
+        self._persist("delete", [entry.get("id", "") for entry in entries])
+        for entry in entries:
+            self._release_image(entry)
+
+    def set_retention_policy(self, policy):
+        self._retention_policy = policy
+        if self._trim():
+            self.entries_changed.emit()
+
+    def reload_retention_policy(self, config):
+        self.set_retention_policy(
+            RetentionPolicy.from_config(
+                config, "clipboard_history", max_entries=self._max_entries
+            )
+        )
+
+    def _release_image(self, entry):
+        if entry.get("type") != "image":
+            return
+        path = entry.get("image_path", "")
+        if self._image_store.owns(path):
+            self._image_store.release(f"clipboard:{entry.get('id', '')}")
+        else:
+            self._safe_remove_file(path)
 
     @staticmethod
     def _safe_remove_file(path):
@@ -208,83 +493,96 @@ class ClipboardHistoryManager(QObject):
             pass
 
     def get_entries(self, query="", limit=200):
-        text = query.strip().lower()
-        items = self._entries
+        limit = max(1, int(limit))
+        text = str(query or "").strip()
         if text:
-            filtered = []
-            for entry in items:
-                if entry.get("type") == "text":
-                    value = str(entry.get("text", "")).lower()
-                    if text in value:
-                        filtered.append(entry)
-                else:
-                    marker = f"{entry.get('width', 0)}x{entry.get('height', 0)}"
-                    if text in marker or text in "image 图片":
-                        filtered.append(entry)
-            items = filtered
-
-        sorted_items = sorted(
-            items,
-            key=lambda e: (
-                0 if e.get("pinned", False) else 1,
-                -float(e.get("created_at", 0)),
-            ),
-        )
-        return [dict(item) for item in sorted_items[: max(1, limit)]]
+            self._ensure_search_index()
+            items = self._search_index.search(text, limit=limit)
+        else:
+            # Entries are kept newest first, so only pinned ones move.
+            pinned = [e for e in self._entries if e.get("pinned", False)]
+            unpinned = (e for e in self._entries if not e.get("pinned", False))
+            items = pinned[:limit] + list(
+                itertools.islice(unpinned, max(0, limit - len(pinned)))
+            )
+        return [dict(item) for item in items]
 
     def get_entry(self, entry_id):
         key = str(entry_id).strip()
         if not key:
             return None
-        for entry in self._entries:
-            if entry.get("id") == key:
-                return dict(entry)
-        return None
+        entry = self._entries.get(key)
+        return dict(entry) if entry is not None else None
 
     def toggle_pin(self, entry_id):
         key = str(entry_id).strip()
         if not key:
             return False
-        for entry in self._entries:
-            if entry.get("id") == key:
-                entry["pinned"] = not bool(entry.get("pinned", False))
-                self._save()
-                self.entries_changed.emit()
-                return bool(entry["pinned"])
-        return False
+        entry = self._entries.get(key)
+        if entry is None:
+            return False
+        entry["pinned"] = not bool(entry.get("pinned", False))
+        if entry["pinned"]:
+            self._retention.remove(key)
+        else:
+            self._track_retention(entry)
+        self._search_index.set_pinned(key, entry["pinned"])
+        self._persist("set_pinned", key, entry["pinned"])
+        self.entries_changed.emit()
+        return bool(entry["pinned"])
 
     def delete_entry(self, entry_id):
         key = str(entry_id).strip()
         if not key:
             return False
 
-        for idx, entry in enumerate(self._entries):
-            if entry.get("id") == key:
-                removed = self._entries.pop(idx)
-                if removed.get("type") == "image":
-                    self._safe_remove_file(removed.get("image_path", ""))
-                self._save()
-                self.entries_changed.emit()
-                return True
-        return False
+        removed = self._entries.pop(key)
+        if removed is None:
+            return False
+        self._retention.remove(key)
+        self._unindex_entry(key)
+        self._release_image(removed)
+        self._persist("delete", [key])
+        self.entries_changed.emit()
+        return True
 
     def clear_unpinned(self):
         remaining = []
-        removed_count = 0
+        removed_ids = []
         for entry in self._entries:
             if entry.get("pinned", False):
                 remaining.append(entry)
             else:
-                removed_count += 1
-                if entry.get("type") == "image":
-                    self._safe_remove_file(entry.get("image_path", ""))
+                removed_ids.append(entry.get("id", ""))
+                self._unindex_entry(entry.get("id", ""))
+                self._release_image(entry)
 
+        removed_count = len(removed_ids)
         if removed_count > 0:
-            self._entries = remaining
-            self._save()
+            self._entries = HistoryEntries(remaining)
+            self._retention.clear()
+            self._persist("delete", removed_ids)
             self.entries_changed.emit()
         return removed_count
 
+    def get_entry_text(self, entry_id, max_chars=None):
+        """Return an entry's text, reading out-of-line text from the store."""
+        entry = self.get_entry(entry_id)
+        if not entry or entry.get("type") != "text":
+            return ""
+        return self._entry_text(entry, max_chars)
+
+    def _entry_text(self, entry, max_chars=None):
+        text = str(entry.get("text", ""))
+        if entry.get("text_hash") and self._store is not None:
+            try:
+                full_text = self._store.load_text(entry["text_hash"], max_chars)
+                if full_text is not None:
+                    return full_text
+            except Exception as e:
+                logger.warning("Failed to read clipboard text: %s", e)
+        return text if max_chars is None else text[:max_chars]
+
     def copy_entry_to_clipboard(self, entry_id):
         entry = self.get_entry(entry_id)
         if not entry:
@@ -294,15 +592,18 @@ class ClipboardHistoryManager(QObject):
         if clipboard is None:
             return False
 
+        self._retention.touch(entry.get("id"))
         self._is_applying = True
         try:
             if entry.get("type") == "text":
-                clipboard.setText(str(entry.get("text", "")))
+                clipboard.setText(self._entry_text(entry))
             elif entry.get("type") == "image":
+                image = self._pending_images.get(entry.get("id"))
                 path = str(entry.get("image_path", ""))
-                if not path or not os.path.exists(path):
+                if image is None and (not path or not os.path.exists(path)):
                     return False
-                image = QImage(path)
+                if image is None:
+                    image = QImage(path)
                 if image.isNull():
                     return False
                 clipboard.setImage(image)
@@ -327,6 +628,8 @@ class ClipboardHistoryManager(QObject):
 
         w = int(entry.get("width", 0) or 0)
         h = int(entry.get("height", 0) or 0)
+        if entry.get("pending"):
+            return f"🖼️ 图片 {w}x{h} (保存中)"
         return f"🖼️ 图片 {w}x{h}"
 
     def as_search_results(self, query="", limit=20):
@@ -336,6 +639,8 @@ class ClipboardHistoryManager(QObject):
             if entry.get("pinned", False):
                 name = f"★ {name}"
 
+            text = str(entry.get("text", ""))
+            text_length = int(entry.get("text_length", 0) or len(text))
             results.append(
                 {
                     "type": "clipboard_entry",
@@ -343,9 +648,12 @@ class ClipboardHistoryManager(QObject):
                     "path": str(entry.get("id", "")),
                     "clipboard_id": str(entry.get("id", "")),
                     "clipboard_type": str(entry.get("type", "")),
-                    "clipboard_text": str(entry.get("text", "")),
+                    # Results carry a preview; the whole text is read on copy.
+                    "clipboard_text": text[:TEXT_PREVIEW_CHARS],
+                    "clipboard_text_length": text_length,
                     "clipboard_image_path": str(entry.get("image_path", "")),
                     "clipboard_pinned": bool(entry.get("pinned", False)),
+                    "clipboard_pending": bool(entry.get("pending", False)),
                     "clipboard_size": f"{entry.get('width', 0)}x{entry.get('height', 0)}",
                 }
             )
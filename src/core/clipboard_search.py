@@ -0,0 +1,326 @@
+import heapq
+import re
+import time
+from bisect import bisect_left, insort
+
+from src.core.pinyin import char_initial, char_pinyin
+
+
+_WORD_RE = re.compile(r"[a-z0-9_]+")
+_CJK_RE = re.compile(r"[\u3400-\u4dbf\u4e00-\u9fff]+")
+
+# Only the head of an entry is indexed; out-of-line texts only keep that much
+# in memory anyway. Full pinyin covers fewer characters than the initials.
+_INDEX_CHARS = 2000
+_PINYIN_CHARS = 64
+
+# Postings keys for pinyin initial bigrams and full-pinyin trigrams, kept
+# apart from word tokens by a control-character prefix.
+_INITIALS_KEY = "\x01"
+_PINYIN_KEY = "\x02"
+
+_MAX_PREFIX_EXPANSIONS = 256
+_FUZZY_MIN_LENGTH = 4
+
+RECENCY_HALF_LIFE_DAYS = 7.0
+
+_EXACT = 1.0
+_INITIALS = 0.9
+_PINYIN = 0.85
+_PREFIX = 0.8
+_INFIX = 0.6
+_FUZZY = 0.4
+
+
+def _is_word_token(token):
+    return token[0] not in (_INITIALS_KEY, _PINYIN_KEY) and not _CJK_RE.match(token)
+
+
+def _deletes(word):
+    return {word[:i] + word[i + 1 :] for i in range(len(word))}
+
+
+def _grams(text, size):
+    return {text[i : i + size] for i in range(len(text) - size + 1)}
+
+
+def _tiers(by_quality):
+    """Turn ``{quality: ids}`` into disjoint ``[(quality, ids)]``, best first."""
+    tiers = []
+    seen = set()
+    for quality in sorted(by_quality, reverse=True):
+        ids = by_quality[quality] - seen
+        if ids:
+            tiers.append((quality, ids))
+            seen |= ids
+    return tiers
+
+
+class _Doc:
+    __slots__ = ("entry", "lower", "initials", "pinyin", "tokens")
+
+    def __init__(self, entry, lower, initials, pinyin, tokens):
+        self.entry = entry
+        self.lower = lower
+        self.initials = initials
+        self.pinyin = pinyin
+        self.tokens = tokens
+
+
+class ClipboardSearchIndex:
+    """Incrementally maintained token index for ranked clipboard search.
+
+    Entries are split into ASCII words, single CJK characters, pinyin initial
+    bigrams and full-pinyin trigrams. The sorted word vocabulary serves
+    prefix matches, a trigram map over it serves matches inside words, and a
+    one-deletion map serves typo-tolerant matches.
+
+    Postings hold integer sequence numbers, and entries must be added oldest
+    first, so a higher number means a newer entry. Matches are kept as sets
+    per match quality; only the newest ``limit`` of each set, plus pinned
+    entries, are scored by quality times recency. The original entry dicts
+    are returned, so callers copy only what they show.
+    """
+
+    def __init__(self):
+        self._seq_by_id = {}
+        self._docs = {}
+        self._pinned = set()
+        self._next_seq = 0
+        self._postings = {}
+        self._words = []
+        self._word_grams = {}
+        self._word_deletes = {}
+
+    def __len__(self):
+        return len(self._docs)
+
+    def __contains__(self, entry_id):
+        return entry_id in self._seq_by_id
+
+    @staticmethod
+    def _entry_text(entry):
+        if entry.get("type") == "image":
+            return f"{entry.get('width', 0)}x{entry.get('height', 0)} image 图片"
+        return str(entry.get("text", ""))[:_INDEX_CHARS]
+
+    def add(self, entry):
+        entry_id = entry.get("id")
+        self.remove(entry_id)
+
+        lower = self._entry_text(entry).lower()
+        runs = _CJK_RE.findall(lower)
+        initials = " ".join("".join(char_initial(ch) for ch in run) for run in runs)
+        pinyin_parts = []
+        budget = _PINYIN_CHARS
+        for run in runs:
+            if budget <= 0:
+                break
+            pinyin_parts.append("".join(char_pinyin(ch) for ch in run[:budget]))
+            budget -= len(run)
+        pinyin = " ".join(part for part in pinyin_parts if part)
+
+        tokens = set(_WORD_RE.findall(lower))
+        for run in runs:
+            tokens.update(run)
+        for part in initials.split():
+            tokens.update(_INITIALS_KEY + gram for gram in _grams(part, 2))
+        for part in pinyin.split():
+            tokens.update(_PINYIN_KEY + gram for gram in _grams(part, 3))
+
+        seq = self._next_seq
+        self._next_seq += 1
+        self._seq_by_id[entry_id] = seq
+        self._docs[seq] = _Doc(entry, lower, initials, pinyin, tokens)
+        if entry.get("pinned", False):
+            self._pinned.add(seq)
+        for token in tokens:
+            ids = self._postings.get(token)
+            if ids is None:
+                ids = self._postings[token] = set()
+                if _is_word_token(token):
+                    self._add_word(token)
+            ids.add(seq)
+
+    def remove(self, entry_id):
+        seq = self._seq_by_id.pop(entry_id, None)
+        if seq is None:
+            return
+        doc = self._docs.pop(seq)
+        self._pinned.discard(seq)
+        for token in doc.tokens:
+            ids = self._postings[token]
+            ids.discard(seq)
+            if not ids:
+                del self._postings[token]
+                if _is_word_token(token):
+                    self._remove_word(token)
+
+    def set_pinned(self, entry_id, pinned):
+        seq = self._seq_by_id.get(entry_id)
+        if seq is None:
+            return
+        if pinned:
+            self._pinned.add(seq)
+        else:
+            self._pinned.discard(seq)
+
+    def clear(self):
+        self._seq_by_id.clear()
+        self._docs.clear()
+        self._pinned.clear()
+        self._postings.clear()
+        self._words = []
+        self._word_grams.clear()
+        self._word_deletes.clear()
+
+    def _add_word(self, word):
+        insort(self._words, word)
+        for gram in _grams(word, 3):
+            self._word_grams.setdefault(gram, set()).add(word)
+        if len(word) >= _FUZZY_MIN_LENGTH:
+            for key in _deletes(word) | {word}:
+                self._word_deletes.setdefault(key, set()).add(word)
+
+    def _remove_word(self, word):
+        index = bisect_left(self._words, word)
+        if index < len(self._words) and self._words[index] == word:
+            del self._words[index]
+        for gram in _grams(word, 3):
+            self._discard(self._word_grams, gram, word)
+        if len(word) >= _FUZZY_MIN_LENGTH:
+            for key in _deletes(word) | {word}:
+                self._discard(self._word_deletes, key, word)
+
+    @staticmethod
+    def _discard(mapping, key, value):
+        values = mapping.get(key)
+        if values is not None:
+            values.discard(value)
+            if not values:
+                del mapping[key]
+
+    def _intersect(self, tokens):
+        sets = [self._postings.get(token) for token in tokens]
+        if not sets or any(ids is None for ids in sets):
+            return set()
+        sets.sort(key=len)
+        result = set(sets[0])
+        for ids in sets[1:]:
+            result &= ids
+            if not result:
+                break
+        return result
+
+    def _word_matches(self, term):
+        """Return ``{word: quality}`` for vocabulary words matching ``term``."""
+        matches = {}
+        index = bisect_left(self._words, term)
+        for word in self._words[index : index + _MAX_PREFIX_EXPANSIONS]:
+            if not word.startswith(term):
+                break
+            matches[word] = _EXACT if word == term else _PREFIX
+
+        if len(term) >= 3:
+            grams = [self._word_grams.get(gram) for gram in _grams(term, 3)]
+            if all(grams):
+                grams.sort(key=len)
+                for word in set.intersection(*grams):
+                    if word not in matches and term in word:
+                        matches[word] = _INFIX
+
+        if len(term) >= _FUZZY_MIN_LENGTH:
+            for key in _deletes(term) | {term}:
+                for word in self._word_deletes.get(key, ()):
+                    if word not in matches and abs(len(word) - len(term)) <= 1:
+                        matches[word] = _FUZZY
+        return matches
+
+    def _pinyin_matches(self, term, key, gram_size, field):
+        ids = self._intersect({key + gram for gram in _grams(term, gram_size)})
+        if len(term) == gram_size:
+            return ids
+        docs = self._docs
+        return {seq for seq in ids if term in getattr(docs[seq], field)}
+
+    def _word_term_tiers(self, term):
+        by_quality = {}
+        for word, quality in self._word_matches(term).items():
+            by_quality.setdefault(quality, set()).update(self._postings[word])
+        if term.isalpha() and len(term) >= 2:
+            by_quality.setdefault(_INITIALS, set()).update(
+                self._pinyin_matches(term, _INITIALS_KEY, 2, "initials")
+            )
+        if term.isalpha() and len(term) >= 3:
+            by_quality.setdefault(_PINYIN, set()).update(
+                self._pinyin_matches(term, _PINYIN_KEY, 3, "pinyin")
+            )
+        return _tiers(by_quality)
+
+    def _term_tiers(self, term):
+        """Return disjoint ``[(quality, seqs)]`` for entries matching ``term``."""
+        if _WORD_RE.fullmatch(term):
+            return self._word_term_tiers(term)
+
+        # CJK or punctuated terms: every CJK character and word must occur,
+        # and a verbatim occurrence ranks as an exact match.
+        chars = {ch for run in _CJK_RE.findall(term) for ch in run}
+        ids = self._intersect(chars) if chars else None
+        for word in _WORD_RE.findall(term):
+            word_ids = set()
+            for _quality, seqs in self._word_term_tiers(word):
+                word_ids |= seqs
+            ids = word_ids if ids is None else ids & word_ids
+        if not ids:
+            return []
+        if len(term) == 1:
+            return [(_EXACT, ids)]
+        docs = self._docs
+        exact = {seq for seq in ids if term in docs[seq].lower}
+        return _tiers({_EXACT: exact, _INFIX: ids})
+
+    def search(self, query, limit=200, now=None):
+        """Return the best matching entries, pinned first, then by score."""
+        terms = str(query or "").lower().split()
+        if not terms:
+            return []
+
+        per_term = [self._term_tiers(term) for term in terms]
+        per_term.sort(key=lambda tiers: sum(len(seqs) for _q, seqs in tiers))
+        combined = per_term[0]
+        for tiers in per_term[1:]:
+            merged = {}
+            for quality, seqs in combined:
+                for other_quality, other_seqs in tiers:
+                    both = seqs & other_seqs
+                    if both:
+                        merged.setdefault(quality + other_quality, set()).update(both)
+            combined = list(merged.items())
+            if not combined:
+                return []
+
+        # Within one tier a newer entry always scores higher, so the overall
+        # top ``limit`` is among each tier's newest ``limit`` and the pinned.
+        limit = max(1, int(limit))
+        quality_by_seq = {}
+        for quality, seqs in combined:
+            shortlist = seqs if len(seqs) <= limit else sorted(seqs)[-limit:]
+            for seq in shortlist:
+                quality_by_seq[seq] = quality
+            for seq in seqs & self._pinned:
+                quality_by_seq[seq] = quality
+
+        now = time.time() if now is None else now
+        half_life = RECENCY_HALF_LIFE_DAYS * 24 * 60 * 60
+        term_count = len(terms)
+        docs = self._docs
+        pinned = self._pinned
+
+        def rank(seq):
+            entry = docs[seq].entry
+            age = max(0.0, now - float(entry.get("created_at", 0) or 0))
+            recency = 0.5 + 0.5 * 0.5 ** (age / half_life)
+            return (seq in pinned, quality_by_seq[seq] / term_count * recency, seq)
+
+        best = heapq.nlargest(limit, quality_by_seq, key=rank)
+        return [docs[seq].entry for seq in best]
@@ -0,0 +1,253 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import zlib
+
+from src.core.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+ENTRY_COLUMNS = (
+    "id",
+    "type",
+    "text",
+    "image_path",
+    "created_at",
+    "pinned",
+    "signature",
+    "width",
+    "height",
+    "text_length",
+    "text_hash",
+)
+
+# Texts longer than this are stored zlib-compressed in ``text_blobs``; the
+# entry row and memory only hold the first TEXT_PREVIEW_CHARS.
+LARGE_TEXT_THRESHOLD = 64 * 1024
+TEXT_PREVIEW_CHARS = 2000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    text TEXT NOT NULL DEFAULT '',
+    image_path TEXT NOT NULL DEFAULT '',
+    created_at REAL NOT NULL,
+    pinned INTEGER NOT NULL DEFAULT 0,
+    signature TEXT NOT NULL DEFAULT '',
+    width INTEGER NOT NULL DEFAULT 0,
+    height INTEGER NOT NULL DEFAULT 0,
+    text_length INTEGER NOT NULL DEFAULT 0,
+    text_hash TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS entries_created_at ON entries (created_at);
+CREATE TABLE IF NOT EXISTS text_blobs (
+    hash TEXT PRIMARY KEY,
+    data BLOB NOT NULL
+);
+"""
+
+_TEXT_BLOB_SCHEMA = """
+CREATE INDEX IF NOT EXISTS entries_text_hash ON entries (text_hash)
+WHERE text_hash != '';
+CREATE TRIGGER IF NOT EXISTS entries_text_blob_delete AFTER DELETE ON entries
+WHEN old.text_hash != ''
+    AND NOT EXISTS (SELECT 1 FROM entries WHERE text_hash = old.text_hash) BEGIN
+    DELETE FROM text_blobs WHERE hash = old.text_hash;
+END;
+"""
+
+# Earlier versions mirrored texts into an FTS5 table that nothing queried;
+# its triggers still wrote on every insert and delete.
+_LEGACY_FTS_CLEANUP = """
+DROP TRIGGER IF EXISTS entries_fts_insert;
+DROP TRIGGER IF EXISTS entries_fts_delete;
+DROP TRIGGER IF EXISTS entries_fts_update;
+DROP TABLE IF EXISTS entries_fts;
+"""
+
+
+def text_digest(text):
+    return hashlib.sha1(text.encode("utf-8", errors="replace")).hexdigest()
+
+
+class ClipboardHistoryStore:
+    """SQLite storage for clipboard history.
+
+    The database runs in WAL mode and every change is a single-row statement,
+    so pinning, deleting or adding an entry no longer rewrites the history.
+    Searching is left to the in-memory ``ClipboardSearchIndex``.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        upgraded = self._add_missing_columns()
+        self._conn.executescript(_TEXT_BLOB_SCHEMA)
+        self._drop_legacy_fts()
+        self._conn.commit()
+        if upgraded:
+            self._move_large_texts_out()
+
+    def _add_missing_columns(self):
+        """Add columns introduced after a database was created."""
+        existing = {
+            row["name"] for row in self._conn.execute("PRAGMA table_info(entries)")
+        }
+        added = False
+        for column, definition in (
+            ("text_length", "INTEGER NOT NULL DEFAULT 0"),
+            ("text_hash", "TEXT NOT NULL DEFAULT ''"),
+        ):
+            if column not in existing:
+                self._conn.execute(
+                    f"ALTER TABLE entries ADD COLUMN {column} {definition}"
+                )
+                added = True
+        return added
+
+    def _move_large_texts_out(self):
+        """Compress texts stored inline by older versions into ``text_blobs``."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, text FROM entries "
+                "WHERE type = 'text' AND length(text) > ?",
+                (LARGE_TEXT_THRESHOLD,),
+            ).fetchall()
+            with self._conn:
+                for row in rows:
+                    text_hash = text_digest(row["text"])
+                    self._conn.execute(
+                        "INSERT OR IGNORE INTO text_blobs (hash, data) VALUES (?, ?)",
+                        (text_hash, self._compress(row["text"])),
+                    )
+                    self._conn.execute(
+                        "UPDATE entries SET text = ?, text_length = ?, text_hash = ? "
+                        "WHERE id = ?",
+                        (
+                            row["text"][:TEXT_PREVIEW_CHARS],
+                            len(row["text"]),
+                            text_hash,
+                            row["id"],
+                        ),
+                    )
+        if rows:
+            logger.info("Moved %d large clipboard texts out of line", len(rows))
+
+    @staticmethod
+    def _compress(text):
+        return zlib.compress(text.encode("utf-8", errors="replace"), 6)
+
+    def _drop_legacy_fts(self):
+        try:
+            self._conn.executescript(_LEGACY_FTS_CLEANUP)
+        except sqlite3.OperationalError as e:
+            logger.info("Could not drop the old FTS5 table: %s", e)
+
+    @staticmethod
+    def _row_to_entry(row):
+        entry = {column: row[column] for column in ENTRY_COLUMNS}
+        entry["pinned"] = bool(entry["pinned"])
+        return entry
+
+    @staticmethod
+    def _entry_values(entry):
+        return (
+            str(entry.get("id", "")),
+            str(entry.get("type", "")),
+            str(entry.get("text", "")),
+            str(entry.get("image_path", "")),
+            float(entry.get("created_at", 0) or 0),
+            1 if entry.get("pinned", False) else 0,
+            str(entry.get("signature", "")),
+            int(entry.get("width", 0) or 0),
+            int(entry.get("height", 0) or 0),
+            int(entry.get("text_length", 0) or 0),
+            str(entry.get("text_hash", "")),
+        )
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def load_entries(self, limit=None):
+        """Return stored entries, newest first."""
+        sql = f"SELECT {', '.join(ENTRY_COLUMNS)} FROM entries ORDER BY created_at DESC"
+        params = ()
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = (int(limit),)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._row_to_entry(row) for row in rows]
+
+    def insert_many(self, entries, full_texts=None):
+        """Insert entries; ``full_texts`` maps ``text_hash`` to the whole text."""
+        placeholders = ", ".join("?" for _ in ENTRY_COLUMNS)
+        blobs = [
+            (text_hash, self._compress(text))
+            for text_hash, text in (full_texts or {}).items()
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO text_blobs (hash, data) VALUES (?, ?)", blobs
+            )
+            self._conn.executemany(
+                f"INSERT OR IGNORE INTO entries ({', '.join(ENTRY_COLUMNS)}) "
+                f"VALUES ({placeholders})",
+                [self._entry_values(entry) for entry in entries],
+            )
+
+    def insert(self, entry, full_text=None):
+        full_texts = {}
+        if full_text is not None and entry.get("text_hash"):
+            full_texts[entry["text_hash"]] = full_text
+        self.insert_many([entry], full_texts)
+
+    def load_text(self, text_hash, max_chars=None):
+        """Return an out-of-line text, or ``None`` if it is missing.
+
+        With ``max_chars`` only enough of the blob is inflated to cover that
+        many characters.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM text_blobs WHERE hash = ?", (str(text_hash),)
+            ).fetchone()
+        if row is None:
+            return None
+        if max_chars is None:
+            return zlib.decompress(row[0]).decode("utf-8", errors="replace")
+        # UTF-8 needs at most four bytes per character.
+        data = zlib.decompressobj().decompress(row[0], int(max_chars) * 4)
+        return data.decode("utf-8", errors="ignore")[: int(max_chars)]
+
+    def text_blob_count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM text_blobs").fetchone()[0]
+
+    def set_pinned(self, entry_id, pinned):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE entries SET pinned = ? WHERE id = ?",
+                (1 if pinned else 0, str(entry_id)),
+            )
+
+    def delete(self, entry_ids):
+        ids = [(str(entry_id),) for entry_id in entry_ids]
+        if not ids:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM entries WHERE id = ?", ids)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
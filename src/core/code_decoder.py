@@ -0,0 +1,235 @@
+import threading
+import time
+from dataclasses import dataclass
+
+from src.core.logger import get_logger
+from src.core.metrics import metrics_store
+from src.utils.qimage_numpy import bgra_view
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+
+logger = get_logger(__name__)
+
+CODE_DECODING_AVAILABLE = cv2 is not None
+
+# Levels of the detection pyramid halve the image until its long side would
+# drop below this; smaller images are decoded directly at native size.
+PYRAMID_MIN_SIDE = 640
+# Native pixels kept around a candidate, relative to its size, so the crop
+# still has the code's quiet zone.
+_CANDIDATE_MARGIN = 0.2
+_CANDIDATE_MIN_MARGIN = 16
+# The detectors drop finder patterns that are small next to the whole image,
+# so large images are also swept at native size in tiles this big. Tiles
+# overlap by enough to hold any code the pyramid is too coarse to see.
+SWEEP_TILE = 1024
+SWEEP_OVERLAP = 256
+
+_detectors = {}
+_detectors_lock = threading.Lock()
+# OpenCV detectors are not safe to share between threads mid-call.
+_decode_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class DecodedCode:
+    kind: str  # "qr" or "barcode"
+    text: str
+    # Corners of the code in the decoded image's native pixels.
+    points: tuple
+
+    @property
+    def center(self):
+        xs = [x for x, _ in self.points]
+        ys = [y for _, y in self.points]
+        return (sum(xs) / len(xs), sum(ys) / len(ys))
+
+
+def _detector(kind):
+    detector = _detectors.get(kind)
+    if detector is None:
+        with _detectors_lock:
+            detector = _detectors.get(kind)
+            if detector is None:
+                if kind == "qr":
+                    detector = cv2.QRCodeDetector()
+                elif kind == "qr_candidates":
+                    # The ArUco based detector finds finder patterns far
+                    # more reliably on downscaled levels; older OpenCV
+                    # builds fall back to the classic one.
+                    if hasattr(cv2, "QRCodeDetectorAruco"):
+                        detector = cv2.QRCodeDetectorAruco()
+                    else:
+                        detector = cv2.QRCodeDetector()
+                else:
+                    detector = cv2.barcode.BarcodeDetector()
+                _detectors[kind] = detector
+    return detector
+
+
+def _pyramid_factors(height, width):
+    """Downscale factors to try, coarsest first."""
+    factors = []
+    factor = 2
+    while max(height, width) / factor >= PYRAMID_MIN_SIDE:
+        factors.insert(0, factor)
+        factor *= 2
+    return factors
+
+
+def _decode(kind, gray, origin=(0, 0)):
+    ok, texts, points, _ = _detector(kind).detectAndDecodeMulti(gray)
+    if not ok or points is None:
+        return []
+    left, top = origin
+    return [
+        DecodedCode(
+            kind,
+            text,
+            tuple((round(float(x)) + left, round(float(y)) + top) for x, y in quad),
+        )
+        for text, quad in zip(texts, points)
+        if text
+    ]
+
+
+def _overlaps(box, other):
+    return (
+        box[0] < other[2]
+        and other[0] < box[2]
+        and box[1] < other[3]
+        and other[1] < box[3]
+    )
+
+
+def _candidate_box(quad, width, height):
+    x1, y1 = quad.min(axis=0)
+    x2, y2 = quad.max(axis=0)
+    margin = max(_CANDIDATE_MIN_MARGIN, _CANDIDATE_MARGIN * max(x2 - x1, y2 - y1))
+    return (
+        max(0, int(x1 - margin)),
+        max(0, int(y1 - margin)),
+        min(width, int(x2 + margin) + 1),
+        min(height, int(y2 + margin) + 1),
+    )
+
+
+def _candidates(gray):
+    """Native bounding boxes of QR codes found on a downscaled pyramid.
+
+    Every level is searched, coarsest first, since a level only finds codes
+    whose modules survive its downscaling; a box overlapping one from a
+    coarser level is the same code. Even all levels together cost a
+    fraction of one native-size detection.
+    """
+    height, width = gray.shape
+    factors = _pyramid_factors(height, width)
+    boxes = []
+    for factor in factors:
+        level = cv2.resize(
+            gray,
+            (width // factor, height // factor),
+            interpolation=cv2.INTER_AREA,
+        )
+        ok, points = _detector("qr_candidates").detectMulti(level)
+        if not ok or points is None:
+            continue
+        for quad in points * factor:
+            box = _candidate_box(quad, width, height)
+            if not any(_overlaps(box, other) for other in boxes):
+                boxes.append(box)
+    return factors, boxes
+
+
+def _tile_starts(length):
+    step = SWEEP_TILE - SWEEP_OVERLAP
+    return range(0, max(1, length - SWEEP_OVERLAP), step)
+
+
+def _sweep(gray, boxes):
+    """Native boxes of codes the pyramid missed, found tile by tile.
+
+    A code too small for every pyramid level (or dropped there next to a
+    larger one) is still big inside a native tile. Quads centred in a box
+    the pyramid already found are the same code and are skipped.
+    """
+    height, width = gray.shape
+    found = []
+    for top in _tile_starts(height):
+        for left in _tile_starts(width):
+            tile = gray[top : top + SWEEP_TILE, left : left + SWEEP_TILE]
+            ok, points = _detector("qr_candidates").detectMulti(tile)
+            if not ok or points is None:
+                continue
+            for quad in points + (left, top):
+                cx, cy = quad.mean(axis=0)
+                if any(
+                    x1 <= cx < x2 and y1 <= cy < y2 for x1, y1, x2, y2 in boxes
+                ):
+                    continue
+                box = _candidate_box(quad, width, height)
+                if not any(_overlaps(box, other) for other in boxes + found):
+                    found.append(box)
+    return found
+
+
+def _dedupe(codes):
+    unique = []
+    for code in codes:
+        cx, cy = code.center
+        if not any(
+            other.text == code.text
+            and abs(other.center[0] - cx) < 8
+            and abs(other.center[1] - cy) < 8
+            for other in unique
+        ):
+            unique.append(code)
+    return unique
+
+
+def decode_codes(image):
+    """Every QR code and barcode in a QImage, top to bottom.
+
+    Large images are searched for QR candidates on a downscaled pyramid,
+    then swept in native tiles for the codes the pyramid could not see,
+    and only the area around each candidate is decoded, at native
+    resolution. Images too small for a pyramid, or where no candidate
+    decodes, are decoded whole at native size.
+    """
+    if not CODE_DECODING_AVAILABLE or image.isNull():
+        return []
+
+    started = time.perf_counter()
+    gray = cv2.cvtColor(bgra_view(image), cv2.COLOR_BGRA2GRAY)
+    codes = []
+    factors, boxes = [], []
+    with _decode_lock:
+        try:
+            factors, boxes = _candidates(gray)
+            if factors:
+                boxes += _sweep(gray, boxes)
+            for x1, y1, x2, y2 in boxes:
+                codes.extend(_decode("qr", gray[y1:y2, x1:x2], (x1, y1)))
+            if not codes:
+                codes.extend(_decode("qr", gray))
+            if hasattr(cv2, "barcode"):
+                codes.extend(_decode("barcode", gray))
+        except cv2.error as e:
+            logger.warning("Code decode error: %s", e)
+
+    codes = sorted(_dedupe(codes), key=lambda code: code.center[::-1])
+    metrics_store.record(
+        "qr.decode",
+        (time.perf_counter() - started) * 1000,
+        {
+            "codes": len(codes),
+            "pixels": image.width() * image.height(),
+            "pyramid_levels": len(factors),
+            "candidates": len(boxes),
+        },
+    )
+    return codes
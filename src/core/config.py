@@ -32,8 +32,22 @@ DEFAULT_CONFIG = {
         os.path.expanduser("~"), "Pictures", "x-tools-screenshots"
     ),
     "screenshot_filename_template": "x-tools_{date}_{time}",
+    "screenshot_undo_depth": 200,
+    "screenshot_undo_max_mb": 64,
+    "screenshot_mosaic_block_size": 15,
+    "screenshot_parallel_grab": True,
+    "screenshot_scroll_interval_ms": 120,
+    "screenshot_scroll_max_height": 20000,
     "workflows": copy.deepcopy(DEFAULT_WORKFLOWS),
     "custom_launch_items": [],
+    "file_index_roots": [],
+    "search_first_paint_deadline_ms": 40,
+    "search_source_quotas": {"custom": 10, "app": 20, "file": 20},
+    "search_source_weights": {"custom": 1.5, "app": 1.2, "file": 1.0},
+    "clipboard_history_max_mb": 512,
+    "clipboard_history_max_age_days": 0,
+    "capture_history_max_mb": 2048,
+    "capture_history_max_age_days": 0,
 }
 
 
@@ -0,0 +1,180 @@
+import math
+
+from PyQt6.QtCore import QRect, Qt
+from PyQt6.QtGui import QImage, QPainter, QPixmap
+
+from src.utils.qimage_numpy import array_image, image_view
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+DEFAULT_BLOCK_SIZE = 15
+DEFAULT_TILE_SIZE = 256
+EFFECT_STYLES = ("mosaic", "blur")
+
+_FORMAT = QImage.Format.Format_ARGB32_Premultiplied
+
+
+def _block_means(image, block):
+    """``image`` shrunk so each pixel is the mean of one ``block`` square.
+
+    Blocks start at the image's top-left corner; partial blocks on the
+    right and bottom edges average only the pixels they cover.
+    """
+    width, height = image.width(), image.height()
+    columns, rows = math.ceil(width / block), math.ceil(height / block)
+    if np is None:
+        return image.scaled(
+            columns,
+            rows,
+            Qt.AspectRatioMode.IgnoreAspectRatio,
+            Qt.TransformationMode.SmoothTransformation,
+        )
+
+    # Zero-pad partial blocks, sum rows then columns of each block, and
+    # divide by the number of real pixels in it.
+    array = image_view(image)
+    pad_rows, pad_columns = rows * block - height, columns * block - width
+    if pad_rows or pad_columns:
+        array = np.pad(array, ((0, pad_rows), (0, pad_columns), (0, 0)))
+    row_dtype = np.uint16 if block <= 257 else np.uint32
+    sums = (
+        array.reshape(rows, block, columns * block, 4)
+        .sum(axis=1, dtype=row_dtype)
+        .reshape(rows, columns, block, 4)
+        .sum(axis=2, dtype=np.uint32)
+    )
+    row_counts = np.full(rows, block)
+    row_counts[-1] -= pad_rows
+    column_counts = np.full(columns, block)
+    column_counts[-1] -= pad_columns
+    counts = (row_counts[:, None] * column_counts[None, :])[..., None]
+    return array_image((sums + counts // 2) // counts, _FORMAT)
+
+
+def _expand(small, block, width, height, mode):
+    return small.scaled(
+        small.width() * block,
+        small.height() * block,
+        Qt.AspectRatioMode.IgnoreAspectRatio,
+        mode,
+    ).copy(0, 0, width, height)
+
+
+def mosaic_image(image, block_size=DEFAULT_BLOCK_SIZE):
+    """Replace each ``block_size`` square of ``image`` with its average."""
+    block = max(1, int(block_size))
+    image = image.convertToFormat(_FORMAT)
+    return _expand(
+        _block_means(image, block),
+        block,
+        image.width(),
+        image.height(),
+        Qt.TransformationMode.FastTransformation,
+    )
+
+
+def blur_image(image, radius=DEFAULT_BLOCK_SIZE):
+    """Blur ``image`` by interpolating between ``radius`` sized block means."""
+    block = max(1, int(radius))
+    image = image.convertToFormat(_FORMAT)
+    return _expand(
+        _block_means(image, block),
+        block,
+        image.width(),
+        image.height(),
+        Qt.TransformationMode.SmoothTransformation,
+    )
+
+
+class EffectTileCache:
+    """Mosaic or blur of a screenshot, built one tile at a time on demand.
+
+    Tiles are squares of the source's native pixels, sized to a multiple of
+    the mosaic block so blocks line up across tile edges. A blur tile is
+    computed from the tile plus a margin of whole blocks around it, so
+    tiles join without seams. Only tiles under an annotation are ever built.
+    """
+
+    def __init__(
+        self,
+        source,
+        style="mosaic",
+        block_size=DEFAULT_BLOCK_SIZE,
+        tile_size=DEFAULT_TILE_SIZE,
+    ):
+        if style not in EFFECT_STYLES:
+            raise ValueError(f"unknown effect style: {style}")
+        self.source = source
+        self.style = style
+        self.block_size = max(1, int(block_size))
+        self.tile_size = self.block_size * math.ceil(tile_size / self.block_size)
+        self._bounds = QRect(0, 0, source.width(), source.height())
+        self._tiles = {}
+
+    def __len__(self):
+        return len(self._tiles)
+
+    def _tile_rect(self, column, row):
+        size = self.tile_size
+        return QRect(column * size, row * size, size, size) & self._bounds
+
+    def _build_tile(self, rect):
+        if self.style == "mosaic":
+            image = mosaic_image(self.source.copy(rect).toImage(), self.block_size)
+            return QPixmap.fromImage(image)
+
+        margin = 2 * self.block_size
+        context = rect.adjusted(-margin, -margin, margin, margin) & self._bounds
+        image = blur_image(self.source.copy(context).toImage(), self.block_size)
+        offset = rect.topLeft() - context.topLeft()
+        return QPixmap.fromImage(
+            image.copy(offset.x(), offset.y(), rect.width(), rect.height())
+        )
+
+    def _tile(self, column, row):
+        key = (column, row)
+        tile = self._tiles.get(key)
+        if tile is None:
+            tile = self._build_tile(self._tile_rect(column, row))
+            # Tiles are addressed in native pixels whatever the source's DPR.
+            tile.setDevicePixelRatio(1.0)
+            self._tiles[key] = tile
+        return tile
+
+    def region(self, rect):
+        """Pixmap of the effect over ``rect``, in native source pixels.
+
+        Parts of ``rect`` outside the source are left transparent.
+        """
+        visible = rect & self._bounds
+        if visible.isEmpty():
+            return QPixmap()
+
+        size = self.tile_size
+        first_column, first_row = visible.left() // size, visible.top() // size
+        last_column, last_row = visible.right() // size, visible.bottom() // size
+        if visible == rect and (first_column, first_row) == (last_column, last_row):
+            tile_rect = self._tile_rect(first_column, first_row)
+            return self._tile(first_column, first_row).copy(
+                rect.translated(-tile_rect.topLeft())
+            )
+
+        result = QPixmap(rect.size())
+        result.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(result)
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Source)
+        for row in range(first_row, last_row + 1):
+            for column in range(first_column, last_column + 1):
+                tile_rect = self._tile_rect(column, row)
+                part = tile_rect & visible
+                painter.drawPixmap(
+                    part.topLeft() - rect.topLeft(),
+                    self._tile(column, row),
+                    part.translated(-tile_rect.topLeft()),
+                )
+        painter.end()
+        return result
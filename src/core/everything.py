@@ -2,8 +2,11 @@ import ctypes
 import os
 import threading
 import sys
+import time
+from collections import OrderedDict
 from typing import Any
 from src.core.logger import get_logger
+from src.core.metrics import metrics_store
 
 
 logger = get_logger(__name__)
@@ -70,7 +73,8 @@ class Everything:
         try:
             self.dll = ctypes.WinDLL("Everything64.dll")
             self._setup_signatures()
-        except OSError:
+        except (OSError, AttributeError):
+            # AttributeError: ctypes.WinDLL only exists on Windows.
             raise FileNotFoundError(
                 "Could not find Everything64.dll. Please ensure Everything is installed and the DLL is accessible."
             )
@@ -91,42 +95,159 @@ class Everything:
         dll.Everything_GetResultPathW.argtypes = [ctypes.c_uint32]
         dll.Everything_GetResultPathW.restype = ctypes.c_wchar_p
         dll.Everything_SetMax.argtypes = [ctypes.c_uint32]
+        dll.Everything_SetOffset.argtypes = [ctypes.c_uint32]
 
-    def search(self, query, max_results=20):
+    def search(self, query, max_results=20, offset=0):
+        wait_started = time.perf_counter()
         with self.lock:
-            if not self.dll:
-                return []
+            waited_ms = (time.perf_counter() - wait_started) * 1000
+            results = self._search_locked(query, max_results, offset)
 
-            try:
-                self.dll.Everything_SetSearchW(query)
-                self.dll.Everything_SetRequestFlags(
-                    EVERYTHING_REQUEST_FILE_NAME | EVERYTHING_REQUEST_PATH
-                )
-                self.dll.Everything_SetMax(max_results)
+        metrics_store.record(
+            "everything.lock_wait",
+            waited_ms,
+            {"query_len": len(str(query or "")), "result_count": len(results)},
+        )
+        return results
 
-                # Execute query
-                self.dll.Everything_QueryW(True)
+    def _search_locked(self, query, max_results, offset):
+        if not self.dll:
+            return []
 
-                results = []
-                num_results = self.dll.Everything_GetNumResults()
+        try:
+            self.dll.Everything_SetSearchW(query)
+            self.dll.Everything_SetRequestFlags(
+                EVERYTHING_REQUEST_FILE_NAME | EVERYTHING_REQUEST_PATH
+            )
+            self.dll.Everything_SetMax(max_results)
+            # Offset-based paging: ask the service for one window of rows so
+            # deeper pages cost the same as the first one.
+            self.dll.Everything_SetOffset(max(0, int(offset)))
+
+            # Execute query
+            if not self.dll.Everything_QueryW(True):
+                raise OSError("Everything_QueryW failed")
+
+            results = []
+            num_results = self.dll.Everything_GetNumResults()
+
+            for i in range(num_results):
+                filename = self.dll.Everything_GetResultFileNameW(i)
+                path = self.dll.Everything_GetResultPathW(i)
+                full_path = os.path.join(path, filename)
+                results.append({"name": filename, "path": full_path, "type": "file"})
 
-                for i in range(num_results):
-                    filename = self.dll.Everything_GetResultFileNameW(i)
-                    path = self.dll.Everything_GetResultPathW(i)
-                    full_path = os.path.join(path, filename)
-                    results.append(
-                        {"name": filename, "path": full_path, "type": "file"}
-                    )
+            return results
+        except Exception as e:
+            # Re-raise so the broker never caches a failed query as "no hits".
+            logger.exception("Everything search error: %s", e)
+            raise
 
-                return results
-            except Exception as e:
-                logger.exception("Everything search error: %s", e)
-                return []
+
+class _PendingQuery:
+    def __init__(self):
+        self.event = threading.Event()
+        self.results = []
+        self.error = None
+
+
+class EverythingQueryBroker:
+    """Shares Everything queries between concurrent callers.
+
+    The SDK keeps its query state in process-wide globals, so every call must
+    go through the client's single lock. The broker makes that cheaper:
+    identical in-flight queries are coalesced into one SDK call whose result
+    is fanned out to every waiter, and finished results are kept for a short
+    time so bursts of the same query never reach the DLL twice.
+    """
+
+    def __init__(self, client, cache_ttl=1.5, max_cache_entries=64):
+        self.client = client
+        self._cache_ttl = float(cache_ttl)
+        self._max_cache_entries = max(1, int(max_cache_entries))
+        self._lock = threading.Lock()
+        self._inflight: dict[tuple, _PendingQuery] = {}
+        self._cache: OrderedDict[tuple, tuple[float, list]] = OrderedDict()
+        self.coalesced_count = 0
+        self.cache_hit_count = 0
+
+    @staticmethod
+    def _copy_results(results):
+        return [dict(item) for item in results]
+
+    def _cached_results(self, key, now):
+        cached = self._cache.get(key)
+        if cached is None:
+            return None
+        stored_at, results = cached
+        if now - stored_at > self._cache_ttl:
+            self._cache.pop(key, None)
+            return None
+        self._cache.move_to_end(key)
+        return results
+
+    def _store_results(self, key, results, now):
+        self._cache[key] = (now, results)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._max_cache_entries:
+            self._cache.popitem(last=False)
+
+    def search(self, query, max_results=20, offset=0):
+        key = (str(query or ""), int(max_results), max(0, int(offset)))
+
+        with self._lock:
+            cached = self._cached_results(key, time.monotonic())
+            if cached is not None:
+                self.cache_hit_count += 1
+                return self._copy_results(cached)
+
+            pending = self._inflight.get(key)
+            is_leader = pending is None
+            if is_leader:
+                pending = _PendingQuery()
+                self._inflight[key] = pending
+            else:
+                self.coalesced_count += 1
+
+        if not is_leader:
+            pending.event.wait()
+            if pending.error is not None:
+                raise pending.error
+            return self._copy_results(pending.results)
+
+        try:
+            query_text, limit, page_offset = key
+            results = (
+                self.client.search(query_text, max_results=limit, offset=page_offset)
+                or []
+            )
+        except Exception as e:
+            # A failure is handed to the waiters but never cached, so the
+            # next caller asks the service again.
+            with self._lock:
+                self._inflight.pop(key, None)
+            pending.error = e
+            pending.event.set()
+            raise
+        else:
+            with self._lock:
+                self._inflight.pop(key, None)
+                self._store_results(key, results, time.monotonic())
+            pending.results = results
+            pending.event.set()
+
+        return self._copy_results(results)
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
 
 
 # Singleton instance
 everything_client = None
+everything_broker = None
 try:
     everything_client = Everything()
+    everything_broker = EverythingQueryBroker(everything_client)
 except FileNotFoundError:
     logger.warning("Everything DLL not found. Search will not work.")
@@ -0,0 +1,534 @@
+import heapq
+import json
+import os
+import struct
+import threading
+import time
+from array import array
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+APPDATA_DIR = os.getenv("APPDATA") or os.path.expanduser("~")
+XTOOLS_DIR = os.path.join(APPDATA_DIR, "x-tools")
+INDEX_FILE = os.path.join(XTOOLS_DIR, "file_index.bin")
+
+INDEX_MAGIC = b"XTFI"
+INDEX_VERSION = 2
+
+DEFAULT_EXCLUDED_DIR_NAMES = {
+    ".git",
+    ".hg",
+    ".svn",
+    ".cache",
+    ".venv",
+    "__pycache__",
+    "node_modules",
+}
+
+_FLAG_ALIVE = 1
+_FLAG_DIR = 2
+
+
+# Names decoded per query at most; prefix candidates are scanned first.
+DEFAULT_MAX_CANDIDATES = 20000
+
+
+def _trigrams(text):
+    if len(text) < 3:
+        return set()
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def _prefix_key(prefix):
+    """Posting key of the names starting with a 1 or 2 character ``prefix``.
+
+    "/" never occurs in a file name, so these keys cannot collide with a
+    trigram; they give short queries and prefix hits a posting of their own.
+    """
+    return "/" + prefix
+
+
+class FileIndex:
+    """Incremental file name index for platforms without Everything.
+
+    Entries live in flat, array-backed tables: every name is stored once in a
+    UTF-8 blob addressed by an offset array, and each entry only keeps the id
+    of its parent directory. Lower-cased name trigrams map to posting arrays
+    of entry ids, so a query touches the candidates of its rarest trigram
+    instead of the whole table. Removed entries are tombstoned and skipped
+    until the next compaction. ``generation`` changes whenever an entry is
+    added or removed, so callers can tell whether a refresh changed anything.
+    """
+
+    def __init__(
+        self,
+        roots=None,
+        index_file=None,
+        excluded_dir_names=None,
+        max_workers=4,
+    ):
+        self.roots = [os.path.abspath(os.path.expanduser(r)) for r in roots or []]
+        self.index_file = index_file or INDEX_FILE
+        self.excluded_dir_names = set(
+            DEFAULT_EXCLUDED_DIR_NAMES
+            if excluded_dir_names is None
+            else excluded_dir_names
+        )
+        self.max_workers = max(1, int(max_workers))
+        self._lock = threading.RLock()
+        self.generation = 0
+        self._reset_tables()
+
+    def _reset_tables(self):
+        self._name_blob = bytearray()
+        self._name_offsets = array("Q", [0])
+        self._parents = array("i")
+        self._flags = bytearray()
+        self._dead_count = 0
+
+        self._dir_paths = []
+        self._dir_ids = {}
+        self._dir_entries = array("i")
+        self._dir_mtimes = array("d")
+        self._dir_children = []
+
+        self._postings = {}
+
+    def __len__(self):
+        with self._lock:
+            return len(self._flags) - self._dead_count
+
+    # ------------------------------------------------------------------
+    # Table helpers
+    # ------------------------------------------------------------------
+
+    def _name(self, entry_id):
+        start = self._name_offsets[entry_id]
+        end = self._name_offsets[entry_id + 1]
+        return self._name_blob[start:end].decode("utf-8", errors="surrogateescape")
+
+    def _full_path(self, entry_id):
+        return os.path.join(
+            self._dir_paths[self._parents[entry_id]], self._name(entry_id)
+        )
+
+    def _add_dir(self, path, entry_id=-1, mtime=0.0):
+        dir_id = self._dir_ids.get(path)
+        if dir_id is not None:
+            self._dir_entries[dir_id] = entry_id
+            return dir_id
+
+        dir_id = len(self._dir_paths)
+        self._dir_paths.append(path)
+        self._dir_ids[path] = dir_id
+        self._dir_entries.append(entry_id)
+        self._dir_mtimes.append(float(mtime))
+        self._dir_children.append(array("I"))
+        return dir_id
+
+    def _add_entry(self, parent_id, name, is_dir):
+        entry_id = len(self._flags)
+        self._name_blob.extend(name.encode("utf-8", errors="surrogateescape"))
+        self._name_offsets.append(len(self._name_blob))
+        self._parents.append(parent_id)
+        self._flags.append(_FLAG_ALIVE | (_FLAG_DIR if is_dir else 0))
+        self._dir_children[parent_id].append(entry_id)
+        self.generation += 1
+        lower = name.lower()
+        grams = _trigrams(lower)
+        grams.update(_prefix_key(lower[:length]) for length in (1, 2))
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if posting is None:
+                posting = self._postings[gram] = array("I")
+            posting.append(entry_id)
+        return entry_id
+
+    def _remove_entry(self, entry_id):
+        if not self._flags[entry_id] & _FLAG_ALIVE:
+            return
+        self._flags[entry_id] &= ~_FLAG_ALIVE
+        self._dead_count += 1
+        self.generation += 1
+
+        if self._flags[entry_id] & _FLAG_DIR:
+            path = self._full_path(entry_id)
+            dir_id = self._dir_ids.pop(path, None)
+            if dir_id is not None:
+                for child_id in self._dir_children[dir_id]:
+                    self._remove_entry(child_id)
+                self._dir_children[dir_id] = array("I")
+                self._dir_entries[dir_id] = -1
+
+    # ------------------------------------------------------------------
+    # Crawling
+    # ------------------------------------------------------------------
+
+    def _scan_dir(self, path):
+        try:
+            mtime = os.stat(path).st_mtime
+            children = []
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                    except OSError:
+                        is_dir = False
+                    children.append((entry.name, is_dir))
+            return path, mtime, children
+        except OSError:
+            return path, None, None
+
+    def _apply_scan(self, path, mtime, children):
+        """Merge one directory listing; return subdirectories to crawl."""
+        to_crawl = []
+        dir_id = self._dir_ids.get(path)
+        if dir_id is None:
+            return to_crawl
+
+        if children is None:
+            return to_crawl
+
+        existing = {}
+        for child_id in self._dir_children[dir_id]:
+            if self._flags[child_id] & _FLAG_ALIVE:
+                existing[self._name(child_id)] = child_id
+
+        live_children = array("I")
+        seen = set()
+        for name, is_dir in children:
+            seen.add(name)
+            child_id = existing.get(name)
+            if (
+                child_id is not None
+                and bool(self._flags[child_id] & _FLAG_DIR) != is_dir
+            ):
+                self._remove_entry(child_id)
+                child_id = None
+
+            if child_id is None:
+                if is_dir and name in self.excluded_dir_names:
+                    continue
+                child_id = self._add_entry(dir_id, name, is_dir)
+                if is_dir:
+                    child_path = os.path.join(path, name)
+                    self._add_dir(child_path, child_id)
+                    to_crawl.append(child_path)
+            live_children.append(child_id)
+
+        for name, child_id in existing.items():
+            if name not in seen:
+                self._remove_entry(child_id)
+
+        self._dir_children[dir_id] = live_children
+        self._dir_mtimes[dir_id] = float(mtime)
+        return to_crawl
+
+    def _crawl(self, paths):
+        if not paths:
+            return 0
+
+        scanned = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            pending = {pool.submit(self._scan_dir, path) for path in paths}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path, mtime, children = future.result()
+                    scanned += 1
+                    with self._lock:
+                        subdirs = self._apply_scan(path, mtime, children)
+                    for subdir in subdirs:
+                        pending.add(pool.submit(self._scan_dir, subdir))
+        return scanned
+
+    def build(self):
+        """Crawl every root from scratch."""
+        started = time.perf_counter()
+        with self._lock:
+            self._reset_tables()
+            roots = [root for root in self.roots if os.path.isdir(root)]
+            for root in roots:
+                self._add_dir(root)
+        scanned = self._crawl(roots)
+        logger.info(
+            "File index built: %d entries, %d dirs in %.1f ms",
+            len(self),
+            scanned,
+            (time.perf_counter() - started) * 1000,
+        )
+        return scanned
+
+    def refresh(self):
+        """Rescan only directories whose mtime changed since the last scan."""
+        with self._lock:
+            known_roots = {path for path in self.roots if path in self._dir_ids}
+            missing_roots = [
+                root
+                for root in self.roots
+                if root not in known_roots and os.path.isdir(root)
+            ]
+            for root in missing_roots:
+                self._add_dir(root)
+            candidates = [
+                (path, dir_id)
+                for path, dir_id in self._dir_ids.items()
+                if path not in missing_roots
+            ]
+
+        changed = list(missing_roots)
+        for path, dir_id in candidates:
+            try:
+                mtime = os.stat(path).st_mtime
+            except OSError:
+                mtime = None
+            with self._lock:
+                if mtime is None:
+                    entry_id = self._dir_entries[dir_id]
+                    if entry_id >= 0:
+                        self._remove_entry(entry_id)
+                    elif self._dir_ids.pop(path, None) is not None:
+                        # A configured root vanished; drop everything under it.
+                        for child_id in self._dir_children[dir_id]:
+                            self._remove_entry(child_id)
+                        self._dir_children[dir_id] = array("I")
+                elif mtime != self._dir_mtimes[dir_id]:
+                    changed.append(path)
+
+        scanned = self._crawl(changed)
+        with self._lock:
+            if self._dead_count > max(1024, len(self._flags) // 3):
+                self._compact()
+        return scanned
+
+    def _compact(self):
+        old_flags = self._flags
+        old_parents = self._parents
+        old_dir_paths = self._dir_paths
+        old_dir_mtimes = self._dir_mtimes
+        old_dir_ids = self._dir_ids
+        old_name = self._name
+
+        alive = [
+            (old_dir_paths[old_parents[i]], old_name(i), bool(old_flags[i] & _FLAG_DIR))
+            for i in range(len(old_flags))
+            if old_flags[i] & _FLAG_ALIVE
+        ]
+        mtimes = {path: old_dir_mtimes[dir_id] for path, dir_id in old_dir_ids.items()}
+
+        self._reset_tables()
+        for root in self.roots:
+            if root in mtimes:
+                self._add_dir(root, mtime=mtimes[root])
+        for parent_path, name, is_dir in alive:
+            parent_id = self._dir_ids.get(parent_path)
+            if parent_id is None:
+                parent_id = self._add_dir(
+                    parent_path, mtime=mtimes.get(parent_path, 0.0)
+                )
+            entry_id = self._add_entry(parent_id, name, is_dir)
+            if is_dir:
+                child_path = os.path.join(parent_path, name)
+                self._add_dir(child_path, entry_id, mtimes.get(child_path, 0.0))
+
+    # ------------------------------------------------------------------
+    # Query
+    # ------------------------------------------------------------------
+
+    def search(
+        self,
+        query,
+        max_results=20,
+        offset=0,
+        max_candidates=DEFAULT_MAX_CANDIDATES,
+    ):
+        """Rank matches and return one page of them.
+
+        Names starting with the first term come first, then shorter names.
+        Prefix candidates come from their own posting and are scanned
+        before substring candidates, which are skipped once the prefix hits
+        fill the page; at most ``max_candidates`` names are decoded. Terms
+        shorter than three characters only match name prefixes, unless
+        another term narrows the candidates.
+        """
+        terms = [t for t in str(query or "").lower().split() if t]
+        if not terms:
+            return []
+
+        limit = max(0, int(offset)) + max(1, int(max_results))
+        first = terms[0]
+        budget = max(1, int(max_candidates))
+        prefix_hits, other_hits = [], []
+        with self._lock:
+            grams = set()
+            for term in terms:
+                grams |= _trigrams(term)
+            substring_candidates = ()
+            if grams:
+                postings = []
+                for gram in grams:
+                    posting = self._postings.get(gram)
+                    if posting is None:
+                        return []
+                    postings.append(posting)
+                substring_candidates = min(postings, key=len)
+            prefix_candidates = self._postings.get(_prefix_key(first[:2]), ())
+
+            # Names are decoded straight from the blob to keep the loop tight.
+            blob, offsets, flags = self._name_blob, self._name_offsets, self._flags
+            rest = terms[1:]
+            for candidates, prefix_pass in (
+                (prefix_candidates, True),
+                (substring_candidates, False),
+            ):
+                if not prefix_pass and len(prefix_hits) >= limit:
+                    break
+                for entry_id in candidates:
+                    if not flags[entry_id] & _FLAG_ALIVE:
+                        continue
+                    if budget <= 0:
+                        break
+                    budget -= 1
+                    lower = (
+                        blob[offsets[entry_id] : offsets[entry_id + 1]]
+                        .decode("utf-8", errors="surrogateescape")
+                        .lower()
+                    )
+                    if rest and not all(term in lower for term in rest):
+                        continue
+                    if lower.startswith(first):
+                        # Prefix hits met in the substring pass were
+                        # already collected by the prefix pass.
+                        if prefix_pass:
+                            prefix_hits.append((len(lower), lower, entry_id))
+                    elif not prefix_pass and first in lower:
+                        other_hits.append((len(lower), lower, entry_id))
+
+            ranked = heapq.nsmallest(limit, prefix_hits)
+            if len(ranked) < limit:
+                ranked += heapq.nsmallest(limit - len(ranked), other_hits)
+            page = ranked[max(0, int(offset)) :]
+            return [
+                {
+                    "name": self._name(entry_id),
+                    "path": self._full_path(entry_id),
+                    "type": "file",
+                }
+                for _length, _lower, entry_id in page
+            ]
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path=None):
+        path = path or self.index_file
+        with self._lock:
+            if self._dead_count:
+                self._compact()
+
+            gram_keys = sorted(self._postings)
+            gram_offsets = array("Q", [0])
+            gram_flat = array("I")
+            for gram in gram_keys:
+                gram_flat.extend(self._postings[gram])
+                gram_offsets.append(len(gram_flat))
+
+            header = {
+                "version": INDEX_VERSION,
+                "roots": self.roots,
+                "entries": len(self._flags),
+                "dirs": len(self._dir_paths),
+            }
+            sections = [
+                json.dumps(header).encode("utf-8"),
+                bytes(self._name_blob),
+                self._name_offsets.tobytes(),
+                self._parents.tobytes(),
+                bytes(self._flags),
+                "\0".join(self._dir_paths).encode("utf-8", errors="surrogateescape"),
+                self._dir_entries.tobytes(),
+                self._dir_mtimes.tobytes(),
+                "\0".join(gram_keys).encode("utf-8", errors="surrogateescape"),
+                gram_offsets.tobytes(),
+                gram_flat.tobytes(),
+            ]
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(INDEX_MAGIC)
+            f.write(struct.pack("<I", len(sections)))
+            for section in sections:
+                f.write(struct.pack("<Q", len(section)))
+                f.write(section)
+        os.replace(tmp_path, path)
+
+    def load(self, path=None):
+        path = path or self.index_file
+        if not os.path.exists(path):
+            return False
+
+        try:
+            with open(path, "rb") as f:
+                if f.read(4) != INDEX_MAGIC:
+                    return False
+                (count,) = struct.unpack("<I", f.read(4))
+                sections = []
+                for _ in range(count):
+                    (size,) = struct.unpack("<Q", f.read(8))
+                    sections.append(f.read(size))
+
+            header = json.loads(sections[0].decode("utf-8"))
+            if header.get("version") != INDEX_VERSION:
+                return False
+            if header.get("roots") != self.roots:
+                return False
+
+            def _array(typecode, raw):
+                values = array(typecode)
+                values.frombytes(raw)
+                return values
+
+            def _split(raw):
+                if not raw:
+                    return []
+                return raw.decode("utf-8", errors="surrogateescape").split("\0")
+
+            dir_paths = _split(sections[5])
+            dir_entries = _array("i", sections[6])
+            dir_mtimes = _array("d", sections[7])
+            gram_keys = _split(sections[8])
+            gram_offsets = _array("Q", sections[9])
+            gram_flat = _array("I", sections[10])
+            parents = _array("i", sections[3])
+            flags = bytearray(sections[4])
+
+            dir_children = [array("I") for _ in dir_paths]
+            for entry_id, parent_id in enumerate(parents):
+                dir_children[parent_id].append(entry_id)
+
+            with self._lock:
+                self._name_blob = bytearray(sections[1])
+                self._name_offsets = _array("Q", sections[2])
+                self._parents = parents
+                self._flags = flags
+                self._dead_count = 0
+                self._dir_paths = dir_paths
+                self._dir_ids = {p: i for i, p in enumerate(dir_paths)}
+                self._dir_entries = dir_entries
+                self._dir_mtimes = dir_mtimes
+                self._dir_children = dir_children
+                self._postings = {
+                    gram: gram_flat[gram_offsets[i] : gram_offsets[i + 1]]
+                    for i, gram in enumerate(gram_keys)
+                }
+            return True
+        except Exception as e:
+            logger.warning("Failed to load file index %s: %s", path, e)
+            with self._lock:
+                self._reset_tables()
+            return False
@@ -0,0 +1,322 @@
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from src.core.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+APPDATA_DIR = os.getenv("APPDATA") or os.path.expanduser("~")
+XTOOLS_DIR = os.path.join(APPDATA_DIR, "x-tools")
+IMAGE_STORE_DIR = os.path.join(XTOOLS_DIR, "images")
+
+_BLOB_SUFFIX = ".png"
+
+
+def save_image_atomically(image, path, fmt="PNG"):
+    """Save ``image`` to ``path`` through a temp file only this call uses."""
+    tmp_path = f"{path}.{os.getpid()}-{uuid.uuid4().hex}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if not image.save(tmp_path, fmt):
+            return False
+        os.replace(tmp_path, path)
+        return True
+    except Exception as e:
+        logger.warning("Failed to write image %s: %s", path, e)
+        return False
+    finally:
+        if os.path.exists(tmp_path):
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+class ImageStore:
+    """Content-addressed PNG store shared by the clipboard and capture histories.
+
+    Blobs are named by their pixel digest (see ``image_pixel_digest``), so the
+    same image copied repeatedly, or captured and then picked up from the
+    clipboard, is kept once. Each history entry holds a reference under an
+    owner key such as ``"clipboard:<id>"``; a blob is deleted when its last
+    reference is released. References live in a small SQLite table so they
+    survive restarts, and ``collect_garbage`` removes blobs nobody refers to.
+    Blobs are encoded through ``write``, which lets only one thread encode a
+    given digest at a time. Blob sizes are counted once, on the first
+    ``disk_usage`` or ``collect_garbage`` call, and kept current by
+    ``write`` and blob removal, so reporting usage never walks the
+    directory again.
+    """
+
+    def __init__(self, root=None):
+        self.root = root or IMAGE_STORE_DIR
+        self._lock = threading.RLock()
+        self._conn = None
+        # digest -> Event set when the thread encoding that blob is done.
+        self._writing = {}
+        # digest -> bytes on disk; None until the first directory scan.
+        self._blob_sizes = None
+        self._sizes_ready = threading.Event()
+
+    def _db(self):
+        if self._conn is None:
+            os.makedirs(self.root, exist_ok=True)
+            self._conn = sqlite3.connect(
+                os.path.join(self.root, "refs.db"), check_same_thread=False
+            )
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS refs ("
+                "owner TEXT PRIMARY KEY, digest TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS refs_digest ON refs (digest)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def path_for(self, digest):
+        return os.path.join(self.root, digest[:2], f"{digest}{_BLOB_SUFFIX}")
+
+    def owns(self, path):
+        if not path:
+            return False
+        base = os.path.abspath(self.root)
+        return os.path.abspath(path).startswith(base + os.sep)
+
+    @staticmethod
+    def digest_from_path(path):
+        name = os.path.basename(str(path or ""))
+        return name[: -len(_BLOB_SUFFIX)] if name.endswith(_BLOB_SUFFIX) else ""
+
+    def contains(self, digest):
+        return bool(digest) and os.path.exists(self.path_for(digest))
+
+    def write(self, digest, image, fmt="PNG"):
+        """Encode ``image`` into ``digest``'s blob unless it is already there.
+
+        When another thread is encoding the same digest this waits for it
+        and reuses its blob instead of encoding again. Returns whether the
+        blob is on disk.
+        """
+        if not digest:
+            return False
+        while True:
+            with self._lock:
+                if self.contains(digest):
+                    return True
+                done = self._writing.get(digest)
+                if done is None:
+                    done = self._writing[digest] = threading.Event()
+                    break
+            done.wait()
+            # The other writer may have failed; try again ourselves.
+
+        path = self.path_for(digest)
+        try:
+            ok = save_image_atomically(image, path, fmt)
+            if ok:
+                self._record_blob(digest, path)
+            return ok
+        finally:
+            with self._lock:
+                self._writing.pop(digest, None)
+            done.set()
+
+    def add_ref(self, digest, owner):
+        if not digest:
+            return
+        with self._lock:
+            db = self._db()
+            with db:
+                db.execute(
+                    "INSERT OR REPLACE INTO refs (owner, digest) VALUES (?, ?)",
+                    (str(owner), digest),
+                )
+
+    def ref_count(self, digest):
+        with self._lock:
+            row = self._db().execute(
+                "SELECT COUNT(*) FROM refs WHERE digest = ?", (digest,)
+            ).fetchone()
+        return int(row[0]) if row else 0
+
+    def release(self, owner):
+        """Drop ``owner``'s reference and delete the blob if it was the last."""
+        with self._lock:
+            db = self._db()
+            row = db.execute(
+                "SELECT digest FROM refs WHERE owner = ?", (str(owner),)
+            ).fetchone()
+            if row is None:
+                return
+            with db:
+                db.execute("DELETE FROM refs WHERE owner = ?", (str(owner),))
+            self.discard_if_unreferenced(row[0])
+
+    def discard_if_unreferenced(self, digest):
+        with self._lock:
+            if not digest or self.ref_count(digest) > 0:
+                return False
+            return self._remove_blob(self.path_for(digest))
+
+    def _remove_blob(self, path):
+        try:
+            if os.path.exists(path):
+                os.remove(path)
+                with self._lock:
+                    if self._blob_sizes is not None:
+                        self._blob_sizes.pop(self.digest_from_path(path), None)
+                return True
+        except OSError as e:
+            logger.warning("Failed to remove image blob %s: %s", path, e)
+        return False
+
+    def _record_blob(self, digest, path):
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return
+        with self._lock:
+            if self._blob_sizes is not None:
+                self._blob_sizes[digest] = size
+
+    def _ensure_blob_sizes(self):
+        """Walk the blob directory once to seed the running size table.
+
+        Writes and removals that race with the walk update the table
+        themselves; a second caller waits for the walk in progress.
+        """
+        with self._lock:
+            scanning = self._blob_sizes is not None
+            if not scanning:
+                self._blob_sizes = {}
+        if scanning:
+            self._sizes_ready.wait()
+            return
+        try:
+            for blob in self._iter_blobs():
+                try:
+                    size = blob.stat().st_size
+                except OSError:
+                    continue
+                with self._lock:
+                    self._blob_sizes.setdefault(
+                        self.digest_from_path(blob.name), size
+                    )
+        finally:
+            self._sizes_ready.set()
+
+    def reconcile(self, namespace, live_refs):
+        """Make ``namespace``'s references match ``{entry_id: digest}``.
+
+        Called when a history loads, to repair references left behind by a
+        crash between taking a reference and persisting the entry.
+        """
+        prefix = f"{namespace}:"
+        wanted = {f"{prefix}{entry_id}": digest for entry_id, digest in live_refs.items()}
+        with self._lock:
+            db = self._db()
+            current = dict(
+                db.execute(
+                    "SELECT owner, digest FROM refs WHERE substr(owner, 1, ?) = ?",
+                    (len(prefix), prefix),
+                ).fetchall()
+            )
+            stale = [owner for owner in current if owner not in wanted]
+            missing = [
+                (owner, digest)
+                for owner, digest in wanted.items()
+                if current.get(owner) != digest
+            ]
+            with db:
+                db.executemany(
+                    "DELETE FROM refs WHERE owner = ?", [(owner,) for owner in stale]
+                )
+                db.executemany(
+                    "INSERT OR REPLACE INTO refs (owner, digest) VALUES (?, ?)",
+                    missing,
+                )
+            for owner in stale:
+                self.discard_if_unreferenced(current[owner])
+
+    def _iter_blobs(self):
+        if not os.path.isdir(self.root):
+            return
+        for shard in os.scandir(self.root):
+            if not shard.is_dir():
+                continue
+            for blob in os.scandir(shard.path):
+                if blob.is_file() and blob.name.endswith(_BLOB_SUFFIX):
+                    yield blob
+
+    def collect_garbage(self, grace_seconds=600.0):
+        """Delete unreferenced blobs older than ``grace_seconds``.
+
+        The grace period keeps blobs whose reference is about to be taken,
+        such as an image still being written in the background. The first
+        run also seeds the size table ``disk_usage`` reports from.
+        """
+        self._ensure_blob_sizes()
+        with self._lock:
+            referenced = {
+                row[0] for row in self._db().execute("SELECT DISTINCT digest FROM refs")
+            }
+        cutoff = time.time() - float(grace_seconds)
+        removed = 0
+        freed = 0
+        for blob in self._iter_blobs():
+            if self.digest_from_path(blob.name) in referenced:
+                continue
+            try:
+                stat = blob.stat()
+            except OSError:
+                continue
+            if stat.st_mtime > cutoff:
+                continue
+            if self._remove_blob(blob.path):
+                removed += 1
+                freed += stat.st_size
+        if removed:
+            logger.info("Image store GC removed %d blobs (%d bytes)", removed, freed)
+        return removed
+
+    def disk_usage(self, scan=True):
+        """Summarize blob count, bytes on disk, and unreferenced leftovers.
+
+        Sizes come from the running table, so only the first call walks the
+        directory. With ``scan`` false that first walk is left to a
+        background caller and ``None`` is returned until it has finished.
+        """
+        if not self._sizes_ready.is_set():
+            if not scan:
+                return None
+            self._ensure_blob_sizes()
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT digest, COUNT(*) FROM refs GROUP BY digest"
+            ).fetchall()
+            sizes = dict(self._blob_sizes)
+        ref_counts = dict(rows)
+        orphans = [size for digest, size in sizes.items() if digest not in ref_counts]
+        return {
+            "blob_count": len(sizes),
+            "total_bytes": sum(sizes.values()),
+            "orphan_count": len(orphans),
+            "orphan_bytes": sum(orphans),
+            "reference_count": sum(ref_counts.values()),
+            "shared_count": sum(1 for count in ref_counts.values() if count > 1),
+        }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+image_store = ImageStore()
@@ -0,0 +1,115 @@
+import hashlib
+import queue
+import threading
+import time
+
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtGui import QImage
+
+from src.core.image_store import save_image_atomically
+from src.core.logger import get_logger
+from src.core.metrics import metrics_store
+
+
+logger = get_logger(__name__)
+
+
+# Opaque pixels have identical bytes in these formats, so a screenshot and the
+# same image read back from the clipboard hash alike whichever one Qt picked.
+_DIGEST_FORMATS = {
+    QImage.Format.Format_RGB32,
+    QImage.Format.Format_ARGB32,
+    QImage.Format.Format_ARGB32_Premultiplied,
+}
+
+
+def image_pixel_digest(image):
+    """SHA1 of a QImage's pixels, computed straight from its bits.
+
+    Row padding past the visible width is skipped, so two images with the
+    same pixels hash alike regardless of stride. No encoding happens here.
+    """
+    if not isinstance(image, QImage) or image.isNull():
+        return ""
+    if image.format() not in _DIGEST_FORMATS:
+        image = image.convertToFormat(QImage.Format.Format_ARGB32)
+
+    digest = hashlib.sha1(f"{image.width()}x{image.height()}:".encode("ascii"))
+    bits = image.constBits()
+    bits.setsize(image.sizeInBytes())
+    view = memoryview(bits)
+    stride = image.bytesPerLine()
+    row_bytes = image.width() * 4
+    if row_bytes == stride:
+        digest.update(view)
+    else:
+        for row in range(image.height()):
+            start = row * stride
+            digest.update(view[start : start + row_bytes])
+    return digest.hexdigest()
+
+
+class BackgroundImageWriter(QObject):
+    """Encodes and writes images on one worker thread, in submission order.
+
+    ``image_written(job_id, path, ok)`` is emitted from the worker thread and
+    therefore delivered queued to receivers living on the GUI thread. Paths
+    inside ``image_store`` are written through it, so a blob another thread
+    is already encoding is waited for rather than encoded twice.
+    """
+
+    image_written = pyqtSignal(str, str, bool)
+
+    def __init__(self, metric_name="image_writer.encode", image_store=None):
+        super().__init__()
+        self._metric_name = metric_name
+        self._image_store = image_store
+        self._queue = queue.Queue()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        self._pending = 0
+        self._idle = threading.Condition()
+
+    def _ensure_thread(self):
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._worker, name="image-writer", daemon=True
+                )
+                self._thread.start()
+
+    def submit(self, job_id, image, path, fmt="PNG"):
+        with self._idle:
+            self._pending += 1
+        self._queue.put((str(job_id), image, path, fmt))
+        self._ensure_thread()
+
+    def _worker(self):
+        while True:
+            job_id, image, path, fmt = self._queue.get()
+            started = time.perf_counter()
+            store = self._image_store
+            if store is not None and store.owns(path):
+                ok = store.write(store.digest_from_path(path), image, fmt)
+            else:
+                ok = save_image_atomically(image, path, fmt)
+
+            metrics_store.record(
+                self._metric_name,
+                (time.perf_counter() - started) * 1000,
+                {"width": image.width(), "height": image.height(), "ok": ok},
+            )
+            self.image_written.emit(job_id, path, ok)
+            with self._idle:
+                self._pending -= 1
+                self._idle.notify_all()
+
+    def wait_idle(self, timeout=None):
+        """Block until every submitted job has been written."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    @property
+    def pending_count(self):
+        with self._idle:
+            return self._pending
@@ -0,0 +1,83 @@
+import importlib
+from functools import lru_cache
+
+lazy_pinyin = None
+try:
+    _pypinyin = importlib.import_module("pypinyin")
+    lazy_pinyin = getattr(_pypinyin, "lazy_pinyin", None)
+except Exception:
+    lazy_pinyin = None
+
+
+INITIAL_RANGES = [
+    (-20319, "a"),
+    (-20284, "b"),
+    (-19776, "c"),
+    (-19219, "d"),
+    (-18711, "e"),
+    (-18527, "f"),
+    (-18240, "g"),
+    (-17923, "h"),
+    (-17418, "j"),
+    (-16475, "k"),
+    (-16213, "l"),
+    (-15641, "m"),
+    (-15166, "n"),
+    (-14923, "o"),
+    (-14915, "p"),
+    (-14631, "q"),
+    (-14150, "r"),
+    (-14091, "s"),
+    (-13319, "t"),
+    (-12839, "w"),
+    (-12557, "x"),
+    (-11848, "y"),
+    (-11056, "z"),
+]
+
+
+@lru_cache(maxsize=8192)
+def char_initial(ch):
+    """Pinyin initial of a GBK level-1 hanzi, or the lowercase ASCII char."""
+    if not ch:
+        return ""
+
+    lower = ch.lower()
+    if "a" <= lower <= "z" or "0" <= lower <= "9":
+        return lower
+
+    try:
+        gbk = ch.encode("gbk")
+    except Exception:
+        return ""
+
+    if len(gbk) < 2:
+        return ""
+
+    code = gbk[0] * 256 + gbk[1] - 65536
+    for i in range(len(INITIAL_RANGES) - 1):
+        lower_bound, initial = INITIAL_RANGES[i]
+        upper_bound, _ = INITIAL_RANGES[i + 1]
+        if lower_bound <= code < upper_bound:
+            return initial
+
+    if code >= INITIAL_RANGES[-1][0]:
+        return INITIAL_RANGES[-1][1]
+
+    return ""
+
+
+def full_pinyin(text):
+    """Toneless pinyin of ``text`` joined together, or "" without pypinyin."""
+    if lazy_pinyin is None:
+        return ""
+    try:
+        return "".join(lazy_pinyin(text)).lower()
+    except Exception:
+        return ""
+
+
+@lru_cache(maxsize=8192)
+def char_pinyin(ch):
+    """Toneless pinyin of a single character, cached; "" without pypinyin."""
+    return full_pinyin(ch)
@@ -0,0 +1,168 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from src.core.logger import get_logger
+from src.core.metrics import metrics_store
+
+
+logger = get_logger(__name__)
+
+DEFAULT_FIRST_PAINT_DEADLINE_MS = 40
+DEFAULT_SOURCE_QUOTAS = {"custom": 10, "app": 20, "file": 20}
+DEFAULT_SOURCE_WEIGHTS = {"custom": 1.5, "app": 1.2, "file": 1.0}
+
+_source_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="search-source")
+_speculation = threading.local()
+
+
+class SpeculativeRun:
+    """Marks the searches merged on this thread as speculative while active.
+
+    Their deadline misses are not recorded, since nobody is waiting on
+    them, and the thread CPU time their sources spend on the worker pool is
+    summed into ``cpu_ms``: it never shows on the calling thread's clock.
+    """
+
+    def __init__(self):
+        self.cpu_ms = 0.0
+        self._outer = None
+
+    def __enter__(self):
+        self._outer = getattr(_speculation, "run", None)
+        _speculation.run = self
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _speculation.run = self._outer
+        return False
+
+
+class ResultMergePolicy:
+    """Per-source quotas and weights plus the first-paint deadline.
+
+    Merged results are interleaved by ``weight / (position + 1)``, so a
+    heavier source leads but every source that answered gets rows near the
+    top instead of being pushed below another source's whole result list.
+    """
+
+    def __init__(self, deadline_ms=None, quotas=None, weights=None):
+        if deadline_ms is None:
+            deadline_ms = DEFAULT_FIRST_PAINT_DEADLINE_MS
+        self.deadline_ms = max(0, int(deadline_ms))
+        self.quotas = dict(DEFAULT_SOURCE_QUOTAS)
+        self.weights = dict(DEFAULT_SOURCE_WEIGHTS)
+
+        for source, value in (quotas or {}).items():
+            try:
+                self.quotas[str(source)] = max(1, int(value))
+            except (TypeError, ValueError):
+                continue
+        for source, value in (weights or {}).items():
+            try:
+                self.weights[str(source)] = max(0.0, float(value))
+            except (TypeError, ValueError):
+                continue
+
+    @classmethod
+    def from_config(cls, config_manager):
+        quotas = config_manager.get_value("search_source_quotas", {})
+        weights = config_manager.get_value("search_source_weights", {})
+        return cls(
+            deadline_ms=config_manager.get_value(
+                "search_first_paint_deadline_ms", DEFAULT_FIRST_PAINT_DEADLINE_MS
+            ),
+            quotas=quotas if isinstance(quotas, dict) else {},
+            weights=weights if isinstance(weights, dict) else {},
+        )
+
+    def quota_for(self, source):
+        return self.quotas.get(source, 20)
+
+    def weight_for(self, source):
+        return self.weights.get(source, 1.0)
+
+    def merge(self, source_results):
+        """Merge ``{source: results}`` into one list tagged with ``merge_rank``."""
+        scored = []
+        for order, (source, results) in enumerate(source_results.items()):
+            weight = self.weight_for(source)
+            for position, item in enumerate(
+                list(results or [])[: self.quota_for(source)]
+            ):
+                scored.append((-weight / (position + 1), order, position, source, item))
+
+        scored.sort(key=lambda entry: entry[:3])
+        merged = []
+        for rank, (_score, _order, _position, source, item) in enumerate(scored):
+            payload = dict(item)
+            payload["merge_rank"] = rank
+            payload["merge_source"] = source
+            merged.append(payload)
+        return merged
+
+
+class DeadlineResultMerger:
+    """Queries every source concurrently and paints what is ready in time.
+
+    Sources still running at the deadline are recorded as
+    ``search.deadline_miss`` (unless inside a ``SpeculativeRun``); the
+    caller gets a partial merge for the first paint, if any source made it
+    in time, and the full merge once the stragglers answer.
+    """
+
+    def __init__(self, policy, executor=None):
+        self.policy = policy
+        self._executor = executor or _source_executor
+
+    @staticmethod
+    def _timed(search):
+        cpu_started = time.thread_time()
+        try:
+            results = search() or []
+        except Exception as e:
+            logger.warning("Search source failed: %s", e)
+            results = []
+        cpu_ms = (time.thread_time() - cpu_started) * 1000
+        return results, time.perf_counter(), cpu_ms
+
+    def run(self, sources, on_first_paint=None):
+        started = time.perf_counter()
+        speculation = getattr(_speculation, "run", None)
+        futures = {
+            name: self._executor.submit(self._timed, search)
+            for name, search in sources.items()
+        }
+        deadline_s = self.policy.deadline_ms / 1000.0
+        _done, pending = wait(list(futures.values()), timeout=deadline_s)
+
+        missed = [name for name, future in futures.items() if future in pending]
+        # With nothing back yet a first paint would only clear the list the
+        # user is looking at; the previous results stay until the full merge.
+        if missed and len(missed) < len(futures) and on_first_paint is not None:
+            ready = {
+                name: future.result()[0]
+                for name, future in futures.items()
+                if name not in missed
+            }
+            on_first_paint(self.policy.merge(ready), missed)
+
+        if pending:
+            wait(pending)
+        if speculation is not None:
+            speculation.cpu_ms += sum(
+                future.result()[2] for future in futures.values()
+            )
+            missed = []
+        for name in missed:
+            finished_at = futures[name].result()[1]
+            late_ms = (finished_at - started) * 1000 - self.policy.deadline_ms
+            metrics_store.record(
+                "search.deadline_miss",
+                max(0.0, late_ms),
+                {"source": name, "deadline_ms": self.policy.deadline_ms},
+            )
+
+        return self.policy.merge(
+            {name: future.result()[0] for name, future in futures.items()}
+        )
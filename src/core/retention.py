@@ -0,0 +1,221 @@
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from src.core.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+_BYTES_PER_MB = 1024 * 1024
+_SECONDS_PER_DAY = 24 * 60 * 60
+
+
+class RetentionPolicy:
+    """Limits a history keeps to: entry count, total bytes and idle age.
+
+    ``0`` disables the byte or age limit. Pinned entries never count
+    against any limit and are never evicted.
+    """
+
+    def __init__(self, max_entries=None, max_bytes=0, max_age_days=0):
+        self.max_entries = max(1, int(max_entries)) if max_entries else None
+        self.max_bytes = max(0, int(max_bytes or 0))
+        self.max_age_seconds = max(0.0, float(max_age_days or 0)) * _SECONDS_PER_DAY
+
+    @classmethod
+    def from_config(cls, config_manager, prefix, max_entries=None):
+        """Read ``<prefix>_max_mb`` and ``<prefix>_max_age_days``."""
+
+        def number(key):
+            try:
+                return max(0.0, float(config_manager.get_value(key, 0) or 0))
+            except (TypeError, ValueError):
+                return 0.0
+
+        return cls(
+            max_entries=max_entries,
+            max_bytes=number(f"{prefix}_max_mb") * _BYTES_PER_MB,
+            max_age_days=number(f"{prefix}_max_age_days"),
+        )
+
+
+class RetentionIndex:
+    """Unpinned history entries in least-recently-used order.
+
+    Each entry carries its byte size and last-use time, and the index keeps
+    a running byte total, so finding what to evict only ever looks at the
+    front of the order: amortized O(1) per evicted entry.
+
+    Entries that share stored data, such as one content-addressed image
+    blob, pass the same ``blob`` key. Its bytes are charged once while any
+    holder is tracked and freed when the last one goes, so evicting one of
+    several holders does not pretend to free space.
+    """
+
+    def __init__(self):
+        self._order = OrderedDict()
+        # blob key -> [holder count, charged bytes]
+        self._blobs = {}
+        self.total_bytes = 0
+
+    def __len__(self):
+        return len(self._order)
+
+    def __contains__(self, entry_id):
+        return entry_id in self._order
+
+    def _charge(self, blob, size):
+        if blob is None:
+            self.total_bytes += size
+            return
+        shared = self._blobs.get(blob)
+        if shared is None:
+            self._blobs[blob] = [1, size]
+            self.total_bytes += size
+        else:
+            shared[0] += 1
+
+    def _release(self, item):
+        size, _last_used, blob = item
+        if blob is None:
+            self.total_bytes -= size
+            return
+        shared = self._blobs.get(blob)
+        if shared is None:
+            return
+        shared[0] -= 1
+        if shared[0] <= 0:
+            del self._blobs[blob]
+            self.total_bytes -= shared[1]
+
+    def add(self, entry_id, size, last_used=None, blob=None):
+        """Track ``entry_id`` as the most recently used entry."""
+        self.remove(entry_id)
+        size = max(0, int(size or 0))
+        last_used = time.time() if last_used is None else last_used
+        self._order[entry_id] = (size, last_used, blob)
+        self._charge(blob, size)
+
+    def touch(self, entry_id, now=None):
+        item = self._order.get(entry_id)
+        if item is None:
+            return
+        self._order[entry_id] = (item[0], time.time() if now is None else now, item[2])
+        self._order.move_to_end(entry_id)
+
+    def update_size(self, entry_id, size):
+        item = self._order.get(entry_id)
+        if item is None:
+            return
+        size = max(0, int(size or 0))
+        blob = item[2]
+        if blob is None:
+            self.total_bytes += size - item[0]
+        else:
+            shared = self._blobs[blob]
+            self.total_bytes += size - shared[1]
+            shared[1] = size
+        self._order[entry_id] = (size, item[1], blob)
+
+    def remove(self, entry_id):
+        item = self._order.pop(entry_id, None)
+        if item is not None:
+            self._release(item)
+
+    def clear(self):
+        self._order.clear()
+        self._blobs.clear()
+        self.total_bytes = 0
+
+    def evict(self, policy, pinned_count=0, now=None):
+        """Pop and return ids that break ``policy``, least recently used first."""
+        now = time.time() if now is None else now
+        evicted = []
+        while self._order:
+            entry_id, item = next(iter(self._order.items()))
+            over_count = (
+                policy.max_entries is not None
+                and len(self._order) + pinned_count > policy.max_entries
+            )
+            over_bytes = policy.max_bytes and self.total_bytes > policy.max_bytes
+            too_old = policy.max_age_seconds and now - item[1] > policy.max_age_seconds
+            if not (over_count or over_bytes or too_old):
+                break
+            self._order.popitem(last=False)
+            self._release(item)
+            evicted.append(entry_id)
+        return evicted
+
+
+class HistoryEntries:
+    """History entries, newest first, keyed by their ``id``.
+
+    Entries live in an insertion-ordered dict, oldest first, so adding the
+    newest entry and removing any entry by id are O(1) wherever ``touch``
+    has left it in the retention order; there is no list to rebuild.
+    """
+
+    def __init__(self, entries=()):
+        self._by_id = {}
+        for entry in reversed(list(entries)):
+            self._by_id[entry["id"]] = entry
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __iter__(self):
+        return reversed(self._by_id.values())
+
+    def __reversed__(self):
+        return iter(self._by_id.values())
+
+    def newest(self):
+        if not self._by_id:
+            return None
+        return next(reversed(self._by_id.values()))
+
+    def add(self, entry):
+        """Insert ``entry`` as the newest one."""
+        self._by_id.pop(entry["id"], None)
+        self._by_id[entry["id"]] = entry
+
+    def get(self, entry_id):
+        return self._by_id.get(entry_id)
+
+    def pop(self, entry_id):
+        return self._by_id.pop(entry_id, None)
+
+    def pop_many(self, entry_ids):
+        """Remove entries whose ``id`` is in ``entry_ids`` and return them."""
+        removed = (self._by_id.pop(entry_id, None) for entry_id in entry_ids)
+        return [entry for entry in removed if entry is not None]
+
+    def to_list(self):
+        return list(self)
+
+
+class BackgroundCleaner:
+    """Runs disk cleanup for evicted history entries on one worker thread."""
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="history-cleanup"
+        )
+
+    def submit(self, fn, *args):
+        return self._executor.submit(self._run, fn, args)
+
+    @staticmethod
+    def _run(fn, args):
+        try:
+            fn(*args)
+        except Exception as e:
+            logger.warning("History cleanup failed: %s", e)
+
+    def flush(self, timeout=None):
+        """Block until every cleanup submitted so far has run."""
+        self._executor.submit(lambda: None).result(timeout)
+
+
+background_cleaner = BackgroundCleaner()
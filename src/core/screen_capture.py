@@ -0,0 +1,202 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from PyQt6.QtCore import QPoint, QRect, QRectF, QSize, Qt
+from PyQt6.QtGui import QGuiApplication, QPainter, QPixmap
+
+
+# QPA plugins whose screen grabs are plain GDI/raster copies that can be
+# taken off the GUI thread; elsewhere screens are grabbed one by one.
+THREADED_GRAB_PLATFORMS = frozenset({"windows"})
+
+_grab_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="screen-grab")
+
+
+def scaled_rect(rect: QRect, scale: float) -> QRect:
+    x1 = round(rect.x() * scale)
+    y1 = round(rect.y() * scale)
+    x2 = round((rect.x() + rect.width()) * scale)
+    y2 = round((rect.y() + rect.height()) * scale)
+    return QRect(x1, y1, max(1, x2 - x1), max(1, y2 - y1))
+
+
+def capture_scale(screen, pixmap) -> float:
+    geometry = screen.geometry()
+    scale_values = [
+        float(screen.devicePixelRatio()),
+        float(pixmap.devicePixelRatio()),
+    ]
+    if geometry.width() > 0:
+        scale_values.append(float(pixmap.width()) / float(geometry.width()))
+    if geometry.height() > 0:
+        scale_values.append(float(pixmap.height()) / float(geometry.height()))
+
+    return max(1.0, max(scale_values))
+
+
+def can_grab_in_threads() -> bool:
+    return QGuiApplication.platformName() in THREADED_GRAB_PLATFORMS
+
+
+@dataclass
+class ScreenGrab:
+    geometry: QRect
+    pixmap: QPixmap
+    scale: float
+    grab_ms: float = 0.0
+
+
+def _grab(screen) -> ScreenGrab:
+    started = time.perf_counter()
+    shot = screen.grabWindow(0)
+    scale = capture_scale(screen, shot)
+    if abs(float(shot.devicePixelRatio()) - scale) > 0.01:
+        shot.setDevicePixelRatio(scale)
+    return ScreenGrab(
+        QRect(screen.geometry()),
+        shot,
+        scale,
+        (time.perf_counter() - started) * 1000,
+    )
+
+
+class ScreenCapture:
+    """Every screen of one screenshot, read as a single virtual desktop.
+
+    Each screen keeps its own grab at its own scale; nothing desktop sized
+    is ever composed. Reads address the desktop as if it were one pixmap
+    at the highest screen scale (``scale``) and only assemble the pixels
+    they ask for, so a capture costs one buffer per screen. ``width``,
+    ``height`` and ``copy`` mirror QPixmap for consumers such as
+    EffectTileCache.
+    """
+
+    def __init__(self, grabs, parallel=False):
+        if not grabs:
+            raise ValueError("a capture needs at least one screen")
+        self.grabs = list(grabs)
+        self.parallel = parallel
+
+        virtual_rect = QRect(self.grabs[0].geometry)
+        for grab in self.grabs[1:]:
+            virtual_rect = virtual_rect.united(grab.geometry)
+        self.virtual_rect = virtual_rect
+        self.scale = max(1.0, max(grab.scale for grab in self.grabs))
+        self.size = QSize(
+            max(1, round(virtual_rect.width() * self.scale)),
+            max(1, round(virtual_rect.height() * self.scale)),
+        )
+        origin = virtual_rect.topLeft()
+        # Where each screen lands on the virtual desktop, in logical and in
+        # native (``scale``) pixels.
+        self._local = [grab.geometry.translated(-origin) for grab in self.grabs]
+        self._native = [scaled_rect(rect, self.scale) for rect in self._local]
+
+    @classmethod
+    def grab(cls, screens, parallel=True):
+        """Grab ``screens``, concurrently when ``parallel`` and the platform
+        allows it. Each grab records how long it took."""
+        screens = list(screens)
+        threaded = parallel and len(screens) > 1 and can_grab_in_threads()
+        if threaded:
+            grabs = list(_grab_executor.map(_grab, screens))
+        else:
+            grabs = [_grab(screen) for screen in screens]
+        return cls(grabs, parallel=threaded)
+
+    @classmethod
+    def from_pixmap(cls, pixmap, origin=None):
+        """Capture of a single screen whose grab is ``pixmap``."""
+        scale = max(1.0, float(pixmap.devicePixelRatio()))
+        geometry = QRect(
+            origin or QPoint(),
+            QSize(round(pixmap.width() / scale), round(pixmap.height() / scale)),
+        )
+        return cls([ScreenGrab(geometry, pixmap, scale)])
+
+    def __len__(self):
+        return len(self.grabs)
+
+    def width(self):
+        return self.size.width()
+
+    def height(self):
+        return self.size.height()
+
+    def devicePixelRatio(self):
+        return self.scale
+
+    def grab_times(self):
+        """Milliseconds each screen's grab took, in screen order."""
+        return [round(grab.grab_ms, 2) for grab in self.grabs]
+
+    def draw(self, painter, target: QRect):
+        """Paint the logical ``target`` of the desktop at the same place."""
+        for grab, local in zip(self.grabs, self._local):
+            part = target & local
+            if part.isEmpty():
+                continue
+            painter.drawPixmap(
+                part,
+                grab.pixmap,
+                scaled_rect(part.translated(-local.topLeft()), grab.scale),
+            )
+
+    def copy(self, rect: QRect) -> QPixmap:
+        """Native pixels under ``rect``, like ``QPixmap.copy`` on a composite.
+
+        As with QPixmap, the result is clipped to the desktop.
+        """
+        if len(self.grabs) == 1 and self.grabs[0].scale == self.scale:
+            return self.grabs[0].pixmap.copy(rect)
+
+        rect = rect & QRect(QPoint(), self.size)
+        if rect.isEmpty():
+            return QPixmap()
+        result = QPixmap(rect.size())
+        result.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(result)
+        for grab, bounds in zip(self.grabs, self._native):
+            part = rect & bounds
+            if part.isEmpty():
+                continue
+            factor = grab.scale / self.scale
+            source = QRectF(
+                (part.x() - bounds.x()) * factor,
+                (part.y() - bounds.y()) * factor,
+                part.width() * factor,
+                part.height() * factor,
+            )
+            painter.drawPixmap(
+                QRectF(part.translated(-rect.topLeft())), grab.pixmap, source
+            )
+        painter.end()
+        result.setDevicePixelRatio(self.scale)
+        return result
+
+    def region(self, rect: QRect) -> QPixmap:
+        """The logical ``rect`` of the desktop at native resolution.
+
+        A rect on a single screen comes straight from that screen's grab at
+        its own scale; one spanning screens is assembled at ``scale``.
+        """
+        matches = [
+            (grab, local)
+            for grab, local in zip(self.grabs, self._local)
+            if local.intersects(rect)
+        ]
+        if len(matches) == 1:
+            grab, local = matches[0]
+            source = (rect & local).translated(-local.topLeft())
+            pixmap = grab.pixmap.copy(scaled_rect(source, grab.scale))
+            pixmap.setDevicePixelRatio(grab.scale)
+            return pixmap
+        return self.copy(scaled_rect(rect, self.scale))
+
+    def pixel_color(self, native_point):
+        """Color of one native pixel, or ``None`` outside the desktop."""
+        x, y = native_point.x(), native_point.y()
+        if not (0 <= x < self.width() and 0 <= y < self.height()):
+            return None
+        return self.copy(QRect(x, y, 1, 1)).toImage().pixelColor(0, 0)
@@ -0,0 +1,227 @@
+"""Stitch successive grabs of a scrolling area into one tall image.
+
+Each frame is reduced to one 64-bit hash per pixel row, and the shift
+between two frames is found by lining those hashes up, so a frame costs a
+few vectorized passes over its pixels whatever the page looks like. Rows
+that stay put from frame to frame (sticky headers, footers, toolbars) are
+measured once, on the first scroll, and kept out of the match. Stitched
+rows go into fixed-height tiles, so growing the image never copies what is
+already there, and the total height is capped.
+"""
+
+import time
+
+from PyQt6.QtGui import QImage
+
+from src.core.logger import get_logger
+from src.core.metrics import metrics_store
+from src.utils.qimage_numpy import bgra_view, image_view
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+logger = get_logger(__name__)
+
+SCROLL_STITCH_AVAILABLE = np is not None
+
+DEFAULT_TILE_HEIGHT = 512
+DEFAULT_MAX_HEIGHT = 20000
+# Share of the overlapping rows that must match for a shift to be taken.
+MIN_MATCH_RATIO = 0.9
+# A shift has to leave at least this many rows overlapping.
+MIN_OVERLAP_ROWS = 16
+# Sticky rows at the top or at the bottom may cover at most this share.
+MAX_STICKY_SHARE = 1 / 3
+# Columns at the right edge left out of the hashes, where a scrollbar
+# thumb moving with the page would make every row differ.
+SCROLLBAR_WIDTH = 24
+# Rows of the new frame used as anchors when looking for the shift.
+_ANCHOR_ROWS = 8
+
+_FORMAT = QImage.Format.Format_RGB32
+_weights = {}
+
+
+def _row_weights(width):
+    weights = _weights.get(width)
+    if weights is None:
+        weights = np.random.default_rng(width).integers(
+            1, 2**63, size=width, dtype=np.uint64
+        ) | np.uint64(1)
+        _weights[width] = weights
+    return weights
+
+
+def row_hashes(pixels):
+    """One uint64 hash per row of an ``(h, w, 4)`` uint8 pixel array."""
+    height, width = pixels.shape[:2]
+    if width > 4 * SCROLLBAR_WIDTH:
+        width -= SCROLLBAR_WIDTH
+    words = pixels[:, :width].view(np.uint32).reshape(height, width)
+    # Wrapping multiply-add with odd random weights: equal rows always
+    # collide, different rows almost never do.
+    return (words * _row_weights(width)).sum(axis=1, dtype=np.uint64)
+
+
+def _sticky_rows(previous, current):
+    """Rows at the top and bottom that are the same in both frames."""
+    limit = int(len(current) * MAX_STICKY_SHARE)
+    same = previous == current
+    top = int(np.argmin(same)) if not same.all() else len(same)
+    bottom = int(np.argmin(same[::-1])) if not same.all() else len(same)
+    return min(top, limit), min(bottom, limit)
+
+
+def find_shift(previous, current):
+    """Rows ``current`` has scrolled down from ``previous``, or ``None``.
+
+    Both arguments are row hashes of the same band of two frames. Returns
+    0 when nothing moved and ``None`` when no downward shift leaves enough
+    matching overlap (the page jumped, scrolled back up, or changed).
+    """
+    rows = len(current)
+    if rows != len(previous) or rows < MIN_OVERLAP_ROWS + 1:
+        return None
+    if np.array_equal(previous, current):
+        return 0
+
+    # Anchor on the rows of ``current`` that are rarest in ``previous``,
+    # so blank lines repeated all over the page do not flood the search.
+    values, counts = np.unique(previous, return_counts=True)
+    head = current[: rows - MIN_OVERLAP_ROWS]
+    found = np.searchsorted(values, head)
+    found[found == len(values)] = 0
+    present = values[found] == head
+    if not present.any():
+        return None
+    anchors = np.flatnonzero(present)
+    anchors = anchors[np.argsort(counts[found[anchors]], kind="stable")]
+
+    shifts = set()
+    for anchor in anchors[:_ANCHOR_ROWS]:
+        for row in np.flatnonzero(previous == current[anchor]):
+            shift = int(row - anchor)
+            if 0 < shift <= rows - MIN_OVERLAP_ROWS:
+                shifts.add(shift)
+
+    best, best_ratio = None, MIN_MATCH_RATIO
+    for shift in sorted(shifts):
+        ratio = float(np.mean(previous[shift:] == current[: rows - shift]))
+        if ratio > best_ratio:
+            best, best_ratio = shift, ratio
+    return best
+
+
+class ScrollStitcher:
+    """Build one tall image from frames grabbed while the page scrolls.
+
+    Feed frames of the same size to ``add_frame`` in the order they were
+    grabbed; ``image`` returns the page so far. Only the last matched
+    frame is kept besides the tiles, so memory grows with the stitched
+    height alone, up to ``max_height`` rows.
+    """
+
+    def __init__(
+        self, tile_height=DEFAULT_TILE_HEIGHT, max_height=DEFAULT_MAX_HEIGHT
+    ):
+        self.tile_height = max(1, int(tile_height))
+        self.max_height = max(1, int(max_height))
+        self.truncated = False
+        self._tiles = []
+        self._height = 0
+        self._frame = None
+        self._hashes = None
+        # Sticky (top, bottom) rows, fixed by the first frame that scrolled.
+        self._sticky = None
+
+    @property
+    def width(self):
+        return 0 if self._frame is None else self._frame.shape[1]
+
+    @property
+    def height(self):
+        if self._frame is None:
+            return 0
+        if self._sticky is None:
+            return self._frame.shape[0]
+        return self._height + self._sticky[1]
+
+    def add_frame(self, image):
+        """Stitch ``image`` onto the page.
+
+        Returns the number of new rows, 0 when the page has not moved (or
+        the height cap was reached), and ``None`` when the frame could not
+        be lined up with the last one; the next frame is then matched
+        against that last frame again, so scrolling back a little resumes.
+        """
+        started = time.perf_counter()
+        frame = bgra_view(image)
+        hashes = row_hashes(frame)
+        if self._frame is None:
+            self._frame, self._hashes = frame, hashes
+            return 0
+        if frame.shape != self._frame.shape:
+            logger.warning(
+                "Scroll frame size changed from %s to %s",
+                self._frame.shape[:2],
+                frame.shape[:2],
+            )
+            return None
+
+        sticky = self._sticky or _sticky_rows(self._hashes, hashes)
+        end = len(hashes) - sticky[1]
+        shift = find_shift(self._hashes[sticky[0] : end], hashes[sticky[0] : end])
+        if not shift:
+            return shift
+        if self._sticky is None:
+            self._sticky = sticky
+            self._append(self._frame[:end])
+
+        added = min(shift, self.max_height - self.height)
+        if added < shift:
+            self.truncated = True
+        if added > 0:
+            self._append(frame[end - shift : end - shift + added])
+        self._frame, self._hashes = frame, hashes
+
+        metrics_store.record(
+            "screenshot.scroll_stitch",
+            (time.perf_counter() - started) * 1000,
+            {"rows": added, "height": self.height, "sticky": list(sticky)},
+        )
+        return max(0, added)
+
+    def _append(self, rows):
+        start = 0
+        while start < len(rows):
+            offset = self._height % self.tile_height
+            if offset == 0:
+                self._tiles.append(
+                    np.empty((self.tile_height,) + rows.shape[1:], np.uint8)
+                )
+            count = min(len(rows) - start, self.tile_height - offset)
+            self._tiles[-1][offset : offset + count] = rows[start : start + count]
+            self._height += count
+            start += count
+
+    def image(self):
+        """The stitched page as an RGB32 QImage (null before any frame)."""
+        if self._frame is None:
+            return QImage()
+        if self._sticky is None:
+            footer = self._frame
+        else:
+            footer = self._frame[len(self._frame) - self._sticky[1] :]
+
+        image = QImage(self.width, self.height, _FORMAT)
+        pixels = image_view(image, writable=True)
+        row = 0
+        for tile in self._tiles:
+            count = min(self.tile_height, self._height - row)
+            pixels[row : row + count] = tile[:count]
+            row += count
+        pixels[row:] = footer
+        return image
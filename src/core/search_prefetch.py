@@ -0,0 +1,148 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+from src.core.logger import get_logger
+from src.core.metrics import metrics_store
+from src.core.result_merger import SpeculativeRun
+
+
+logger = get_logger(__name__)
+
+
+class SearchPrefetcher:
+    """Runs likely queries ahead of time so the real keystroke finds them cached.
+
+    Speculative searches run on a single background worker and are throttled
+    by a CPU budget: once the jobs of the last ``budget_window_s`` seconds
+    used ``cpu_budget_ms`` of CPU time, further speculation is dropped until
+    the window slides on. A job's CPU time is that of the worker plus that of
+    the merged sources it fanned out to. Entries live ``ttl_seconds``; callers
+    paint a hit and still run the real search behind it. ``lookup`` counts
+    hits so the hit rate can be checked against the CPU spent.
+    """
+
+    def __init__(
+        self,
+        search,
+        ttl_seconds=10.0,
+        max_entries=64,
+        cpu_budget_ms=150.0,
+        budget_window_s=5.0,
+        max_workers=1,
+    ):
+        self._search = search
+        self._ttl_seconds = float(ttl_seconds)
+        self._max_entries = max(1, int(max_entries))
+        self._cpu_budget_ms = float(cpu_budget_ms)
+        self._budget_window_s = float(budget_window_s)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, int(max_workers)), thread_name_prefix="search-prefetch"
+        )
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()
+        self._inflight = set()
+        self._cpu_spent = deque()
+        self.lookups = 0
+        self.hits = 0
+        self.prefetched = 0
+        self.skipped_over_budget = 0
+
+    @staticmethod
+    def _normalize(query):
+        return str(query or "").strip()
+
+    def _cached(self, key):
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        created_at, value = entry
+        if time.monotonic() - created_at > self._ttl_seconds:
+            self._cache.pop(key, None)
+            return None
+        self._cache.move_to_end(key)
+        return value
+
+    def _budget_used_ms(self):
+        cutoff = time.monotonic() - self._budget_window_s
+        while self._cpu_spent and self._cpu_spent[0][0] < cutoff:
+            self._cpu_spent.popleft()
+        return sum(cpu_ms for _at, cpu_ms in self._cpu_spent)
+
+    def lookup(self, query):
+        """Return the prefetched value for ``query`` or ``None``."""
+        key = self._normalize(query)
+        if not key:
+            return None
+        with self._lock:
+            self.lookups += 1
+            value = self._cached(key)
+            if value is not None:
+                self.hits += 1
+        return value
+
+    def prefetch(self, queries):
+        """Schedule speculative searches; returns how many were queued."""
+        scheduled = 0
+        for query in queries:
+            key = self._normalize(query)
+            if not key:
+                continue
+            with self._lock:
+                if key in self._inflight or self._cached(key) is not None:
+                    continue
+                if self._budget_used_ms() >= self._cpu_budget_ms:
+                    self.skipped_over_budget += 1
+                    continue
+                self._inflight.add(key)
+            self._executor.submit(self._run, key)
+            scheduled += 1
+        return scheduled
+
+    def _run(self, key):
+        wall_started = time.perf_counter()
+        cpu_started = time.thread_time()
+        with SpeculativeRun() as speculation:
+            try:
+                value = self._search(key)
+            except Exception as e:
+                logger.warning("Prefetch for %r failed: %s", key, e)
+                value = None
+        cpu_ms = (time.thread_time() - cpu_started) * 1000 + speculation.cpu_ms
+
+        with self._lock:
+            self._inflight.discard(key)
+            self._cpu_spent.append((time.monotonic(), cpu_ms))
+            if value is not None:
+                self._cache[key] = (time.monotonic(), value)
+                self._cache.move_to_end(key)
+                while len(self._cache) > self._max_entries:
+                    self._cache.popitem(last=False)
+                self.prefetched += 1
+
+        metrics_store.record(
+            "search.prefetch",
+            (time.perf_counter() - wall_started) * 1000,
+            {"query_len": len(key), "cpu_ms": round(cpu_ms, 2)},
+        )
+
+    @property
+    def hit_rate(self):
+        with self._lock:
+            return self.hits / self.lookups if self.lookups else 0.0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "lookups": self.lookups,
+                "hits": self.hits,
+                "hit_rate": self.hits / self.lookups if self.lookups else 0.0,
+                "prefetched": self.prefetched,
+                "skipped_over_budget": self.skipped_over_budget,
+                "cpu_used_ms": round(self._budget_used_ms(), 2),
+            }
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
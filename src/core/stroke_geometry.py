@@ -0,0 +1,191 @@
+import math
+
+from PyQt6.QtCore import QPointF, QRectF, Qt
+from PyQt6.QtGui import QPainterPath, QPainterPathStroker
+
+
+# Live points closer than this to the last kept one are dropped.
+MIN_POINT_DISTANCE = 2.0
+# A point turning the stroke by less than this slides the last point along
+# the straight run instead of adding a new one ...
+SLIDE_MAX_DEGREES = 8.0
+# ... as long as the run stays short enough to keep the curve smooth.
+SLIDE_MAX_LENGTH = 24.0
+# Ramer-Douglas-Peucker tolerance applied when a stroke is committed.
+SIMPLIFY_TOLERANCE = 0.75
+# Smoothed segments per cached chunk of a stroke's path.
+CHUNK_SEGMENTS = 64
+
+
+def add_point(points, pos):
+    """Add a live mouse position to ``points``, decimating as it goes.
+
+    Returns ``False`` when ``pos`` was dropped. Only the last point is ever
+    moved, so everything before it can be cached.
+    """
+    if not points:
+        points.append(pos)
+        return True
+    last = points[-1]
+    dx, dy = pos.x() - last.x(), pos.y() - last.y()
+    if math.hypot(dx, dy) < MIN_POINT_DISTANCE:
+        return False
+
+    if len(points) >= 2:
+        prev = points[-2]
+        run_x, run_y = last.x() - prev.x(), last.y() - prev.y()
+        turn = abs(math.atan2(run_x * dy - run_y * dx, run_x * dx + run_y * dy))
+        if (
+            math.degrees(turn) < SLIDE_MAX_DEGREES
+            and math.hypot(pos.x() - prev.x(), pos.y() - prev.y()) <= SLIDE_MAX_LENGTH
+        ):
+            points[-1] = pos
+            return True
+    points.append(pos)
+    return True
+
+
+def simplify(points, tolerance=SIMPLIFY_TOLERANCE):
+    """``points`` reduced with Ramer-Douglas-Peucker; ends are always kept."""
+    if len(points) < 3:
+        return list(points)
+
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        ax, ay = points[first].x(), points[first].y()
+        bx, by = points[last].x(), points[last].y()
+        dx, dy = bx - ax, by - ay
+        length = math.hypot(dx, dy)
+        farthest, distance = None, tolerance
+        for index in range(first + 1, last):
+            px, py = points[index].x(), points[index].y()
+            if length:
+                offset = abs(dy * (px - ax) - dx * (py - ay)) / length
+            else:
+                offset = math.hypot(px - ax, py - ay)
+            if offset > distance:
+                farthest, distance = index, offset
+        if farthest is not None:
+            keep[farthest] = True
+            stack.append((first, farthest))
+            stack.append((farthest, last))
+    return [point for point, kept in zip(points, keep) if kept]
+
+
+def _mid(a, b):
+    return QPointF((a.x() + b.x()) / 2, (a.y() + b.y()) / 2)
+
+
+def _smoothed(points, first, last, close):
+    """Quadratic segments ``first``..``last`` of the smoothed ``points``.
+
+    Segment ``i`` curves through ``points[i]`` between the midpoints on
+    either side of it; with ``close`` the path runs on to the last point.
+    """
+    path = QPainterPath()
+    if first == 1:
+        path.moveTo(QPointF(points[0]))
+    else:
+        path.moveTo(_mid(points[first - 1], points[first]))
+    for index in range(first, last + 1):
+        path.quadTo(QPointF(points[index]), _mid(points[index], points[index + 1]))
+    if close:
+        path.lineTo(QPointF(points[-1]))
+    return path
+
+
+def smooth_path(points) -> QPainterPath:
+    """The smoothed path through every one of ``points``."""
+    if len(points) < 3:
+        path = QPainterPath()
+        for index, point in enumerate(points):
+            if index == 0:
+                path.moveTo(QPointF(point))
+            else:
+                path.lineTo(QPointF(point))
+        return path
+    return _smoothed(points, 1, len(points) - 2, close=True)
+
+
+class StrokePart:
+    __slots__ = ("path", "outline", "bounds")
+
+    def __init__(self, path, outline):
+        self.path = path
+        self.outline = outline
+        shape = outline if outline is not None else path
+        self.bounds = shape.boundingRect()
+
+
+class StrokeGeometry:
+    """Smoothed path and outline of one freehand stroke, cached in chunks.
+
+    Segments that can no longer change are frozen into chunks of
+    ``CHUNK_SEGMENTS``; only the short tail after them is rebuilt as the
+    stroke grows, so keeping a live stroke up to date costs the same at
+    any length. Points may only change by being appended or by moving the
+    last one, as ``add_point`` does; a new points list starts over.
+    """
+
+    def __init__(self, outline_width=None):
+        self.outline_width = outline_width
+        self._points = None
+        self._chunks = []
+        self._chunk_bounds = QRectF()
+        self._frozen = 0  # segments held in self._chunks
+        self._tail = None
+        self._tail_key = None
+
+    def _part(self, path):
+        outline = None
+        if self.outline_width is not None:
+            stroker = QPainterPathStroker()
+            stroker.setWidth(self.outline_width)
+            stroker.setCapStyle(Qt.PenCapStyle.RoundCap)
+            stroker.setJoinStyle(Qt.PenJoinStyle.RoundJoin)
+            outline = stroker.createStroke(path)
+        return StrokePart(path, outline)
+
+    def update(self, points):
+        if points is not self._points or len(points) < self._frozen + 3:
+            self._points = points
+            self._chunks = []
+            self._chunk_bounds = QRectF()
+            self._frozen = 0
+            self._tail_key = None
+
+        # Segment i is final once point i + 1 is no longer the last point.
+        final = len(points) - 3
+        while final - self._frozen >= CHUNK_SEGMENTS:
+            first = self._frozen + 1
+            last = self._frozen + CHUNK_SEGMENTS
+            chunk = self._part(_smoothed(points, first, last, False))
+            self._chunks.append(chunk)
+            self._chunk_bounds = self._chunk_bounds.united(chunk.bounds)
+            self._frozen = last
+            self._tail_key = None
+
+        key = (len(points), points[-1].x(), points[-1].y()) if points else None
+        if key != self._tail_key:
+            self._tail_key = key
+            if len(points) < 2:
+                self._tail = None
+            elif not self._chunks:
+                self._tail = self._part(smooth_path(points))
+            else:
+                self._tail = self._part(
+                    _smoothed(points, self._frozen + 1, len(points) - 2, True)
+                )
+
+    def parts(self):
+        if self._tail is None:
+            return list(self._chunks)
+        return self._chunks + [self._tail]
+
+    def bounds(self) -> QRectF:
+        if self._tail is None:
+            return QRectF(self._chunk_bounds)
+        return self._chunk_bounds.united(self._tail.bounds)
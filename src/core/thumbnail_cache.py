@@ -0,0 +1,184 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from PyQt6.QtCore import QObject, QRunnable, QSize, QThreadPool, pyqtSignal
+from PyQt6.QtGui import QImage, QImageReader
+
+from src.core.image_store import ImageStore
+from src.core.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+APPDATA_DIR = os.getenv("APPDATA") or os.path.expanduser("~")
+XTOOLS_DIR = os.path.join(APPDATA_DIR, "x-tools")
+THUMBNAIL_DIR = os.path.join(XTOOLS_DIR, "thumbnails")
+
+
+def thumbnail_key(path):
+    """Content key for ``path``: the blob digest, or a stat-based hash."""
+    digest = ImageStore.digest_from_path(path)
+    if len(digest) == 40:
+        return digest
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return ""
+    source = f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+    return hashlib.sha1(source.encode("utf-8", errors="replace")).hexdigest()
+
+
+def _fit_size(original, box):
+    """Largest size with ``original``'s aspect ratio that fits in ``box``."""
+    scale = min(box.width() / original.width(), box.height() / original.height())
+    return QSize(
+        max(1, round(original.width() * scale)),
+        max(1, round(original.height() * scale)),
+    )
+
+
+class _ThumbnailJob(QRunnable):
+    def __init__(self, service, request_id, source_path, cache_path, size):
+        super().__init__()
+        self.service = service
+        self.request_id = request_id
+        self.source_path = source_path
+        self.cache_path = cache_path
+        self.size = size
+
+    def run(self):
+        self.service._generate(
+            self.request_id, self.source_path, self.cache_path, self.size
+        )
+
+
+class ThumbnailService(QObject):
+    """Fixed-size thumbnails decoded on a worker pool and cached on disk.
+
+    ``request`` answers from memory when it can and otherwise returns
+    ``None`` and emits ``thumbnail_ready(request_id, image)`` once the
+    thumbnail has been read from the disk cache or decoded from the source
+    with ``QImageReader.setScaledSize``, which avoids decoding the image at
+    full resolution for most formats.
+    """
+
+    thumbnail_ready = pyqtSignal(str, QImage)
+
+    def __init__(self, cache_dir=None, max_memory_items=128, max_disk_files=2000):
+        super().__init__()
+        self.cache_dir = cache_dir or THUMBNAIL_DIR
+        self._max_memory_items = max(1, int(max_memory_items))
+        self._max_disk_files = max(1, int(max_disk_files))
+        self._memory = OrderedDict()
+        self._inflight = set()
+        self._lock = threading.Lock()
+        self._writes_since_prune = 0
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(2)
+
+    @staticmethod
+    def request_id(key, size):
+        return f"{key}_{size.width()}x{size.height()}"
+
+    def cache_path_for(self, request_id):
+        return os.path.join(self.cache_dir, f"{request_id}.png")
+
+    def request(self, path, size=QSize(320, 320)):
+        """Return ``(request_id, image_or_None)`` for a thumbnail of ``path``."""
+        key = thumbnail_key(path) if path else ""
+        if not key:
+            return "", None
+
+        request_id = self.request_id(key, size)
+        with self._lock:
+            image = self._memory.get(request_id)
+            if image is not None:
+                self._memory.move_to_end(request_id)
+                return request_id, image
+            if request_id in self._inflight:
+                return request_id, None
+            self._inflight.add(request_id)
+
+        self._pool.start(
+            _ThumbnailJob(
+                self, request_id, path, self.cache_path_for(request_id), QSize(size)
+            )
+        )
+        return request_id, None
+
+    def _generate(self, request_id, source_path, cache_path, size):
+        image = QImage()
+        try:
+            if os.path.exists(cache_path):
+                image = QImage(cache_path)
+            if image.isNull():
+                image = self._decode_scaled(source_path, size)
+                if not image.isNull():
+                    self._write_cache(image, cache_path)
+        except Exception as e:
+            logger.warning("Thumbnail for %s failed: %s", source_path, e)
+            image = QImage()
+
+        with self._lock:
+            self._inflight.discard(request_id)
+            if not image.isNull():
+                self._memory[request_id] = image
+                self._memory.move_to_end(request_id)
+                while len(self._memory) > self._max_memory_items:
+                    self._memory.popitem(last=False)
+        self.thumbnail_ready.emit(request_id, image)
+
+    @staticmethod
+    def _decode_scaled(source_path, size):
+        reader = QImageReader(source_path)
+        reader.setAutoTransform(True)
+        original = reader.size()
+        if original.isValid() and (
+            original.width() > size.width() or original.height() > size.height()
+        ):
+            reader.setScaledSize(_fit_size(original, size))
+        return reader.read()
+
+    def _write_cache(self, image, cache_path):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{cache_path}.tmp"
+        if image.save(tmp_path, "PNG"):
+            os.replace(tmp_path, cache_path)
+        with self._lock:
+            self._writes_since_prune += 1
+            should_prune = self._writes_since_prune >= 64
+            if should_prune:
+                self._writes_since_prune = 0
+        if should_prune:
+            self.prune()
+
+    def prune(self):
+        """Keep only the most recently written ``max_disk_files`` thumbnails."""
+        try:
+            files = [
+                entry
+                for entry in os.scandir(self.cache_dir)
+                if entry.is_file() and entry.name.endswith(".png")
+            ]
+        except OSError:
+            return 0
+        excess = len(files) - self._max_disk_files
+        if excess <= 0:
+            return 0
+        files.sort(key=lambda entry: entry.stat().st_mtime)
+        removed = 0
+        for entry in files[:excess]:
+            try:
+                os.remove(entry.path)
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def wait_idle(self, timeout_ms=-1):
+        return self._pool.waitForDone(timeout_ms)
+
+
+thumbnail_service = ThumbnailService()
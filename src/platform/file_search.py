@@ -1,21 +1,174 @@
-from src.platform.runtime import CAPABILITY_FILE_SEARCH, supports_capabilities
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from src.core.logger import get_logger
+from src.platform.runtime import (
+    CAPABILITY_FILE_SEARCH,
+    PLATFORM_WINDOWS,
+    current_platform,
+    supports_capabilities,
+)
+
+
+logger = get_logger(__name__)
 
 
 class NullFileSearchProvider:
-    def search(self, query, max_results=20):
+    def start(self):
+        pass
+
+    def search(self, query, max_results=20, offset=0):
         return []
 
 
 class WindowsEverythingFileSearchProvider:
     def __init__(self):
-        from src.core.everything import everything_client
+        from src.core.everything import everything_broker
 
-        self.client = everything_client
+        self.client = everything_broker
 
-    def search(self, query, max_results=20):
+    def start(self):
+        pass
+
+    def search(self, query, max_results=20, offset=0):
         if self.client is None:
             return []
-        return self.client.search(query, max_results=max_results)
+        return self.client.search(query, max_results=max_results, offset=offset)
+
+
+class IndexedFileSearchProvider:
+    """File search backed by the built-in index, for hosts without Everything.
+
+    ``start`` loads the persisted index on a background thread, which then
+    keeps it current by rescanning changed directories and saves it again
+    when that added or removed entries. Queries made before the load
+    finishes see an empty index instead of waiting for it.
+    """
+
+    def __init__(self, index=None, refresh_interval=300.0):
+        if index is None:
+            from src.core.config import config_manager
+            from src.core.file_index import FileIndex
+
+            roots = config_manager.get_value("file_index_roots", []) or [
+                os.path.expanduser("~")
+            ]
+            index = FileIndex(roots)
+        self.index = index
+        self.refresh_interval = float(refresh_interval)
+        self._started = False
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        with self._start_lock:
+            if self._started:
+                return
+            self._started = True
+        threading.Thread(target=self._maintain, daemon=True).start()
+
+    def _maintain(self):
+        try:
+            self.index.load()
+        except Exception as e:
+            logger.warning("File index load failed: %s", e)
+        saved_generation = self.index.generation
+        while True:
+            try:
+                self.index.refresh()
+                # Only write the index back when the refresh changed entries.
+                if self.index.generation != saved_generation:
+                    self.index.save()
+                    saved_generation = self.index.generation
+            except Exception as e:
+                logger.warning("File index refresh failed: %s", e)
+            time.sleep(self.refresh_interval)
+
+    def search(self, query, max_results=20, offset=0):
+        self.start()
+        return self.index.search(query, max_results=max_results, offset=offset)
+
+
+class FileSearchPager:
+    """Fetches file results one page at a time and caches pages per query.
+
+    Each page is requested with an offset, so browsing deep into a broad
+    result set costs one page-sized provider call per page instead of
+    re-running the query with an ever larger limit.
+    """
+
+    def __init__(self, provider, page_size=20, max_queries=32, ttl_seconds=60.0):
+        self.provider = provider
+        self.page_size = max(1, int(page_size))
+        self._max_queries = max(1, int(max_queries))
+        self._ttl_seconds = float(ttl_seconds)
+        self._pages = OrderedDict()
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the provider's background work ahead of the first query."""
+        self.provider.start()
+
+    def set_page_size(self, page_size):
+        """Change the page size, dropping cached pages cut at the old size."""
+        page_size = max(1, int(page_size))
+        with self._lock:
+            if page_size != self.page_size:
+                self.page_size = page_size
+                self._pages.clear()
+
+    def _cached_page(self, query, page_index):
+        entry = self._pages.get(query)
+        if entry is None:
+            return None
+        if time.monotonic() - entry["created_at"] > self._ttl_seconds:
+            self._pages.pop(query, None)
+            return None
+        self._pages.move_to_end(query)
+        return entry["pages"].get(page_index)
+
+    def _store_page(self, query, page_index, results):
+        entry = self._pages.get(query)
+        if entry is None:
+            entry = {"created_at": time.monotonic(), "pages": {}}
+            self._pages[query] = entry
+        entry["pages"][page_index] = results
+        self._pages.move_to_end(query)
+        while len(self._pages) > self._max_queries:
+            self._pages.popitem(last=False)
+
+    def fetch_page(self, query, page_index=0):
+        """Return ``(results, has_more)`` for one page of ``query``."""
+        key = str(query or "").strip()
+        page_index = max(0, int(page_index))
+        if not key:
+            return [], False
+
+        with self._lock:
+            cached = self._cached_page(key, page_index)
+        if cached is None:
+            # Ask for one row past the page: it only tells whether another
+            # page exists, so a total that is an exact multiple of the page
+            # size does not offer an empty "load more".
+            rows = list(
+                self.provider.search(
+                    key,
+                    max_results=self.page_size + 1,
+                    offset=page_index * self.page_size,
+                )
+                or []
+            )
+            cached = (rows[: self.page_size], len(rows) > self.page_size)
+            with self._lock:
+                self._store_page(key, page_index, cached)
+
+        results, has_more = cached
+        return list(results), has_more
+
+    def clear(self):
+        with self._lock:
+            self._pages.clear()
 
 
 def create_file_search_provider():
@@ -23,10 +176,12 @@ def create_file_search_provider():
         return NullFileSearchProvider()
 
     try:
-        return WindowsEverythingFileSearchProvider()
+        if current_platform() == PLATFORM_WINDOWS:
+            return WindowsEverythingFileSearchProvider()
+        return IndexedFileSearchProvider()
     except Exception:
         return NullFileSearchProvider()
 
 
 file_search_provider = create_file_search_provider()
-
+file_search_pager = FileSearchPager(file_search_provider)
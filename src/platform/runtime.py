@@ -43,8 +43,9 @@ PLATFORM_CAPABILITIES = {
     },
     # Non-Windows adapters are intentionally conservative for now. They keep
     # the application importable and hide features that still need native work.
-    PLATFORM_MACOS: COMMON_QT_CAPABILITIES,
-    PLATFORM_LINUX: COMMON_QT_CAPABILITIES,
+    # File search is served by the built-in index instead of Everything.
+    PLATFORM_MACOS: COMMON_QT_CAPABILITIES | {CAPABILITY_FILE_SEARCH},
+    PLATFORM_LINUX: COMMON_QT_CAPABILITIES | {CAPABILITY_FILE_SEARCH},
     PLATFORM_UNKNOWN: COMMON_QT_CAPABILITIES,
 }
 
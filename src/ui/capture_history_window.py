@@ -1,8 +1,8 @@
 import os
 from datetime import datetime
 
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QAction, QColor, QPixmap
+from PyQt6.QtCore import QSize, Qt
+from PyQt6.QtGui import QAction, QColor, QImage, QPixmap
 from PyQt6.QtWidgets import (
     QApplication,
     QHBoxLayout,
@@ -13,23 +13,50 @@ from PyQt6.QtWidgets import (
     QVBoxLayout,
     QWidget,
 )
-from qfluentwidgets import ListWidget, PrimaryPushButton, PushButton, SearchLineEdit
+from qfluentwidgets import (
+    ComboBox,
+    ListWidget,
+    PrimaryPushButton,
+    PushButton,
+    SearchLineEdit,
+)
 from qframelesswindow import AcrylicWindow
 
 from src.core.capture_history import capture_history_manager
+from src.core.code_decoder import CODE_DECODING_AVAILABLE
 from src.core.logger import get_logger
+from src.core.thumbnail_cache import thumbnail_service
 from src.platform.shell import open_parent, open_path
+from src.ui.code_results_menu import CodeDecodeWorker, show_code_results
 from src.ui.pinned_image_window import PinnedImageWindow
 
 
 logger = get_logger(__name__)
 
+# (label, days back from the start of today; None keeps every capture)
+DATE_FILTERS = [
+    ("全部时间", None),
+    ("今天", 0),
+    ("最近 7 天", 6),
+    ("最近 30 天", 29),
+]
+SOURCE_FILTERS = [("全部来源", ""), ("手动操作", "manual"), ("自动保存", "auto")]
+ACTION_FILTERS = [
+    ("全部操作", ""),
+    ("复制", "copy"),
+    ("贴图", "pin"),
+    ("保存", "save"),
+]
+
 
 class CaptureHistoryWindow(AcrylicWindow):
     def __init__(self, manager=None, parent=None):
         super().__init__(parent)
         self.manager = manager or capture_history_manager
         self._pinned_windows = []
+        self._preview_request_id = ""
+        self._preview_thumbnail = None
+        self.code_worker = None
 
         self.setWindowFlags(
             self.windowFlags() | Qt.WindowType.Tool | Qt.WindowType.WindowStaysOnTopHint
@@ -38,6 +65,7 @@ class CaptureHistoryWindow(AcrylicWindow):
         self.setMinimumSize(920, 580)
 
         self._build_ui()
+        thumbnail_service.thumbnail_ready.connect(self._on_thumbnail_ready)
         self.manager.entries_changed.connect(self.refresh_list)
         self.refresh_list()
 
@@ -56,7 +84,17 @@ class CaptureHistoryWindow(AcrylicWindow):
         self.search_edit = SearchLineEdit(self)
         self.search_edit.setPlaceholderText("搜索捕获历史...")
         self.search_edit.textChanged.connect(self.refresh_list)
-        layout.addWidget(self.search_edit)
+
+        search_row = QHBoxLayout()
+        search_row.setContentsMargins(0, 0, 0, 0)
+        search_row.setSpacing(8)
+        search_row.addWidget(self.search_edit, 1)
+        self.date_filter = self._filter_combo(DATE_FILTERS)
+        self.source_filter = self._filter_combo(SOURCE_FILTERS)
+        self.action_filter = self._filter_combo(ACTION_FILTERS)
+        for combo in (self.date_filter, self.source_filter, self.action_filter):
+            search_row.addWidget(combo)
+        layout.addLayout(search_row)
 
         content_row = QHBoxLayout()
         content_row.setContentsMargins(0, 0, 0, 0)
@@ -150,6 +188,25 @@ class CaptureHistoryWindow(AcrylicWindow):
             """
         )
 
+    def _filter_combo(self, options):
+        combo = ComboBox(self)
+        for label, value in options:
+            combo.addItem(label, userData=value)
+        combo.setCurrentIndex(0)
+        combo.currentIndexChanged.connect(lambda _index: self.refresh_list())
+        return combo
+
+    def _filters(self):
+        filters = {
+            "source": self.source_filter.currentData() or "",
+            "action": self.action_filter.currentData() or "",
+        }
+        days = self.date_filter.currentData()
+        if days is not None:
+            today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+            filters["since"] = today.timestamp() - int(days) * 24 * 60 * 60
+        return filters
+
     @staticmethod
     def _format_time(ts):
         try:
@@ -169,7 +226,7 @@ class CaptureHistoryWindow(AcrylicWindow):
         current_id = self._current_entry_id()
         self.list_widget.clear()
 
-        entries = self.manager.get_entries(query=query, limit=300)
+        entries = self.manager.get_entries(query=query, limit=300, **self._filters())
         selected_row = 0
         for row, entry in enumerate(entries):
             item = QListWidgetItem(self._entry_title(entry))
@@ -216,17 +273,17 @@ class CaptureHistoryWindow(AcrylicWindow):
             return
 
         path = str(entry.get("image_path", ""))
-        pixmap = QPixmap(path)
-        if pixmap.isNull():
-            self.preview_image.clear()
+        request_id, image = thumbnail_service.request(path, QSize(640, 480))
+        if request_id != self._preview_request_id:
+            self._preview_request_id = request_id
+            self._preview_thumbnail = None
+        if image is not None:
+            self._preview_thumbnail = QPixmap.fromImage(image)
+        if self._preview_thumbnail is not None:
+            self._show_preview_thumbnail()
         else:
-            target = self.preview_image.size()
-            scaled = pixmap.scaled(
-                target,
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation,
-            )
-            self.preview_image.setPixmap(scaled)
+            self.preview_image.clear()
+            self.preview_image.setText("加载预览..." if request_id else "")
 
         saved_path = str(entry.get("saved_path", "")).strip() or "仅历史副本"
         detail_lines = [
@@ -237,6 +294,24 @@ class CaptureHistoryWindow(AcrylicWindow):
         ]
         self.preview_details.setText("\n".join(detail_lines))
 
+    def _show_preview_thumbnail(self):
+        self.preview_image.setPixmap(
+            self._preview_thumbnail.scaled(
+                self.preview_image.size(),
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.SmoothTransformation,
+            )
+        )
+
+    def _on_thumbnail_ready(self, request_id, image):
+        if request_id != self._preview_request_id:
+            return
+        if image.isNull():
+            self.preview_image.clear()
+            return
+        self._preview_thumbnail = QPixmap.fromImage(image)
+        self._show_preview_thumbnail()
+
     def copy_selected(self):
         entry_id = self._current_entry_id()
         if not entry_id:
@@ -263,6 +338,27 @@ class CaptureHistoryWindow(AcrylicWindow):
         self._pinned_windows.append(window)
         self.hide()
 
+    def recognize_codes_selected(self):
+        entry = self._current_entry()
+        if not entry:
+            return
+
+        image = QImage(str(entry.get("image_path", "")))
+        if image.isNull():
+            QMessageBox.warning(self, "失败", "识别失败，捕获记录可能已失效。")
+            return
+        if self.code_worker and self.code_worker.isRunning():
+            return
+
+        self.code_worker = CodeDecodeWorker(image, self)
+        self.code_worker.finished.connect(
+            lambda codes: show_code_results(codes, parent=self)
+        )
+        self.code_worker.error.connect(
+            lambda e: logger.warning("Code decode error: %s", e)
+        )
+        self.code_worker.start()
+
     def toggle_pin_selected(self):
         entry_id = self._current_entry_id()
         if not entry_id:
@@ -323,6 +419,11 @@ class CaptureHistoryWindow(AcrylicWindow):
         pin_image_action.triggered.connect(self.pin_selected)
         menu.addAction(pin_image_action)
 
+        if CODE_DECODING_AVAILABLE:
+            code_action = QAction("识别二维码/条码", self)
+            code_action.triggered.connect(self.recognize_codes_selected)
+            menu.addAction(code_action)
+
         open_action = QAction("打开图片", self)
         open_action.triggered.connect(self.open_selected)
         menu.addAction(open_action)
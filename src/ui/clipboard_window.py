@@ -1,7 +1,7 @@
 from datetime import datetime
 
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QAction, QColor
+from PyQt6.QtCore import QSize, Qt
+from PyQt6.QtGui import QAction, QColor, QIcon, QPixmap
 from PyQt6.QtWidgets import (
     QApplication,
     QHBoxLayout,
@@ -16,6 +16,7 @@ from qframelesswindow import AcrylicWindow
 
 from src.core.clipboard_history import clipboard_history_manager
 from src.core.logger import get_logger
+from src.core.thumbnail_cache import thumbnail_service
 
 
 logger = get_logger(__name__)
@@ -31,8 +32,10 @@ class ClipboardWindow(AcrylicWindow):
         )
         self.titleBar.hide()
         self.setMinimumSize(760, 520)
+        self._thumbnail_items = {}
 
         self._build_ui()
+        thumbnail_service.thumbnail_ready.connect(self._on_thumbnail_ready)
         self.manager.entries_changed.connect(self.refresh_list)
         self.refresh_list()
 
@@ -54,6 +57,7 @@ class ClipboardWindow(AcrylicWindow):
         layout.addWidget(self.search_edit)
 
         self.list_widget = ListWidget(self)
+        self.list_widget.setIconSize(QSize(48, 48))
         self.list_widget.itemDoubleClicked.connect(self.copy_selected)
         self.list_widget.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.list_widget.customContextMenuRequested.connect(self.show_context_menu)
@@ -107,11 +111,14 @@ class ClipboardWindow(AcrylicWindow):
             return f"{pinned_prefix}文本  {text}"
 
         size = f"{entry.get('width', 0)}x{entry.get('height', 0)}"
+        if entry.get("pending", False):
+            return f"{pinned_prefix}图片  {size}  (保存中)"
         return f"{pinned_prefix}图片  {size}"
 
     def refresh_list(self):
         query = self.search_edit.text().strip()
         self.list_widget.clear()
+        self._thumbnail_items = {}
 
         entries = self.manager.get_entries(query=query, limit=300)
         for entry in entries:
@@ -125,11 +132,29 @@ class ClipboardWindow(AcrylicWindow):
             elif entry.get("type") == "image":
                 item.setForeground(QColor(140, 210, 255))
 
+            if entry.get("type") == "image" and not entry.get("pending", False):
+                self._request_thumbnail(item, entry.get("image_path", ""))
+
             self.list_widget.addItem(item)
 
         if self.list_widget.count() > 0:
             self.list_widget.setCurrentRow(0)
 
+    def _request_thumbnail(self, item, path):
+        request_id, image = thumbnail_service.request(path, QSize(96, 96))
+        if image is not None:
+            item.setIcon(QIcon(QPixmap.fromImage(image)))
+        elif request_id:
+            self._thumbnail_items.setdefault(request_id, []).append(item)
+
+    def _on_thumbnail_ready(self, request_id, image):
+        items = self._thumbnail_items.pop(request_id, [])
+        if image.isNull():
+            return
+        icon = QIcon(QPixmap.fromImage(image))
+        for item in items:
+            item.setIcon(icon)
+
     def _current_entry_id(self):
         item = self.list_widget.currentItem()
         if item is None:
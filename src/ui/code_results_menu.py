@@ -0,0 +1,80 @@
+from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtGui import QAction, QCursor
+from PyQt6.QtWidgets import QApplication, QMenu
+
+from src.core.code_decoder import decode_codes
+from src.platform.shell import open_path
+
+
+_KIND_LABELS = {"qr": "二维码", "barcode": "条码"}
+_MAX_LABEL_CHARS = 48
+
+
+class CodeDecodeWorker(QThread):
+    """Decodes the codes in a ``QImage`` off the GUI thread.
+
+    A full sweep of a large image takes most of a second; ``decode_codes``
+    serializes concurrent calls itself.
+    """
+
+    finished = pyqtSignal(list)
+    error = pyqtSignal(str)
+
+    def __init__(self, image, parent=None):
+        super().__init__(parent)
+        self.image = image
+
+    def run(self):
+        try:
+            self.finished.emit(decode_codes(self.image))
+        except Exception as e:
+            self.error.emit(str(e))
+
+
+def _elide(text):
+    text = " ".join(text.split())
+    if len(text) <= _MAX_LABEL_CHARS:
+        return text
+    return text[: _MAX_LABEL_CHARS - 1] + "…"
+
+
+def _copy(text):
+    QApplication.clipboard().setText(text)
+
+
+def build_code_results_menu(codes, parent=None):
+    """Menu listing decoded codes; choosing one copies or opens it."""
+    menu = QMenu(parent)
+    if not codes:
+        empty_action = QAction("未识别到二维码或条码", menu)
+        empty_action.setEnabled(False)
+        menu.addAction(empty_action)
+        return menu
+
+    for code in codes:
+        label = _KIND_LABELS.get(code.kind, code.kind)
+        copy_action = QAction(f"复制{label}: {_elide(code.text)}", menu)
+        copy_action.triggered.connect(lambda _=False, text=code.text: _copy(text))
+        menu.addAction(copy_action)
+
+        if code.text.startswith(("http://", "https://")):
+            open_action = QAction("    打开链接", menu)
+            open_action.triggered.connect(
+                lambda _=False, text=code.text: open_path(text)
+            )
+            menu.addAction(open_action)
+
+    if len(codes) > 1:
+        menu.addSeparator()
+        copy_all_action = QAction(f"复制全部 ({len(codes)})", menu)
+        copy_all_action.triggered.connect(
+            lambda: _copy("\n".join(code.text for code in codes))
+        )
+        menu.addAction(copy_all_action)
+    return menu
+
+
+def show_code_results(codes, pos=None, parent=None):
+    """Pop up the decoded codes at ``pos`` (the cursor by default)."""
+    menu = build_code_results_menu(codes, parent)
+    menu.exec(pos if pos is not None else QCursor.pos())
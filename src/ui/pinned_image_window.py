@@ -25,8 +25,11 @@ import json
 import time
 import urllib.parse
 import urllib.request
+from src.core.code_decoder import CODE_DECODING_AVAILABLE
 from src.core.logger import get_logger
 from src.core.metrics import metrics_store
+from src.ui.code_results_menu import CodeDecodeWorker, show_code_results
+from src.utils.qimage_numpy import image_view
 
 
 logger = get_logger(__name__)
@@ -56,19 +59,10 @@ class OCRWorker(QThread):
 
     def run(self):
         try:
-            import numpy as np
-
             ocr = get_ocr_engine()
-            image = self.pixmap.toImage()
-            image = image.convertToFormat(QImage.Format.Format_RGBA8888)
-            width, height = image.width(), image.height()
-
-            ptr = image.bits()
-            ptr.setsize(image.sizeInBytes())
-            arr = np.frombuffer(ptr.asstring(), dtype=np.uint8).reshape(
-                (height, width, 4)
-            )
-            arr = arr[:, :, :3]  # Drop alpha channel
+            # Qt converts straight to packed RGB; the model reads the
+            # converted image's pixels in place.
+            arr = image_view(self.pixmap.toImage(), QImage.Format.Format_RGB888)
 
             with _OCR_INFER_LOCK:
                 result, elapse = ocr(arr)
@@ -619,6 +613,7 @@ class PinnedImageWindow(QWidget):
 
         self.drag_position = QPoint()
         self.ocr_worker = None
+        self.code_worker = None
         self.translate_worker = None
         self.toast_label = None
 
@@ -679,6 +674,11 @@ class PinnedImageWindow(QWidget):
         ocr_action.triggered.connect(self.recognize_text)
         menu.addAction(ocr_action)
 
+        if CODE_DECODING_AVAILABLE:
+            code_action = QAction("识别二维码/条码", self)
+            code_action.triggered.connect(self.recognize_codes)
+            menu.addAction(code_action)
+
         if self.image_label.ocr_lines:
             menu.addSeparator()
 
@@ -944,5 +944,22 @@ class PinnedImageWindow(QWidget):
         self.ocr_worker.error.connect(lambda e: logger.warning("OCR Error: %s", e))
         self.ocr_worker.start()
 
+    def recognize_codes(self):
+        if self.code_worker and self.code_worker.isRunning():
+            return
+
+        self.code_worker = CodeDecodeWorker(self.original_pixmap.toImage(), self)
+        self.code_worker.finished.connect(self.on_codes_decoded)
+        self.code_worker.error.connect(
+            lambda e: logger.warning("Code decode error: %s", e)
+        )
+        self.code_worker.start()
+
+    def on_codes_decoded(self, codes):
+        if not codes:
+            self.show_toast("未识别到二维码或条码")
+            return
+        show_code_results(codes, parent=self)
+
     def on_ocr_finished(self, results):
         self.image_label.set_ocr_results(results)
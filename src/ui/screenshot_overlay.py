@@ -1,4 +1,14 @@
-from PyQt6.QtCore import Qt, QPoint, QPointF, QRect, QRectF, pyqtSignal, QSize, QSettings
+from PyQt6.QtCore import (
+    Qt,
+    QPoint,
+    QPointF,
+    QRect,
+    QRectF,
+    pyqtSignal,
+    QSize,
+    QSettings,
+    QTimer,
+)
 from PyQt6.QtGui import (
     QPainter,
     QColor,
@@ -11,6 +21,7 @@ from PyQt6.QtGui import (
     QFont,
     QFontMetrics,
     QKeySequence,
+    QRegion,
 )
 from PyQt6.QtWidgets import (
     QWidget,
@@ -28,29 +39,45 @@ from PyQt6.QtWidgets import (
 )
 from datetime import datetime
 import math
-import time
 import os
+import time
 
-cv2 = None
-np = None
-
-try:
-    import cv2
-    import numpy as np
-
-    CV2_AVAILABLE = True
-except ImportError:
-    CV2_AVAILABLE = False
-
+from src.ui.code_results_menu import CodeDecodeWorker, show_code_results
 from src.ui.pinned_image_window import PinnedImageWindow
+from src.ui.scroll_capture_window import (
+    DEFAULT_SCROLL_INTERVAL_MS,
+    ScrollCaptureWindow,
+)
 from src.core.logger import get_logger
 from src.core.config import config_manager
+from src.core.annotation_history import (
+    DEFAULT_UNDO_DEPTH,
+    DEFAULT_UNDO_MAX_MB,
+    AnnotationHistory,
+)
+from src.core.effect_tiles import DEFAULT_BLOCK_SIZE, EffectTileCache
+from src.core.screen_capture import ScreenCapture, scaled_rect
+from src.core.scroll_stitch import (
+    DEFAULT_MAX_HEIGHT,
+    SCROLL_STITCH_AVAILABLE,
+)
+from src.core.stroke_geometry import StrokeGeometry, add_point, simplify
 from src.core.capture_history import capture_history_manager
 from src.core.metrics import metrics_store
 
 
 logger = get_logger(__name__)
 
+_MAGNIFIER_ZOOM_SIZE = 15
+_MAGNIFIER_SCALE = 12
+_MAGNIFIER_PANEL_HEIGHT = 75
+# Reach of the selection border and anchor dots outside/inside its edge.
+_SELECTION_CHROME_MARGIN = 6
+_MOSAIC_STROKE_WIDTH = 15
+_FREEHAND_TYPES = ("pen", "mosaic", "blur", "eraser")
+# Points at the end of a live freehand stroke whose curve can still change.
+_LIVE_TAIL_POINTS = 4
+
 
 class ScreenshotOverlay(QWidget):
     closed = pyqtSignal()
@@ -65,10 +92,11 @@ class ScreenshotOverlay(QWidget):
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
         self.setCursor(Qt.CursorShape.CrossCursor)
 
-        self.screen_pixmap = None
-        self.screen_image = None
+        self.screen_capture = None
+        # (started, capture_started, grabbed) perf_counter() stamps of the
+        # capture awaiting its first paint.
+        self._first_paint_pending = None
         self.screen_virtual_rect = QRect()
-        self.screen_capture_sources = []
         self.screen_scale = 1.0
 
         self.start_pos = QPoint()
@@ -81,6 +109,8 @@ class ScreenshotOverlay(QWidget):
         self.setMouseTracking(True)
 
         self.pinned_windows = []
+        self.scroll_capture = None
+        self.code_worker = None
 
         self.draw_mode = None
         self.color_format = "rgb"
@@ -90,13 +120,20 @@ class ScreenshotOverlay(QWidget):
         self._load_annotation_style()
         self.draw_actions = []
         self.current_action = None
-        self.mosaic_pixmap = None
+        # Committed annotations flattened into one pixmap; see
+        # _annotation_layer_pixmap.
+        self._annotation_layer = None
+        self._annotation_layer_rect = QRect()
+        self._annotation_layer_key = None
+        self._annotation_layer_count = 0
+        # Mosaic/blur tiles per style, built lazily under effect strokes.
+        self._effect_tiles = {}
+        self.effect_block_size = DEFAULT_BLOCK_SIZE
         self.is_moving_action = False
         self.moving_action_index = None
         self.action_drag_last_pos = QPoint()
         self.action_drag_changed = False
         self.editing_text_index = None
-        self.editing_text_snapshot = None
 
         self.text_input = QLineEdit(self)
         self.text_input.hide()
@@ -105,8 +142,7 @@ class ScreenshotOverlay(QWidget):
         )
         self.text_input.returnPressed.connect(self.commit_text_action)
 
-        self.undo_states = []
-        self.redo_states = []
+        self.undo_history = AnnotationHistory()
 
         self.init_toolbar()
 
@@ -158,6 +194,11 @@ class ScreenshotOverlay(QWidget):
             painter.setBrush(QColor(150, 150, 150))
             painter.drawRect(12, 4, 8, 8)
             painter.drawRect(4, 12, 8, 8)
+        elif mode == "blur":
+            painter.setPen(Qt.PenStyle.NoPen)
+            for radius, alpha in ((9, 60), (6, 130), (3, 255)):
+                painter.setBrush(QColor(255, 255, 255, alpha))
+                painter.drawEllipse(QPointF(12, 12), radius, radius)
         elif mode == "text":
             font = painter.font()
             font.setBold(True)
@@ -196,6 +237,11 @@ class ScreenshotOverlay(QWidget):
             painter.drawRect(14, 4, 6, 6)
             painter.drawRect(4, 14, 6, 6)
             painter.drawRect(14, 14, 6, 6)
+        elif mode == "scroll":
+            painter.drawRect(6, 3, 12, 12)
+            painter.drawLine(12, 15, 12, 21)
+            painter.drawLine(9, 18, 12, 21)
+            painter.drawLine(15, 18, 12, 21)
         elif mode == "close":
             painter.drawLine(6, 6, 18, 18)
             painter.drawLine(6, 18, 18, 6)
@@ -416,6 +462,7 @@ class ScreenshotOverlay(QWidget):
         btn_arrow = create_tool("箭头", "arrow")
         btn_line = create_tool("直线", "line")
         btn_mosaic = create_tool("马赛克", "mosaic")
+        btn_blur = create_tool("模糊", "blur")
         btn_text = create_tool("文字", "text")
         btn_number = create_tool("编号", "number")
         btn_eraser = create_tool("橡皮擦", "eraser")
@@ -425,6 +472,7 @@ class ScreenshotOverlay(QWidget):
         tool_layout.addWidget(btn_arrow)
         tool_layout.addWidget(btn_line)
         tool_layout.addWidget(btn_mosaic)
+        tool_layout.addWidget(btn_blur)
         tool_layout.addWidget(create_separator())
         tool_layout.addWidget(btn_text)
         tool_layout.addWidget(btn_number)
@@ -434,6 +482,10 @@ class ScreenshotOverlay(QWidget):
         btn_redo = create_action("重做", "redo", self.redo_action)
         btn_pin = create_action("贴图 (P)", "pin", self.on_pin_clicked)
         btn_qr = create_action("扫码 (Q)", "qr", self.on_qr_clicked)
+        self.btn_scroll = create_action(
+            "长截图 (L)", "scroll", self.start_scroll_capture
+        )
+        self.btn_scroll.setEnabled(SCROLL_STITCH_AVAILABLE)
         btn_save = create_action("保存到... (Ctrl+S)", "save", self.on_save_clicked)
         btn_copy = create_action("复制到剪贴板 (Enter)", "copy", self.on_copy_clicked)
         btn_cancel = create_action("退出 (Esc)", "close", self.close_overlay)
@@ -443,6 +495,7 @@ class ScreenshotOverlay(QWidget):
         action_layout.addWidget(create_separator())
         action_layout.addWidget(btn_pin)
         action_layout.addWidget(btn_qr)
+        action_layout.addWidget(self.btn_scroll)
         action_layout.addWidget(create_separator())
         action_layout.addWidget(btn_save)
         action_layout.addWidget(btn_copy)
@@ -526,30 +579,6 @@ class ScreenshotOverlay(QWidget):
     def _number_marker_size(thickness: int) -> int:
         return min(48, max(24, 20 + int(thickness) * 2))
 
-    @staticmethod
-    def _smooth_path(points) -> QPainterPath:
-        path = QPainterPath()
-        if not points:
-            return path
-
-        path.moveTo(QPointF(points[0]))
-        if len(points) == 1:
-            return path
-        if len(points) == 2:
-            path.lineTo(QPointF(points[1]))
-            return path
-
-        for index in range(1, len(points) - 1):
-            current = points[index]
-            next_point = points[index + 1]
-            mid = QPointF(
-                (current.x() + next_point.x()) / 2,
-                (current.y() + next_point.y()) / 2,
-            )
-            path.quadTo(QPointF(current), mid)
-        path.lineTo(QPointF(points[-1]))
-        return path
-
     @staticmethod
     def _draw_arrow(painter: QPainter, p1: QPoint, p2: QPoint, color, thickness: int):
         start = QPointF(p1)
@@ -648,41 +677,21 @@ class ScreenshotOverlay(QWidget):
     def undo_action(self):
         if self.text_input.isVisible():
             self.commit_text_action()
-        if self.undo_states:
-            self.redo_states.append(self._clone_draw_actions())
-            self.draw_actions = self.undo_states.pop()
+        if self.undo_history.undo(self.draw_actions):
+            self._invalidate_annotation_layer()
+            self._sync_scroll_action()
             self.update()
 
     def redo_action(self):
         if self.text_input.isVisible():
             self.commit_text_action()
-        if self.redo_states:
-            self.undo_states.append(self._clone_draw_actions())
-            self.draw_actions = self.redo_states.pop()
+        if self.undo_history.redo(self.draw_actions):
+            self._invalidate_annotation_layer()
+            self._sync_scroll_action()
             self.update()
 
-    @staticmethod
-    def _clone_action(action):
-        cloned = {}
-        for key, value in action.items():
-            if key == "points":
-                cloned[key] = [QPoint(point) for point in value]
-            elif key == "pos":
-                cloned[key] = QPoint(value)
-            elif key == "color":
-                cloned[key] = QColor(value)
-            else:
-                cloned[key] = value
-        return cloned
-
-    def _clone_draw_actions(self):
-        return [self._clone_action(action) for action in self.draw_actions]
-
-    def _record_undo_state(self, snapshot=None):
-        if snapshot is None:
-            snapshot = self._clone_draw_actions()
-        self.undo_states.append(snapshot)
-        self.redo_states.clear()
+    def _record_undo_state(self):
+        self.undo_history.record(self.draw_actions)
 
     @staticmethod
     def _is_movable_action_type(action_type):
@@ -770,6 +779,7 @@ class ScreenshotOverlay(QWidget):
                 "thickness": max(2, min(6, self.draw_thickness)),
             }
         )
+        self._sync_scroll_action()
         self.update()
 
     def _find_movable_action_index(self, pos: QPoint):
@@ -820,9 +830,9 @@ class ScreenshotOverlay(QWidget):
     def commit_text_action(self):
         if self.text_input.isVisible():
             txt = self.text_input.text()
-            should_record = txt.strip() or self.editing_text_snapshot is not None
-            if should_record:
-                self._record_undo_state(self.editing_text_snapshot)
+            # Re-edited texts were recorded when editing started.
+            if txt.strip() and self.editing_text_index is None:
+                self._record_undo_state()
             if txt.strip():
                 action = {
                     "type": "text",
@@ -836,10 +846,11 @@ class ScreenshotOverlay(QWidget):
                 else:
                     insert_at = min(self.editing_text_index, len(self.draw_actions))
                     self.draw_actions.insert(insert_at, action)
+                    self._invalidate_annotation_layer()
             self.editing_text_index = None
-            self.editing_text_snapshot = None
             self.text_input.clear()
             self.text_input.hide()
+            self._sync_scroll_action()
             self.update()
 
     def _prompt_manual_save_path(self):
@@ -856,53 +867,26 @@ class ScreenshotOverlay(QWidget):
             return None
         return self._normalize_output_path(output_path)
 
-    def _save_pixmap_to_path(self, pixmap, output_path, source="manual"):
+    def _prepare_save_path(self, output_path):
+        """Normalize ``output_path`` and make sure its folder is writable.
+
+        The image itself is written by the capture history's background
+        writer, which also records the ``screenshot.save`` metric.
+        """
         output_path = self._normalize_output_path(output_path)
-        started = time.perf_counter()
-        ok = False
         try:
-            output_dir = os.path.dirname(output_path)
-            if output_dir:
-                os.makedirs(output_dir, exist_ok=True)
-            ok = pixmap.save(output_path, "PNG")
+            output_dir = os.path.dirname(output_path) or "."
+            os.makedirs(output_dir, exist_ok=True)
+            if os.access(output_dir, os.W_OK):
+                return output_path
         except Exception as e:
-            logger.warning("Failed to save screenshot to %s: %s", output_path, e)
-
-        elapsed = (time.perf_counter() - started) * 1000
-        metrics_store.record(
-            "screenshot.save",
-            elapsed,
-            {"ok": bool(ok), "path": output_path, "source": source},
-        )
-
-        if ok:
-            logger.info("Screenshot saved (%s): %s", source, output_path)
-            return output_path
-
-        logger.warning("Failed to save screenshot (%s): %s", source, output_path)
+            logger.warning(
+                "Failed to prepare screenshot folder for %s: %s", output_path, e
+            )
+        logger.warning("Screenshot folder is not writable: %s", output_path)
         return None
 
-    @staticmethod
-    def _capture_scale(screen, pixmap):
-        geometry = screen.geometry()
-        scale_values = [
-            float(screen.devicePixelRatio()),
-            float(pixmap.devicePixelRatio()),
-        ]
-        if geometry.width() > 0:
-            scale_values.append(float(pixmap.width()) / float(geometry.width()))
-        if geometry.height() > 0:
-            scale_values.append(float(pixmap.height()) / float(geometry.height()))
-
-        return max(1.0, max(scale_values))
-
-    @staticmethod
-    def _scaled_rect(rect: QRect, scale: float) -> QRect:
-        x1 = round(rect.x() * scale)
-        y1 = round(rect.y() * scale)
-        x2 = round((rect.x() + rect.width()) * scale)
-        y2 = round((rect.y() + rect.height()) * scale)
-        return QRect(x1, y1, max(1, x2 - x1), max(1, y2 - y1))
+    _scaled_rect = staticmethod(scaled_rect)
 
     def _native_rect(self, rect: QRect) -> QRect:
         return self._scaled_rect(rect, self.screen_scale)
@@ -941,62 +925,52 @@ class ScreenshotOverlay(QWidget):
 
     def on_qr_clicked(self):
         self.recognize_qr()
-        self.close_overlay()
 
-    def capture_screen(self):
+    def prewarm(self):
+        """Create the native window and lay out the toolbar ahead of a capture.
+
+        The overlay is reused between captures, so this only moves the
+        first capture's one-off costs off the hotkey path.
+        """
+        self.winId()
+        self.ensurePolished()
+        self.sub_toolbar.adjustSize()
+        self.toolbar_widget.adjustSize()
+        self.text_input.ensurePolished()
+
+    def capture_screen(self, triggered_at=None):
+        """Grab every screen and show the overlay.
+
+        ``triggered_at`` is the ``time.perf_counter()`` value when the
+        hotkey fired; the first paint afterwards records the latency.
+        """
+        capture_started = time.perf_counter()
         screens = QApplication.screens()
         if not screens:
             return
+        self._discard_scroll_capture()
 
-        virtual_rect = screens[0].geometry()
-        for screen in screens[1:]:
-            virtual_rect = virtual_rect.united(screen.geometry())
-
-        captures = []
-        self.screen_scale = 1.0
-        for screen in screens:
-            shot = screen.grabWindow(0)
-            scale = self._capture_scale(screen, shot)
-            if abs(float(shot.devicePixelRatio()) - scale) > 0.01:
-                shot.setDevicePixelRatio(scale)
-            captures.append(
-                {
-                    "geometry": QRect(screen.geometry()),
-                    "pixmap": shot,
-                    "scale": scale,
-                }
-            )
-            self.screen_scale = max(self.screen_scale, scale)
-
-        native_size = QSize(
-            max(1, round(virtual_rect.width() * self.screen_scale)),
-            max(1, round(virtual_rect.height() * self.screen_scale)),
+        # Screens stay in their own grabs; painting and every read go
+        # through the capture, so no desktop-sized composite is built.
+        self.screen_capture = ScreenCapture.grab(
+            screens,
+            parallel=bool(config_manager.get_value("screenshot_parallel_grab", True)),
         )
+        virtual_rect = self.screen_capture.virtual_rect
         self.screen_virtual_rect = QRect(virtual_rect)
-        self.screen_capture_sources = captures
-        self.screen_pixmap = QPixmap(native_size)
-        self.screen_pixmap.setDevicePixelRatio(self.screen_scale)
-        self.screen_pixmap.fill(Qt.GlobalColor.transparent)
-
-        painter = QPainter(self.screen_pixmap)
-        for capture in captures:
-            offset = capture["geometry"].topLeft() - virtual_rect.topLeft()
-            painter.drawPixmap(offset, capture["pixmap"])
-        painter.end()
+        self.screen_scale = self.screen_capture.scale
 
-        self.screen_image = self.screen_pixmap.toImage()
+        grabbed = time.perf_counter()
 
-        # Precompute mosaic
-        self.mosaic_pixmap = self.screen_pixmap.scaled(
-            max(1, self.screen_pixmap.width() // 15),
-            max(1, self.screen_pixmap.height() // 15),
-            Qt.AspectRatioMode.IgnoreAspectRatio,
-            Qt.TransformationMode.FastTransformation,
-        ).scaled(
-            self.screen_pixmap.width(),
-            self.screen_pixmap.height(),
-            Qt.AspectRatioMode.IgnoreAspectRatio,
-            Qt.TransformationMode.FastTransformation,
+        # Mosaic and blur tiles are built on demand under their strokes.
+        self._effect_tiles = {}
+        self.effect_block_size = max(
+            2,
+            int(
+                config_manager.get_value(
+                    "screenshot_mosaic_block_size", DEFAULT_BLOCK_SIZE
+                )
+            ),
         )
 
         # Reset state on new capture
@@ -1007,8 +981,15 @@ class ScreenshotOverlay(QWidget):
         self.resize_anchor = None
         self.selection_rect = QRect()
         self.draw_actions.clear()
-        self.undo_states.clear()
-        self.redo_states.clear()
+        self._invalidate_annotation_layer()
+        self._sync_scroll_action()
+        self.undo_history.clear()
+        self.undo_history.configure(
+            config_manager.get_value("screenshot_undo_depth", DEFAULT_UNDO_DEPTH),
+            config_manager.get_value("screenshot_undo_max_mb", DEFAULT_UNDO_MAX_MB)
+            * 1024
+            * 1024,
+        )
         self.current_action = None
         self.draw_mode = None
         self.is_moving_action = False
@@ -1016,7 +997,6 @@ class ScreenshotOverlay(QWidget):
         self.action_drag_last_pos = QPoint()
         self.action_drag_changed = False
         self.editing_text_index = None
-        self.editing_text_snapshot = None
         if self.tool_group:
             for b in self.tool_group.buttons():
                 b.setChecked(False)
@@ -1027,98 +1007,169 @@ class ScreenshotOverlay(QWidget):
         self.toolbar_widget.hide()
 
         self.setGeometry(virtual_rect)
+        self._first_paint_pending = (
+            capture_started if triggered_at is None else triggered_at,
+            capture_started,
+            grabbed,
+        )
         self.show()
         self.activateWindow()
 
+    def _record_first_paint(self):
+        started, capture_started, grabbed = self._first_paint_pending
+        self._first_paint_pending = None
+        painted = time.perf_counter()
+        metrics_store.record(
+            "screenshot.first_paint",
+            (painted - started) * 1000,
+            {
+                "queue_ms": round((capture_started - started) * 1000, 2),
+                "grab_ms": round((grabbed - capture_started) * 1000, 2),
+                "show_ms": round((painted - grabbed) * 1000, 2),
+                "screens": len(self.screen_capture),
+                "screen_grab_ms": self.screen_capture.grab_times(),
+                "parallel_grab": self.screen_capture.parallel,
+            },
+        )
+
     def paintEvent(self, event):
-        if not self.screen_pixmap:
+        if self.screen_capture is None:
             return
 
+        # Qt clips the painter to the invalidated region; every layer below
+        # also limits its own work to ``dirty`` so a hover over a 3x4K
+        # desktop only touches the pixels around the magnifier.
+        dirty = event.rect()
         painter = QPainter(self)
         self._enable_quality_rendering(painter)
-        painter.drawPixmap(0, 0, self.screen_pixmap)
+        self.screen_capture.draw(painter, dirty)
 
         # Draw darkened overlay
         overlay_color = QColor(0, 0, 0, 100)
-        painter.fillRect(self.rect(), overlay_color)
+        painter.fillRect(dirty, overlay_color)
 
         if not self.selection_rect.isNull():
-            # Clear the chosen rect so it's bright
-            painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Clear)
-            painter.fillRect(self.selection_rect, Qt.GlobalColor.transparent)
+            self._paint_selection(painter, dirty)
 
-            # Draw the chosen rect back with normal pixmap
-            painter.setCompositionMode(
-                QPainter.CompositionMode.CompositionMode_SourceOver
-            )
-            painter.drawPixmap(
-                self.selection_rect,
-                self.screen_pixmap,
-                self._native_rect(self.selection_rect),
-            )
+        self._paint_cursor_preview(painter, dirty)
 
-            # Draw border
-            pen = QPen(QColor(0, 174, 255), 2)
-            painter.setPen(pen)
-            painter.drawRect(self.selection_rect)
+        if not self.current_mouse_pos.isNull():
+            magnifier_rect = self._magnifier_rect(self.current_mouse_pos)
+            if magnifier_rect.intersects(dirty):
+                self._paint_magnifier(painter, self.current_mouse_pos, magnifier_rect)
 
-            # Clip drawing rendering to the selection area
-            painter.setClipRect(self.selection_rect)
-            self.draw_all_actions(painter)
-            painter.setClipping(False)
+        if self._first_paint_pending is not None:
+            self._record_first_paint()
 
-            # Draw dimension text
-            dim_text = f"{self.selection_rect.width()} x {self.selection_rect.height()}"
-            painter.setPen(Qt.GlobalColor.white)
+    def _paint_selection(self, painter, dirty):
+        inner = self.selection_rect & dirty
+        if not inner.isEmpty():
+            # Draw the chosen rect back bright, over the darkened overlay
+            painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Source)
+            self.screen_capture.draw(painter, inner)
+            painter.setCompositionMode(
+                QPainter.CompositionMode.CompositionMode_SourceOver
+            )
 
-            # Explicitly set a normal font to avoid inheriting large font sizes from drawing actions
-            f = painter.font()
-            f.setPixelSize(12)
-            f.setBold(False)
-            painter.setFont(f)
+            # Committed annotations come from the cached layer; only the
+            # stroke being drawn and the annotation being dragged are live.
+            painter.save()
+            painter.setClipRect(inner, Qt.ClipOperation.IntersectClip)
+            layer = self._annotation_layer_pixmap()
+            if layer is not None:
+                target = inner & self._annotation_layer_rect
+                if not target.isEmpty():
+                    source = target.translated(-self._annotation_layer_rect.topLeft())
+                    painter.drawPixmap(
+                        target,
+                        layer,
+                        self._scaled_rect(source, layer.devicePixelRatio()),
+                    )
+            live_actions = self._live_actions()
+            if live_actions:
+                self._draw_action_list(painter, live_actions, inner)
+            painter.restore()
 
-            fm = painter.fontMetrics()
-            text_rect = fm.boundingRect(dim_text)
-            text_rect.adjust(-5, -2, 5, 2)
+        if not self._selection_chrome_region(self.selection_rect).intersects(dirty):
+            return
 
-            text_x = self.selection_rect.left()
-            text_y = self.selection_rect.top() - text_rect.height() - 5
+        # Draw border
+        pen = QPen(QColor(0, 174, 255), 2)
+        painter.setPen(pen)
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawRect(self.selection_rect)
 
-            if text_y < 0:
-                text_y = self.selection_rect.top() + 5
+        # Draw dimension text
+        dim_text = f"{self.selection_rect.width()} x {self.selection_rect.height()}"
+        painter.setPen(Qt.GlobalColor.white)
 
-            text_rect.moveTo(text_x, text_y)
+        # Explicitly set a normal font to avoid inheriting large font sizes from drawing actions
+        painter.setFont(self._dimension_font())
+        text_rect = self._dimension_label_rect(self.selection_rect)
+        painter.fillRect(text_rect, QColor(0, 0, 0, 150))
+        painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, dim_text)
 
-            painter.fillRect(text_rect, QColor(0, 0, 0, 150))
-            painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, dim_text)
+        # Draw anchor dots
+        painter.setBrush(QColor(0, 174, 255))
+        painter.setPen(Qt.PenStyle.NoPen)
+        r = 4
+        for px, py in self.get_anchor_points():
+            painter.drawEllipse(QPoint(px, py), r, r)
+
+    def _dimension_font(self):
+        font = QFont(self.font())
+        font.setPixelSize(12)
+        font.setBold(False)
+        return font
 
-            # Draw anchor dots
-            painter.setBrush(QColor(0, 174, 255))
-            painter.setPen(Qt.PenStyle.NoPen)
-            r = 4
-            for px, py in self.get_anchor_points():
-                painter.drawEllipse(QPoint(px, py), r, r)
+    def _dimension_label_rect(self, selection_rect):
+        dim_text = f"{selection_rect.width()} x {selection_rect.height()}"
+        text_rect = QFontMetrics(self._dimension_font()).boundingRect(dim_text)
+        text_rect.adjust(-5, -2, 5, 2)
+
+        text_x = selection_rect.left()
+        text_y = selection_rect.top() - text_rect.height() - 5
+        if text_y < 0:
+            text_y = selection_rect.top() + 5
+
+        text_rect.moveTo(text_x, text_y)
+        return text_rect
+
+    def _selection_chrome_region(self, selection_rect):
+        """Border, anchor dots and size label drawn around ``selection_rect``."""
+        if selection_rect.isNull():
+            return QRegion()
+        margin = _SELECTION_CHROME_MARGIN
+        outer = QRegion(selection_rect.adjusted(-margin, -margin, margin, margin))
+        inner = selection_rect.adjusted(margin, margin, -margin, -margin)
+        region = outer.subtracted(QRegion(inner)) if inner.isValid() else outer
+        label_rect = self._dimension_label_rect(selection_rect)
+        return region.united(label_rect.adjusted(-1, -1, 1, 1))
+
+    def _cursor_preview_rect(self):
+        size = max(self.draw_thickness, self._number_marker_size(self.draw_thickness))
+        half = size // 2 + 4
+        return QRect(
+            self.current_mouse_pos - QPoint(half, half), QSize(half * 2, half * 2)
+        )
 
+    def _paint_cursor_preview(self, painter, dirty):
         if (
-            self.draw_mode
-            and self.draw_mode != "text"
-            and self.draw_mode != "mosaic"
-            and self.draw_mode != "number"
-            and self.toolbar_widget.isVisible()
-            and self.selection_rect.contains(self.current_mouse_pos)
+            not self.draw_mode
+            or not self.toolbar_widget.isVisible()
+            or not self.selection_rect.contains(self.current_mouse_pos)
+            or not self._cursor_preview_rect().intersects(dirty)
         ):
+            return
+
+        if self.draw_mode not in ("text", "mosaic", "blur", "number"):
             painter.setPen(Qt.PenStyle.NoPen)
             painter.setBrush(
                 self.draw_color if self.draw_mode != "eraser" else Qt.GlobalColor.white
             )
             r = self.draw_thickness / 2
             painter.drawEllipse(QPointF(self.current_mouse_pos), r, r)
-
-        if (
-            self.draw_mode == "number"
-            and self.toolbar_widget.isVisible()
-            and self.selection_rect.contains(self.current_mouse_pos)
-        ):
+        elif self.draw_mode == "number":
             size = self._number_marker_size(self.draw_thickness)
             rect = QRect(
                 self.current_mouse_pos - QPoint(size // 2, size // 2),
@@ -1132,165 +1183,255 @@ class ScreenshotOverlay(QWidget):
                 max(2, min(6, self.draw_thickness)),
             )
 
-        # Draw magnifier
-        if not self.current_mouse_pos.isNull() and self.screen_image:
-            cursor_pos = self.current_mouse_pos
-            native_cursor_pos = self._native_point(cursor_pos)
-            zoom_size = 15  # Must be odd to have a true center (15x15 pixels)
-            scale = 12
-
-            if self.screen_image.valid(native_cursor_pos):
-                c = self.screen_image.pixelColor(native_cursor_pos)
-
-                zoom_rect = QRect(
-                    native_cursor_pos.x() - zoom_size // 2,
-                    native_cursor_pos.y() - zoom_size // 2,
-                    zoom_size,
-                    zoom_size,
-                )
+    def _magnifier_rect(self, cursor_pos):
+        """Area covered by the magnifier and its info panel at ``cursor_pos``."""
+        mag_w = mag_h = _MAGNIFIER_ZOOM_SIZE * _MAGNIFIER_SCALE
+        mag_x = cursor_pos.x() + 20
+        mag_y = cursor_pos.y() + 20
+
+        # Boundary checks
+        if mag_x + mag_w > self.width():
+            mag_x = cursor_pos.x() - mag_w - 40
+        if mag_y + mag_h + _MAGNIFIER_PANEL_HEIGHT > self.height():
+            mag_y = cursor_pos.y() - mag_h - _MAGNIFIER_PANEL_HEIGHT - 40
+        return QRect(mag_x, mag_y, mag_w, mag_h + _MAGNIFIER_PANEL_HEIGHT)
+
+    def _pixel_color(self, native_point):
+        """Color of one native pixel, read without converting the whole grab."""
+        if self.screen_capture is None:
+            return None
+        return self.screen_capture.pixel_color(native_point)
 
-                zoomed_pixmap = self.screen_pixmap.copy(zoom_rect)
-                zoomed_pixmap.setDevicePixelRatio(1.0)
-                zoomed_pixmap = zoomed_pixmap.scaled(
-                    zoom_size * scale,
-                    zoom_size * scale,
-                    Qt.AspectRatioMode.IgnoreAspectRatio,
-                    Qt.TransformationMode.FastTransformation,
-                )
+    def _paint_magnifier(self, painter, cursor_pos, magnifier_rect):
+        native_cursor_pos = self._native_point(cursor_pos)
+        zoom_size = _MAGNIFIER_ZOOM_SIZE  # Must be odd to have a true center
+        scale = _MAGNIFIER_SCALE
 
-                mag_x = cursor_pos.x() + 20
-                mag_y = cursor_pos.y() + 20
-                mag_w = zoom_size * scale
-                mag_h = zoom_size * scale
+        c = self._pixel_color(native_cursor_pos)
+        if c is None:
+            return
 
-                # Calculate Info panel dimensions
-                panel_h = 75
+        zoom_rect = QRect(
+            native_cursor_pos.x() - zoom_size // 2,
+            native_cursor_pos.y() - zoom_size // 2,
+            zoom_size,
+            zoom_size,
+        )
 
-                # Boundary checks
-                if mag_x + mag_w > self.width():
-                    mag_x = cursor_pos.x() - mag_w - 40
-                if mag_y + mag_h + panel_h > self.height():
-                    mag_y = cursor_pos.y() - mag_h - panel_h - 40
+        zoomed_pixmap = self.screen_capture.copy(zoom_rect)
+        zoomed_pixmap.setDevicePixelRatio(1.0)
+        zoomed_pixmap = zoomed_pixmap.scaled(
+            zoom_size * scale,
+            zoom_size * scale,
+            Qt.AspectRatioMode.IgnoreAspectRatio,
+            Qt.TransformationMode.FastTransformation,
+        )
 
-                # 1. Draw the scaled image
-                mag_rect = QRect(mag_x, mag_y, mag_w, mag_h)
-                painter.setCompositionMode(
-                    QPainter.CompositionMode.CompositionMode_SourceOver
-                )
-                painter.drawPixmap(mag_rect, zoomed_pixmap)
-
-                # 2. Draw Crosshair bands (horizontal and vertical overlay passing through center)
-                center_x = mag_x + (zoom_size // 2) * scale
-                center_y = mag_y + (zoom_size // 2) * scale
-                band_color = QColor(0, 174, 255, 80)
-
-                painter.setPen(Qt.PenStyle.NoPen)
-                painter.setBrush(band_color)
-                # Horizontal band
-                painter.drawRect(mag_x, center_y, mag_w, scale)
-                # Vertical band
-                painter.drawRect(center_x, mag_y, scale, mag_h)
-
-                # 3. Draw Grid
-                painter.setPen(QPen(QColor(0, 0, 0, 50), 1, Qt.PenStyle.SolidLine))
-                painter.setBrush(Qt.BrushStyle.NoBrush)
-                for i in range(1, zoom_size):
-                    # Vertical
-                    painter.drawLine(
-                        mag_x + i * scale, mag_y, mag_x + i * scale, mag_y + mag_h
-                    )
-                    # Horizontal
-                    painter.drawLine(
-                        mag_x, mag_y + i * scale, mag_x + mag_w, mag_y + i * scale
-                    )
+        mag_x = magnifier_rect.x()
+        mag_y = magnifier_rect.y()
+        mag_w = zoom_size * scale
+        mag_h = zoom_size * scale
+        panel_h = _MAGNIFIER_PANEL_HEIGHT
 
-                # 4. Draw Center Pixel Outline
-                painter.setPen(QPen(Qt.GlobalColor.black, 1))
-                painter.drawRect(center_x, center_y, scale, scale)
-                painter.setPen(QPen(Qt.GlobalColor.white, 1))
-                painter.drawRect(center_x + 1, center_y + 1, scale - 2, scale - 2)
-
-                # 5. Draw Image Border
-                painter.setPen(QPen(Qt.GlobalColor.black, 1))
-                painter.drawRect(mag_rect)
-
-                # 6. Draw Info Panel Background
-                panel_rect = QRect(mag_x, mag_y + mag_h, mag_w, panel_h)
-                painter.setPen(Qt.PenStyle.NoPen)
-                painter.setBrush(QColor(30, 30, 30, 240))
-                painter.drawRect(panel_rect)
-
-                # 7. Draw Texts
-                painter.setPen(Qt.GlobalColor.white)
-                f = painter.font()
-                f.setPixelSize(12)
-                f.setBold(False)
-                painter.setFont(f)
-
-                # Line 1: coordinates
-                global_pos = self.mapToGlobal(cursor_pos)
-                coord_text = f"({global_pos.x()}, {global_pos.y()})"
-                painter.drawText(
-                    QRect(mag_x, mag_y + mag_h + 5, mag_w, 15),
-                    Qt.AlignmentFlag.AlignCenter,
-                    coord_text,
-                )
+        # 1. Draw the scaled image
+        mag_rect = QRect(mag_x, mag_y, mag_w, mag_h)
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceOver)
+        painter.drawPixmap(mag_rect, zoomed_pixmap)
 
-                # Line 2: color box + text
-                color_text = (
-                    f"rgb({c.red()}, {c.green()}, {c.blue()})"
-                    if self.color_format == "rgb"
-                    else c.name().upper()
-                )
-                fm = painter.fontMetrics()
-                tw = fm.horizontalAdvance(color_text)
-                box_size = 12
-                spacing = 5
-                total_w = box_size + spacing + tw
-                start_x = mag_x + (mag_w - total_w) // 2
-
-                # Draw color box
-                painter.setPen(Qt.PenStyle.NoPen)
-                painter.setBrush(c)
-                painter.drawRect(start_x, mag_y + mag_h + 24, box_size, box_size)
-                painter.setPen(QPen(Qt.GlobalColor.white, 1))
-                painter.setBrush(Qt.BrushStyle.NoBrush)
-                painter.drawRect(start_x, mag_y + mag_h + 24, box_size, box_size)
-
-                # Draw color text
-                painter.drawText(
-                    start_x + box_size + spacing,
-                    mag_y + mag_h + 23,
-                    tw,
-                    15,
-                    Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
-                    color_text,
-                )
+        # 2. Draw Crosshair bands (horizontal and vertical overlay passing through center)
+        center_x = mag_x + (zoom_size // 2) * scale
+        center_y = mag_y + (zoom_size // 2) * scale
+        band_color = QColor(0, 174, 255, 80)
 
-                # Line 3: Shift Hint
-                f.setPixelSize(11)
-                painter.setFont(f)
-                painter.setPen(QColor(200, 200, 200))
-                painter.drawText(
-                    QRect(mag_x, mag_y + mag_h + 40, mag_w, 15),
-                    Qt.AlignmentFlag.AlignCenter,
-                    "Shift: 切换颜色格式",
-                )
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(band_color)
+        # Horizontal band
+        painter.drawRect(mag_x, center_y, mag_w, scale)
+        # Vertical band
+        painter.drawRect(center_x, mag_y, scale, mag_h)
+
+        # 3. Draw Grid
+        painter.setPen(QPen(QColor(0, 0, 0, 50), 1, Qt.PenStyle.SolidLine))
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        for i in range(1, zoom_size):
+            # Vertical
+            painter.drawLine(mag_x + i * scale, mag_y, mag_x + i * scale, mag_y + mag_h)
+            # Horizontal
+            painter.drawLine(mag_x, mag_y + i * scale, mag_x + mag_w, mag_y + i * scale)
+
+        # 4. Draw Center Pixel Outline
+        painter.setPen(QPen(Qt.GlobalColor.black, 1))
+        painter.drawRect(center_x, center_y, scale, scale)
+        painter.setPen(QPen(Qt.GlobalColor.white, 1))
+        painter.drawRect(center_x + 1, center_y + 1, scale - 2, scale - 2)
+
+        # 5. Draw Image Border
+        painter.setPen(QPen(Qt.GlobalColor.black, 1))
+        painter.drawRect(mag_rect)
+
+        # 6. Draw Info Panel Background
+        panel_rect = QRect(mag_x, mag_y + mag_h, mag_w, panel_h)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor(30, 30, 30, 240))
+        painter.drawRect(panel_rect)
+
+        # 7. Draw Texts
+        painter.setPen(Qt.GlobalColor.white)
+        f = self._dimension_font()
+        painter.setFont(f)
+
+        # Line 1: coordinates
+        global_pos = self.mapToGlobal(cursor_pos)
+        coord_text = f"({global_pos.x()}, {global_pos.y()})"
+        painter.drawText(
+            QRect(mag_x, mag_y + mag_h + 5, mag_w, 15),
+            Qt.AlignmentFlag.AlignCenter,
+            coord_text,
+        )
 
-                # Line 4: Copy Hint
-                painter.drawText(
-                    QRect(mag_x, mag_y + mag_h + 55, mag_w, 15),
-                    Qt.AlignmentFlag.AlignCenter,
-                    "C: 复制色值",
-                )
+        # Line 2: color box + text
+        color_text = (
+            f"rgb({c.red()}, {c.green()}, {c.blue()})"
+            if self.color_format == "rgb"
+            else c.name().upper()
+        )
+        fm = painter.fontMetrics()
+        tw = fm.horizontalAdvance(color_text)
+        box_size = 12
+        spacing = 5
+        total_w = box_size + spacing + tw
+        start_x = mag_x + (mag_w - total_w) // 2
+
+        # Draw color box
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(c)
+        painter.drawRect(start_x, mag_y + mag_h + 24, box_size, box_size)
+        painter.setPen(QPen(Qt.GlobalColor.white, 1))
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawRect(start_x, mag_y + mag_h + 24, box_size, box_size)
+
+        # Draw color text
+        painter.drawText(
+            start_x + box_size + spacing,
+            mag_y + mag_h + 23,
+            tw,
+            15,
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+            color_text,
+        )
 
-    def draw_all_actions(self, painter):
-        self._enable_quality_rendering(painter)
+        # Line 3: Shift Hint
+        f.setPixelSize(11)
+        painter.setFont(f)
+        painter.setPen(QColor(200, 200, 200))
+        painter.drawText(
+            QRect(mag_x, mag_y + mag_h + 40, mag_w, 15),
+            Qt.AlignmentFlag.AlignCenter,
+            "Shift: 切换颜色格式",
+        )
+
+        # Line 4: Copy Hint
+        painter.drawText(
+            QRect(mag_x, mag_y + mag_h + 55, mag_w, 15),
+            Qt.AlignmentFlag.AlignCenter,
+            "C: 复制色值",
+        )
+
+    def _invalidate_annotation_layer(self):
+        self._annotation_layer = None
+        self._annotation_layer_key = None
+
+    def _layer_excluded_index(self):
+        if self.is_moving_action and self.moving_action_index is not None:
+            return self.moving_action_index
+        return None
+
+    def _live_actions(self):
+        actions = []
+        excluded = self._layer_excluded_index()
+        if excluded is not None and 0 <= excluded < len(self.draw_actions):
+            actions.append(self.draw_actions[excluded])
+        if self.current_action:
+            actions.append(self.current_action)
+        return actions
+
+    def _annotation_layer_pixmap(self):
+        """Committed annotations flattened into a transparent pixmap.
+
+        The layer covers the bounds of every committed action, so resizing
+        the selection does not touch it. Actions appended since the last
+        build are painted onto it in place; undo, redo, text edits and
+        the end of a drag rebuild it. An action being dragged is left out
+        and drawn live until the drag ends.
+        """
+        actions = self.draw_actions
+        if not actions:
+            return None
+
+        excluded = self._layer_excluded_index()
+        dpr = max(1.0, float(self.devicePixelRatioF()))
+        key = (id(actions), excluded, dpr)
+        count = len(actions)
+        layer = self._annotation_layer
+        if (
+            layer is not None
+            and key == self._annotation_layer_key
+            and count >= self._annotation_layer_count
+        ):
+            appended = actions[self._annotation_layer_count :]
+            if all(
+                self._annotation_layer_rect.contains(self._action_bounds(action))
+                for action in appended
+            ):
+                if appended:
+                    self._paint_annotation_layer(layer, appended)
+                    self._annotation_layer_count = count
+                return layer
+
+        layer_actions = [
+            action for index, action in enumerate(actions) if index != excluded
+        ]
+        bounds = QRect()
+        for action in layer_actions:
+            bounds = bounds.united(self._action_bounds(action))
+        bounds = bounds.adjusted(-2, -2, 2, 2) & self.rect()
+        if bounds.isEmpty():
+            self._invalidate_annotation_layer()
+            return None
+
+        layer = QPixmap(
+            max(1, math.ceil(bounds.width() * dpr)),
+            max(1, math.ceil(bounds.height() * dpr)),
+        )
+        layer.setDevicePixelRatio(dpr)
+        layer.fill(Qt.GlobalColor.transparent)
+        self._annotation_layer = layer
+        self._annotation_layer_rect = bounds
+        self._annotation_layer_key = key
+        self._annotation_layer_count = count
+        self._paint_annotation_layer(layer, layer_actions)
+        return layer
+
+    def _paint_annotation_layer(self, layer, actions):
+        painter = QPainter(layer)
+        painter.translate(-self._annotation_layer_rect.topLeft())
+        self._draw_action_list(painter, actions)
+        painter.end()
+
+    def draw_all_actions(self, painter, clip_rect=None):
+        """Draw annotations; with ``clip_rect``, skip those outside it."""
         actions = self.draw_actions.copy()
         if self.current_action:
             actions.append(self.current_action)
+        self._draw_action_list(painter, actions, clip_rect)
 
+    def _draw_action_list(self, painter, actions, clip_rect=None):
+        self._enable_quality_rendering(painter)
         for act in actions:
+            if clip_rect is not None and not self._action_bounds(act).intersects(
+                clip_rect
+            ):
+                continue
             pts = act.get("points", [])
             color = act.get("color", Qt.GlobalColor.red)
             t = act.get("type")
@@ -1317,7 +1458,12 @@ class ScreenshotOverlay(QWidget):
             elif t == "arrow" and len(pts) == 2:
                 self._draw_arrow(painter, pts[0], pts[1], color, thickness)
             elif t == "pen" and len(pts) > 1:
-                painter.drawPath(self._smooth_path(pts))
+                margin = thickness / 2 + 2
+                for part in self._stroke_geometry(act).parts():
+                    if clip_rect is None or part.bounds.adjusted(
+                        -margin, -margin, margin, margin
+                    ).intersects(QRectF(clip_rect)):
+                        painter.drawPath(part.path)
             elif t == "text":
                 painter.setPen(act["color"])
                 font_size = act.get("font_size", 18)
@@ -1335,22 +1481,118 @@ class ScreenshotOverlay(QWidget):
                     str(act.get("number", 1)),
                     outline_width,
                 )
-            elif t in ["mosaic", "eraser"] and len(pts) > 1:
-                stroker = QPainterPathStroker()
-                stroker.setWidth(15)
-                stroker.setCapStyle(Qt.PenCapStyle.RoundCap)
-                stroker.setJoinStyle(Qt.PenJoinStyle.RoundJoin)
-
-                path = self._smooth_path(pts)
-
-                s_path = stroker.createStroke(path)
-                painter.setClipPath(s_path)
-                if t == "mosaic" and self.mosaic_pixmap:
-                    painter.drawPixmap(0, 0, self.mosaic_pixmap)
-                elif t == "eraser" and self.screen_pixmap:
-                    painter.drawPixmap(0, 0, self.screen_pixmap)
-                # Reset clip
-                painter.setClipRect(self.selection_rect)
+            elif t in _FREEHAND_TYPES and len(pts) > 1:
+                if self.screen_capture is None:
+                    continue
+                for part in self._stroke_geometry(act).parts():
+                    self._draw_effect_part(painter, t, part, clip_rect)
+
+    def _draw_effect_part(self, painter, style, part, clip_rect):
+        # Only blit the pixels under the stroke that need repainting.
+        target = part.bounds.toAlignedRect().adjusted(-1, -1, 1, 1)
+        if clip_rect is not None:
+            target &= clip_rect
+        if target.isEmpty():
+            return
+        if style != "eraser":
+            source = self._effect_tiles_for(style).region(self._native_rect(target))
+            if source.isNull():
+                return
+        painter.save()
+        painter.setClipPath(part.outline, Qt.ClipOperation.IntersectClip)
+        if style == "eraser":
+            self.screen_capture.draw(painter, target)
+        else:
+            painter.drawPixmap(
+                target, source, QRect(0, 0, source.width(), source.height())
+            )
+        painter.restore()
+
+    @staticmethod
+    def _stroke_geometry(action):
+        """The cached smoothed path of a freehand ``action``, kept up to date."""
+        geometry = action.get("path_cache")
+        if geometry is None:
+            geometry = StrokeGeometry(
+                None if action["type"] == "pen" else _MOSAIC_STROKE_WIDTH
+            )
+            action["path_cache"] = geometry
+        geometry.update(action["points"])
+        return geometry
+
+    def _effect_tiles_for(self, style):
+        tiles = self._effect_tiles.get(style)
+        if tiles is None or tiles.source is not self.screen_capture:
+            tiles = EffectTileCache(self.screen_capture, style, self.effect_block_size)
+            self._effect_tiles[style] = tiles
+        return tiles
+
+    def _action_bounds(self, action) -> QRect:
+        """Bounding rect of everything ``action`` paints, pen width included."""
+        action_type = action.get("type")
+        if action_type == "text":
+            return self._get_text_action_rect(action).adjusted(-4, -4, 4, 4)
+        if action_type == "number":
+            return self._get_number_action_rect(action).adjusted(-4, -4, 4, 4)
+
+        points = action.get("points", [])
+        margin = self._action_margin(action)
+        if action_type in _FREEHAND_TYPES and len(points) > 1:
+            # The smoothed curve stays inside its points' hull, so the cached
+            # path bounds are exact; an effect outline already has its width.
+            bounds = self._stroke_geometry(action).bounds().toAlignedRect()
+            if action_type != "pen":
+                margin = 2
+            return bounds.adjusted(-margin, -margin, margin, margin)
+        return self._points_bounds(points, margin)
+
+    @staticmethod
+    def _action_margin(action):
+        action_type = action.get("type")
+        thickness = int(action.get("thickness", 2))
+        if action_type in ("mosaic", "blur", "eraser"):
+            return _MOSAIC_STROKE_WIDTH // 2 + 2
+        if action_type == "arrow":
+            return int(max(14.0, thickness * 5.5)) + 2
+        return thickness // 2 + 2
+
+    @staticmethod
+    def _points_bounds(points, margin) -> QRect:
+        if not points:
+            return QRect()
+        xs = [point.x() for point in points]
+        ys = [point.y() for point in points]
+        return QRect(
+            QPoint(min(xs) - margin, min(ys) - margin),
+            QPoint(max(xs) + margin, max(ys) + margin),
+        )
+
+    def _dynamic_region(self):
+        """Parts of the overlay that follow the cursor or the current drag."""
+        region = QRegion()
+        if not self.current_mouse_pos.isNull():
+            region = region.united(
+                self._magnifier_rect(self.current_mouse_pos).adjusted(-1, -1, 2, 2)
+            )
+            region = region.united(self._cursor_preview_rect())
+        if self.current_action:
+            action = self.current_action
+            if action["type"] in _FREEHAND_TYPES:
+                # Only the end of a live stroke changes as it grows.
+                region = region.united(
+                    self._points_bounds(
+                        action["points"][-_LIVE_TAIL_POINTS:],
+                        self._action_margin(action),
+                    )
+                )
+            else:
+                region = region.united(self._action_bounds(action))
+        if self.is_moving_action and self.moving_action_index is not None:
+            if 0 <= self.moving_action_index < len(self.draw_actions):
+                region = region.united(
+                    self._action_bounds(self.draw_actions[self.moving_action_index])
+                )
+        return region
 
     def get_anchor_points(self):
         if self.selection_rect.isNull():
@@ -1443,6 +1685,7 @@ class ScreenshotOverlay(QWidget):
             "text",
             "number",
             "mosaic",
+            "blur",
             "eraser",
         }
         if not self.selection_rect.isNull() and self.draw_mode in adjustable_modes:
@@ -1478,7 +1721,6 @@ class ScreenshotOverlay(QWidget):
                         self.text_input.move(pos)
                         self.text_input.setText("")
                         self.editing_text_index = None
-                        self.editing_text_snapshot = None
                         self.update_text_input_style()
                         self.text_input.show()
                         self.text_input.setFocus()
@@ -1508,6 +1750,8 @@ class ScreenshotOverlay(QWidget):
                         "points": [pos],
                         "thickness": self.draw_thickness,
                     }
+                    if self.draw_mode in _FREEHAND_TYPES:
+                        self._stroke_geometry(self.current_action)
                     return
 
             anchor = self.get_anchor(pos)
@@ -1562,7 +1806,8 @@ class ScreenshotOverlay(QWidget):
                 if self.text_input.isVisible():
                     self.commit_text_action()
                 action = self.draw_actions[text_index]
-                self.editing_text_snapshot = self._clone_draw_actions()
+                self._invalidate_annotation_layer()
+                self._record_undo_state()
                 self.editing_text_index = text_index
                 self.text_input.move(action["pos"])
                 self.text_input.setText(action["text"])
@@ -1583,6 +1828,8 @@ class ScreenshotOverlay(QWidget):
 
     def mouseMoveEvent(self, event):
         pos = event.position().toPoint()
+        dirty_before = self._dynamic_region()
+        selection_before = QRect(self.selection_rect)
         self.current_mouse_pos = pos
 
         if self.current_action:
@@ -1591,8 +1838,8 @@ class ScreenshotOverlay(QWidget):
                     self.current_action["points"][1] = pos
                 else:
                     self.current_action["points"].append(pos)
-            elif self.current_action["type"] in ["pen", "mosaic", "eraser"]:
-                self.current_action["points"].append(pos)
+            elif self.current_action["type"] in _FREEHAND_TYPES:
+                add_point(self.current_action["points"], pos)
         elif self.is_moving_action and self.moving_action_index is not None:
             delta = pos - self.action_drag_last_pos
             if not delta.isNull():
@@ -1627,18 +1874,34 @@ class ScreenshotOverlay(QWidget):
         else:
             self.update_cursor(pos)
 
-        self.update()  # Update to render magnifier at all times
+        # Repaint only what moved: magnifier, cursor preview, selection edges
+        # and the annotation being drawn or dragged, before and after.
+        dirty = dirty_before.united(self._dynamic_region())
+        if self.selection_rect != selection_before:
+            dirty = (
+                dirty.united(QRegion(selection_before).xored(QRegion(self.selection_rect)))
+                .united(self._selection_chrome_region(selection_before))
+                .united(self._selection_chrome_region(self.selection_rect))
+            )
+        self.update(dirty)
 
     def mouseReleaseEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton:
             if self.current_action:
+                if self.current_action["type"] in _FREEHAND_TYPES:
+                    self.current_action["points"] = simplify(
+                        self.current_action["points"]
+                    )
                 self._record_undo_state()
                 self.draw_actions.append(self.current_action)
                 self.current_action = None
+                self._sync_scroll_action()
                 self.update()
                 return
 
             if self.is_moving_action:
+                if self.action_drag_changed:
+                    self._invalidate_annotation_layer()
                 self.is_moving_action = False
                 self.moving_action_index = None
                 self.action_drag_last_pos = QPoint()
@@ -1690,14 +1953,9 @@ class ScreenshotOverlay(QWidget):
             self.finalize_capture(manual_copy=True)
         elif event.key() == Qt.Key.Key_P and not self.selection_rect.isNull():
             self.finalize_capture(manual_pin=True)
-        elif (
-            event.key() == Qt.Key.Key_C
-            and not self.current_mouse_pos.isNull()
-            and self.screen_image
-        ):
-            native_mouse_pos = self._native_point(self.current_mouse_pos)
-            if self.screen_image.valid(native_mouse_pos):
-                c = self.screen_image.pixelColor(native_mouse_pos)
+        elif event.key() == Qt.Key.Key_C and not self.current_mouse_pos.isNull():
+            c = self._pixel_color(self._native_point(self.current_mouse_pos))
+            if c is not None:
                 text = (
                     f"rgb({c.red()}, {c.green()}, {c.blue()})"
                     if self.color_format == "rgb"
@@ -1709,16 +1967,18 @@ class ScreenshotOverlay(QWidget):
                 # Just updating the clipboard is fine.
         elif event.key() == Qt.Key.Key_Q and not self.selection_rect.isNull():
             self.recognize_qr()
-            self.close_overlay()
+        elif event.key() == Qt.Key.Key_L and not self.selection_rect.isNull():
+            self.start_scroll_capture()
 
     def get_selected_pixmap(self):
-        if self.selection_rect.isNull() or not self.screen_pixmap:
+        if self.selection_rect.isNull() or self.screen_capture is None:
             return None
 
         if self.text_input.isVisible():
             self.commit_text_action()
 
-        pixmap = self._copy_selected_native_pixmap()
+        # A selection on one screen keeps that screen's own resolution.
+        pixmap = self.screen_capture.region(self.selection_rect)
         if hasattr(self, "draw_actions") and self.draw_actions:
             painter = QPainter(pixmap)
             painter.translate(-self.selection_rect.topLeft())
@@ -1727,34 +1987,6 @@ class ScreenshotOverlay(QWidget):
 
         return pixmap
 
-    def _copy_selected_native_pixmap(self):
-        selection_rect = QRect(self.selection_rect)
-        selection_global = QRect(selection_rect)
-        selection_global.translate(self.screen_virtual_rect.topLeft())
-
-        matches = []
-        for capture in self.screen_capture_sources:
-            screen_rect = capture["geometry"]
-            intersection = selection_global.intersected(screen_rect)
-            if (
-                not intersection.isNull()
-                and intersection.width() > 0
-                and intersection.height() > 0
-            ):
-                matches.append((capture, intersection))
-
-        if len(matches) == 1:
-            capture, intersection = matches[0]
-            source_rect = QRect(intersection)
-            source_rect.translate(-capture["geometry"].topLeft())
-            pixmap = capture["pixmap"].copy(
-                self._scaled_rect(source_rect, capture["scale"])
-            )
-            pixmap.setDevicePixelRatio(capture["scale"])
-            return pixmap
-
-        return self.screen_pixmap.copy(self._native_rect(selection_rect))
-
     def pin_selection(self):
         pixmap = self.get_selected_pixmap()
         if pixmap:
@@ -1790,14 +2022,14 @@ class ScreenshotOverlay(QWidget):
             safe_name = f"x-tools_{now.strftime('%Y%m%d_%H%M%S')}"
         return safe_name + ".png"
 
-    def _auto_save_pixmap(self, pixmap):
+    def _auto_save_path(self):
         if not config_manager.get_value("screenshot_auto_save", False):
             return None
 
         output_path = os.path.join(
             self._get_screenshot_save_dir(), self._build_screenshot_filename()
         )
-        return self._save_pixmap_to_path(pixmap, output_path, source="auto")
+        return self._prepare_save_path(output_path)
 
     def _pin_pixmap(self, pixmap):
         pin_win = PinnedImageWindow(pixmap)
@@ -1812,22 +2044,22 @@ class ScreenshotOverlay(QWidget):
         self.pinned_windows.append(pin_win)
 
     def finalize_capture(
-        self, manual_copy=False, manual_pin=False, manual_save_path=None
+        self, manual_copy=False, manual_pin=False, manual_save_path=None, pixmap=None
     ):
-        pixmap = self.get_selected_pixmap()
+        """Copy, pin and/or save the selection (or ``pixmap``), then close."""
+        if pixmap is None:
+            pixmap = self.get_selected_pixmap()
         if not pixmap:
             return
 
         auto_copy = bool(config_manager.get_value("screenshot_auto_copy", False))
         auto_pin = bool(config_manager.get_value("screenshot_auto_pin", False))
-        saved_path = ""
+        save_path = ""
         actions = []
 
         if manual_save_path:
-            saved_path = self._save_pixmap_to_path(
-                pixmap, manual_save_path, source="manual"
-            )
-            if not saved_path:
+            save_path = self._prepare_save_path(manual_save_path)
+            if not save_path:
                 QMessageBox.warning(
                     self,
                     "保存失败",
@@ -1845,53 +2077,121 @@ class ScreenshotOverlay(QWidget):
             actions.append("pin")
 
         if not manual_save_path:
-            saved_path = self._auto_save_pixmap(pixmap) or ""
-            if saved_path:
+            save_path = self._auto_save_path() or ""
+            if save_path:
                 actions.append("save")
 
+        # Encoding and writing happen on the history's writer thread, once
+        # for both the save folder and the history, so the overlay closes
+        # without waiting for the PNG.
         source = "manual" if any([manual_copy, manual_pin, manual_save_path]) else "auto"
-        capture_history_manager.add_capture(
-            pixmap,
+        capture_history_manager.submit_capture(
+            pixmap.toImage(),
             source=source,
-            saved_path=saved_path,
             actions=actions,
+            save_path=save_path,
+            save_source="manual" if manual_save_path else "auto",
         )
         self.close_overlay()
 
-    def recognize_qr(self):
-        pixmap = self.get_selected_pixmap()
-        if not pixmap or not CV2_AVAILABLE:
+    def _sync_scroll_action(self):
+        # Scrolling capture grabs the live screen and cannot keep the
+        # annotations, so it is only offered while there are none.
+        if self.draw_actions:
+            self.btn_scroll.setEnabled(False)
+            self.btn_scroll.setToolTip("长截图 (L)：撤销全部标注后可用")
+        else:
+            self.btn_scroll.setEnabled(SCROLL_STITCH_AVAILABLE)
+            self.btn_scroll.setToolTip("长截图 (L)")
+
+    def start_scroll_capture(self):
+        """Hide the overlay and stitch the selection while the user scrolls.
+
+        The overlay stays logically open (``closed`` is not emitted) until
+        the scrolling capture is finished or cancelled. Selections with
+        annotations are refused, since the stitched page cannot keep them.
+        """
+        if self.selection_rect.isNull() or not SCROLL_STITCH_AVAILABLE:
+            return
+        if self.text_input.isVisible():
+            self.commit_text_action()
+        if self.draw_actions:
             return
+        rect = QRect(
+            self.mapToGlobal(self.selection_rect.topLeft()), self.selection_rect.size()
+        )
+        self.hide()
+        # Frames come from the live screen; the frozen grabs are not needed.
+        self.screen_capture = None
+        self._effect_tiles = {}
+        self._invalidate_annotation_layer()
 
-        import cv2 as cv2_mod
-        import numpy as np_mod
+        self.scroll_capture = ScrollCaptureWindow(
+            rect,
+            config_manager.get_value(
+                "screenshot_scroll_interval_ms", DEFAULT_SCROLL_INTERVAL_MS
+            ),
+            config_manager.get_value(
+                "screenshot_scroll_max_height", DEFAULT_MAX_HEIGHT
+            ),
+        )
+        self.scroll_capture.finished.connect(self._finish_scroll_capture)
+        self.scroll_capture.cancelled.connect(self._cancel_scroll_capture)
+        # Let the overlay disappear before the first frame is grabbed.
+        QTimer.singleShot(80, self.scroll_capture.start)
+
+    def _finish_scroll_capture(self, pixmap, action):
+        self.scroll_capture = None
+        if pixmap.isNull():
+            self.close_overlay()
+            return
+        if action == "save":
+            output_path = self._prompt_manual_save_path()
+            if not output_path:
+                self.close_overlay()
+                return
+            self.finalize_capture(manual_save_path=output_path, pixmap=pixmap)
+        else:
+            self.finalize_capture(
+                manual_copy=action == "copy", manual_pin=action == "pin", pixmap=pixmap
+            )
 
-        image = pixmap.toImage()
-        width = image.width()
-        height = image.height()
+    def _cancel_scroll_capture(self):
+        self.scroll_capture = None
+        self.close_overlay()
 
-        # Format_ARGB32 -> 32-bit Depth -> BGRA
-        # Note: Depending on Qt Image format it might be RGB32 or ARGB32
-        ptr = image.bits()
-        ptr.setsize(image.sizeInBytes())
-        buffer = ptr.asstring()
+    def _discard_scroll_capture(self):
+        """Drop a scrolling capture still on screen when a new capture starts.
 
-        try:
-            # Create a numpy array from the buffer
-            arr = np_mod.frombuffer(buffer, dtype=np_mod.uint8).reshape(
-                (height, width, 4)
-            )
-            # Convert BGRA to grayscale for QR detection
-            gray = cv2_mod.cvtColor(arr, cv2_mod.COLOR_BGRA2GRAY)
+        The overlay is taken over by the new capture, so it is not closed.
+        """
+        scroll_capture, self.scroll_capture = self.scroll_capture, None
+        if scroll_capture is None:
+            return
+        scroll_capture.finished.disconnect(self._finish_scroll_capture)
+        scroll_capture.cancelled.disconnect(self._cancel_scroll_capture)
+        scroll_capture.cancel()
+
+    def recognize_qr(self):
+        """Decode every code in the selection, close, and list what was found."""
+        pixmap = self.get_selected_pixmap()
+        self.close_overlay()
+        if not pixmap:
+            return
+
+        if self.code_worker and self.code_worker.isRunning():
+            return
 
-            detector = cv2_mod.QRCodeDetector()
-            data, bbox, straight_qrcode = detector.detectAndDecode(gray)
+        self.code_worker = CodeDecodeWorker(pixmap.toImage(), self)
+        self.code_worker.finished.connect(self._on_codes_decoded)
+        self.code_worker.error.connect(
+            lambda e: logger.warning("Code decode error: %s", e)
+        )
+        self.code_worker.start()
 
-            if data:
-                QApplication.clipboard().setText(data)
-                logger.info("QR decoded and copied to clipboard")
-        except Exception as e:
-            logger.warning("QR decode error: %s", e)
+    def _on_codes_decoded(self, codes):
+        logger.info("Decoded %d code(s) from the selection", len(codes))
+        show_code_results(codes)
 
     def close_overlay(self):
         self.is_moving_action = False
@@ -1899,4 +2199,9 @@ class ScreenshotOverlay(QWidget):
         self.action_drag_last_pos = QPoint()
         self.action_drag_changed = False
         self.hide()
+        # The overlay is reused; drop the screen grabs and everything
+        # derived from them until the next capture.
+        self.screen_capture = None
+        self._effect_tiles = {}
+        self._invalidate_annotation_layer()
         self.closed.emit()
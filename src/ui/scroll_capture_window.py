@@ -0,0 +1,171 @@
+from PyQt6.QtCore import QPoint, QRect, Qt, QTimer, pyqtSignal
+from PyQt6.QtGui import QColor, QGuiApplication, QPainter, QPen, QPixmap
+from PyQt6.QtWidgets import QFrame, QHBoxLayout, QLabel, QPushButton, QWidget
+
+from src.core.logger import get_logger
+from src.core.scroll_stitch import DEFAULT_MAX_HEIGHT, ScrollStitcher
+from src.core.screen_capture import capture_scale
+
+
+logger = get_logger(__name__)
+
+DEFAULT_SCROLL_INTERVAL_MS = 120
+_FRAME_MARGIN = 3
+
+
+class _CaptureFrame(QWidget):
+    """Border drawn just outside the area being captured; clicks pass through."""
+
+    def __init__(self, rect: QRect):
+        super().__init__()
+        self.setWindowFlags(
+            Qt.WindowType.FramelessWindowHint
+            | Qt.WindowType.WindowStaysOnTopHint
+            | Qt.WindowType.Tool
+            | Qt.WindowType.WindowTransparentForInput
+        )
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+        self.setAttribute(Qt.WidgetAttribute.WA_ShowWithoutActivating)
+        margin = _FRAME_MARGIN
+        self.setGeometry(rect.adjusted(-margin, -margin, margin, margin))
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setPen(QPen(QColor("#367DE8"), 2))
+        painter.drawRect(self.rect().adjusted(1, 1, -1, -1))
+        painter.end()
+
+
+class ScrollCaptureWindow(QFrame):
+    """Control bar for a scrolling capture of ``rect`` (global coordinates).
+
+    While it is open the area is grabbed on a timer and stitched as the
+    user scrolls the window underneath; ``finished`` carries the stitched
+    pixmap and the button chosen ("copy", "pin" or "save").
+    """
+
+    finished = pyqtSignal(QPixmap, str)
+    cancelled = pyqtSignal()
+
+    def __init__(
+        self,
+        rect: QRect,
+        interval_ms=DEFAULT_SCROLL_INTERVAL_MS,
+        max_height=DEFAULT_MAX_HEIGHT,
+    ):
+        super().__init__()
+        self.setWindowFlags(
+            Qt.WindowType.FramelessWindowHint
+            | Qt.WindowType.WindowStaysOnTopHint
+            | Qt.WindowType.Tool
+        )
+        self.setObjectName("ScrollCaptureBar")
+        self.setStyleSheet(
+            """
+            QFrame#ScrollCaptureBar {
+                background-color: #25292D;
+                border: 1px solid rgba(255, 255, 255, 50);
+                border-radius: 8px;
+            }
+            QLabel { color: #E6E6E6; padding: 0 6px; }
+            QPushButton {
+                color: #FFFFFF;
+                background-color: rgba(255, 255, 255, 20);
+                border: 1px solid rgba(255, 255, 255, 34);
+                border-radius: 6px;
+                padding: 4px 10px;
+            }
+            QPushButton:hover { background-color: rgba(255, 255, 255, 40); }
+            """
+        )
+
+        self.capture_screen = QGuiApplication.screenAt(rect.center())
+        if self.capture_screen is None:
+            self.capture_screen = QGuiApplication.primaryScreen()
+        # Frames come from one screen; a selection spilling over is cut.
+        self.capture_rect = rect & self.capture_screen.geometry()
+        self.stitcher = ScrollStitcher(max_height=max_height)
+        self.scale = 1.0
+        self._frame = _CaptureFrame(self.capture_rect)
+
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(8, 6, 8, 6)
+        layout.setSpacing(6)
+        self.status_label = QLabel("请滚动页面")
+        self.status_label.setMinimumWidth(170)
+        layout.addWidget(self.status_label)
+        for text, action in (("复制", "copy"), ("贴图", "pin"), ("保存", "save")):
+            button = QPushButton(text)
+            button.clicked.connect(lambda _=False, a=action: self.finish(a))
+            layout.addWidget(button)
+        cancel_button = QPushButton("取消")
+        cancel_button.clicked.connect(self.cancel)
+        layout.addWidget(cancel_button)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(max(30, int(interval_ms)))
+        self.timer.timeout.connect(self.grab_frame)
+
+    def start(self):
+        self.adjustSize()
+        below = self.capture_rect.bottom() + _FRAME_MARGIN + 8
+        screen_rect = self.capture_screen.availableGeometry()
+        if below + self.height() > screen_rect.bottom():
+            below = self.capture_rect.top() - _FRAME_MARGIN - 8 - self.height()
+        x = min(self.capture_rect.right() - self.width(), screen_rect.right())
+        self.move(QPoint(max(screen_rect.left(), x), max(screen_rect.top(), below)))
+        self._frame.show()
+        self.show()
+        self.grab_frame()
+        self.timer.start()
+
+    def _grab(self):
+        origin = self.capture_screen.geometry().topLeft()
+        rect = self.capture_rect.translated(-origin)
+        pixmap = self.capture_screen.grabWindow(
+            0, rect.x(), rect.y(), rect.width(), rect.height()
+        )
+        self.scale = capture_scale(self.capture_screen, pixmap)
+        return pixmap.toImage()
+
+    def grab_frame(self):
+        image = self._grab()
+        if image.isNull():
+            return
+        added = self.stitcher.add_frame(image)
+        if self.stitcher.truncated:
+            self.status_label.setText(f"已达最大高度 {self.stitcher.height} px")
+        elif added is None:
+            self.status_label.setText("无法拼接，请往回滚动一点")
+        else:
+            self.status_label.setText(f"已拼接 {self.stitcher.height} px")
+
+    def finish(self, action):
+        self.timer.stop()
+        self.grab_frame()
+        pixmap = QPixmap.fromImage(self.stitcher.image())
+        pixmap.setDevicePixelRatio(self.scale)
+        logger.info(
+            "Scrolling capture finished: %dx%d",
+            pixmap.width(),
+            pixmap.height(),
+        )
+        self._close()
+        self.finished.emit(pixmap, action)
+
+    def cancel(self):
+        self.timer.stop()
+        self._close()
+        self.cancelled.emit()
+
+    def keyPressEvent(self, event):
+        if event.key() == Qt.Key.Key_Escape:
+            self.cancel()
+        elif event.key() in (Qt.Key.Key_Return, Qt.Key.Key_Enter):
+            self.finish("copy")
+        else:
+            super().keyPressEvent(event)
+
+    def _close(self):
+        self._frame.close()
+        self.close()
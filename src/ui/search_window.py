@@ -4,6 +4,7 @@ import threading
 import json
 import time
 import difflib
+from collections import Counter, OrderedDict
 from PyQt6.QtCore import (
     Qt,
     pyqtSignal,
@@ -15,7 +16,7 @@ from PyQt6.QtCore import (
     QSize,
     QFileInfo,
 )
-from PyQt6.QtGui import QAction, QIcon, QColor, QFont
+from PyQt6.QtGui import QAction, QIcon, QColor, QFont, QPixmap
 from PyQt6.QtWidgets import (
     QApplication,
     QWidget,
@@ -47,12 +48,17 @@ from src.core.plugin_manager import plugin_manager
 from src.ui.screenshot_overlay import ScreenshotOverlay
 from src.ui.pinned_image_window import PinnedImageWindow
 from src.ui.network_monitor import NetworkMonitorWidget
+from src.core.capture_history import capture_history_manager
 from src.core.clipboard_history import clipboard_history_manager
 from src.core.custom_launch import custom_launch_manager
+from src.core.image_store import image_store
+from src.core.thumbnail_cache import thumbnail_service
 from src.core.logger import get_logger, export_diagnostics, get_log_dir
 from src.core.metrics import metrics_store
+from src.core.result_merger import DeadlineResultMerger, ResultMergePolicy
+from src.core.search_prefetch import SearchPrefetcher
 from src.platform.applications import app_scanner
-from src.platform.file_search import file_search_provider
+from src.platform.file_search import file_search_pager
 from src.platform.hotkeys import create_hotkey_manager
 from src.platform.shell import open_parent, open_path
 from src.platform.windowing import force_foreground_window
@@ -60,9 +66,36 @@ from src.platform.windowing import force_foreground_window
 
 logger = get_logger(__name__)
 
+# Large clipboard texts are inflated only this far for the preview panel.
+CLIPBOARD_PREVIEW_MAX_CHARS = 20000
+# Delay after startup before the screenshot overlay is built and prewarmed.
+SCREENSHOT_PREWARM_DELAY_MS = 1500
+
+
+def collect_search_results(query, on_first_paint=None):
+    """Query every global source and return ``(results, file_has_more)``."""
+    policy = ResultMergePolicy.from_config(config_manager)
+    file_search_pager.set_page_size(policy.quota_for("file"))
+    file_page = {"has_more": False}
+
+    def search_files():
+        results, file_page["has_more"] = file_search_pager.fetch_page(query, 0)
+        return results
+
+    sources = {
+        "custom": lambda: custom_launch_manager.search(
+            query, limit=policy.quota_for("custom")
+        ),
+        "app": lambda: app_scanner.search(query),
+        "file": search_files,
+    }
+    results = DeadlineResultMerger(policy).run(sources, on_first_paint=on_first_paint)
+    return results, file_page["has_more"]
+
 
 class SearchThread(QThread):
-    results_found = pyqtSignal(int, str, list)
+    results_found = pyqtSignal(int, str, list, bool)
+    first_paint_ready = pyqtSignal(int, str, list, list)
 
     def __init__(self, query, request_id):
         super().__init__()
@@ -70,16 +103,41 @@ class SearchThread(QThread):
         self.request_id = request_id
 
     def run(self):
-        custom_results = custom_launch_manager.search(self.query)
-        app_results = app_scanner.search(self.query)
-        file_results = file_search_provider.search(self.query)
-        results = custom_results + app_results + file_results
-        self.results_found.emit(self.request_id, self.query, results)
+        results, file_has_more = collect_search_results(
+            self.query,
+            on_first_paint=lambda partial, pending: self.first_paint_ready.emit(
+                self.request_id, self.query, partial, pending
+            ),
+        )
+        self.results_found.emit(self.request_id, self.query, results, file_has_more)
+
+
+class FilePageThread(QThread):
+    page_loaded = pyqtSignal(int, str, int, list, bool)
+
+    def __init__(self, query, request_id, page_index):
+        super().__init__()
+        self.query = query
+        self.request_id = request_id
+        self.page_index = page_index
+
+    def run(self):
+        try:
+            results, has_more = file_search_pager.fetch_page(
+                self.query, self.page_index
+            )
+        except Exception as e:
+            logger.warning("File page %s failed: %s", self.page_index, e)
+            results, has_more = [], False
+        self.page_loaded.emit(
+            self.request_id, self.query, self.page_index, results, has_more
+        )
 
 
 class SearchWindow(AcrylicWindow):
     toggle_signal = pyqtSignal()
-    screenshot_signal = pyqtSignal()
+    # time.perf_counter() when the screenshot hotkey fired.
+    screenshot_signal = pyqtSignal(float)
     pin_clipboard_signal = pyqtSignal()
 
     def __init__(self):
@@ -92,6 +150,8 @@ class SearchWindow(AcrylicWindow):
         self._pending_query = ""
         self._search_started_at = {}
         self._search_query_snapshot = {}
+        self._first_painted_request_id = None
+        self._file_paging = None
         self._search_drag_candidate = False
         self._search_dragging_window = False
         self._search_drag_start_global = QPoint()
@@ -114,14 +174,32 @@ class SearchWindow(AcrylicWindow):
         self.pin_clipboard_signal.connect(self.pin_clipboard)
         self.screenshot_overlay = None
         self._pinned_windows = []
+        # Build the overlay once startup settles so the first Alt+A is warm.
+        QTimer.singleShot(SCREENSHOT_PREWARM_DELAY_MS, self._prewarm_screenshot_overlay)
+        # The built-in file index loads in the background, not in the first query.
+        file_search_pager.start()
 
         self._search_debounce_timer = QTimer(self)
         self._search_debounce_timer.setSingleShot(True)
         self._search_debounce_timer.setInterval(120)
         self._search_debounce_timer.timeout.connect(self._perform_debounced_search)
 
+        # Likely queries are run ahead on an idle worker: first letters when the
+        # window opens, frecent completions once typing pauses.
+        self._preview_thumbnail_id = ""
+        thumbnail_service.thumbnail_ready.connect(self._on_thumbnail_ready)
+        self._search_prefetcher = SearchPrefetcher(collect_search_results)
+        self._prefetch_hit_requests = set()
+        self._file_icon_cache = OrderedDict()
+        self._speculation_timer = QTimer(self)
+        self._speculation_timer.setSingleShot(True)
+        self._speculation_timer.setInterval(450)
+        self._speculation_timer.timeout.connect(self._speculate_completions)
+
         self._usage_settings = QSettings("x-tools", "search_usage")
         self._usage_counter = {}
+        # Usage keys are lowercased; the original paths are kept beside them.
+        self._usage_paths = {}
         self._favorites = set()
         self._load_usage_data()
 
@@ -134,6 +212,7 @@ class SearchWindow(AcrylicWindow):
         self.clipboard_history.start(QApplication.clipboard())
 
         threading.Thread(target=app_scanner.scan, daemon=True).start()
+        threading.Thread(target=image_store.collect_garbage, daemon=True).start()
 
     def _load_usage_data(self):
         raw = self._usage_settings.value("data", defaultValue="")
@@ -148,6 +227,7 @@ class SearchWindow(AcrylicWindow):
 
         usage = data.get("usage", {}) if isinstance(data, dict) else {}
         favorites = data.get("favorites", []) if isinstance(data, dict) else []
+        paths = data.get("paths", {}) if isinstance(data, dict) else {}
 
         if isinstance(usage, dict):
             self._usage_counter = {
@@ -161,10 +241,18 @@ class SearchWindow(AcrylicWindow):
         else:
             self._favorites = set()
 
+        if isinstance(paths, dict):
+            self._usage_paths = {
+                str(k): str(v) for k, v in paths.items() if k in self._usage_counter
+            }
+        else:
+            self._usage_paths = {}
+
     def _save_usage_data(self):
         payload = {
             "usage": self._usage_counter,
             "favorites": sorted(self._favorites),
+            "paths": self._usage_paths,
         }
         self._usage_settings.setValue("data", json.dumps(payload, ensure_ascii=False))
 
@@ -254,6 +342,9 @@ class SearchWindow(AcrylicWindow):
             return
 
         self._usage_counter[key] = int(self._usage_counter.get(key, 0)) + 1
+        path = str(data.get("path") or "").strip()
+        if path:
+            self._usage_paths[key] = path
         self._save_usage_data()
 
     def _is_favorite(self, data):
@@ -275,8 +366,9 @@ class SearchWindow(AcrylicWindow):
         key = self._item_key(item)
         fav = 0 if key and key in self._favorites else 1
         usage = -int(self._usage_counter.get(key, 0)) if key else 0
+        merge_rank = int(item.get("merge_rank", 0) or 0)
         name = str(item.get("name", "")).lower()
-        return (fav, usage, name)
+        return (fav, usage, merge_rank, name)
 
     def _find_plugin_by_keyword(self, keyword):
         word = keyword.strip().lower()
@@ -463,6 +555,16 @@ class SearchWindow(AcrylicWindow):
 
         return items[:4]
 
+    def _clipboard_preview_text(self, data):
+        text = str(data.get("clipboard_text", ""))
+        total = int(data.get("clipboard_text_length", 0) or len(text))
+        if total <= len(text):
+            return text
+        text = self.clipboard_history.get_entry_text(
+            str(data.get("clipboard_id", "")), max_chars=CLIPBOARD_PREVIEW_MAX_CHARS
+        ) or text
+        return f"{text}\n\n... 共 {total} 个字符，复制时读取全文"
+
     def _preview_text_for_item(self, data):
         if not isinstance(data, dict):
             return ""
@@ -501,9 +603,11 @@ class SearchWindow(AcrylicWindow):
         if item_type in {"clipboard_entry", "clipboard_center", "clipboard_cmd"}:
             if item_type == "clipboard_entry":
                 if data.get("clipboard_type") == "text":
-                    return str(data.get("clipboard_text", ""))
+                    return self._clipboard_preview_text(data)
                 image_path = str(data.get("clipboard_image_path", ""))
                 size = str(data.get("clipboard_size", ""))
+                if data.get("clipboard_pending"):
+                    image_path = "保存中..."
                 return f"剪贴板图片\n尺寸: {size}\n路径: {image_path}"
 
             if item_type == "clipboard_center":
@@ -571,6 +675,9 @@ class SearchWindow(AcrylicWindow):
                         pass
             return "\n".join(lines).strip()
 
+        if item_type == "file_load_more":
+            return "继续加载下一页文件搜索结果，滚动到列表底部也会自动加载。"
+
         if item_type == "hosts_cmd":
             return "打开 Hosts 管理中心，可编辑方案、拉取远程配置并应用到系统。"
 
@@ -611,25 +718,40 @@ class SearchWindow(AcrylicWindow):
         except Exception:
             return 0
 
+    def _file_icon(self, path):
+        key = os.path.normcase(path)
+        icon = self._file_icon_cache.get(key)
+        if icon is not None:
+            self._file_icon_cache.move_to_end(key)
+            return icon
+        if not os.path.exists(path):
+            return None
+        try:
+            icon = self._file_icon_provider.icon(QFileInfo(path))
+        except Exception:
+            return None
+        self._file_icon_cache[key] = icon
+        while len(self._file_icon_cache) > 512:
+            self._file_icon_cache.popitem(last=False)
+        return icon
+
     def _icon_for_item(self, data):
         item_type = str(data.get("type", "")).strip() if isinstance(data, dict) else ""
         if item_type == "custom_launch":
             target = str(data.get("launch_target", "")).strip()
-            if target and os.path.exists(target):
-                try:
-                    return self._file_icon_provider.icon(QFileInfo(target))
-                except Exception:
-                    pass
+            icon = self._file_icon(target) if target else None
+            if icon is not None:
+                return icon
 
         path = str(data.get("path", "")).strip() if isinstance(data, dict) else ""
-        if path and os.path.exists(path):
-            try:
-                return self._file_icon_provider.icon(QFileInfo(path))
-            except Exception:
-                pass
+        icon = self._file_icon(path) if path else None
+        if icon is not None:
+            return icon
 
         if item_type == "app":
             return self.style().standardIcon(self.style().StandardPixmap.SP_ComputerIcon)
+        if item_type == "file_load_more":
+            return self.style().standardIcon(self.style().StandardPixmap.SP_ArrowDown)
         if item_type in {"plugin_trigger", "command_hint", "workflow_run"}:
             return self.style().standardIcon(
                 self.style().StandardPixmap.SP_CommandLink
@@ -663,6 +785,8 @@ class SearchWindow(AcrylicWindow):
             return "命令"
         if item_type == "workflow_run":
             return "工作流"
+        if item_type == "file_load_more":
+            return "分页"
         if item_type == "clipboard_entry":
             return "剪贴板"
         if item_type == "capture_entry":
@@ -809,6 +933,16 @@ class SearchWindow(AcrylicWindow):
 
         icon = self._icon_for_item(data)
         self.preview_icon_box.setPixmap(icon.pixmap(QSize(82, 82)))
+        self._preview_thumbnail_id = ""
+        thumbnail_path = self._preview_thumbnail_path(data)
+        if thumbnail_path:
+            request_id, image = thumbnail_service.request(
+                thumbnail_path, QSize(164, 164)
+            )
+            if image is not None:
+                self._set_preview_thumbnail(image)
+            else:
+                self._preview_thumbnail_id = request_id
         self.preview_name.setText(str(data.get("name", "")).strip() or "未命名")
 
         rows = [
@@ -836,6 +970,35 @@ class SearchWindow(AcrylicWindow):
 
         self.preview_secondary_button.setEnabled(bool(path))
 
+    @staticmethod
+    def _preview_thumbnail_path(data):
+        item_type = data.get("type")
+        if item_type == "capture_entry":
+            return str(data.get("capture_image_path", ""))
+        if (
+            item_type == "clipboard_entry"
+            and data.get("clipboard_type") == "image"
+            and not data.get("clipboard_pending")
+        ):
+            return str(data.get("clipboard_image_path", ""))
+        return ""
+
+    def _set_preview_thumbnail(self, image):
+        self.preview_icon_box.setPixmap(
+            QPixmap.fromImage(image).scaled(
+                QSize(82, 82),
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.SmoothTransformation,
+            )
+        )
+
+    def _on_thumbnail_ready(self, request_id, image):
+        if not request_id or request_id != self._preview_thumbnail_id:
+            return
+        self._preview_thumbnail_id = ""
+        if not image.isNull():
+            self._set_preview_thumbnail(image)
+
     def _handle_preview_primary(self):
         if isinstance(self._current_preview_data, dict):
             self.handle_item_action(self._current_preview_data)
@@ -1004,6 +1167,9 @@ class SearchWindow(AcrylicWindow):
         self.result_list.itemClicked.connect(self.on_item_clicked)
         self.result_list.itemDoubleClicked.connect(self.on_item_double_clicked)
         self.result_list.currentItemChanged.connect(self.on_result_item_changed)
+        self.result_list.verticalScrollBar().valueChanged.connect(
+            self._on_result_list_scrolled
+        )
 
         self.preview_panel = QWidget()
         self.preview_panel.setObjectName("previewPanel")
@@ -1657,6 +1823,7 @@ class SearchWindow(AcrylicWindow):
 
         self.tray_icon.setContextMenu(menu)
         self.tray_icon.show()
+        capture_history_manager.capture_saved.connect(self.on_capture_saved)
 
         # Load network monitor state
         settings = QSettings("x-tools", "network_monitor")
@@ -1712,7 +1879,10 @@ class SearchWindow(AcrylicWindow):
 
         screenshot_key = config_manager.get_hotkey("screenshot")
         if screenshot_key:
-            self.hotkey_manager.register(screenshot_key, self.screenshot_signal.emit)
+            self.hotkey_manager.register(
+                screenshot_key,
+                lambda: self.screenshot_signal.emit(time.perf_counter()),
+            )
 
         pin_key = config_manager.get_hotkey("pin_clipboard")
         if pin_key:
@@ -1723,17 +1893,31 @@ class SearchWindow(AcrylicWindow):
         self._register_hotkeys_from_config()
         self.hotkey_manager.start()
 
-    def trigger_screenshot(self):
-        # Track if monitor was visible so we can restore it later
-        self._monitor_was_visible = (
-            self.network_monitor is not None and self.network_monitor.isVisible()
-        )
-
-        self._screenshot_active = True
+    def _ensure_screenshot_overlay(self):
         if not self.screenshot_overlay:
             self.screenshot_overlay = ScreenshotOverlay()
             self.screenshot_overlay.closed.connect(self.on_screenshot_closed)
-        self.screenshot_overlay.capture_screen()
+        return self.screenshot_overlay
+
+    def _prewarm_screenshot_overlay(self):
+        if self.screenshot_overlay or self._screenshot_active:
+            return
+        try:
+            self._ensure_screenshot_overlay().prewarm()
+        except Exception as e:
+            logger.warning("Screenshot overlay prewarm failed: %s", e)
+
+    def trigger_screenshot(self, triggered_at=None):
+        # Track if monitor was visible so we can restore it later. A capture
+        # started over an open one (or a scrolling capture) keeps the value,
+        # since the monitor is already hidden by then.
+        if not self._screenshot_active:
+            self._monitor_was_visible = (
+                self.network_monitor is not None and self.network_monitor.isVisible()
+            )
+
+        self._screenshot_active = True
+        self._ensure_screenshot_overlay().capture_screen(triggered_at)
 
         # Hide monitor AFTER capture_screen grabs the screen, so it appears in the screenshot
         if self._monitor_was_visible:
@@ -1745,6 +1929,20 @@ class SearchWindow(AcrylicWindow):
         if getattr(self, "_monitor_was_visible", False) and self.network_monitor:
             QTimer.singleShot(300, self._restore_monitor_after_screenshot)
 
+    def on_capture_saved(self, path, ok):
+        # The overlay has already closed when a queued save fails.
+        if ok:
+            return
+        try:
+            self.tray_icon.showMessage(
+                "X-Tools",
+                f"无法保存截图到:\n{path}",
+                QSystemTrayIcon.MessageIcon.Warning,
+                2800,
+            )
+        except Exception:
+            pass
+
     def _restore_monitor_after_screenshot(self):
         if self.network_monitor:
             self.network_monitor.show()
@@ -1802,6 +2000,7 @@ class SearchWindow(AcrylicWindow):
     def toggle_visibility(self):
         if self.isVisible():
             self.hide()
+            logger.debug("Search prefetch stats: %s", self._search_prefetcher.stats())
         else:
             self.showNormal()
 
@@ -1826,6 +2025,55 @@ class SearchWindow(AcrylicWindow):
             self.search_bar.setFocus()
             self.search_bar.deselect()
             self.search_bar.end(False)
+            QTimer.singleShot(0, self._prefetch_on_show)
+
+    def _frecent_item_keys(self, limit):
+        ranked = sorted(
+            self._usage_counter.items(),
+            key=lambda pair: (0 if pair[0] in self._favorites else 1, -pair[1]),
+        )
+        return [key for key, _count in ranked[:limit]]
+
+    def _is_global_query(self, text):
+        plugin, _plugin_query = self._parse_inline_plugin_command(text)
+        return plugin is None
+
+    def _prefetch_on_show(self):
+        if not self.isVisible() or self.plugin_mode:
+            return
+
+        for key in self._frecent_item_keys(12):
+            path = self._usage_paths.get(key)
+            if path:
+                self._file_icon(path)
+
+        first_letters = Counter(
+            command[0].lower() for command in self._command_history if command
+        )
+        self._search_prefetcher.prefetch(
+            letter for letter, _count in first_letters.most_common(3)
+        )
+
+    def _speculate_completions(self):
+        text = self.search_bar.text().strip()
+        if not text or self.plugin_mode or not self.isVisible():
+            return
+
+        lowered = text.lower()
+        candidates = []
+        for command in self._command_history:
+            if command.lower().startswith(lowered) and command.lower() != lowered:
+                candidates.append(command)
+        for key in self._frecent_item_keys(40):
+            stem = os.path.splitext(os.path.basename(key.partition(":")[2]))[0]
+            if stem.startswith(lowered) and stem != lowered:
+                candidates.append(stem)
+
+        queries = []
+        for candidate in candidates:
+            if candidate not in queries and self._is_global_query(candidate):
+                queries.append(candidate)
+        self._search_prefetcher.prefetch(queries[:3])
 
     def on_search_query(self, text):
         if self.plugin_mode:
@@ -1834,6 +2082,7 @@ class SearchWindow(AcrylicWindow):
 
         self._pending_query = text
         self._search_debounce_timer.stop()
+        self._speculation_timer.stop()
         self._search_request_id += 1
 
         if not text.strip():
@@ -1842,10 +2091,12 @@ class SearchWindow(AcrylicWindow):
             self._set_preview_empty()
             self._search_started_at.clear()
             self._search_query_snapshot.clear()
+            self._file_paging = None
             self.adjust_size(expanded=False)
             return
 
         self._search_debounce_timer.start()
+        self._speculation_timer.start()
 
     def _perform_debounced_search(self):
         raw_query = self._pending_query
@@ -1876,14 +2127,75 @@ class SearchWindow(AcrylicWindow):
         request_id = self._search_request_id
         self._search_started_at[request_id] = time.perf_counter()
         self._search_query_snapshot[request_id] = raw_query
+        prefetched = self._search_prefetcher.lookup(query)
+        if prefetched is not None:
+            # Paint the speculative rows at once, then revalidate them with
+            # the real search below, which replaces them keeping the selection.
+            results, _file_has_more = prefetched
+            self._prefetch_hit_requests.add(request_id)
+            self._on_first_paint_results(request_id, query, list(results), [])
+
         self.search_thread = SearchThread(query, request_id)
         self.search_thread.results_found.connect(self._on_search_results)
+        self.search_thread.first_paint_ready.connect(self._on_first_paint_results)
         self.search_thread.finished.connect(self.search_thread.deleteLater)
         self.search_thread.start()
 
-    def _on_search_results(self, request_id, query, results):
+    def _is_current_search(self, request_id, raw_query):
+        if request_id != self._search_request_id:
+            return False
+        if self.plugin_mode:
+            return False
+        return raw_query.strip() == self.search_bar.text().strip()
+
+    def _on_first_paint_results(self, request_id, query, results, pending_sources):
+        raw_query = self._search_query_snapshot.get(request_id, query)
+        if not self._is_current_search(request_id, raw_query):
+            return
+        if self._first_painted_request_id == request_id:
+            # Already painted from the prefetch cache; a partial merge of the
+            # revalidating search would only drop rows from it.
+            return
+
+        started = self._search_started_at.get(request_id)
+        if started is not None:
+            metrics_store.record(
+                "search.first_paint",
+                (time.perf_counter() - started) * 1000,
+                {
+                    "query_len": len(raw_query),
+                    "result_count": len(results),
+                    "pending_sources": ",".join(pending_sources),
+                },
+            )
+        self.update_results(results, query=self.search_bar.text())
+        self._first_painted_request_id = request_id
+        if self.result_list.count() > 0:
+            self.summary_label.setText(
+                f"找到 {self.result_list.count()} 个结果，其余结果加载中..."
+            )
+
+    def _current_result_key(self):
+        item = self.result_list.currentItem()
+        data = item.data(Qt.ItemDataRole.UserRole) if item is not None else None
+        if not isinstance(data, dict):
+            return None
+        return self._item_key(data)
+
+    def _restore_current_result(self, key):
+        if not key:
+            return
+        for row in range(self.result_list.count()):
+            data = self.result_list.item(row).data(Qt.ItemDataRole.UserRole)
+            if isinstance(data, dict) and self._item_key(data) == key:
+                self.result_list.setCurrentRow(row)
+                return
+
+    def _on_search_results(self, request_id, query, results, file_has_more=False):
         raw_query = self._search_query_snapshot.pop(request_id, query)
         started = self._search_started_at.pop(request_id, None)
+        prefetch_hit = request_id in self._prefetch_hit_requests
+        self._prefetch_hit_requests.discard(request_id)
         if started is not None:
             elapsed = (time.perf_counter() - started) * 1000
             metrics_store.record(
@@ -1892,16 +2204,116 @@ class SearchWindow(AcrylicWindow):
                 {
                     "query_len": len(raw_query),
                     "result_count": len(results) if isinstance(results, list) else 0,
+                    "prefetch_hit": prefetch_hit,
                 },
             )
 
-        if request_id != self._search_request_id:
+        if not self._is_current_search(request_id, raw_query):
             return
-        if self.plugin_mode:
+
+        # Backfilling after a first paint must not yank the selection away
+        # from a row the user may already be looking at.
+        selected_key = None
+        if self._first_painted_request_id == request_id:
+            selected_key = self._current_result_key()
+        self._first_painted_request_id = None
+        self.update_results(results, query=self.search_bar.text())
+        self._restore_current_result(selected_key)
+        if file_has_more:
+            self._file_paging = {
+                "request_id": request_id,
+                "query": query,
+                "next_page": 1,
+                "loading": False,
+            }
+            self._append_load_more_item()
+            self._update_result_summary()
+
+    def _append_load_more_item(self):
+        self._append_result_item(
+            {"type": "file_load_more", "name": "加载更多文件结果"},
+            self.style().standardIcon(self.style().StandardPixmap.SP_ArrowDown),
+        )
+
+    def _take_load_more_item(self):
+        count = self.result_list.count()
+        if count == 0:
             return
-        if raw_query.strip() != self.search_bar.text().strip():
+        item = self.result_list.item(count - 1)
+        data = item.data(Qt.ItemDataRole.UserRole) if item is not None else None
+        if isinstance(data, dict) and data.get("type") == "file_load_more":
+            was_current = item is self.result_list.currentItem()
+            self.result_list.takeItem(count - 1)
+            return was_current
+        return False
+
+    def _result_item_count(self):
+        count = self.result_list.count()
+        if self._file_paging is not None and count > 0:
+            count -= 1
+        return count
+
+    def _update_result_summary(self):
+        count = self._result_item_count()
+        if self._file_paging is not None:
+            self.summary_label.setText(f"找到 {count} 个结果，滚动加载更多")
+        else:
+            self.summary_label.setText(f"找到 {count} 个结果")
+
+    def _on_result_list_scrolled(self, value):
+        paging = self._file_paging
+        if paging is None or paging.get("loading"):
             return
-        self.update_results(results, query=self.search_bar.text())
+        scroll_bar = self.result_list.verticalScrollBar()
+        if value >= scroll_bar.maximum() - scroll_bar.pageStep() // 4:
+            self._load_more_file_results()
+
+    def _load_more_file_results(self):
+        paging = self._file_paging
+        if paging is None or paging.get("loading"):
+            return
+        if paging.get("request_id") != self._search_request_id:
+            return
+
+        paging["loading"] = True
+        self.summary_label.setText(
+            f"找到 {self._result_item_count()} 个结果，正在加载更多..."
+        )
+        self.file_page_thread = FilePageThread(
+            paging["query"], paging["request_id"], paging["next_page"]
+        )
+        self.file_page_thread.page_loaded.connect(self._on_file_page_loaded)
+        self.file_page_thread.finished.connect(self.file_page_thread.deleteLater)
+        self.file_page_thread.start()
+
+    def _on_file_page_loaded(self, request_id, query, page_index, results, has_more):
+        paging = self._file_paging
+        if paging is None or request_id != self._search_request_id:
+            return
+        if self.plugin_mode or page_index != paging.get("next_page"):
+            return
+
+        started = time.perf_counter()
+        load_more_was_current = self._take_load_more_item()
+        first_new_row = self.result_list.count()
+        for raw_item in results:
+            self._append_result_item(dict(raw_item))
+
+        paging["loading"] = False
+        paging["next_page"] = page_index + 1
+        if has_more and results:
+            self._append_load_more_item()
+        else:
+            self._file_paging = None
+
+        if load_more_was_current and first_new_row < self.result_list.count():
+            self.result_list.setCurrentRow(first_new_row)
+        self._update_result_summary()
+        metrics_store.record(
+            "search.file_page",
+            (time.perf_counter() - started) * 1000,
+            {"page": page_index, "result_count": len(results)},
+        )
 
     def execute_plugin(self, text):
         if not self.plugin_mode:
@@ -1909,68 +2321,70 @@ class SearchWindow(AcrylicWindow):
         results = self.plugin_mode.execute(text)
         self.update_results(results, query=text, source_plugin=self.plugin_mode)
 
+    def _append_result_item(self, item_data, icon=None):
+        widget_item = QListWidgetItem(item_data.get("name", ""))
+        widget_item.setData(Qt.ItemDataRole.UserRole, item_data)
+        if icon is not None:
+            widget_item.setIcon(icon)
+        widget_item.setSizeHint(QSize(0, 82))
+
+        item_type = item_data.get("type")
+        if item_type == "app":
+            widget_item.setText(str(item_data.get("name", "")))
+        elif item_type == "sys_cmd":
+            widget_item.setForeground(QColor(108, 114, 230))
+        elif item_type in ["calc_error", "error"]:
+            widget_item.setForeground(Qt.GlobalColor.red)
+        elif item_type == "command_hint":
+            text_value = str(item_data.get("path", "")).strip()
+            widget_item.setText(text_value)
+        elif item_type == "command_template":
+            pass
+        elif item_type == "command_form":
+            pass
+        elif item_type == "command_recent":
+            pass
+        elif item_type == "command_correction":
+            pass
+        elif item_type == "workflow_run":
+            pass
+        elif item_type == "clipboard_entry":
+            pass
+        elif item_type in {"clipboard_center", "clipboard_cmd"}:
+            pass
+        elif item_type == "capture_entry":
+            pass
+        elif item_type in {"capture_center", "capture_cmd"}:
+            pass
+        elif item_type == "json_compare_cmd":
+            pass
+        elif item_type == "custom_launch":
+            pass
+        elif "path" in item_data and item_type == "file":
+            widget_item.setText(str(item_data.get("name", "")))
+
+        if self._is_favorite(item_data):
+            show_text = widget_item.text()
+            if show_text and not show_text.startswith("★ "):
+                widget_item.setText(f"★ {show_text}")
+                item_data = dict(item_data)
+                item_data["name"] = f"★ {item_data.get('name', '')}"
+                widget_item.setData(Qt.ItemDataRole.UserRole, item_data)
+
+        # qfluentwidgets still paints the QListWidgetItem text underneath a
+        # custom item widget. Clear delegate text after building row data.
+        widget_item.setText("")
+        self.result_list.addItem(widget_item)
+        self.result_list.setItemWidget(widget_item, self._create_result_row(item_data))
+
     def update_results(self, results, query=None, source_plugin=None):
         self.result_list.clear()
+        self._file_paging = None
 
         raw_text = query if query is not None else self.search_bar.text()
         text_stripped = raw_text.strip()
         text_lower = text_stripped.lower()
-
-        def add_item(item_data, icon=None):
-            widget_item = QListWidgetItem(item_data.get("name", ""))
-            widget_item.setData(Qt.ItemDataRole.UserRole, item_data)
-            if icon is not None:
-                widget_item.setIcon(icon)
-            widget_item.setSizeHint(QSize(0, 82))
-
-            item_type = item_data.get("type")
-            if item_type == "app":
-                widget_item.setText(str(item_data.get("name", "")))
-            elif item_type == "sys_cmd":
-                widget_item.setForeground(QColor(108, 114, 230))
-            elif item_type in ["calc_error", "error"]:
-                widget_item.setForeground(Qt.GlobalColor.red)
-            elif item_type == "command_hint":
-                text_value = str(item_data.get("path", "")).strip()
-                widget_item.setText(text_value)
-            elif item_type == "command_template":
-                pass
-            elif item_type == "command_form":
-                pass
-            elif item_type == "command_recent":
-                pass
-            elif item_type == "command_correction":
-                pass
-            elif item_type == "workflow_run":
-                pass
-            elif item_type == "clipboard_entry":
-                pass
-            elif item_type in {"clipboard_center", "clipboard_cmd"}:
-                pass
-            elif item_type == "capture_entry":
-                pass
-            elif item_type in {"capture_center", "capture_cmd"}:
-                pass
-            elif item_type == "json_compare_cmd":
-                pass
-            elif item_type == "custom_launch":
-                pass
-            elif "path" in item_data and item_type == "file":
-                widget_item.setText(str(item_data.get("name", "")))
-
-            if self._is_favorite(item_data):
-                show_text = widget_item.text()
-                if show_text and not show_text.startswith("★ "):
-                    widget_item.setText(f"★ {show_text}")
-                    item_data = dict(item_data)
-                    item_data["name"] = f"★ {item_data.get('name', '')}"
-                    widget_item.setData(Qt.ItemDataRole.UserRole, item_data)
-
-            # qfluentwidgets still paints the QListWidgetItem text underneath a
-            # custom item widget. Clear delegate text after building row data.
-            widget_item.setText("")
-            self.result_list.addItem(widget_item)
-            self.result_list.setItemWidget(widget_item, self._create_result_row(item_data))
+        add_item = self._append_result_item
 
         if source_plugin is None and text_lower:
             for plugin in plugin_manager.get_plugins(enabled_only=True):
@@ -2011,7 +2425,7 @@ class SearchWindow(AcrylicWindow):
                 add_item(hint_item)
 
         if self.result_list.count() > 0:
-            self.summary_label.setText(f"找到 {self.result_list.count()} 个结果")
+            self._update_result_summary()
             self.result_list.setCurrentRow(0)
             if self.results_container.isHidden():
                 self.adjust_size(expanded=True)
@@ -2054,6 +2468,10 @@ class SearchWindow(AcrylicWindow):
                 self.search_bar.end(False)
             return
 
+        if item_type == "file_load_more":
+            self._load_more_file_results()
+            return
+
         if item_type == "command_form":
             plugin = data.get("plugin")
             if plugin is not None:
@@ -2193,7 +2611,7 @@ class SearchWindow(AcrylicWindow):
             return
 
         data = item.data(Qt.ItemDataRole.UserRole)
-        if not isinstance(data, dict):
+        if not isinstance(data, dict) or data.get("type") == "file_load_more":
             return
 
         path = data.get("path")
@@ -2390,6 +2808,7 @@ class SearchWindow(AcrylicWindow):
                     "唤起各类高级工具、本地搜索与系统功能..."
                 )
                 self.result_list.clear()
+                self._file_paging = None
                 self.summary_label.setText("输入关键词开始搜索")
                 self._set_preview_empty()
                 self.adjust_size(expanded=False)
@@ -22,6 +22,8 @@ from qfluentwidgets import (
     FluentIcon as FI,
     SettingCard,
     ComboBox,
+    SpinBox,
+    DoubleSpinBox,
     NavigationItemPosition,
     LargeTitleLabel,
 )
@@ -32,7 +34,11 @@ from datetime import datetime
 import os
 import sys
 
+from src.core.capture_history import capture_history_manager
+from src.core.clipboard_history import clipboard_history_manager
+from src.core.image_store import image_store
 from src.core.metrics import metrics_store
+from src.core.result_merger import ResultMergePolicy
 from src.core.workflow_schema import validate_workflow_id
 from src.core.workflow_steps_codec import (
     extract_placeholders,
@@ -50,6 +56,17 @@ HOTKEY_ACTIONS = [
     ("pin_clipboard", "贴图", "将剪贴板图片固定到桌面"),
 ]
 
+SEARCH_MERGE_SOURCES = [
+    ("custom", "自定义启动项", FI.TAG),
+    ("app", "应用程序", FI.APPLICATION),
+    ("file", "文件", FI.FOLDER),
+]
+
+HISTORY_RETENTION_TARGETS = [
+    ("clipboard_history", "剪贴板历史", FI.PASTE),
+    ("capture_history", "截图历史", FI.CAMERA),
+]
+
 THEME_COLOR_FIELDS = [
     ("window_bg", "窗口背景", "主窗口、搜索面板和大面积容器的背景色"),
     ("input_bg", "输入背景", "搜索框、预览面板和输入区域背景"),
@@ -724,7 +741,10 @@ class MetricsDashboardPanel(QWidget):
         ("search.global", "全局搜索"),
         ("search.inline_plugin", "命令直输"),
         ("ocr.inference", "OCR 识别"),
+        ("qr.decode", "扫码识别"),
+        ("screenshot.first_paint", "截图唤起"),
         ("screenshot.save", "截图保存"),
+        ("screenshot.scroll_stitch", "长截图拼接"),
     ]
 
     def __init__(self, parent=None):
@@ -1357,8 +1377,74 @@ class SettingsWindow(FluentWindow):
         if screenshot_preview_layout is not None:
             screenshot_preview_layout.addWidget(self.screenshot_save_preview)
 
+        search_merge_group = SettingCardGroup("搜索结果合并", self.page_gen)
+
+        self.search_deadline_card = SettingCard(
+            FI.SEARCH,
+            "首屏等待时间",
+            "超过该时间仍未返回的来源先不等待，结果到达后再补充 (毫秒)",
+            search_merge_group,
+        )
+        self.search_deadline_spin = SpinBox(self.search_deadline_card)
+        self.search_deadline_spin.setRange(0, 2000)
+        self.search_deadline_spin.setSingleStep(10)
+        self.search_deadline_spin.valueChanged.connect(self.on_search_merge_changed)
+        self.search_deadline_card.hBoxLayout.addWidget(
+            self.search_deadline_spin, 0, Qt.AlignmentFlag.AlignRight
+        )
+        self.search_deadline_card.hBoxLayout.addSpacing(16)
+        search_merge_group.addSettingCard(self.search_deadline_card)
+
+        self._search_source_spins = {}
+        for source, title, icon in SEARCH_MERGE_SOURCES:
+            card = SettingCard(
+                icon,
+                f"{title}来源",
+                "最多显示条数 / 排序权重 (权重越大越靠前)",
+                search_merge_group,
+            )
+            quota_spin = SpinBox(card)
+            quota_spin.setRange(1, 200)
+            weight_spin = DoubleSpinBox(card)
+            weight_spin.setRange(0.0, 10.0)
+            weight_spin.setSingleStep(0.1)
+            weight_spin.setDecimals(1)
+            quota_spin.valueChanged.connect(self.on_search_merge_changed)
+            weight_spin.valueChanged.connect(self.on_search_merge_changed)
+            card.hBoxLayout.addWidget(quota_spin, 0, Qt.AlignmentFlag.AlignRight)
+            card.hBoxLayout.addWidget(weight_spin, 0, Qt.AlignmentFlag.AlignRight)
+            card.hBoxLayout.addSpacing(16)
+            search_merge_group.addSettingCard(card)
+            self._search_source_spins[source] = (quota_spin, weight_spin)
+
+        retention_group = SettingCardGroup("历史记录保留", self.page_gen)
+        self._retention_spins = {}
+        for prefix, title, icon in HISTORY_RETENTION_TARGETS:
+            card = SettingCard(
+                icon,
+                title,
+                "占用上限 (MB) / 未使用多少天后清理，0 表示不限；已置顶的条目不会被清理",
+                retention_group,
+            )
+            mb_spin = SpinBox(card)
+            mb_spin.setRange(0, 1024 * 1024)
+            mb_spin.setSingleStep(64)
+            days_spin = SpinBox(card)
+            days_spin.setRange(0, 3650)
+            for spin in (mb_spin, days_spin):
+                spin.valueChanged.connect(self.on_retention_changed)
+                # Evict only once the value is committed, not per keystroke.
+                spin.editingFinished.connect(self.apply_retention_settings)
+            card.hBoxLayout.addWidget(mb_spin, 0, Qt.AlignmentFlag.AlignRight)
+            card.hBoxLayout.addWidget(days_spin, 0, Qt.AlignmentFlag.AlignRight)
+            card.hBoxLayout.addSpacing(16)
+            retention_group.addSettingCard(card)
+            self._retention_spins[prefix] = (mb_spin, days_spin)
+
         self.page_gen.addGroup(screenshot_group)
         self.page_gen.addGroup(screenshot_preview_group)
+        self.page_gen.addGroup(search_merge_group)
+        self.page_gen.addGroup(retention_group)
         self.page_gen.addStretch()
 
         # ─── Page 1: Appearance ───
@@ -1847,6 +1933,8 @@ class SettingsWindow(FluentWindow):
         self.screenshot_tpl_edit.setText(
             config.get("screenshot_filename_template", "x-tools_{date}_{time}")
         )
+        self.load_search_merge_settings()
+        self.load_retention_settings()
 
         self.sync_theme_color_cards()
         self.load_workflow_settings()
@@ -1862,6 +1950,65 @@ class SettingsWindow(FluentWindow):
             self.refresh_screenshot_save_preview()
         self.refresh_settings_overview()
 
+    def load_search_merge_settings(self):
+        policy = ResultMergePolicy.from_config(self.config_manager)
+        self._loading_search_merge = True
+        try:
+            self.search_deadline_spin.setValue(policy.deadline_ms)
+            for source, (quota_spin, weight_spin) in self._search_source_spins.items():
+                quota_spin.setValue(policy.quota_for(source))
+                weight_spin.setValue(policy.weight_for(source))
+        finally:
+            self._loading_search_merge = False
+
+    def on_search_merge_changed(self, _value=None):
+        if getattr(self, "_loading_search_merge", False):
+            return
+        self.config_manager.set_value(
+            "search_first_paint_deadline_ms", self.search_deadline_spin.value()
+        )
+        self.config_manager.set_value(
+            "search_source_quotas",
+            {
+                source: quota_spin.value()
+                for source, (quota_spin, _weight) in self._search_source_spins.items()
+            },
+        )
+        self.config_manager.set_value(
+            "search_source_weights",
+            {
+                source: round(weight_spin.value(), 2)
+                for source, (_quota, weight_spin) in self._search_source_spins.items()
+            },
+        )
+
+    def load_retention_settings(self):
+        self._loading_retention = True
+        try:
+            for prefix, (mb_spin, days_spin) in self._retention_spins.items():
+                for spin, key in (
+                    (mb_spin, f"{prefix}_max_mb"),
+                    (days_spin, f"{prefix}_max_age_days"),
+                ):
+                    try:
+                        value = int(self.config_manager.get_value(key, 0) or 0)
+                    except (TypeError, ValueError):
+                        value = 0
+                    spin.setValue(value)
+        finally:
+            self._loading_retention = False
+
+    def on_retention_changed(self, _value=None):
+        if getattr(self, "_loading_retention", False):
+            return
+        for prefix, (mb_spin, days_spin) in self._retention_spins.items():
+            self.config_manager.set_value(f"{prefix}_max_mb", mb_spin.value())
+            self.config_manager.set_value(f"{prefix}_max_age_days", days_spin.value())
+
+    def apply_retention_settings(self):
+        clipboard_history_manager.reload_retention_policy(self.config_manager)
+        capture_history_manager.reload_retention_policy(self.config_manager)
+
     def on_plugin_enabled_changed(self, plugin_name, state):
         from src.core.plugin_manager import plugin_manager
 
@@ -1963,10 +2110,37 @@ class SettingsWindow(FluentWindow):
                 "startup.total",
                 "search.global",
                 "search.inline_plugin",
+                "search.first_paint",
+                "search.deadline_miss",
+                "search.prefetch",
+                "clipboard.coalesce",
+                "everything.lock_wait",
                 "ocr.inference",
+                "qr.decode",
+                "screenshot.first_paint",
                 "screenshot.save",
+                "screenshot.scroll_stitch",
             ]
         )
+        coalesce = clipboard_history_manager.coalesce_stats()
+        text += (
+            f"\n\n剪贴板变化: {coalesce['events']} 次, "
+            f"合并后处理 {coalesce['ingested']} 次, "
+            f"跳过 {coalesce['suppressed']} 次"
+        )
+        # The startup GC thread counts the blobs; until it has, say so
+        # rather than walking the store directory on the GUI thread.
+        usage = image_store.disk_usage(scan=False)
+        if usage is None:
+            text += "\n\n图片存储: 统计中…"
+        else:
+            text += (
+                f"\n\n图片存储: {usage['blob_count']} 个文件, "
+                f"{usage['total_bytes'] / 1024 / 1024:.1f} MB, "
+                f"共享 {usage['shared_count']} 个, "
+                f"未引用 {usage['orphan_count']} 个 "
+                f"({usage['orphan_bytes'] / 1024 / 1024:.1f} MB)"
+            )
         self.metrics_text.setPlainText(text)
 
     def on_clear_metrics(self):
@@ -0,0 +1,104 @@
+"""NumPy views over QImage pixels, without copying the image buffer.
+
+``image_view`` wraps a QImage's bits in an ndarray that honours the
+image's stride (``bytesPerLine``) instead of reshaping a flat copy, so
+padded rows cost nothing. The array keeps what it points into alive: a
+read-only view pins its own shallow copy of the image, so later writes to
+the caller's image detach instead of changing or freeing the pixels under
+the view; a writable view pins the caller's image itself and writes
+through to it.
+"""
+
+from PyQt6.QtGui import QImage
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Bytes per pixel of the formats a view can be taken of.
+_PIXEL_BYTES = {
+    QImage.Format.Format_RGB32: 4,
+    QImage.Format.Format_ARGB32: 4,
+    QImage.Format.Format_ARGB32_Premultiplied: 4,
+    QImage.Format.Format_RGBX8888: 4,
+    QImage.Format.Format_RGBA8888: 4,
+    QImage.Format.Format_RGBA8888_Premultiplied: 4,
+    QImage.Format.Format_RGB888: 3,
+    QImage.Format.Format_BGR888: 3,
+    QImage.Format.Format_Grayscale8: 1,
+    QImage.Format.Format_Alpha8: 1,
+}
+
+# Formats whose bytes are B, G, R, A in memory on little-endian machines,
+# which is every platform the app ships for.
+BGRA_FORMATS = frozenset(
+    {
+        QImage.Format.Format_RGB32,
+        QImage.Format.Format_ARGB32,
+        QImage.Format.Format_ARGB32_Premultiplied,
+    }
+)
+
+
+class _ImageBuffer:
+    """Owner of a view's memory: holds the image and describes its bits."""
+
+    def __init__(self, image, writable):
+        self.image = image
+        bits = image.bits() if writable else image.constBits()
+        depth = _PIXEL_BYTES[image.format()]
+        shape = (image.height(), image.width())
+        strides = (image.bytesPerLine(), depth)
+        if depth > 1:
+            shape += (depth,)
+            strides += (1,)
+        self.__array_interface__ = {
+            "version": 3,
+            "shape": shape,
+            "strides": strides,
+            "typestr": "|u1",
+            "data": (int(bits), not writable),
+        }
+
+
+def image_view(image, fmt=None, writable=False):
+    """ndarray over ``image``'s pixels, shaped ``(height, width[, channels])``.
+
+    When ``fmt`` is given and differs from the image's format the image is
+    converted first; that conversion is the only copy made. Single-byte
+    formats give a 2-D array. The view stays valid for as long as the
+    array (or any array derived from it) is alive.
+    """
+    if fmt is not None and image.format() != fmt:
+        image = image.convertToFormat(fmt)
+    if image.isNull():
+        raise ValueError("cannot view a null image")
+    if image.format() not in _PIXEL_BYTES:
+        raise ValueError(f"unsupported image format: {image.format()}")
+    # A read-only view holds its own shallow copy: if the caller then
+    # paints into ``image``, Qt detaches the caller's copy instead.
+    owner = _ImageBuffer(image if writable else QImage(image), writable)
+    return np.asarray(owner)
+
+
+def bgra_view(image):
+    """(h, w, 4) BGRA view, converting only images not already 32-bit BGRA."""
+    if image.format() in BGRA_FORMATS:
+        return image_view(image)
+    return image_view(image, QImage.Format.Format_ARGB32)
+
+
+def array_image(array, fmt):
+    """QImage with a copy of ``array``'s pixels in ``fmt``.
+
+    Qt does not keep Python buffers alive, so the image owns its pixels;
+    strided arrays are copied row by row without a contiguous temporary.
+    """
+    if fmt not in _PIXEL_BYTES:
+        raise ValueError(f"unsupported image format: {fmt}")
+    height, width = array.shape[:2]
+    image = QImage(width, height, fmt)
+    image_view(image, writable=True)[...] = array
+    return image
@@ -0,0 +1,101 @@
+import unittest
+
+from src.core.annotation_history import AnnotationHistory
+
+
+def _stroke(index, length=3):
+    return {
+        "type": "pen",
+        "color": "#FF0000",
+        "points": [(index, step) for step in range(length)],
+        "thickness": 2,
+    }
+
+
+class TestAnnotationHistory(unittest.TestCase):
+    def _draw(self, history, actions, count, length=3):
+        for _ in range(count):
+            history.record(actions)
+            actions.append(_stroke(len(actions), length))
+
+    def test_undo_and_redo_walk_every_checkpoint(self):
+        history = AnnotationHistory()
+        actions = []
+        self._draw(history, actions, 3)
+        states = [list(actions)]
+
+        history.record(actions)
+        actions[1] = dict(actions[1], points=[(9, 9)])
+        history.record(actions)
+        del actions[0]
+
+        self.assertTrue(history.undo(actions))
+        self.assertEqual(actions[1]["points"], [(9, 9)])
+        self.assertTrue(history.undo(actions))
+        self.assertEqual(actions, states[0])
+        for expected in (2, 1, 0):
+            self.assertTrue(history.undo(actions))
+            self.assertEqual(len(actions), expected)
+        self.assertFalse(history.undo(actions))
+
+        for _ in range(4):
+            self.assertTrue(history.redo(actions))
+        self.assertEqual(actions[1]["points"], [(9, 9)])
+        self.assertTrue(history.redo(actions))
+        self.assertEqual(len(actions), 2)
+        self.assertFalse(history.redo(actions))
+
+    def test_in_place_value_changes_are_undone(self):
+        history = AnnotationHistory()
+        actions = [_stroke(0)]
+        history.record(actions)
+        actions[0]["points"] = [(5, 5)]
+
+        history.undo(actions)
+        self.assertEqual(actions[0]["points"], _stroke(0)["points"])
+        history.redo(actions)
+        self.assertEqual(actions[0]["points"], [(5, 5)])
+
+    def test_new_edit_discards_redo(self):
+        history = AnnotationHistory()
+        actions = []
+        self._draw(history, actions, 2)
+        history.undo(actions)
+
+        self._draw(history, actions, 1)
+
+        self.assertFalse(history.can_redo())
+        self.assertEqual(len(history), 2)
+
+    def test_unchanged_points_are_shared_not_copied(self):
+        history = AnnotationHistory()
+        actions = []
+        self._draw(history, actions, 5)
+        points = actions[0]["points"]
+
+        history.undo(actions)
+        history.undo(actions)
+        history.redo(actions)
+
+        self.assertIs(actions[0]["points"], points)
+
+    def test_depth_and_memory_caps_drop_oldest_steps(self):
+        history = AnnotationHistory(max_depth=10)
+        actions = []
+        self._draw(history, actions, 25)
+        self.assertEqual(len(history), 10)
+        while history.undo(actions):
+            pass
+        self.assertEqual(len(actions), 15)
+
+        history = AnnotationHistory(max_bytes=20_000)
+        actions = []
+        self._draw(history, actions, 50, length=50)
+        self.assertLessEqual(history.memory_usage(), 20_000)
+        self.assertLess(len(history), 50)
+        history.undo(actions)
+        self.assertEqual(len(actions), 49)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,15 @@
 import os
 import tempfile
 import unittest
+from datetime import datetime
+from unittest import mock
 
-from PyQt6.QtGui import QColor, QPixmap
+from PyQt6.QtGui import QColor, QImage, QPixmap
 from PyQt6.QtWidgets import QApplication
 
 from src.core import capture_history as capture_history_module
+from src.core.image_store import ImageStore
+from src.core.retention import BackgroundCleaner, RetentionPolicy
 
 
 app = QApplication.instance() or QApplication([])
@@ -22,17 +26,25 @@ class TestCaptureHistoryManager(unittest.TestCase):
             self.tmp.name, "capture_history.json"
         )
         capture_history_module.IMAGE_DIR = os.path.join(self.tmp.name, "capture_images")
-        self.manager = capture_history_module.CaptureHistoryManager()
+        self.image_store = ImageStore(os.path.join(self.tmp.name, "images"))
+        self.cleaner = BackgroundCleaner()
+        self.manager = capture_history_module.CaptureHistoryManager(
+            image_store=self.image_store,
+            retention_policy=RetentionPolicy(max_entries=300),
+            cleaner=self.cleaner,
+        )
 
     def tearDown(self):
+        self.cleaner.flush(5)
         capture_history_module.XTOOLS_DIR = self.old_xtools_dir
         capture_history_module.HISTORY_FILE = self.old_history_file
         capture_history_module.IMAGE_DIR = self.old_image_dir
+        self.image_store.close()
         self.tmp.cleanup()
 
-    def _pixmap(self):
+    def _pixmap(self, color="#FFFFFF"):
         pixmap = QPixmap(12, 8)
-        pixmap.fill(QColor("#FFFFFF"))
+        pixmap.fill(QColor(color))
         return pixmap
 
     def test_add_capture_persists_history_copy_and_search_result(self):
@@ -61,6 +73,148 @@ class TestCaptureHistoryManager(unittest.TestCase):
         self.assertFalse(os.path.exists(image_path))
         self.assertEqual(self.manager.get_entries(), [])
 
+    def test_byte_budget_keeps_pinned_and_newest_captures(self):
+        pinned = self.manager.add_capture(self._pixmap("#111111"))
+        self.manager.toggle_pin(pinned["id"])
+        old = self.manager.add_capture(self._pixmap("#222222"))
+        budget = os.path.getsize(old["image_path"]) + 1
+        self.manager.set_retention_policy(
+            RetentionPolicy(max_entries=300, max_bytes=budget)
+        )
+
+        newest = self.manager.add_capture(self._pixmap("#333333"))
+        self.cleaner.flush(5)
+
+        self.assertEqual(
+            {entry["id"] for entry in self.manager.get_entries()},
+            {pinned["id"], newest["id"]},
+        )
+        self.assertFalse(os.path.exists(old["image_path"]))
+        self.assertTrue(os.path.exists(pinned["image_path"]))
+
+    def test_identical_captures_share_one_byte_charge(self):
+        first = self.manager.add_capture(self._pixmap("#444444"))
+        budget = os.path.getsize(first["image_path"]) + 1
+        self.manager.set_retention_policy(
+            RetentionPolicy(max_entries=300, max_bytes=budget)
+        )
+
+        second = self.manager.add_capture(self._pixmap("#444444"))
+
+        self.assertEqual(second["image_path"], first["image_path"])
+        self.assertEqual(len(self.manager.get_entries()), 2)
+
+    def _flush_writes(self):
+        self.manager.wait_for_writes(5)
+        app.processEvents()
+
+    def test_submitted_capture_is_encoded_once_for_save_and_history(self):
+        saved = []
+        self.manager.capture_saved.connect(lambda path, ok: saved.append((path, ok)))
+        save_path = os.path.join(self.tmp.name, "shots", "shot.png")
+        os.makedirs(os.path.dirname(save_path))
+        unrelated = f"{save_path}.tmp"
+        with open(unrelated, "w", encoding="utf-8") as f:
+            f.write("not ours")
+
+        encodes = []
+        original_save = QImage.save
+
+        def counting_save(image, *args):
+            encodes.append(args[0])
+            return original_save(image, *args)
+
+        with mock.patch.object(QImage, "save", counting_save):
+            capture_id = self.manager.submit_capture(
+                self._pixmap("#445566").toImage(),
+                source="manual",
+                actions=["copy", "save"],
+                save_path=save_path,
+                save_source="manual",
+            )
+            self._flush_writes()
+
+        self.assertEqual(len(encodes), 1)
+        self.assertEqual(saved, [(save_path, True)])
+        entry = self.manager.get_entry(capture_id)
+        self.assertEqual(entry["saved_path"], save_path)
+        self.assertEqual(entry["actions"], ["copy", "save"])
+        with open(entry["image_path"], "rb") as blob, open(save_path, "rb") as copy:
+            self.assertEqual(blob.read(), copy.read())
+        # The saved file is a copy: editing it must not touch the shared blob.
+        self.assertFalse(os.path.samefile(entry["image_path"], save_path))
+        self.assertEqual(
+            sorted(os.listdir(os.path.dirname(save_path))),
+            ["shot.png", "shot.png.tmp"],
+        )
+
+        self.manager.delete_entry(capture_id)
+        self.assertTrue(os.path.exists(save_path))
+
+    def test_failed_save_still_records_history_without_save_action(self):
+        saved = []
+        self.manager.capture_saved.connect(lambda path, ok: saved.append((path, ok)))
+        blocker = os.path.join(self.tmp.name, "not-a-dir")
+        with open(blocker, "w", encoding="utf-8") as f:
+            f.write("x")
+        save_path = os.path.join(blocker, "shot.png")
+
+        capture_id = self.manager.submit_capture(
+            self._pixmap(), actions=["save"], save_path=save_path
+        )
+        self._flush_writes()
+
+        self.assertEqual(saved, [(save_path, False)])
+        entry = self.manager.get_entry(capture_id)
+        self.assertEqual(entry["saved_path"], "")
+        self.assertEqual(entry["actions"], [])
+
+    def _add_at(self, when, color, **kwargs):
+        with mock.patch.object(
+            capture_history_module.time, "time", return_value=when.timestamp()
+        ):
+            return self.manager.add_capture(self._pixmap(color), **kwargs)
+
+    def test_search_and_filters_by_date_source_and_action(self):
+        old = self._add_at(
+            datetime(2026, 1, 5, 9, 30), "#111111", source="auto", actions=["save"]
+        )
+        mid = self._add_at(
+            datetime(2026, 3, 1, 12, 0),
+            "#222222",
+            source="manual",
+            actions=["copy", "pin"],
+        )
+        new = self._add_at(
+            datetime(2026, 3, 2, 8, 0), "#333333", source="manual", actions=["copy"]
+        )
+
+        def ids(**kwargs):
+            return [entry["id"] for entry in self.manager.get_entries(**kwargs)]
+
+        self.assertEqual(ids(), [new["id"], mid["id"], old["id"]])
+        self.assertEqual(ids(query="2026-01-05 09"), [old["id"]])
+        self.assertEqual(ids(query="copy pin"), [mid["id"]])
+        self.assertEqual(ids(query="manual"), [new["id"], mid["id"]])
+        self.assertEqual(ids(query="screenshot", limit=2), [new["id"], mid["id"]])
+        self.assertEqual(ids(source="manual", action="pin"), [mid["id"]])
+        self.assertEqual(
+            ids(since=datetime(2026, 3, 1), until=datetime(2026, 3, 2)), [mid["id"]]
+        )
+        self.assertEqual(
+            ids(query="12x8", since=datetime(2026, 2, 1).date()),
+            [new["id"], mid["id"]],
+        )
+        self.assertEqual(self.manager.sources(), ["auto", "manual"])
+        self.assertEqual(self.manager.actions(), ["copy", "pin", "save"])
+
+        self.manager.toggle_pin(old["id"])
+        self.assertEqual(ids(action="save")[0], old["id"])
+        self.assertEqual(ids()[0], old["id"])
+        self.manager.delete_entry(mid["id"])
+        self.assertEqual(ids(action="pin"), [])
+        self.assertEqual(ids(query="12:00"), [])
+
 
 if __name__ == "__main__":
     unittest.main()
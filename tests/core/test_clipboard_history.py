@@ -0,0 +1,332 @@
+import json
+import os
+import tempfile
+import unittest
+
+from PyQt6.QtCore import QMimeData
+from PyQt6.QtGui import QColor, QImage
+from PyQt6.QtWidgets import QApplication
+
+from src.core import clipboard_history as clipboard_history_module
+from src.core.clipboard_store import (
+    LARGE_TEXT_THRESHOLD,
+    TEXT_PREVIEW_CHARS,
+    ClipboardHistoryStore,
+)
+from src.core.image_store import ImageStore
+from src.core.retention import BackgroundCleaner, RetentionPolicy
+
+
+app = QApplication.instance() or QApplication([])
+
+
+class _FakeClipboard:
+    def __init__(self):
+        self._mime = QMimeData()
+        self._image = QImage()
+
+    def set_text(self, text):
+        self._mime = QMimeData()
+        self._mime.setText(text)
+
+    def set_image(self, image):
+        self._mime = QMimeData()
+        self._mime.setImageData(image)
+        self._image = image
+
+    def mimeData(self):
+        return self._mime
+
+    def text(self):
+        return self._mime.text()
+
+    def image(self):
+        return self._image
+
+
+class TestClipboardHistoryManager(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self._old = {
+            name: getattr(clipboard_history_module, name)
+            for name in ("XTOOLS_DIR", "HISTORY_FILE", "DB_FILE", "IMAGE_DIR")
+        }
+        clipboard_history_module.XTOOLS_DIR = self.tmp.name
+        clipboard_history_module.HISTORY_FILE = os.path.join(
+            self.tmp.name, "clipboard_history.json"
+        )
+        clipboard_history_module.DB_FILE = os.path.join(
+            self.tmp.name, "clipboard_history.db"
+        )
+        clipboard_history_module.IMAGE_DIR = os.path.join(
+            self.tmp.name, "clipboard_images"
+        )
+        self.image_store = ImageStore(os.path.join(self.tmp.name, "images"))
+        self.cleaner = BackgroundCleaner()
+        self.managers = []
+
+    def tearDown(self):
+        self.cleaner.flush(5)
+        for manager in self.managers:
+            manager._store.close()
+        for name, value in self._old.items():
+            setattr(clipboard_history_module, name, value)
+        self.image_store.close()
+        self.tmp.cleanup()
+
+    def _manager(self, policy=None):
+        manager = clipboard_history_module.ClipboardHistoryManager(
+            image_store=self.image_store,
+            retention_policy=policy or RetentionPolicy(max_entries=100),
+            cleaner=self.cleaner,
+        )
+        manager._clipboard = _FakeClipboard()
+        self.managers.append(manager)
+        return manager
+
+    def _copy(self, manager, text):
+        manager._clipboard.set_text(text)
+        manager._on_clipboard_changed()
+
+    def test_entries_persist_across_instances(self):
+        manager = self._manager()
+        self._copy(manager, "first note")
+        self._copy(manager, "second note")
+        entry_id = manager.get_entries()[1]["id"]
+        manager.toggle_pin(entry_id)
+
+        reloaded = self._manager()
+        entries = reloaded.get_entries()
+
+        self.assertEqual([e["text"] for e in entries], ["first note", "second note"])
+        self.assertTrue(entries[0]["pinned"])
+
+    def test_search_matches_every_term_and_substrings(self):
+        manager = self._manager()
+        self._copy(manager, "deploy the release build")
+        self._copy(manager, "release notes draft")
+        self._copy(manager, "复制的中文内容")
+
+        self.assertEqual(
+            [e["text"] for e in manager.get_entries("release build")],
+            ["deploy the release build"],
+        )
+        self.assertEqual(len(manager.get_entries("lease")), 2)
+        self.assertEqual(len(manager.get_entries("no")), 1)
+        self.assertEqual(
+            [e["text"] for e in manager.get_entries("中文")], ["复制的中文内容"]
+        )
+
+    def test_delete_and_clear_remove_rows_from_store(self):
+        manager = self._manager()
+        self._copy(manager, "keep me")
+        self._copy(manager, "drop me")
+        self._copy(manager, "also drop")
+        keep_id = manager.get_entries("keep")[0]["id"]
+        manager.toggle_pin(keep_id)
+        manager.delete_entry(manager.get_entries("also")[0]["id"])
+
+        self.assertEqual(manager.clear_unpinned(), 1)
+        self.assertEqual(manager._store.count(), 1)
+        self.assertEqual(manager.get_entries("drop"), [])
+
+    def _copy_image(self, manager, color="#FF0000"):
+        image = QImage(40, 30, QImage.Format.Format_RGB32)
+        image.fill(QColor(color))
+        manager._clipboard.set_image(image)
+        manager._on_clipboard_changed()
+
+    def _flush_image_writes(self, manager):
+        self.assertTrue(manager._image_writer.wait_idle(5))
+        app.processEvents()
+
+    def test_image_entry_is_pending_until_background_write_finishes(self):
+        manager = self._manager()
+        self._copy_image(manager)
+
+        entry = manager.get_entries()[0]
+        self.assertTrue(entry["pending"])
+        self.assertEqual(manager._store.count(), 0)
+
+        self._flush_image_writes(manager)
+        entry = manager.get_entries()[0]
+        self.assertNotIn("pending", entry)
+        self.assertTrue(os.path.exists(entry["image_path"]))
+        self.assertEqual(manager._store.count(), 1)
+
+    def test_duplicate_image_is_dropped_before_encoding(self):
+        manager = self._manager()
+        self._copy_image(manager)
+        self._copy_image(manager)
+        self._flush_image_writes(manager)
+
+        self.assertEqual(len(manager.get_entries()), 1)
+        self.assertEqual(self.image_store.disk_usage()["blob_count"], 1)
+
+    def test_image_deleted_while_pending_leaves_no_file(self):
+        manager = self._manager()
+        self._copy_image(manager)
+        manager.delete_entry(manager.get_entries()[0]["id"])
+        self._flush_image_writes(manager)
+
+        self.assertEqual(self.image_store.disk_usage()["blob_count"], 0)
+        self.assertEqual(manager._store.count(), 0)
+
+    def test_byte_budget_evicts_oldest_unpinned_in_background(self):
+        manager = self._manager(RetentionPolicy(max_entries=100, max_bytes=25))
+        self._copy(manager, "a" * 10)
+        self._copy(manager, "b" * 10)
+        manager.toggle_pin(manager.get_entries()[0]["id"])
+        self._copy(manager, "c" * 10)
+        self._copy(manager, "d" * 10)
+        self._copy(manager, "e" * 10)
+
+        self.assertEqual(
+            [e["text"][0] for e in manager.get_entries()], ["b", "e", "d"]
+        )
+        self.cleaner.flush(5)
+        self.assertEqual(manager._store.count(), 3)
+
+    def test_evicted_image_releases_its_blob(self):
+        manager = self._manager(RetentionPolicy(max_entries=1))
+        self._copy_image(manager, "#FF0000")
+        self._flush_image_writes(manager)
+        self._copy_image(manager, "#00FF00")
+        self._flush_image_writes(manager)
+        self.cleaner.flush(5)
+
+        self.assertEqual(len(manager.get_entries()), 1)
+        self.assertEqual(self.image_store.disk_usage()["blob_count"], 1)
+
+    def test_tightened_policy_applies_immediately(self):
+        manager = self._manager()
+        for index in range(5):
+            self._copy(manager, f"note {index}")
+
+        manager.set_retention_policy(RetentionPolicy(max_entries=2))
+
+        self.assertEqual(
+            [e["text"] for e in manager.get_entries()], ["note 4", "note 3"]
+        )
+
+    def test_large_text_is_stored_compressed_and_read_on_demand(self):
+        manager = self._manager()
+        big = "log line with details\n" * (LARGE_TEXT_THRESHOLD // 10)
+        self._copy(manager, big)
+
+        entry = manager.get_entries()[0]
+        self.assertEqual(len(entry["text"]), TEXT_PREVIEW_CHARS)
+        self.assertEqual(entry["text_length"], len(big.strip()))
+        result = manager.as_search_results()[0]
+        self.assertEqual(len(result["clipboard_text"]), TEXT_PREVIEW_CHARS)
+        self.assertEqual(result["clipboard_text_length"], len(big.strip()))
+
+        reloaded = self._manager()
+        entry_id = reloaded.get_entries()[0]["id"]
+        self.assertEqual(reloaded.get_entry_text(entry_id), big.strip())
+        self.assertEqual(reloaded.get_entry_text(entry_id, max_chars=30), big[:30])
+        self.assertEqual(len(reloaded.get_entries("details")), 1)
+
+        reloaded.delete_entry(entry_id)
+        self.assertEqual(reloaded._store.text_blob_count(), 0)
+
+    def test_store_upgrade_moves_inline_large_texts_out(self):
+        import sqlite3
+
+        big = "x" * (LARGE_TEXT_THRESHOLD + 1)
+        conn = sqlite3.connect(clipboard_history_module.DB_FILE)
+        conn.execute(
+            "CREATE TABLE entries (id TEXT PRIMARY KEY, type TEXT NOT NULL, "
+            "text TEXT NOT NULL DEFAULT '', image_path TEXT NOT NULL DEFAULT '', "
+            "created_at REAL NOT NULL, pinned INTEGER NOT NULL DEFAULT 0, "
+            "signature TEXT NOT NULL DEFAULT '', width INTEGER NOT NULL DEFAULT 0, "
+            "height INTEGER NOT NULL DEFAULT 0)"
+        )
+        conn.execute(
+            "INSERT INTO entries (id, type, text, created_at) VALUES "
+            "('old', 'text', ?, 1)",
+            (big,),
+        )
+        conn.commit()
+        conn.close()
+
+        store = ClipboardHistoryStore(clipboard_history_module.DB_FILE)
+        try:
+            entry = store.load_entries()[0]
+            self.assertEqual(len(entry["text"]), TEXT_PREVIEW_CHARS)
+            self.assertEqual(entry["text_length"], len(big))
+            self.assertEqual(store.load_text(entry["text_hash"]), big)
+        finally:
+            store.close()
+
+    def test_store_drops_the_old_fts_mirror(self):
+        import sqlite3
+
+        store = ClipboardHistoryStore(clipboard_history_module.DB_FILE)
+        store.close()
+        conn = sqlite3.connect(clipboard_history_module.DB_FILE)
+        conn.execute(
+            "CREATE VIRTUAL TABLE entries_fts USING fts5("
+            "text, content='entries', content_rowid='rowid')"
+        )
+        conn.execute(
+            "CREATE TRIGGER entries_fts_insert AFTER INSERT ON entries BEGIN "
+            "INSERT INTO entries_fts (rowid, text) VALUES (new.rowid, new.text); "
+            "END"
+        )
+        conn.commit()
+        conn.close()
+
+        store = ClipboardHistoryStore(clipboard_history_module.DB_FILE)
+        store.close()
+        conn = sqlite3.connect(clipboard_history_module.DB_FILE)
+        try:
+            names = [
+                row[0]
+                for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE name LIKE 'entries_fts%'"
+                )
+            ]
+        finally:
+            conn.close()
+        self.assertEqual(names, [])
+
+    def test_burst_of_changes_is_ingested_once(self):
+        manager = self._manager()
+        for text in ("plain", "plain again", "final rich text"):
+            manager._clipboard.set_text(text)
+            manager._on_clipboard_data_changed()
+
+        self.assertTrue(manager._coalesce_timer.isActive())
+        self.assertEqual(manager.get_entries(), [])
+
+        manager._coalesce_timer.stop()
+        manager._flush_clipboard_burst()
+
+        self.assertEqual([e["text"] for e in manager.get_entries()], ["final rich text"])
+        self.assertEqual(
+            manager.coalesce_stats(), {"events": 3, "suppressed": 2, "ingested": 1}
+        )
+
+    def test_legacy_json_history_is_migrated_once(self):
+        with open(clipboard_history_module.HISTORY_FILE, "w", encoding="utf-8") as f:
+            json.dump(
+                [
+                    {"id": "a", "type": "text", "text": "legacy one", "created_at": 2},
+                    {"id": "b", "type": "text", "text": "legacy two", "created_at": 1},
+                    {"id": "c", "type": "image", "image_path": "/missing.png"},
+                ],
+                f,
+            )
+
+        manager = self._manager()
+
+        self.assertEqual([e["id"] for e in manager.get_entries()], ["a", "b"])
+        self.assertFalse(os.path.exists(clipboard_history_module.HISTORY_FILE))
+        self.assertEqual(
+            [e["id"] for e in self._manager().get_entries("two")], ["b"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+
+from src.core.clipboard_search import ClipboardSearchIndex
+from src.core.pinyin import lazy_pinyin
+
+
+NOW = 1_000_000.0
+DAY = 24 * 60 * 60
+
+
+def _entry(entry_id, text, age_days=0.0, pinned=False):
+    return {
+        "id": entry_id,
+        "type": "text",
+        "text": text,
+        "created_at": NOW - age_days * DAY,
+        "pinned": pinned,
+    }
+
+
+class TestClipboardSearchIndex(unittest.TestCase):
+    def _index(self, *entries):
+        index = ClipboardSearchIndex()
+        for entry in entries:
+            index.add(entry)
+        return index
+
+    def _ids(self, index, query, limit=200):
+        return [entry["id"] for entry in index.search(query, limit=limit, now=NOW)]
+
+    def test_exact_word_ranks_above_prefix_and_infix(self):
+        index = self._index(
+            _entry("infix", "prerelease candidate"),
+            _entry("prefix", "releases page"),
+            _entry("exact", "the release build", age_days=3),
+        )
+
+        self.assertEqual(self._ids(index, "release"), ["exact", "prefix", "infix"])
+
+    def test_every_term_must_match(self):
+        index = self._index(
+            _entry("a", "deploy the release build"),
+            _entry("b", "release notes draft"),
+        )
+
+        self.assertEqual(self._ids(index, "release build"), ["a"])
+        self.assertEqual(self._ids(index, "release missing"), [])
+
+    def test_typo_falls_back_to_fuzzy_match(self):
+        index = self._index(_entry("a", "kubernetes deployment"))
+
+        self.assertEqual(self._ids(index, "kubernets"), ["a"])
+        self.assertEqual(self._ids(index, "deplyment"), ["a"])
+
+    def test_chinese_by_characters_and_pinyin(self):
+        index = self._index(
+            _entry("cn", "复制的中文内容"),
+            _entry("en", "plain english"),
+        )
+
+        self.assertEqual(self._ids(index, "中文"), ["cn"])
+        self.assertEqual(self._ids(index, "文中"), ["cn"])
+        if lazy_pinyin is not None:
+            self.assertEqual(self._ids(index, "zhongwen"), ["cn"])
+        self.assertEqual(self._ids(index, "zw"), ["cn"])
+
+    def test_recent_entries_rank_first_within_a_tier(self):
+        index = self._index(
+            _entry("old", "meeting notes", age_days=30),
+            _entry("new", "meeting agenda", age_days=1),
+        )
+
+        self.assertEqual(self._ids(index, "meeting"), ["new", "old"])
+        self.assertEqual(self._ids(index, "meeting", limit=1), ["new"])
+
+    def test_pinned_entries_come_first(self):
+        index = self._index(
+            _entry("pinned", "api token backup", age_days=60, pinned=True),
+            _entry("recent", "api token"),
+        )
+
+        self.assertEqual(self._ids(index, "token", limit=1), ["pinned"])
+        index.set_pinned("pinned", False)
+        self.assertEqual(self._ids(index, "token"), ["recent", "pinned"])
+
+    def test_removed_entries_and_words_are_forgotten(self):
+        index = self._index(
+            _entry("a", "unique snowflake"),
+            _entry("b", "another entry"),
+        )
+
+        index.remove("a")
+
+        self.assertEqual(self._ids(index, "snow"), [])
+        self.assertEqual(self._ids(index, "snowflak"), [])
+        self.assertNotIn("a", index)
+        self.assertEqual(len(index), 1)
+
+    def test_image_entries_match_size_and_keyword(self):
+        index = self._index(
+            {"id": "img", "type": "image", "width": 40, "height": 30, "created_at": NOW}
+        )
+
+        self.assertEqual(self._ids(index, "40x30"), ["img"])
+        self.assertEqual(self._ids(index, "图片"), ["img"])
+
+
+if __name__ == "__main__":
+    unittest.main()
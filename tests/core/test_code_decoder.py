@@ -0,0 +1,111 @@
+import unittest
+from unittest import mock
+
+from PyQt6.QtGui import QColor, QImage
+
+from src.core import code_decoder
+from src.core.code_decoder import decode_codes
+from src.utils.qimage_numpy import array_image
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+cv2 = code_decoder.cv2
+
+
+def _page(width, height, codes):
+    """Light gray RGB32 page with each ``(text, module, x, y)`` QR drawn on."""
+    page = np.full((height, width), 235, np.uint8)
+    encoder = cv2.QRCodeEncoder.create()
+    for text, module, x, y in codes:
+        code = cv2.resize(
+            encoder.encode(text),
+            None,
+            fx=module,
+            fy=module,
+            interpolation=cv2.INTER_NEAREST,
+        )
+        code = cv2.copyMakeBorder(
+            code, *(4 * module,) * 4, cv2.BORDER_CONSTANT, value=255
+        )
+        page[y : y + code.shape[0], x : x + code.shape[1]] = code
+    return array_image(page, QImage.Format.Format_Grayscale8).convertToFormat(
+        QImage.Format.Format_RGB32
+    )
+
+
+@unittest.skipIf(cv2 is None, "opencv is not installed")
+class TestDecodeCodes(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(code_decoder.metrics_store, "record")
+        self.record = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_large_image_decodes_every_candidate_from_the_pyramid(self):
+        image = _page(
+            3000,
+            1800,
+            [("second", 6, 2000, 1200), ("https://example.com/a", 8, 200, 150)],
+        )
+
+        with mock.patch.object(
+            code_decoder, "_decode", wraps=code_decoder._decode
+        ) as decode:
+            codes = decode_codes(image)
+
+        self.assertEqual([c.text for c in codes], ["https://example.com/a", "second"])
+        self.assertEqual(codes[0].kind, "qr")
+        x, y = codes[0].points[0]
+        self.assertTrue(200 < x < 300 and 150 < y < 250, codes[0].points)
+        # Each candidate is decoded from a crop, never the whole image.
+        shapes = [call.args[1].shape for call in decode.call_args_list[:2]]
+        self.assertTrue(all(h < 600 and w < 600 for h, w in shapes), shapes)
+        extra = self.record.call_args.args[2]
+        self.assertEqual((extra["codes"], extra["candidates"]), (2, 2))
+        self.assertGreater(extra["pyramid_levels"], 0)
+
+    def test_small_code_beside_a_large_one_is_found_by_the_native_sweep(self):
+        image = _page(
+            3000,
+            1800,
+            [("large", 12, 300, 300), ("small", 3, 2400, 1400)],
+        )
+
+        with mock.patch.object(
+            code_decoder, "_decode", wraps=code_decoder._decode
+        ) as decode:
+            codes = decode_codes(image)
+
+        self.assertEqual([c.text for c in codes], ["large", "small"])
+        shapes = [
+            call.args[1].shape
+            for call in decode.call_args_list
+            if call.args[0] == "qr"
+        ]
+        self.assertTrue(all(h < 600 and w < 600 for h, w in shapes), shapes)
+        self.assertEqual(self.record.call_args.args[2]["candidates"], 2)
+
+    def test_image_too_small_for_a_pyramid_is_decoded_natively(self):
+        image = _page(1200, 800, [("tiny", 3, 500, 300)])
+
+        codes = decode_codes(image)
+
+        self.assertEqual([c.text for c in codes], ["tiny"])
+        extra = self.record.call_args.args[2]
+        self.assertEqual((extra["pyramid_levels"], extra["candidates"]), (0, 0))
+
+    def test_image_without_codes_and_detector_reuse(self):
+        image = QImage(200, 100, QImage.Format.Format_RGB32)
+        image.fill(QColor("#FFFFFF"))
+
+        self.assertEqual(decode_codes(image), [])
+        detector = code_decoder._detector("qr")
+        decode_codes(image)
+        self.assertIs(code_decoder._detector("qr"), detector)
+        self.assertEqual(decode_codes(QImage()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
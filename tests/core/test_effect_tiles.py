@@ -0,0 +1,101 @@
+import unittest
+from unittest import mock
+
+from PyQt6.QtCore import QPoint, QRect
+from PyQt6.QtGui import QColor, QImage, QLinearGradient, QPainter, QPixmap
+from PyQt6.QtWidgets import QApplication
+
+from src.core import effect_tiles
+from src.core.effect_tiles import EffectTileCache, blur_image, mosaic_image
+
+
+app = QApplication.instance() or QApplication([])
+
+
+def _gradient_pixmap(width, height):
+    pixmap = QPixmap(width, height)
+    painter = QPainter(pixmap)
+    gradient = QLinearGradient(0, 0, width, height)
+    gradient.setColorAt(0, QColor("#224488"))
+    gradient.setColorAt(1, QColor("#EECC22"))
+    painter.fillRect(pixmap.rect(), gradient)
+    painter.end()
+    return pixmap
+
+
+def _image(pixmap):
+    return pixmap.toImage().convertToFormat(
+        QImage.Format.Format_ARGB32_Premultiplied
+    )
+
+
+class TestEffectImages(unittest.TestCase):
+    def _two_blocks(self):
+        image = QImage(4, 2, QImage.Format.Format_ARGB32_Premultiplied)
+        image.fill(QColor("#000000"))
+        for x, y in ((0, 0), (1, 1)):
+            image.setPixelColor(x, y, QColor("#FFFFFF"))
+        return image
+
+    def test_mosaic_averages_each_block(self):
+        result = mosaic_image(self._two_blocks(), 2)
+
+        for x in (0, 1):
+            self.assertEqual(result.pixelColor(x, 0).red(), 128)
+        self.assertEqual(result.pixelColor(3, 1).red(), 0)
+
+    def test_mosaic_without_numpy_falls_back_to_scaling(self):
+        with mock.patch.object(effect_tiles, "np", None):
+            result = mosaic_image(self._two_blocks(), 2)
+
+        self.assertEqual(result.size(), self._two_blocks().size())
+        self.assertEqual(result.pixelColor(0, 0), result.pixelColor(1, 1))
+        self.assertEqual(result.pixelColor(3, 1).red(), 0)
+
+    def test_blur_keeps_size_and_softens_edges(self):
+        image = QImage(40, 10, QImage.Format.Format_ARGB32_Premultiplied)
+        image.fill(QColor("#000000"))
+        image.setPixelColor(20, 5, QColor("#FFFFFF"))
+
+        result = blur_image(image, 3)
+
+        self.assertEqual(result.size(), image.size())
+        self.assertGreater(result.pixelColor(21, 5).red(), 0)
+        self.assertLess(result.pixelColor(20, 5).red(), 255)
+
+
+class TestEffectTileCache(unittest.TestCase):
+    def test_only_tiles_under_a_region_are_built(self):
+        pixmap = _gradient_pixmap(1000, 800)
+        tiles = EffectTileCache(pixmap, block_size=10, tile_size=100)
+
+        tiles.region(QRect(120, 130, 40, 30))
+        self.assertEqual(len(tiles), 1)
+
+        tiles.region(QRect(150, 150, 100, 100))
+        self.assertEqual(len(tiles), 4)
+
+    @unittest.skipIf(effect_tiles.np is None, "numpy is not installed")
+    def test_tiled_effects_match_whole_image(self):
+        pixmap = _gradient_pixmap(300, 200)
+        rect = QRect(70, 40, 150, 120)
+        for style, effect in (("mosaic", mosaic_image), ("blur", blur_image)):
+            tiles = EffectTileCache(pixmap, style, block_size=6, tile_size=64)
+            expected = effect(_image(pixmap), 6).copy(rect)
+
+            self.assertEqual(_image(tiles.region(rect)), expected, style)
+
+    def test_region_outside_source_is_transparent(self):
+        pixmap = _gradient_pixmap(100, 100)
+        tiles = EffectTileCache(pixmap, block_size=5, tile_size=50)
+
+        region = tiles.region(QRect(80, 80, 40, 40)).toImage()
+
+        self.assertEqual(region.size().width(), 40)
+        self.assertEqual(region.pixelColor(QPoint(30, 30)).alpha(), 0)
+        self.assertEqual(region.pixelColor(QPoint(5, 5)).alpha(), 255)
+        self.assertTrue(tiles.region(QRect(200, 200, 10, 10)).isNull())
+
+
+if __name__ == "__main__":
+    unittest.main()
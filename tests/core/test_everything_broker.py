@@ -0,0 +1,118 @@
+import threading
+import time
+import unittest
+
+from src.core.everything import EverythingQueryBroker
+
+
+class _SlowClient:
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def search(self, query, max_results=20, offset=0):
+        with self._lock:
+            self.calls.append((query, max_results, offset))
+        time.sleep(self.delay)
+        return [{"name": query, "path": f"/tmp/{query}", "type": "file"}]
+
+
+class _FlakyClient:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+        self.fail = True
+
+    def search(self, query, max_results=20, offset=0):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise OSError("service unavailable")
+        return [{"name": query, "path": f"/tmp/{query}", "type": "file"}]
+
+
+class TestEverythingQueryBroker(unittest.TestCase):
+    def test_identical_inflight_queries_share_one_client_call(self):
+        client = _SlowClient()
+        broker = EverythingQueryBroker(client)
+        start = threading.Barrier(4)
+        results = []
+
+        def worker():
+            start.wait()
+            results.append(broker.search("report", max_results=20))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(client.calls, [("report", 20, 0)])
+        self.assertEqual(len(results), 4)
+        self.assertTrue(all(r == results[0] for r in results))
+        self.assertIsNot(results[0][0], results[1][0])
+
+    def test_recent_results_are_served_from_cache_until_ttl(self):
+        client = _SlowClient(delay=0)
+        broker = EverythingQueryBroker(client, cache_ttl=60)
+
+        broker.search("a")
+        broker.search("a")
+        broker.search("a", offset=20)
+
+        self.assertEqual(client.calls, [("a", 20, 0), ("a", 20, 20)])
+        self.assertEqual(broker.cache_hit_count, 1)
+
+        broker.clear_cache()
+        broker.search("a")
+        self.assertEqual(len(client.calls), 3)
+
+    def test_expired_results_are_fetched_again(self):
+        client = _SlowClient(delay=0)
+        broker = EverythingQueryBroker(client, cache_ttl=0)
+
+        broker.search("a")
+        time.sleep(0.01)
+        broker.search("a")
+
+        self.assertEqual(len(client.calls), 2)
+
+    def test_failed_query_is_not_cached(self):
+        client = _FlakyClient()
+        broker = EverythingQueryBroker(client, cache_ttl=60)
+
+        with self.assertRaises(OSError):
+            broker.search("a")
+        client.fail = False
+        results = broker.search("a")
+
+        self.assertEqual(client.calls, 2)
+        self.assertEqual(results[0]["name"], "a")
+
+    def test_waiters_receive_the_leaders_error(self):
+        client = _FlakyClient(delay=0.05)
+        broker = EverythingQueryBroker(client, cache_ttl=60)
+        start = threading.Barrier(3)
+        errors = []
+
+        def worker():
+            start.wait()
+            try:
+                broker.search("a")
+            except OSError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(errors), 3)
+        self.assertEqual(client.calls + broker.coalesced_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
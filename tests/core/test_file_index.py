@@ -0,0 +1,175 @@
+import os
+import tempfile
+import time
+import unittest
+
+from src.core.file_index import FileIndex
+
+
+class TestFileIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmp.name, "root")
+        self.index_file = os.path.join(self.tmp.name, "file_index.bin")
+        os.makedirs(os.path.join(self.root, "docs", "reports"))
+        os.makedirs(os.path.join(self.root, "node_modules", "pkg"))
+        self._touch("docs", "reports", "Quarterly Report.pdf")
+        self._touch("docs", "notes.txt")
+        self._touch("node_modules", "pkg", "report.js")
+        self.index = FileIndex([self.root], index_file=self.index_file)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _touch(self, *parts):
+        path = os.path.join(self.root, *parts)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("x")
+        return path
+
+    def _bump_mtime(self, *parts):
+        path = os.path.join(self.root, *parts)
+        future = time.time() + 5
+        os.utime(path, (future, future))
+
+    def _names(self, query, **kwargs):
+        return [item["name"] for item in self.index.search(query, **kwargs)]
+
+    def test_build_indexes_names_and_skips_excluded_dirs(self):
+        self.index.build()
+
+        results = self.index.search("report")
+        self.assertEqual(
+            [item["name"] for item in results], ["reports", "Quarterly Report.pdf"]
+        )
+        self.assertEqual(
+            results[1]["path"],
+            os.path.join(self.root, "docs", "reports", "Quarterly Report.pdf"),
+        )
+        self.assertEqual(results[1]["type"], "file")
+
+    def test_multi_term_and_short_queries(self):
+        self.index.build()
+
+        self.assertEqual(self._names("quart pdf"), ["Quarterly Report.pdf"])
+        self.assertEqual(self._names("no"), ["notes.txt"])
+        self.assertEqual(self._names("missing"), [])
+
+    def test_offset_pages_through_ranked_matches(self):
+        for i in range(5):
+            self._touch("docs", f"log-{i}.txt")
+        self.index.build()
+
+        first = self._names("log", max_results=2)
+        second = self._names("log", max_results=2, offset=2)
+
+        self.assertEqual(len(first), 2)
+        self.assertEqual(len(second), 2)
+        self.assertFalse(set(first) & set(second))
+
+    def test_prefix_hit_outranks_many_earlier_substring_hits(self):
+        for i in range(30):
+            self._touch("docs", f"old-log-{i:02d}.txt")
+        self._touch("docs", "log.txt")
+        self.index.build()
+
+        self.assertEqual(self._names("log", max_results=1), ["log.txt"])
+
+    def test_short_terms_match_prefixes_and_scan_is_bounded(self):
+        for i in range(30):
+            self._touch("docs", f"old-log-{i:02d}.txt")
+        self._touch("docs", "log.txt")
+        self.index.build()
+
+        self.assertEqual(self._names("lo"), ["log.txt"])
+        # A longer term supplies substring candidates for the short one.
+        self.assertEqual(len(self._names("lo txt", max_results=50)), 31)
+        self.assertEqual(
+            self._names("log", max_results=1, max_candidates=2), ["log.txt"]
+        )
+        self.assertLessEqual(
+            len(self._names("log", max_results=50, max_candidates=10)), 10
+        )
+
+    @unittest.skipIf(os.name == "nt", "file names are Unicode on Windows")
+    def test_non_utf8_name_keeps_its_path_across_refresh(self):
+        raw = os.path.join(os.fsencode(self.root), b"docs", b"caf\xe9-menu.txt")
+        with open(raw, "wb") as f:
+            f.write(b"x")
+        self.index.build()
+        size = len(self.index)
+
+        results = self.index.search("menu")
+        self.assertEqual(len(results), 1)
+        self.assertEqual(os.fsencode(results[0]["path"]), raw)
+        self.assertTrue(os.path.exists(results[0]["path"]))
+
+        self._bump_mtime("docs")
+        self.index.refresh()
+        self.assertEqual(len(self.index), size)
+        self.assertEqual(self.index._dead_count, 0)
+
+    def test_refresh_picks_up_added_and_removed_entries(self):
+        self.index.build()
+
+        self._touch("docs", "budget.xlsx")
+        os.remove(os.path.join(self.root, "docs", "notes.txt"))
+        self._bump_mtime("docs")
+        self.index.refresh()
+
+        self.assertEqual(self._names("budget"), ["budget.xlsx"])
+        self.assertEqual(self._names("notes"), [])
+
+    def test_generation_changes_only_when_entries_change(self):
+        self.index.build()
+        generation = self.index.generation
+
+        self._bump_mtime("docs")
+        self.index.refresh()
+        self.assertEqual(self.index.generation, generation)
+
+        self._touch("docs", "budget.xlsx")
+        self._bump_mtime("docs")
+        self.index.refresh()
+        self.assertNotEqual(self.index.generation, generation)
+
+    def test_refresh_drops_removed_directory_subtree(self):
+        self.index.build()
+
+        os.remove(os.path.join(self.root, "docs", "reports", "Quarterly Report.pdf"))
+        os.rmdir(os.path.join(self.root, "docs", "reports"))
+        self._bump_mtime("docs")
+        self.index.refresh()
+
+        self.assertEqual(self._names("report"), [])
+
+    def test_save_and_load_round_trip(self):
+        self.index.build()
+        self.index.save()
+
+        restored = FileIndex([self.root], index_file=self.index_file)
+        self.assertTrue(restored.load())
+
+        self.assertEqual(len(restored), len(self.index))
+        self.assertEqual(
+            [item["path"] for item in restored.search("report")],
+            [item["path"] for item in self.index.search("report")],
+        )
+
+        self._touch("docs", "after-load.md")
+        self._bump_mtime("docs")
+        restored.refresh()
+        self.assertEqual(
+            [item["name"] for item in restored.search("after")], ["after-load.md"]
+        )
+
+    def test_load_rejects_index_for_other_roots(self):
+        self.index.build()
+        self.index.save()
+
+        other = FileIndex([self.tmp.name], index_file=self.index_file)
+        self.assertFalse(other.load())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import threading
+import unittest
+
+from src.platform.file_search import FileSearchPager, IndexedFileSearchProvider
+
+
+class _FakeProvider:
+    def __init__(self, total):
+        self.total = total
+        self.calls = []
+
+    def search(self, query, max_results=20, offset=0):
+        self.calls.append((query, max_results, offset))
+        end = min(self.total, offset + max_results)
+        return [
+            {"name": f"{query}-{i}", "path": f"/tmp/{query}-{i}", "type": "file"}
+            for i in range(offset, end)
+        ]
+
+
+class _BlockingIndex:
+    generation = 0
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.loaded = threading.Event()
+
+    def load(self):
+        self.release.wait(2)
+        self.loaded.set()
+
+    def refresh(self):
+        pass
+
+    def search(self, query, max_results=20, offset=0):
+        return []
+
+
+class TestFileSearchPager(unittest.TestCase):
+    def test_fetch_page_uses_offset_and_reports_more_pages(self):
+        provider = _FakeProvider(total=25)
+        pager = FileSearchPager(provider, page_size=10)
+
+        first, first_more = pager.fetch_page("doc", 0)
+        third, third_more = pager.fetch_page("doc", 2)
+
+        self.assertEqual(len(first), 10)
+        self.assertTrue(first_more)
+        self.assertEqual([item["name"] for item in third], [f"doc-{i}" for i in range(20, 25)])
+        self.assertFalse(third_more)
+        self.assertEqual(provider.calls, [("doc", 11, 0), ("doc", 11, 20)])
+
+    def test_exact_multiple_of_page_size_has_no_extra_page(self):
+        provider = _FakeProvider(total=20)
+        pager = FileSearchPager(provider, page_size=10)
+
+        first, first_more = pager.fetch_page("doc", 0)
+        second, second_more = pager.fetch_page("doc", 1)
+
+        self.assertEqual(len(first), 10)
+        self.assertTrue(first_more)
+        self.assertEqual(len(second), 10)
+        self.assertFalse(second_more)
+
+    def test_pages_are_cached_per_query(self):
+        provider = _FakeProvider(total=100)
+        pager = FileSearchPager(provider, page_size=10)
+
+        pager.fetch_page("doc", 1)
+        pager.fetch_page("doc", 1)
+        pager.fetch_page(" doc ", 1)
+        pager.fetch_page("img", 1)
+
+        self.assertEqual(provider.calls, [("doc", 11, 10), ("img", 11, 10)])
+
+    def test_least_recent_query_is_evicted(self):
+        provider = _FakeProvider(total=100)
+        pager = FileSearchPager(provider, page_size=10, max_queries=1)
+
+        pager.fetch_page("a", 0)
+        pager.fetch_page("b", 0)
+        pager.fetch_page("a", 0)
+
+        self.assertEqual(len(provider.calls), 3)
+
+    def test_blank_query_does_not_hit_provider(self):
+        provider = _FakeProvider(total=100)
+        pager = FileSearchPager(provider)
+
+        self.assertEqual(pager.fetch_page("  ", 0), ([], False))
+        self.assertEqual(provider.calls, [])
+
+
+class TestIndexedFileSearchProvider(unittest.TestCase):
+    def test_index_loads_in_the_background(self):
+        index = _BlockingIndex()
+        provider = IndexedFileSearchProvider(index, refresh_interval=60)
+
+        provider.start()
+        self.assertEqual(provider.search("doc"), [])
+        self.assertFalse(index.loaded.is_set())
+
+        index.release.set()
+        self.assertTrue(index.loaded.wait(2))
+
+
+if __name__ == "__main__":
+    unittest.main()
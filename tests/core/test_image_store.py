@@ -0,0 +1,210 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from PyQt6.QtGui import QColor, QImage, QPixmap
+from PyQt6.QtWidgets import QApplication
+
+from src.core import capture_history as capture_history_module
+from src.core import clipboard_history as clipboard_history_module
+from src.core.image_store import ImageStore
+
+
+app = QApplication.instance() or QApplication([])
+
+
+class _ImageClipboard:
+    def __init__(self, image):
+        from PyQt6.QtCore import QMimeData
+
+        self._image = image
+        self._mime = QMimeData()
+        self._mime.setImageData(image)
+
+    def mimeData(self):
+        return self._mime
+
+    def image(self):
+        return self._image
+
+
+class TestImageStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = ImageStore(os.path.join(self.tmp.name, "images"))
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def _write_blob(self, digest, age_seconds=0):
+        path = self.store.path_for(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(b"png")
+        if age_seconds:
+            past = time.time() - age_seconds
+            os.utime(path, (past, past))
+        return path
+
+    def test_blob_survives_until_last_reference_is_released(self):
+        path = self._write_blob("ab12")
+        self.store.add_ref("ab12", "clipboard:1")
+        self.store.add_ref("ab12", "capture:1")
+
+        self.store.release("capture:1")
+        self.assertTrue(os.path.exists(path))
+
+        self.store.release("clipboard:1")
+        self.assertFalse(os.path.exists(path))
+
+    def test_collect_garbage_skips_referenced_and_recent_blobs(self):
+        kept = self._write_blob("aa01", age_seconds=3600)
+        recent = self._write_blob("bb02")
+        orphan = self._write_blob("cc03", age_seconds=3600)
+        self.store.add_ref("aa01", "capture:1")
+
+        self.assertEqual(self.store.disk_usage()["orphan_count"], 2)
+        self.assertEqual(self.store.collect_garbage(grace_seconds=600), 1)
+
+        self.assertTrue(os.path.exists(kept))
+        self.assertTrue(os.path.exists(recent))
+        self.assertFalse(os.path.exists(orphan))
+
+    def test_disk_usage_is_kept_current_without_rescanning(self):
+        self._write_blob("ac01")
+        self.assertIsNone(self.store.disk_usage(scan=False))
+        self.assertEqual(self.store.disk_usage()["blob_count"], 1)
+
+        image = QImage(4, 4, QImage.Format.Format_RGB32)
+        image.fill(QColor("#654321"))
+        self.store.write("bd02", image)
+        self.store.add_ref("bd02", "capture:1")
+        # Written behind the store's back, so the running table misses it.
+        self._write_blob("ce03")
+
+        usage = self.store.disk_usage(scan=False)
+        self.assertEqual(usage["blob_count"], 2)
+        self.assertEqual(
+            usage["total_bytes"], 3 + os.path.getsize(self.store.path_for("bd02"))
+        )
+        self.assertEqual(usage["orphan_count"], 1)
+
+        self.store.release("capture:1")
+        self.assertEqual(self.store.disk_usage()["blob_count"], 1)
+
+    def test_reconcile_drops_stale_references_of_one_namespace(self):
+        stale = self._write_blob("dd04")
+        self._write_blob("ee05")
+        self.store.add_ref("dd04", "clipboard:gone")
+        self.store.add_ref("ee05", "capture:kept")
+
+        self.store.reconcile("clipboard", {"live": "ee05"})
+
+        self.assertFalse(os.path.exists(stale))
+        self.assertEqual(self.store.ref_count("ee05"), 2)
+
+    def test_concurrent_writes_of_one_digest_encode_once(self):
+        saved = []
+        started = threading.Event()
+
+        class _SlowImage:
+            def save(self, path, fmt):
+                saved.append(path)
+                started.set()
+                time.sleep(0.1)
+                with open(path, "wb") as f:
+                    f.write(b"png")
+                return True
+
+        results = []
+        first = threading.Thread(
+            target=lambda: results.append(self.store.write("ff06", _SlowImage()))
+        )
+        first.start()
+        started.wait(2)
+        results.append(self.store.write("ff06", _SlowImage()))
+        first.join()
+
+        self.assertEqual(results, [True, True])
+        self.assertEqual(len(saved), 1)
+        self.assertTrue(self.store.contains("ff06"))
+        self.assertEqual(os.listdir(os.path.dirname(saved[0])), ["ff06.png"])
+
+    def test_failed_write_leaves_no_temp_file_and_next_writer_retries(self):
+        class _BrokenImage:
+            def save(self, path, fmt):
+                with open(path, "wb") as f:
+                    f.write(b"partial")
+                return False
+
+        self.assertFalse(self.store.write("ab07", _BrokenImage()))
+        self.assertEqual(os.listdir(os.path.dirname(self.store.path_for("ab07"))), [])
+
+        image = QImage(4, 4, QImage.Format.Format_RGB32)
+        image.fill(QColor("#123456"))
+        self.assertTrue(self.store.write("ab07", image))
+        self.assertTrue(self.store.contains("ab07"))
+
+
+class TestSharedHistoryImages(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self._old = {
+            (module, name): getattr(module, name)
+            for module in (capture_history_module, clipboard_history_module)
+            for name in ("XTOOLS_DIR", "HISTORY_FILE", "IMAGE_DIR")
+        }
+        self._old[(clipboard_history_module, "DB_FILE")] = (
+            clipboard_history_module.DB_FILE
+        )
+        for module in (capture_history_module, clipboard_history_module):
+            module.XTOOLS_DIR = self.tmp.name
+            module.HISTORY_FILE = os.path.join(self.tmp.name, "history.json")
+            module.IMAGE_DIR = os.path.join(self.tmp.name, "legacy_images")
+        clipboard_history_module.HISTORY_FILE = os.path.join(
+            self.tmp.name, "clipboard_history.json"
+        )
+        clipboard_history_module.DB_FILE = os.path.join(self.tmp.name, "clip.db")
+        self.store = ImageStore(os.path.join(self.tmp.name, "images"))
+        self.capture = capture_history_module.CaptureHistoryManager(
+            image_store=self.store
+        )
+        self.clipboard = clipboard_history_module.ClipboardHistoryManager(
+            image_store=self.store
+        )
+
+    def tearDown(self):
+        self.clipboard._store.close()
+        self.store.close()
+        for (module, name), value in self._old.items():
+            setattr(module, name, value)
+        self.tmp.cleanup()
+
+    def test_capture_then_clipboard_copy_shares_one_blob(self):
+        pixmap = QPixmap(24, 16)
+        pixmap.fill(QColor("#3366CC"))
+        capture_entry = self.capture.add_capture(pixmap, actions=["copy"])
+
+        image = QImage(24, 16, QImage.Format.Format_ARGB32)
+        image.fill(QColor("#3366CC"))
+        self.clipboard._clipboard = _ImageClipboard(image)
+        self.clipboard._on_clipboard_changed()
+        clip_entry = self.clipboard.get_entries()[0]
+
+        self.assertEqual(clip_entry["image_path"], capture_entry["image_path"])
+        self.assertNotIn("pending", clip_entry)
+        usage = self.store.disk_usage()
+        self.assertEqual(usage["blob_count"], 1)
+        self.assertEqual(usage["shared_count"], 1)
+
+        self.capture.delete_entry(capture_entry["id"])
+        self.assertTrue(os.path.exists(clip_entry["image_path"]))
+        self.clipboard.delete_entry(clip_entry["id"])
+        self.assertFalse(os.path.exists(clip_entry["image_path"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
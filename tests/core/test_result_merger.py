@@ -0,0 +1,141 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from src.core.result_merger import (
+    DeadlineResultMerger,
+    ResultMergePolicy,
+    SpeculativeRun,
+)
+
+
+def _items(prefix, count):
+    return [{"name": f"{prefix}{i}", "path": f"/{prefix}/{i}"} for i in range(count)]
+
+
+class TestResultMergePolicy(unittest.TestCase):
+    def test_quota_caps_each_source(self):
+        policy = ResultMergePolicy(quotas={"app": 2, "file": 3})
+
+        merged = policy.merge({"app": _items("a", 10), "file": _items("f", 10)})
+
+        sources = [item["merge_source"] for item in merged]
+        self.assertEqual(sources.count("app"), 2)
+        self.assertEqual(sources.count("file"), 3)
+
+    def test_weights_interleave_sources(self):
+        policy = ResultMergePolicy(weights={"app": 2.0, "file": 1.0})
+
+        merged = policy.merge({"file": _items("f", 3), "app": _items("a", 3)})
+
+        self.assertEqual(
+            [item["name"] for item in merged],
+            ["a0", "f0", "a1", "a2", "f1", "f2"],
+        )
+        self.assertEqual([item["merge_rank"] for item in merged], list(range(6)))
+
+    def test_invalid_config_values_fall_back_to_defaults(self):
+        policy = ResultMergePolicy(
+            deadline_ms=-5, quotas={"app": "many"}, weights={"file": None}
+        )
+
+        self.assertEqual(policy.deadline_ms, 0)
+        self.assertEqual(policy.quota_for("app"), 20)
+        self.assertEqual(policy.weight_for("file"), 1.0)
+
+
+class TestDeadlineResultMerger(unittest.TestCase):
+    def test_fast_sources_paint_first_and_slow_source_backfills(self):
+        release = threading.Event()
+        first_paint = []
+
+        def slow_files():
+            release.wait(2)
+            return _items("f", 2)
+
+        def on_first_paint(results, pending):
+            first_paint.append(([item["name"] for item in results], pending))
+            release.set()
+
+        merger = DeadlineResultMerger(ResultMergePolicy(deadline_ms=20))
+        with patch("src.core.result_merger.metrics_store.record") as record:
+            merged = merger.run(
+                {"app": lambda: _items("a", 2), "file": slow_files},
+                on_first_paint=on_first_paint,
+            )
+
+        self.assertEqual(first_paint, [(["a0", "a1"], ["file"])])
+        self.assertEqual(len(merged), 4)
+        record.assert_called_once()
+        name, _duration, extra = record.call_args.args
+        self.assertEqual(name, "search.deadline_miss")
+        self.assertEqual(extra["source"], "file")
+
+    def test_no_first_paint_when_every_source_misses_deadline(self):
+        release = threading.Event()
+        first_paint = []
+
+        def slow(prefix):
+            def search():
+                release.wait(2)
+                return _items(prefix, 1)
+
+            return search
+
+        merger = DeadlineResultMerger(ResultMergePolicy(deadline_ms=10))
+        timer = threading.Timer(0.1, release.set)
+        timer.start()
+        with patch("src.core.result_merger.metrics_store.record") as record:
+            merged = merger.run(
+                {"app": slow("a"), "file": slow("f")},
+                on_first_paint=lambda *args: first_paint.append(args),
+            )
+        timer.join()
+
+        self.assertEqual(first_paint, [])
+        self.assertEqual(len(merged), 2)
+        self.assertEqual(record.call_count, 2)
+
+    def test_no_first_paint_when_every_source_meets_deadline(self):
+        first_paint = []
+        merger = DeadlineResultMerger(ResultMergePolicy(deadline_ms=1000))
+
+        with patch("src.core.result_merger.metrics_store.record") as record:
+            merged = merger.run(
+                {"app": lambda: _items("a", 1), "file": lambda: _items("f", 1)},
+                on_first_paint=lambda *args: first_paint.append(args),
+            )
+
+        self.assertEqual(first_paint, [])
+        self.assertEqual(len(merged), 2)
+        record.assert_not_called()
+
+    def test_speculative_run_records_no_miss_and_sums_source_cpu(self):
+        def slow_files():
+            started = time.thread_time()
+            while time.thread_time() - started < 0.03:
+                pass
+            return _items("f", 1)
+
+        merger = DeadlineResultMerger(ResultMergePolicy(deadline_ms=0))
+        with patch("src.core.result_merger.metrics_store.record") as record:
+            with SpeculativeRun() as speculation:
+                merged = merger.run({"file": slow_files})
+
+        self.assertEqual(len(merged), 1)
+        record.assert_not_called()
+        self.assertGreaterEqual(speculation.cpu_ms, 30.0)
+
+    def test_failing_source_contributes_no_results(self):
+        def broken():
+            raise RuntimeError("boom")
+
+        merger = DeadlineResultMerger(ResultMergePolicy(deadline_ms=1000))
+        merged = merger.run({"app": lambda: _items("a", 1), "file": broken})
+
+        self.assertEqual([item["name"] for item in merged], ["a0"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+
+from src.core.retention import HistoryEntries, RetentionIndex, RetentionPolicy
+
+
+class _FakeConfig:
+    def __init__(self, values):
+        self.values = values
+
+    def get_value(self, key, default=None):
+        return self.values.get(key, default)
+
+
+class TestRetentionIndex(unittest.TestCase):
+    def _index(self, sizes):
+        index = RetentionIndex()
+        for position, size in enumerate(sizes):
+            index.add(f"e{position}", size, last_used=100 + position)
+        return index
+
+    def test_byte_budget_evicts_least_recently_used_first(self):
+        index = self._index([40, 30, 20, 10])
+        index.touch("e0", now=200)
+
+        evicted = index.evict(RetentionPolicy(max_bytes=50), now=200)
+
+        self.assertEqual(evicted, ["e1", "e2"])
+        self.assertEqual(index.total_bytes, 50)
+        self.assertNotIn("e1", index)
+
+    def test_entry_count_includes_pinned_entries(self):
+        index = self._index([1, 1, 1])
+
+        evicted = index.evict(RetentionPolicy(max_entries=3), pinned_count=2, now=200)
+
+        self.assertEqual(evicted, ["e0", "e1"])
+
+    def test_age_limit_drops_idle_entries(self):
+        index = self._index([1, 1, 1])
+
+        evicted = index.evict(
+            RetentionPolicy(max_age_days=1), now=100.5 + 24 * 60 * 60
+        )
+
+        self.assertEqual(evicted, ["e0"])
+
+    def test_update_size_and_remove_keep_total_in_sync(self):
+        index = self._index([10, 10])
+        index.update_size("e0", 25)
+        index.remove("e1")
+
+        self.assertEqual(index.total_bytes, 25)
+        self.assertEqual(len(index), 1)
+
+    def test_policy_from_config_converts_megabytes(self):
+        policy = RetentionPolicy.from_config(
+            _FakeConfig({"clip_max_mb": 2, "clip_max_age_days": "bad"}),
+            "clip",
+            max_entries=5,
+        )
+
+        self.assertEqual(policy.max_bytes, 2 * 1024 * 1024)
+        self.assertEqual(policy.max_age_seconds, 0)
+        self.assertEqual(policy.max_entries, 5)
+
+    def test_shared_blob_is_charged_once(self):
+        index = RetentionIndex()
+        index.add("e0", 100, last_used=100, blob="d1")
+        index.add("e1", 100, last_used=101, blob="d1")
+        index.add("e2", 10, last_used=102)
+        self.assertEqual(index.total_bytes, 110)
+
+        index.update_size("e1", 120)
+        self.assertEqual(index.total_bytes, 130)
+
+        # Evicting one holder frees nothing, so eviction continues until
+        # the blob's last holder goes.
+        evicted = index.evict(RetentionPolicy(max_bytes=50), now=200)
+
+        self.assertEqual(evicted, ["e0", "e1"])
+        self.assertEqual(index.total_bytes, 10)
+
+
+class TestHistoryEntries(unittest.TestCase):
+    def test_iterates_newest_first_and_pops_by_id(self):
+        entries = HistoryEntries([{"id": "b"}, {"id": "a"}])
+        entries.add({"id": "c"})
+        entries.add({"id": "d"})
+
+        removed = entries.pop_many(["a", "c", "missing"])
+
+        self.assertEqual([e["id"] for e in entries], ["d", "b"])
+        self.assertEqual([e["id"] for e in reversed(entries)], ["b", "d"])
+        self.assertEqual(sorted(e["id"] for e in removed), ["a", "c"])
+        self.assertEqual(entries.newest()["id"], "d")
+        self.assertEqual(entries.pop("b"), {"id": "b"})
+        self.assertIsNone(entries.get("b"))
+        self.assertEqual(len(entries), 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import threading
+import unittest
+from unittest import mock
+
+from PyQt6.QtCore import QPoint, QRect
+from PyQt6.QtGui import QColor, QImage, QPainter, QPixmap
+from PyQt6.QtWidgets import QApplication
+
+from src.core import screen_capture
+from src.core.screen_capture import ScreenCapture, ScreenGrab
+
+
+app = QApplication.instance() or QApplication([])
+
+
+def _pixmap(width, height, color, scale=1.0):
+    pixmap = QPixmap(width, height)
+    pixmap.fill(QColor(color))
+    pixmap.setDevicePixelRatio(scale)
+    return pixmap
+
+
+class _FakeScreen:
+    def __init__(self, geometry, pixmap):
+        self._geometry = geometry
+        self._pixmap = pixmap
+        self.grab_thread = None
+
+    def geometry(self):
+        return self._geometry
+
+    def devicePixelRatio(self):
+        return 1.0
+
+    def grabWindow(self, window):
+        self.grab_thread = threading.current_thread()
+        return self._pixmap
+
+
+def _mixed_capture():
+    # A 2x screen on the left and a 1x screen on the right.
+    return ScreenCapture(
+        [
+            ScreenGrab(QRect(0, 0, 100, 80), _pixmap(200, 160, "#112233", 2.0), 2.0),
+            ScreenGrab(QRect(100, 0, 100, 80), _pixmap(100, 80, "#AA5500"), 1.0),
+        ]
+    )
+
+
+class TestScreenCapture(unittest.TestCase):
+    def test_desktop_is_addressed_at_the_highest_scale(self):
+        capture = _mixed_capture()
+
+        self.assertEqual(capture.virtual_rect, QRect(0, 0, 200, 80))
+        self.assertEqual((capture.width(), capture.height()), (400, 160))
+        self.assertEqual(capture.pixel_color(QPoint(10, 10)), QColor("#112233"))
+        self.assertEqual(capture.pixel_color(QPoint(390, 150)), QColor("#AA5500"))
+        self.assertIsNone(capture.pixel_color(QPoint(400, 0)))
+
+    def test_copy_assembles_only_the_requested_rect(self):
+        capture = _mixed_capture()
+
+        part = capture.copy(QRect(190, 20, 20, 10)).toImage()
+
+        self.assertEqual(part.size().width(), 20)
+        self.assertEqual(part.pixelColor(5, 5), QColor("#112233"))
+        self.assertEqual(part.pixelColor(15, 5), QColor("#AA5500"))
+        self.assertEqual(capture.copy(QRect(390, 150, 40, 40)).width(), 10)
+
+    def test_region_on_one_screen_keeps_its_native_scale(self):
+        capture = _mixed_capture()
+
+        left = capture.region(QRect(10, 10, 30, 20))
+        right = capture.region(QRect(110, 10, 30, 20))
+        spanning = capture.region(QRect(90, 10, 30, 20))
+
+        self.assertEqual((left.width(), left.devicePixelRatio()), (60, 2.0))
+        self.assertEqual((right.width(), right.devicePixelRatio()), (30, 1.0))
+        self.assertEqual((spanning.width(), spanning.devicePixelRatio()), (60, 2.0))
+
+    def test_draw_paints_each_screen_in_place(self):
+        capture = _mixed_capture()
+        canvas = QImage(200, 80, QImage.Format.Format_ARGB32)
+        canvas.fill(QColor("#FFFFFF"))
+
+        painter = QPainter(canvas)
+        capture.draw(painter, QRect(50, 0, 100, 80))
+        painter.end()
+
+        self.assertEqual(canvas.pixelColor(10, 10), QColor("#FFFFFF"))
+        self.assertEqual(canvas.pixelColor(60, 10), QColor("#112233"))
+        self.assertEqual(canvas.pixelColor(140, 10), QColor("#AA5500"))
+        self.assertEqual(canvas.pixelColor(160, 10), QColor("#FFFFFF"))
+
+    def test_grab_times_every_screen_and_threads_only_where_allowed(self):
+        screens = [
+            _FakeScreen(QRect(0, 0, 50, 40), _pixmap(100, 80, "#112233")),
+            _FakeScreen(QRect(50, 0, 50, 40), _pixmap(50, 40, "#AA5500")),
+        ]
+
+        with mock.patch.object(
+            screen_capture, "can_grab_in_threads", return_value=False
+        ):
+            capture = ScreenCapture.grab(screens)
+        self.assertFalse(capture.parallel)
+        self.assertIs(screens[0].grab_thread, threading.current_thread())
+        self.assertEqual([grab.scale for grab in capture.grabs], [2.0, 1.0])
+        self.assertEqual(len(capture.grab_times()), 2)
+
+        with mock.patch.object(
+            screen_capture, "can_grab_in_threads", return_value=True
+        ):
+            capture = ScreenCapture.grab(screens)
+        self.assertTrue(capture.parallel)
+        self.assertIsNot(screens[1].grab_thread, threading.current_thread())
+        self.assertEqual(capture.grabs[1].geometry, QRect(50, 0, 50, 40))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+from unittest import mock
+
+from PyQt6.QtGui import QImage
+
+from src.core import scroll_stitch
+from src.core.scroll_stitch import ScrollStitcher, find_shift, row_hashes
+from src.utils.qimage_numpy import array_image, bgra_view
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+WIDTH = 320
+VIEW = 300
+HEADER = 40
+FOOTER = 30
+BAND = VIEW - HEADER - FOOTER
+
+
+def _page(height):
+    """Noisy page with blank gaps, so some rows repeat and most do not."""
+    rng = np.random.default_rng(7)
+    page = rng.integers(0, 256, (height, WIDTH, 4), dtype=np.uint8)
+    page[..., 3] = 255
+    for top in range(0, height, 97):
+        page[top : top + 12] = 255
+    return page
+
+
+def _chrome(value):
+    chrome = np.full((VIEW, WIDTH, 4), value, np.uint8)
+    chrome[..., 3] = 255
+    return chrome
+
+
+def _frame(page, offset, header, footer):
+    """Viewport over ``page`` at ``offset``, under a fixed header and footer."""
+    frame = np.concatenate([header, page[offset : offset + BAND], footer])
+    return array_image(frame, QImage.Format.Format_RGB32)
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestScrollStitcher(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(scroll_stitch.metrics_store, "record")
+        self.record = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.page = _page(2000)
+        self.header = _chrome(40)[:HEADER]
+        self.footer = _chrome(200)[:FOOTER]
+
+    def _stitch(self, stitcher, offsets):
+        return [
+            stitcher.add_frame(_frame(self.page, offset, self.header, self.footer))
+            for offset in offsets
+        ]
+
+    def test_stitches_scrolled_frames_between_sticky_header_and_footer(self):
+        stitcher = ScrollStitcher(tile_height=64)
+
+        added = self._stitch(stitcher, [0, 0, 90, 215, 215, 400, 600])
+
+        self.assertEqual(added, [0, 0, 90, 125, 0, 185, 200])
+        expected = np.concatenate([self.header, self.page[: 600 + BAND], self.footer])
+        image = stitcher.image()
+        self.assertEqual((image.width(), image.height()), (WIDTH, len(expected)))
+        self.assertTrue(np.array_equal(bgra_view(image), expected))
+        self.assertEqual(self.record.call_args.args[2]["sticky"], [HEADER, FOOTER])
+
+    def test_unmatched_frame_is_skipped_until_the_page_lines_up_again(self):
+        stitcher = ScrollStitcher()
+
+        added = self._stitch(stitcher, [0, 100, 1200, 100, 250])
+
+        self.assertEqual(added, [0, 100, None, 0, 150])
+        expected = np.concatenate([self.header, self.page[: 250 + BAND], self.footer])
+        self.assertTrue(np.array_equal(bgra_view(stitcher.image()), expected))
+
+    def test_height_is_capped(self):
+        stitcher = ScrollStitcher(tile_height=100, max_height=500)
+
+        added = self._stitch(stitcher, [0, 150, 300, 450])
+
+        self.assertEqual(added, [0, 150, 50, 0])
+        self.assertTrue(stitcher.truncated)
+        self.assertEqual(stitcher.image().height(), 500)
+
+    def test_find_shift_and_single_frame(self):
+        hashes = row_hashes(self.page[:BAND])
+        self.assertEqual(find_shift(hashes, hashes), 0)
+        self.assertEqual(find_shift(hashes, row_hashes(self.page[37 : 37 + BAND])), 37)
+        self.assertIsNone(find_shift(hashes, hashes[::-1]))
+
+        stitcher = ScrollStitcher()
+        self.assertTrue(stitcher.image().isNull())
+        stitcher.add_frame(_frame(self.page, 0, self.header, self.footer))
+        self.assertEqual(stitcher.image().height(), VIEW)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from src.core.result_merger import DeadlineResultMerger, ResultMergePolicy
+from src.core.search_prefetch import SearchPrefetcher
+
+
+class _RecordingSearch:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, query):
+        with self._lock:
+            self.calls.append(query)
+        time.sleep(self.delay)
+        return [{"name": query}], False
+
+
+def _wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+class TestSearchPrefetcher(unittest.TestCase):
+    def setUp(self):
+        patcher = patch("src.core.search_prefetch.metrics_store.record")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_prefetched_query_is_a_hit(self):
+        search = _RecordingSearch()
+        prefetcher = SearchPrefetcher(search)
+
+        self.assertEqual(prefetcher.prefetch(["a", " a ", "b"]), 2)
+        self.assertTrue(_wait_until(lambda: prefetcher.prefetched == 2))
+
+        self.assertEqual(prefetcher.lookup("a"), ([{"name": "a"}], False))
+        self.assertIsNone(prefetcher.lookup("c"))
+        self.assertEqual(prefetcher.hit_rate, 0.5)
+        self.assertEqual(sorted(search.calls), ["a", "b"])
+
+    def test_cached_and_inflight_queries_are_not_repeated(self):
+        search = _RecordingSearch(delay=0.05)
+        prefetcher = SearchPrefetcher(search)
+
+        prefetcher.prefetch(["a"])
+        prefetcher.prefetch(["a"])
+        self.assertTrue(_wait_until(lambda: prefetcher.prefetched == 1))
+        prefetcher.prefetch(["a"])
+
+        self.assertEqual(search.calls, ["a"])
+
+    def test_entries_expire_after_ttl(self):
+        prefetcher = SearchPrefetcher(_RecordingSearch(), ttl_seconds=0.01)
+        prefetcher.prefetch(["a"])
+        self.assertTrue(_wait_until(lambda: prefetcher.prefetched == 1))
+
+        time.sleep(0.03)
+        self.assertIsNone(prefetcher.lookup("a"))
+
+    def test_cpu_budget_stops_further_speculation(self):
+        def busy_search(query):
+            started = time.thread_time()
+            while time.thread_time() - started < 0.02:
+                pass
+            return [], False
+
+        prefetcher = SearchPrefetcher(busy_search, cpu_budget_ms=10.0)
+        prefetcher.prefetch(["a"])
+        self.assertTrue(_wait_until(lambda: prefetcher.prefetched == 1))
+
+        self.assertEqual(prefetcher.prefetch(["b", "c"]), 0)
+        self.assertEqual(prefetcher.stats()["skipped_over_budget"], 2)
+
+    def test_cpu_spent_by_merged_sources_counts_against_the_budget(self):
+        def busy_source():
+            started = time.thread_time()
+            while time.thread_time() - started < 0.02:
+                pass
+            return []
+
+        def merged_search(query):
+            merger = DeadlineResultMerger(ResultMergePolicy(deadline_ms=1000))
+            return merger.run({"file": busy_source}), False
+
+        prefetcher = SearchPrefetcher(merged_search, cpu_budget_ms=10.0)
+        prefetcher.prefetch(["a"])
+        self.assertTrue(_wait_until(lambda: prefetcher.prefetched == 1))
+
+        self.assertGreaterEqual(prefetcher.stats()["cpu_used_ms"], 20.0)
+        self.assertEqual(prefetcher.prefetch(["b"]), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
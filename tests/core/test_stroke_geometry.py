@@ -0,0 +1,109 @@
+import math
+import unittest
+
+from PyQt6.QtCore import QPoint, QPointF, Qt
+from PyQt6.QtGui import QColor, QImage, QPainter, QPen
+
+from src.core.stroke_geometry import (
+    CHUNK_SEGMENTS,
+    StrokeGeometry,
+    add_point,
+    simplify,
+    smooth_path,
+)
+
+
+def _wave(count):
+    return [
+        QPoint(5 + index * 3, 100 + round(40 * math.sin(index / 6)))
+        for index in range(count)
+    ]
+
+
+def _render(paths, width=700, height=220):
+    image = QImage(width, height, QImage.Format.Format_ARGB32)
+    image.fill(QColor("#FFFFFF"))
+    painter = QPainter(image)
+    painter.setPen(
+        QPen(
+            QColor("#000000"),
+            4,
+            Qt.PenStyle.SolidLine,
+            Qt.PenCapStyle.RoundCap,
+            Qt.PenJoinStyle.RoundJoin,
+        )
+    )
+    for path in paths:
+        painter.drawPath(path)
+    painter.end()
+    return image
+
+
+class TestAddPoint(unittest.TestCase):
+    def test_drops_jitter_and_slides_along_straight_runs(self):
+        points = []
+        add_point(points, QPoint(0, 0))
+        self.assertFalse(add_point(points, QPoint(1, 0)))
+        add_point(points, QPoint(10, 0))
+        add_point(points, QPoint(20, 0))
+        self.assertEqual(points, [QPoint(0, 0), QPoint(20, 0)])
+
+        add_point(points, QPoint(20, 10))
+        self.assertEqual(points[-1], QPoint(20, 10))
+        self.assertEqual(len(points), 3)
+
+    def test_long_straight_runs_still_add_points(self):
+        points = []
+        for x in range(0, 200, 5):
+            add_point(points, QPoint(x, 0))
+        self.assertGreater(len(points), 200 // 24)
+        self.assertEqual(points[-1], QPoint(195, 0))
+
+
+class TestSimplify(unittest.TestCase):
+    def test_keeps_corners_and_drops_collinear_points(self):
+        points = [QPoint(x, 0) for x in range(0, 50, 5)]
+        points += [QPoint(50, y) for y in range(0, 50, 5)]
+
+        self.assertEqual(
+            simplify(points), [QPoint(0, 0), QPoint(50, 0), QPoint(50, 45)]
+        )
+        self.assertEqual(simplify(points[:2]), points[:2])
+
+
+class TestStrokeGeometry(unittest.TestCase):
+    def test_chunked_parts_draw_the_same_stroke(self):
+        points = _wave(CHUNK_SEGMENTS * 3 + 10)
+        geometry = StrokeGeometry()
+        geometry.update(points)
+
+        parts = geometry.parts()
+        self.assertEqual(len(parts), 4)
+        self.assertEqual(
+            _render(part.path for part in parts), _render([smooth_path(points)])
+        )
+        self.assertEqual(geometry.bounds(), smooth_path(points).boundingRect())
+
+    def test_growing_stroke_only_rebuilds_its_tail(self):
+        points = _wave(CHUNK_SEGMENTS + 10)
+        geometry = StrokeGeometry(15)
+        geometry.update(points)
+        chunk = geometry.parts()[0]
+        tail = geometry.parts()[-1]
+
+        geometry.update(points)
+        self.assertIs(geometry.parts()[-1], tail)
+
+        points.append(QPoint(300, 60))
+        geometry.update(points)
+        self.assertIs(geometry.parts()[0], chunk)
+        self.assertIsNot(geometry.parts()[-1], tail)
+        self.assertIsNotNone(chunk.outline)
+        self.assertTrue(geometry.bounds().contains(QPointF(300, 60)))
+
+        geometry.update(list(points[:3]))
+        self.assertEqual(len(geometry.parts()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+
+from PyQt6.QtCore import QSize
+from PyQt6.QtGui import QColor, QImage
+from PyQt6.QtWidgets import QApplication
+
+from src.core.thumbnail_cache import ThumbnailService
+
+
+app = QApplication.instance() or QApplication([])
+
+
+class TestThumbnailService(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmp.name, "thumbnails")
+        self.source = os.path.join(self.tmp.name, "ab" * 20 + ".png")
+        image = QImage(800, 400, QImage.Format.Format_RGB32)
+        image.fill(QColor("#3366CC"))
+        image.save(self.source, "PNG")
+        self.ready = []
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _service(self):
+        service = ThumbnailService(cache_dir=self.cache_dir)
+        service.thumbnail_ready.connect(
+            lambda request_id, image: self.ready.append((request_id, image))
+        )
+        return service
+
+    def _wait(self, service):
+        self.assertTrue(service.wait_idle(5000))
+        app.processEvents()
+
+    def test_thumbnail_is_scaled_into_box_and_cached_on_disk(self):
+        service = self._service()
+        request_id, image = service.request(self.source, QSize(100, 100))
+        self.assertIsNone(image)
+        self.assertTrue(request_id.startswith("ab" * 20))
+
+        self._wait(service)
+
+        self.assertEqual(len(self.ready), 1)
+        ready_id, thumbnail = self.ready[0]
+        self.assertEqual(ready_id, request_id)
+        self.assertEqual((thumbnail.width(), thumbnail.height()), (100, 50))
+        self.assertTrue(os.path.exists(service.cache_path_for(request_id)))
+
+        again_id, cached = service.request(self.source, QSize(100, 100))
+        self.assertEqual(again_id, request_id)
+        self.assertIsNotNone(cached)
+
+    def test_new_service_reads_disk_cache_instead_of_decoding(self):
+        first = self._service()
+        request_id, _ = first.request(self.source, QSize(64, 64))
+        self._wait(first)
+
+        # Blob names are content keys, so touching the file keeps the key.
+        os.utime(self.source, (1, 1))
+        self.ready.clear()
+
+        second = self._service()
+        second._decode_scaled = lambda *_: self.fail("source was decoded again")
+        second_id, _ = second.request(self.source, QSize(64, 64))
+        self._wait(second)
+
+        self.assertEqual(second_id, request_id)
+        self.assertFalse(self.ready[0][1].isNull())
+
+    def test_missing_source_yields_no_request(self):
+        service = self._service()
+        self.assertEqual(
+            service.request(os.path.join(self.tmp.name, "gone.jpg")), ("", None)
+        )
+
+    def test_prune_keeps_newest_files(self):
+        service = ThumbnailService(cache_dir=self.cache_dir, max_disk_files=2)
+        os.makedirs(self.cache_dir)
+        for index in range(4):
+            path = os.path.join(self.cache_dir, f"t{index}.png")
+            with open(path, "wb") as f:
+                f.write(b"x")
+            os.utime(path, (index + 1, index + 1))
+
+        self.assertEqual(service.prune(), 2)
+        self.assertEqual(sorted(os.listdir(self.cache_dir)), ["t2.png", "t3.png"])
+
+
+if __name__ == "__main__":
+    unittest.main()
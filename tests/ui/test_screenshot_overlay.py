@@ -1,13 +1,29 @@
+import math
 import os
+import time
 import unittest
 from unittest.mock import patch
 
 os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
 
-from PyQt6.QtCore import QEvent, QPoint, QPointF, QRect, Qt
-from PyQt6.QtGui import QColor, QMouseEvent, QPixmap
-from PyQt6.QtWidgets import QApplication
-
+from PyQt6.QtCore import QEvent, QPoint, QPointF, QRect, Qt, QTimer
+from PyQt6.QtGui import (
+    QColor,
+    QImage,
+    QLinearGradient,
+    QMouseEvent,
+    QPainter,
+    QPixmap,
+    QRegion,
+)
+from PyQt6.QtWidgets import QApplication, QWidget
+
+from src.core.annotation_history import AnnotationHistory
+from src.core.code_decoder import DecodedCode
+from src.core.screen_capture import ScreenCapture, ScreenGrab
+from src.core.scroll_stitch import SCROLL_STITCH_AVAILABLE
+from src.ui.code_results_menu import build_code_results_menu
+from src.ui.scroll_capture_window import ScrollCaptureWindow
 from src.ui.screenshot_overlay import ScreenshotOverlay
 
 
@@ -259,26 +275,61 @@ class TestScreenshotOverlay(unittest.TestCase):
         self.assertEqual(len(self.overlay.draw_actions), 0)
 
     def test_undo_and_redo_restore_moved_annotation_position(self):
-        original_line = {
-            "type": "line",
-            "color": QColor("#3399FF"),
-            "points": [QPoint(10, 10), QPoint(30, 20)],
-            "thickness": 3,
-        }
-        self.overlay.draw_actions = [self.overlay._clone_action(original_line)]
+        self.overlay.draw_actions = [
+            {
+                "type": "line",
+                "color": QColor("#3399FF"),
+                "points": [QPoint(10, 10), QPoint(30, 20)],
+                "thickness": 3,
+            }
+        ]
+        history = self.overlay.undo_history
+        self.assertIsInstance(history, AnnotationHistory)
 
         self.overlay._record_undo_state()
         ScreenshotOverlay._translate_action(self.overlay.draw_actions[0], QPoint(12, 6))
 
         self.overlay.undo_action()
         self.assertEqual(
-            self.overlay.draw_actions[0]["points"], original_line["points"]
+            self.overlay.draw_actions[0]["points"], [QPoint(10, 10), QPoint(30, 20)]
         )
+        self.assertTrue(history.can_redo())
 
         self.overlay.redo_action()
         self.assertEqual(
             self.overlay.draw_actions[0]["points"], [QPoint(22, 16), QPoint(42, 26)]
         )
+        self.assertFalse(history.can_redo())
+
+    def test_undo_restores_text_before_reediting(self):
+        self.overlay.selection_rect = QRect(0, 0, 300, 200)
+        self.overlay.draw_mode = "text"
+        self.overlay.draw_actions = [
+            {
+                "type": "text",
+                "color": QColor("#33CC33"),
+                "text": "Hello",
+                "pos": QPoint(80, 40),
+                "font_size": 18,
+            }
+        ]
+        self.overlay.mouseDoubleClickEvent(
+            QMouseEvent(
+                QEvent.Type.MouseButtonDblClick,
+                QPointF(84, 46),
+                Qt.MouseButton.LeftButton,
+                Qt.MouseButton.LeftButton,
+                Qt.KeyboardModifier.NoModifier,
+            )
+        )
+        self.overlay.text_input.setText("Bye")
+        with patch.object(self.overlay.text_input, "isVisible", return_value=True):
+            self.overlay.commit_text_action()
+
+        self.overlay.undo_action()
+        self.assertEqual([a["text"] for a in self.overlay.draw_actions], ["Hello"])
+        self.overlay.redo_action()
+        self.assertEqual([a["text"] for a in self.overlay.draw_actions], ["Bye"])
 
     def test_finalize_capture_manual_save_skips_auto_save(self):
         pixmap = QPixmap(10, 10)
@@ -294,10 +345,12 @@ class TestScreenshotOverlay(unittest.TestCase):
         with patch.object(
             self.overlay, "get_selected_pixmap", return_value=pixmap
         ), patch.object(
-            self.overlay, "_save_pixmap_to_path", return_value="C:/tmp/shot.png"
+            self.overlay, "_prepare_save_path", return_value="C:/tmp/shot.png"
         ) as save_mock, patch.object(
-            self.overlay, "_auto_save_pixmap"
-        ) as auto_save_mock, patch.object(
+            self.overlay, "_auto_save_path"
+        ) as auto_save_mock, patch(
+            "src.ui.screenshot_overlay.capture_history_manager.submit_capture"
+        ) as submit_mock, patch.object(
             self.overlay, "close_overlay"
         ) as close_mock, patch(
             "src.ui.screenshot_overlay.config_manager.get_value",
@@ -305,27 +358,149 @@ class TestScreenshotOverlay(unittest.TestCase):
         ):
             self.overlay.finalize_capture(manual_save_path="C:/tmp/shot.png")
 
-        save_mock.assert_called_once_with(
-            pixmap, "C:/tmp/shot.png", source="manual"
-        )
+        save_mock.assert_called_once_with("C:/tmp/shot.png")
         auto_save_mock.assert_not_called()
+        submit_mock.assert_called_once()
+        self.assertEqual(submit_mock.call_args.kwargs["save_path"], "C:/tmp/shot.png")
+        self.assertEqual(submit_mock.call_args.kwargs["actions"], ["save"])
+        close_mock.assert_called_once()
+
+    @unittest.skipUnless(SCROLL_STITCH_AVAILABLE, "numpy is not installed")
+    def test_scroll_capture_hands_the_stitched_page_to_finalize(self):
+        page = QImage(200, 600, QImage.Format.Format_RGB32)
+        page.fill(QColor("#FFFFFF"))
+        for y in range(page.height()):
+            for x in range(0, page.width(), 8):
+                page.setPixel(x, y, (y * 7919 + x * 104729) & 0xFFFFFF)
+        frames = [page.copy(0, top, 200, 150) for top in (0, 0, 60, 140, 140)]
+        self.overlay.selection_rect = QRect(10, 20, 200, 150)
+
+        with patch.object(
+            ScrollCaptureWindow, "_grab", side_effect=frames
+        ), patch.object(QTimer, "singleShot"), patch.object(
+            self.overlay, "finalize_capture"
+        ) as finalize_mock:
+            self.overlay.start_scroll_capture()
+            self.assertIsNone(self.overlay.screen_capture)
+            capture = self.overlay.scroll_capture
+            capture.start()
+            capture.timer.stop()
+            for _ in range(3):
+                capture.grab_frame()
+            capture.finish("pin")
+
+        self.assertIsNone(self.overlay.scroll_capture)
+        pixmap = finalize_mock.call_args.kwargs["pixmap"]
+        self.assertTrue(finalize_mock.call_args.kwargs["manual_pin"])
+        self.assertEqual((pixmap.width(), pixmap.height()), (200, 290))
+        self.assertEqual(pixmap.toImage(), page.copy(0, 0, 200, 290))
+
+    @unittest.skipUnless(SCROLL_STITCH_AVAILABLE, "numpy is not installed")
+    def test_scroll_capture_is_refused_while_annotations_exist(self):
+        self.overlay.selection_rect = QRect(10, 20, 200, 150)
+        self.overlay._add_number_action(QPoint(30, 40))
+
+        self.assertFalse(self.overlay.btn_scroll.isEnabled())
+        with patch.object(QTimer, "singleShot"):
+            self.overlay.start_scroll_capture()
+        self.assertIsNone(self.overlay.scroll_capture)
+
+        self.overlay.undo_action()
+        self.assertTrue(self.overlay.btn_scroll.isEnabled())
+
+    @unittest.skipUnless(SCROLL_STITCH_AVAILABLE, "numpy is not installed")
+    def test_new_capture_drops_an_open_scroll_capture(self):
+        self.overlay.selection_rect = QRect(10, 20, 200, 150)
+        with patch.object(QTimer, "singleShot"):
+            self.overlay.start_scroll_capture()
+        capture = self.overlay.scroll_capture
+        capture.timer.start()
+
+        with patch.object(self.overlay, "close_overlay") as close_mock:
+            self.overlay.capture_screen()
+
+        self.assertIsNone(self.overlay.scroll_capture)
+        self.assertFalse(capture.timer.isActive())
+        close_mock.assert_not_called()
+        self.assertIsNotNone(self.overlay.screen_capture)
+
+    def test_recognize_qr_lists_every_code_instead_of_copying(self):
+        codes = [
+            DecodedCode("qr", "https://example.com", ((0, 0),)),
+            DecodedCode("barcode", "4006381333931", ((5, 5),)),
+        ]
+        pixmap = QPixmap(40, 40)
+
+        with patch.object(
+            self.overlay, "get_selected_pixmap", return_value=pixmap
+        ), patch(
+            "src.ui.code_results_menu.decode_codes", return_value=codes
+        ), patch(
+            "src.ui.screenshot_overlay.show_code_results"
+        ) as show_mock, patch.object(
+            self.overlay, "close_overlay"
+        ) as close_mock:
+            self.overlay.recognize_qr()
+            # Decoding runs on a worker; the menu comes from its signal.
+            show_mock.assert_not_called()
+            self.assertTrue(self.overlay.code_worker.wait(5000))
+            QApplication.processEvents()
+
         close_mock.assert_called_once()
+        show_mock.assert_called_once_with(codes)
+
+        menu = build_code_results_menu(codes)
+        labels = [action.text() for action in menu.actions()]
+        self.assertEqual(labels[0], "复制二维码: https://example.com")
+        self.assertEqual(labels[2], "复制条码: 4006381333931")
+        self.assertEqual(labels[-1], "复制全部 (2)")
+        menu.actions()[2].trigger()
+        self.assertEqual(QApplication.clipboard().text(), "4006381333931")
+
+    def test_first_paint_after_capture_records_hotkey_latency(self):
+        converted = []
+        to_image = QPixmap.toImage
+
+        def _to_image(pixmap):
+            converted.append(pixmap.width() * pixmap.height())
+            return to_image(pixmap)
+
+        triggered_at = time.perf_counter() - 0.05
+        with patch.object(QPixmap, "toImage", _to_image), patch(
+            "src.ui.screenshot_overlay.metrics_store.record"
+        ) as record_mock:
+            self.overlay.capture_screen(triggered_at)
+            self.overlay.current_mouse_pos = QPoint(20, 20)
+            canvas = QImage(self.overlay.size(), QImage.Format.Format_ARGB32)
+            self.overlay.render(canvas)
+            self.overlay.render(canvas)
+
+        record_mock.assert_called_once()
+        metric, duration, extra = record_mock.call_args.args
+        self.assertEqual(metric, "screenshot.first_paint")
+        self.assertGreaterEqual(duration, 50)
+        self.assertGreaterEqual(extra["queue_ms"], 50)
+        self.assertEqual(
+            set(extra),
+            {
+                "queue_ms",
+                "grab_ms",
+                "show_ms",
+                "screens",
+                "screen_grab_ms",
+                "parallel_grab",
+            },
+        )
+        self.assertEqual(len(extra["screen_grab_ms"]), extra["screens"])
+        self.assertEqual(max(converted), 1)
 
     def test_selected_pixmap_uses_native_pixels_for_high_dpi_capture(self):
         screen_pixmap = QPixmap(200, 160)
         screen_pixmap.setDevicePixelRatio(2.0)
         screen_pixmap.fill(QColor("#112233"))
 
-        self.overlay.screen_pixmap = screen_pixmap
-        self.overlay.screen_image = screen_pixmap.toImage()
+        self.overlay.screen_capture = ScreenCapture.from_pixmap(screen_pixmap)
         self.overlay.screen_virtual_rect = QRect(0, 0, 100, 80)
-        self.overlay.screen_capture_sources = [
-            {
-                "geometry": QRect(0, 0, 100, 80),
-                "pixmap": screen_pixmap,
-                "scale": 2.0,
-            }
-        ]
         self.overlay.screen_scale = 2.0
         self.overlay.selection_rect = QRect(10, 12, 30, 20)
 
@@ -338,6 +513,266 @@ class TestScreenshotOverlay(unittest.TestCase):
         self.assertEqual(selected.deviceIndependentSize().width(), 30)
         self.assertEqual(selected.deviceIndependentSize().height(), 20)
 
+    def test_mixed_dpi_screens_paint_without_a_composite_and_release_on_close(self):
+        left = QPixmap(200, 160)
+        left.setDevicePixelRatio(2.0)
+        left.fill(QColor("#112233"))
+        right = QPixmap(100, 80)
+        right.fill(QColor("#AA5500"))
+        capture = ScreenCapture(
+            [
+                ScreenGrab(QRect(0, 0, 100, 80), left, 2.0),
+                ScreenGrab(QRect(100, 0, 100, 80), right, 1.0),
+            ]
+        )
+        self.overlay.screen_capture = capture
+        self.overlay.screen_virtual_rect = capture.virtual_rect
+        self.overlay.screen_scale = capture.scale
+        self.overlay.setGeometry(0, 0, 200, 80)
+
+        painted = []
+        draw_pixmap = QPainter.drawPixmap
+
+        def _draw_pixmap(painter, *args):
+            painted.append(args[1].width() if len(args) > 2 else None)
+            return draw_pixmap(painter, *args)
+
+        canvas = QImage(200, 80, QImage.Format.Format_ARGB32)
+        with patch.object(QPainter, "drawPixmap", _draw_pixmap):
+            self.overlay.render(canvas)
+        self.assertEqual(painted, [200, 100])
+
+        self.overlay.selection_rect = QRect(110, 10, 30, 20)
+        self.assertEqual(self.overlay.get_selected_pixmap().width(), 30)
+        self.overlay.selection_rect = QRect(90, 10, 30, 20)
+        spanning = self.overlay.get_selected_pixmap()
+        self.assertEqual(spanning.width(), 60)
+        self.assertEqual(spanning.toImage().pixelColor(50, 10), QColor("#AA5500"))
+
+        self.overlay.close_overlay()
+        self.assertIsNone(self.overlay.screen_capture)
+
+    def _load_gradient_screen(self, width=800, height=600):
+        pixmap = QPixmap(width, height)
+        painter = QPainter(pixmap)
+        gradient = QLinearGradient(0, 0, width, height)
+        gradient.setColorAt(0, QColor("#224488"))
+        gradient.setColorAt(1, QColor("#EECC22"))
+        painter.fillRect(pixmap.rect(), gradient)
+        painter.end()
+        self.overlay.screen_capture = ScreenCapture.from_pixmap(pixmap)
+        self.overlay.screen_virtual_rect = QRect(0, 0, width, height)
+        self.overlay.setGeometry(0, 0, width, height)
+
+    def _render(self, canvas, region=None):
+        # render() puts the top-left of ``region`` at the target offset.
+        region = region or QRegion(self.overlay.rect())
+        painter = QPainter(canvas)
+        self.overlay.render(
+            painter, region.boundingRect().topLeft(), region, QWidget.RenderFlag(0)
+        )
+        painter.end()
+
+    def _move(self, x, y):
+        event = QMouseEvent(
+            QEvent.Type.MouseMove,
+            QPointF(x, y),
+            Qt.MouseButton.NoButton,
+            Qt.MouseButton.NoButton,
+            Qt.KeyboardModifier.NoModifier,
+        )
+        with patch.object(self.overlay, "update") as update_mock:
+            self.overlay.mouseMoveEvent(event)
+        return update_mock.call_args.args[0]
+
+    def test_mouse_move_repaints_only_changed_regions(self):
+        self._load_gradient_screen()
+        self.overlay.selection_rect = QRect(60, 40, 200, 150)
+        self.overlay.draw_actions = [
+            {
+                "type": "mosaic",
+                "color": QColor("#000000"),
+                "points": [QPoint(80, 60), QPoint(120, 90), QPoint(160, 70)],
+                "thickness": 3,
+            }
+        ]
+        self.overlay.current_mouse_pos = QPoint(100, 100)
+        canvas = QImage(800, 600, QImage.Format.Format_ARGB32_Premultiplied)
+        canvas.fill(0)
+        self._render(canvas)
+
+        def check(region):
+            self._render(canvas, region)
+            expected = QImage(800, 600, QImage.Format.Format_ARGB32_Premultiplied)
+            expected.fill(0)
+            self._render(expected)
+            self.assertEqual(canvas, expected)
+
+        hover = self._move(108, 104)
+        self.assertLess(
+            hover.boundingRect().width() * hover.boundingRect().height(), 800 * 600 // 4
+        )
+        check(hover)
+
+        self.overlay.is_resizing = True
+        self.overlay.resize_anchor = "br"
+        check(self._move(280, 210))
+        self.overlay.is_resizing = False
+
+        self.overlay.current_action = {
+            "type": "pen",
+            "color": QColor("#00FF00"),
+            "points": [QPoint(150, 150)],
+            "thickness": 6,
+        }
+        for x, y in ((160, 156), (175, 150), (190, 170)):
+            check(self._move(x, y))
+        self.overlay.current_action = None
+        self._render(canvas)
+
+        self.overlay.is_moving_action = True
+        self.overlay.moving_action_index = 0
+        self.overlay.action_drag_last_pos = QPoint(190, 170)
+        check(self._move(230, 200))
+
+    def test_effect_strokes_build_only_the_tiles_they_cover(self):
+        self._load_gradient_screen()
+        self.overlay.selection_rect = QRect(0, 0, 800, 600)
+        self.overlay.draw_actions = [
+            {
+                "type": "blur",
+                "color": QColor("#000000"),
+                "points": [QPoint(40, 40), QPoint(90, 60)],
+                "thickness": 3,
+            }
+        ]
+        canvas = QImage(800, 600, QImage.Format.Format_ARGB32_Premultiplied)
+        canvas.fill(0)
+
+        self._render(canvas)
+
+        self.assertNotIn("mosaic", self.overlay._effect_tiles)
+        self.assertEqual(len(self.overlay._effect_tiles["blur"]), 1)
+
+    def test_long_freehand_stroke_repaints_only_its_tail(self):
+        self._load_gradient_screen()
+        self.overlay.selection_rect = QRect(0, 0, 800, 600)
+        self.overlay.draw_mode = "pen"
+        self.overlay.draw_color = QColor("#00FF00")
+        self.overlay.draw_thickness = 6
+        self.overlay.current_mouse_pos = QPoint(20, 300)
+        canvas = QImage(800, 600, QImage.Format.Format_ARGB32_Premultiplied)
+        canvas.fill(0)
+        self._render(canvas)
+        self.overlay.mousePressEvent(
+            QMouseEvent(
+                QEvent.Type.MouseButtonPress,
+                QPointF(20, 300),
+                Qt.MouseButton.LeftButton,
+                Qt.MouseButton.LeftButton,
+                Qt.KeyboardModifier.NoModifier,
+            )
+        )
+
+        for step in range(1, 300):
+            x, y = 20 + step * 2.5, 300 + 120 * math.sin(step / 15)
+            dirty = self._move(x, y)
+            self._render(canvas, dirty)
+        self.assertFalse(dirty.intersects(QRect(0, 160, 300, 280)))
+        expected = QImage(800, 600, QImage.Format.Format_ARGB32_Premultiplied)
+        expected.fill(0)
+        self._render(expected)
+        self.assertEqual(canvas, expected)
+
+        live_points = len(self.overlay.current_action["points"])
+        self.overlay.mouseReleaseEvent(
+            QMouseEvent(
+                QEvent.Type.MouseButtonRelease,
+                QPointF(x, y),
+                Qt.MouseButton.LeftButton,
+                Qt.MouseButton.NoButton,
+                Qt.KeyboardModifier.NoModifier,
+            )
+        )
+        self.assertLess(len(self.overlay.draw_actions[0]["points"]), live_points)
+
+    def _assert_images_close(self, actual, expected):
+        # Compositing through the layer may round anti-aliased edges by one.
+        actual_bytes = actual.constBits().asstring(actual.sizeInBytes())
+        expected_bytes = expected.constBits().asstring(expected.sizeInBytes())
+        if actual_bytes != expected_bytes:
+            delta = max(abs(a - b) for a, b in zip(actual_bytes, expected_bytes))
+            self.assertLessEqual(delta, 1)
+
+    def _render_direct(self):
+        # Reference frame with every annotation drawn live, bypassing the layer.
+        image = QImage(800, 600, QImage.Format.Format_ARGB32_Premultiplied)
+        image.fill(0)
+        actions = list(self.overlay.draw_actions)
+        if self.overlay.current_action:
+            actions.append(self.overlay.current_action)
+        with patch.object(
+            self.overlay, "_annotation_layer_pixmap", return_value=None
+        ), patch.object(self.overlay, "_live_actions", return_value=actions):
+            self._render(image)
+        return image
+
+    def test_committed_annotations_are_painted_from_cached_layer(self):
+        self._load_gradient_screen()
+        self.overlay.selection_rect = QRect(60, 40, 400, 300)
+        self.overlay.draw_actions = [
+            {
+                "type": "rect",
+                "color": QColor("#FF0000"),
+                "points": [QPoint(80, 60), QPoint(200, 140)],
+                "thickness": 3,
+            },
+            {
+                "type": "mosaic",
+                "color": QColor("#000000"),
+                "points": [QPoint(100, 200), QPoint(160, 220)],
+                "thickness": 3,
+            },
+        ]
+        self.overlay.current_mouse_pos = QPoint(300, 250)
+        canvas = QImage(800, 600, QImage.Format.Format_ARGB32_Premultiplied)
+        canvas.fill(0)
+        self._render(canvas)
+        layer = self.overlay._annotation_layer
+        self.assertIsNotNone(layer)
+        self._assert_images_close(canvas, self._render_direct())
+
+        with patch.object(
+            self.overlay, "_draw_action_list", wraps=self.overlay._draw_action_list
+        ) as draw_mock:
+            self._render(canvas, self._move(310, 256))
+        draw_mock.assert_not_called()
+        self.assertIs(self.overlay._annotation_layer, layer)
+
+        self.overlay.current_action = {
+            "type": "pen",
+            "color": QColor("#00FF00"),
+            "points": [QPoint(120, 100), QPoint(180, 120)],
+            "thickness": 4,
+        }
+        self._render(canvas)
+        self._assert_images_close(canvas, self._render_direct())
+        self.assertIs(self.overlay._annotation_layer, layer)
+
+        self.overlay._record_undo_state()
+        self.overlay.draw_actions.append(self.overlay.current_action)
+        self.overlay.current_action = None
+        self._render(canvas)
+        self.assertIs(self.overlay._annotation_layer, layer)
+        self.assertEqual(self.overlay._annotation_layer_count, 3)
+        self._assert_images_close(canvas, self._render_direct())
+
+        self.overlay.undo_action()
+        self._render(canvas)
+        self.assertIsNot(self.overlay._annotation_layer, layer)
+        self.assertEqual(self.overlay._annotation_layer_count, 2)
+        self._assert_images_close(canvas, self._render_direct())
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,69 @@
+import gc
+import unittest
+
+from PyQt6.QtGui import QColor, QImage
+
+from src.utils import qimage_numpy
+from src.utils.qimage_numpy import array_image, bgra_view, image_view
+
+
+@unittest.skipIf(qimage_numpy.np is None, "numpy is not installed")
+class TestImageView(unittest.TestCase):
+    def test_view_honours_row_padding(self):
+        # 5 RGB888 pixels are 15 bytes, padded to a 16 byte stride.
+        image = QImage(5, 3, QImage.Format.Format_RGB888)
+        image.fill(QColor(10, 20, 30))
+
+        view = image_view(image)
+
+        self.assertEqual(view.shape, (3, 5, 3))
+        self.assertEqual(view.strides, (image.bytesPerLine(), 3, 1))
+        self.assertEqual(view[2, 4].tolist(), [10, 20, 30])
+        self.assertFalse(view.flags.writeable)
+
+    def test_view_outlives_the_image_and_ignores_later_writes(self):
+        image = QImage(4, 2, QImage.Format.Format_ARGB32)
+        image.fill(QColor(1, 2, 3))
+
+        view = bgra_view(image)
+        image.fill(QColor(9, 9, 9))
+        del image
+        gc.collect()
+
+        self.assertEqual(view[1, 3].tolist(), [3, 2, 1, 255])
+
+    def test_writable_view_writes_through(self):
+        image = QImage(4, 2, QImage.Format.Format_ARGB32)
+        image.fill(QColor("#000000"))
+
+        image_view(image, writable=True)[0, 0] = [50, 60, 70, 255]
+
+        self.assertEqual(image.pixelColor(0, 0), QColor(70, 60, 50))
+
+    def test_other_formats_are_converted_once(self):
+        image = QImage(4, 2, QImage.Format.Format_RGB16)
+        image.fill(QColor("#FFFFFF"))
+
+        self.assertEqual(bgra_view(image).shape, (2, 4, 4))
+        self.assertEqual(
+            image_view(image, QImage.Format.Format_Grayscale8).shape, (2, 4)
+        )
+        with self.assertRaises(ValueError):
+            image_view(image)
+
+    def test_array_image_round_trips_strided_arrays(self):
+        image = QImage(6, 4, QImage.Format.Format_RGB888)
+        image.fill(QColor(10, 20, 30))
+        image.setPixelColor(5, 3, QColor(200, 100, 50))
+
+        copy = array_image(image_view(image)[:, ::2], QImage.Format.Format_RGB888)
+
+        self.assertEqual(copy.width(), 3)
+        self.assertEqual(copy.pixelColor(0, 0), QColor(10, 20, 30))
+        self.assertEqual(
+            array_image(image_view(image), QImage.Format.Format_RGB888), image
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()